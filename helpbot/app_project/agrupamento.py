@@ -0,0 +1,162 @@
+"""
+Agrupamento de notificações repetidas.
+
+Cada aviso sobre o mesmo chamado virava uma linha nova de Notificacao, guardada
+e devolvida separadamente em todo polling. Agora, dentro de JANELA segundos:
+
+- A mesma (usuário, chamado, tipo) ainda não lida vira UMA linha: a mensagem é
+  a mais recente, contador soma as ocorrências e criado_em avança (o polling
+  incremental a entrega de novo)
+- Um lote (notificar_em_lote) faz uma consulta das linhas existentes, um
+  bulk_update e um bulk_create, na mesma transação
+- Notificações lidas (inclusive marcações ainda no buffer da escrita adiada)
+  não são reaproveitadas: o aviso seguinte volta a aparecer como novo
+
+O resumo periódico dos chamados de baixa urgência fica em
+manage.py resumir_notificacoes.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .escrita_adiada import buffer_escrita
+from .longpoll import registro_espera, canal_notificacoes
+from .models import Notificacao
+
+logger = logging.getLogger(__name__)
+
+JANELA = getattr(settings, 'NOTIFICACOES_JANELA_AGRUPAMENTO', 600)
+RESUMO_TIPOS = getattr(settings, 'NOTIFICACOES_RESUMO_TIPOS', ('atualizacao', 'mensagem'))
+RESUMO_URGENCIAS = getattr(settings, 'NOTIFICACOES_RESUMO_URGENCIAS', ('baixa',))
+
+TIPO_RESUMO = 'resumo'
+# Chamados citados na mensagem do resumo (o restante vira "e mais N")
+MAX_CHAMADOS_MENSAGEM = 5
+
+
+class AgrupadorNotificacoes:
+    def notificar(self, usuario_id, chamado_id, tipo, mensagem, **campos):
+        """Uma notificação; devolve o id da linha criada ou agrupada"""
+        return self.notificar_em_lote([dict(campos, usuario_id=usuario_id, chamado_id=chamado_id, tipo=tipo, mensagem=mensagem)])[0]
+
+    def notificar_em_lote(self, notificacoes):
+        """
+        notificacoes: dicts com usuario_id, chamado_id, tipo, mensagem (+ campos do modelo).
+        Devolve o id da linha de cada item, na mesma ordem.
+        """
+        if not notificacoes:
+            return []
+
+        # Repetições dentro do próprio lote: a última mensagem vale
+        por_chave = {}
+        for dados in notificacoes:
+            chave = (dados['usuario_id'], dados['chamado_id'], dados['tipo'])
+            if chave in por_chave:
+                por_chave[chave]['mensagem'] = dados['mensagem']
+                por_chave[chave]['contador'] += 1
+            else:
+                por_chave[chave] = dict(dados, contador=1)
+
+        usuarios = {usuario_id for usuario_id, _, _ in por_chave}
+        # Quem marcou como lida e ainda está no buffer não pode ter a linha reaproveitada
+        buffer_escrita.sincronizar_varios(usuarios)
+        agora = timezone.now()
+
+        condicao = Q()
+        for usuario_id, chamado_id, tipo in por_chave:
+            condicao |= Q(usuario_id=usuario_id, chamado_id=chamado_id, tipo=tipo)
+
+        with transaction.atomic():
+            existentes = {}
+            # Mais antigas primeiro: havendo mais de uma, a mais recente fica no dicionário
+            for pk, usuario_id, chamado_id, tipo in (
+                Notificacao.objects
+                .filter(condicao, lida=False, criado_em__gte=agora - timedelta(seconds=JANELA))
+                .order_by('criado_em')
+                .values_list('pk', 'usuario_id', 'chamado_id', 'tipo')
+            ):
+                existentes[(usuario_id, chamado_id, tipo)] = pk
+
+            agrupadas, novas = [], []
+            for chave, dados in por_chave.items():
+                pk = existentes.get(chave)
+                if pk is None:
+                    novas.append(Notificacao(**dados))
+                else:
+                    agrupadas.append(Notificacao(
+                        pk=pk,
+                        mensagem=dados['mensagem'],
+                        contador=F('contador') + dados['contador'],
+                        criado_em=agora,
+                    ))
+
+            if agrupadas:
+                Notificacao.objects.bulk_update(agrupadas, ['mensagem', 'contador', 'criado_em'])
+            for notificacao in Notificacao.objects.bulk_create(novas):
+                existentes[(notificacao.usuario_id, notificacao.chamado_id, notificacao.tipo)] = notificacao.pk
+
+            # bulk_update/bulk_create não disparam post_save: avisar o long-poll de cada usuário
+            for usuario_id in usuarios:
+                registro_espera.notificar_apos_commit(canal_notificacoes(usuario_id))
+
+        if agrupadas:
+            logger.debug(f"Notificações: {len(novas)} criadas, {len(agrupadas)} agrupadas")
+        return [existentes[(dados['usuario_id'], dados['chamado_id'], dados['tipo'])] for dados in notificacoes]
+
+
+def resumir(idade_minutos, tipos=None, urgencias=None):
+    """
+    Junta, por usuário, as notificações não lidas de `tipos` (e resumos anteriores)
+    de chamados de `urgencias` mais velhas que idade_minutos numa única 'resumo'.
+    Devolve (resumos criados, notificações removidas).
+    """
+    tipos = tuple(tipos or RESUMO_TIPOS)
+    urgencias = tuple(urgencias or RESUMO_URGENCIAS)
+    # Marcações de leitura pendentes contam: o que já foi lido não entra no resumo
+    buffer_escrita.gravar()
+    limite = timezone.now() - timedelta(minutes=idade_minutos)
+
+    por_usuario = {}
+    for pk, usuario_id, chamado_id, chamado_legivel, contador in (
+        Notificacao.objects
+        .filter(lida=False, criado_em__lt=limite)
+        .filter(Q(tipo__in=tipos, chamado__urgencia__in=urgencias) | Q(tipo=TIPO_RESUMO))
+        .order_by('criado_em')
+        .values_list('pk', 'usuario_id', 'chamado_id', 'chamado__id_legivel', 'contador')
+    ):
+        por_usuario.setdefault(usuario_id, []).append((pk, chamado_id, chamado_legivel, contador))
+
+    resumos, removidas = [], []
+    for usuario_id, linhas in por_usuario.items():
+        if len(linhas) < 2:
+            continue
+        legiveis = list(dict.fromkeys(legivel for _, _, legivel, _ in linhas if legivel))
+        total = sum(contador for _, _, _, contador in linhas)
+        lista = ', '.join(legiveis[:MAX_CHAMADOS_MENSAGEM])
+        if len(legiveis) > MAX_CHAMADOS_MENSAGEM:
+            lista += f" e mais {len(legiveis) - MAX_CHAMADOS_MENSAGEM}"
+        resumos.append(Notificacao(
+            usuario_id=usuario_id,
+            chamado_id=linhas[-1][1],
+            tipo=TIPO_RESUMO,
+            contador=total,
+            mensagem=f"📋 **Resumo:** {total} notificações de chamados sem urgência ({lista})",
+        ))
+        removidas.extend(pk for pk, _, _, _ in linhas)
+
+    if resumos:
+        with transaction.atomic():
+            Notificacao.objects.bulk_create(resumos)
+            Notificacao.objects.filter(pk__in=removidas).delete()
+            for resumo in resumos:
+                registro_espera.notificar_apos_commit(canal_notificacoes(resumo.usuario_id))
+        logger.info(f"Resumo de notificações: {len(removidas)} notificações em {len(resumos)} resumos")
+    return len(resumos), len(removidas)
+
+
+# Instância global do agrupador (sem estado: tudo fica no banco)
+agrupador_notificacoes = AgrupadorNotificacoes()
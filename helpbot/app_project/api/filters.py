@@ -0,0 +1,30 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+BOOLEANOS = {'true': True, 'false': False, '1': True, '0': False}
+
+
+class FiltroIndexado(BaseFilterBackend):
+    """
+    Filtros declarados na view (parâmetro -> lookup), todos cobertos por índices.
+    Qualquer outro parâmetro é ignorado: nada de filtro arbitrário em coluna sem índice.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filtros = {}
+        for parametro, lookup in getattr(view, 'filtros', {}).items():
+            valor = request.query_params.get(parametro)
+            if valor in (None, ''):
+                continue
+            campo = queryset.model._meta.get_field(lookup.split('__')[0])
+            if isinstance(campo, models.BooleanField):
+                valor = BOOLEANOS.get(valor.lower(), valor)
+            filtros[lookup] = valor
+        if not filtros:
+            return queryset
+        try:
+            return queryset.filter(**filtros)
+        except (DjangoValidationError, ValueError) as e:
+            raise ValidationError({'filtros': str(e)})
@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CursorCriacao(CursorPagination):
+    """
+    Paginação por keyset (WHERE criado_em < último visto), sem OFFSET nem COUNT:
+    o custo de cada página não cresce com a profundidade da listagem.
+    """
+    ordering = '-criado_em'
+    page_size = 50
+    page_size_query_param = 'tamanho'
+    max_page_size = 200
+
+
+class CursorCriacaoCrescente(CursorCriacao):
+    """Mensagens do chat: da mais antiga para a mais nova"""
+    ordering = 'criado_em'
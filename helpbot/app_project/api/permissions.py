@@ -0,0 +1,29 @@
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import BasePermission
+
+from app_project.escrita_adiada import buffer_escrita
+from app_project.models import Usuario
+from app_project.security import security
+
+
+class SessaoUsuarioAuthentication(BaseAuthentication):
+    """Mesma sessão das views (request.session['usuario_id']), sem o auth do Django"""
+
+    def authenticate(self, request):
+        usuario_id = request._request.session.get('usuario_id')
+        if not usuario_id or not security.validate_uuid(usuario_id):
+            return None
+        usuario = Usuario.objects.filter(id_usuario=usuario_id).first()
+        if usuario is None:
+            return None
+        buffer_escrita.sincronizar(usuario.pk)
+        return usuario, None
+
+    def authenticate_header(self, request):
+        # Sem cabeçalho o DRF responde 403; com ele, 401 para quem não tem sessão
+        return 'Session'
+
+
+class UsuarioCadastrado(BasePermission):
+    def has_permission(self, request, view):
+        return isinstance(request.user, Usuario)
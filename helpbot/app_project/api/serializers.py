@@ -1,7 +1,91 @@
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 from app_project import models
 
 class UsuarioSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Usuario
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class SerializadorLeve:
+    """
+    Serializador de leitura sobre .values(): sem instanciar modelos nem Fields do DRF.
+    `campos` mapeia o nome exposto na API para o lookup do ORM (joins só para os
+    campos pedidos). UUIDs e datas ficam com o JSONEncoder do DRF.
+    """
+    campos = {}
+    # Sempre buscados (ordenação do cursor), mesmo fora do ?fields=
+    obrigatorios = ('criado_em',)
+
+    def __init__(self, request=None):
+        self.nomes = self.campos_da_requisicao(request)
+
+    @classmethod
+    def campos_da_requisicao(cls, request):
+        """?fields=id,titulo,status (sparse fieldset); sem o parâmetro, todos os campos"""
+        pedido = request.query_params.get('fields') if request is not None else None
+        if not pedido:
+            return list(cls.campos)
+        nomes = [nome.strip() for nome in pedido.split(',') if nome.strip()]
+        invalidos = [nome for nome in nomes if nome not in cls.campos]
+        if invalidos:
+            raise ValidationError({'fields': f"Campos inválidos: {', '.join(invalidos)}"})
+        return list(dict.fromkeys(nomes))
+
+    def lookups(self):
+        return list(dict.fromkeys([self.campos[nome] for nome in self.nomes] + list(self.obrigatorios)))
+
+    def preparar(self, queryset):
+        return queryset.values(*self.lookups())
+
+    def serializar(self, linhas):
+        pares = [(nome, self.campos[nome]) for nome in self.nomes]
+        return [{nome: linha[lookup] for nome, lookup in pares} for linha in linhas]
+
+
+class ChamadoLeveSerializer(SerializadorLeve):
+    campos = {
+        'id': 'id_chamado',
+        'id_legivel': 'id_legivel',
+        'titulo': 'titulo',
+        'descricao': 'descricao',
+        'status': 'status',
+        'urgencia': 'urgencia',
+        'prioridade': 'prioridade',
+        'modalidade_presencial': 'modalidade_presencial',
+        'departamento_id': 'departamento_id',
+        'departamento': 'departamento__nome',
+        'nome_solicitante': 'nome_solicitante',
+        'usuario_id': 'usuario_id',
+        'suporte_responsavel_id': 'suporte_responsavel_id',
+        'suporte_responsavel': 'suporte_responsavel__username',
+        'duplicado_de_id': 'duplicado_de_id',
+        'criado_em': 'criado_em',
+        'atualizado_em': 'atualizado_em',
+        'data_resolucao': 'data_resolucao',
+    }
+
+
+class InteracaoLeveSerializer(SerializadorLeve):
+    campos = {
+        'id': 'id_interacao',
+        'chamado_id': 'chamado_id',
+        'remetente': 'remetente',
+        'mensagem': 'mensagem',
+        'acao_bot': 'acao_bot',
+        'suporte_responsavel': 'suporte_responsavel__username',
+        'criado_em': 'criado_em',
+    }
+
+
+class NotificacaoLeveSerializer(SerializadorLeve):
+    campos = {
+        'id': 'id_notificacao',
+        'chamado_id': 'chamado_id',
+        'chamado_legivel': 'chamado__id_legivel',
+        'tipo': 'tipo',
+        'mensagem': 'mensagem',
+        'lida': 'lida',
+        'criado_em': 'criado_em',
+    }
@@ -1,7 +1,89 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
+from rest_framework.response import Response
 from app_project.api import serializers
+from app_project.api.filters import FiltroIndexado
+from app_project.api.pagination import CursorCriacao, CursorCriacaoCrescente
+from app_project.api.permissions import SessaoUsuarioAuthentication, UsuarioCadastrado
 from app_project import models
 
+UUID_REGEX = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+
 class UsuarioViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.UsuarioSerializer
-    queryset = models.Usuario.objects.all()
\ No newline at end of file
+    queryset = models.Usuario.objects.all()
+
+
+class LeituraLeveViewSet(viewsets.GenericViewSet):
+    """
+    Base das APIs de leitura para integrações: list/retrieve sobre .values()
+    (serializador leve), paginação por cursor, ?fields= e filtros indexados.
+    Cada página custa uma consulta, sem COUNT.
+    """
+    authentication_classes = [SessaoUsuarioAuthentication]
+    permission_classes = [UsuarioCadastrado]
+    filter_backends = [FiltroIndexado]
+    pagination_class = CursorCriacao
+    # O router não pode capturar rotas existentes como /api/chamados/recentes/
+    lookup_value_regex = UUID_REGEX
+    serializador = None
+    filtros = {}
+
+    def list(self, request):
+        serializador = self.serializador(request)
+        linhas = self.paginate_queryset(serializador.preparar(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(serializador.serializar(linhas))
+
+    def retrieve(self, request, pk=None):
+        serializador = self.serializador(request)
+        linha = get_object_or_404(serializador.preparar(self.get_queryset()), pk=pk)
+        return Response(serializador.serializar([linha])[0])
+
+
+class ChamadoViewSet(LeituraLeveViewSet):
+    """Chamados: suporte vê todos, colaborador só os próprios"""
+    serializador = serializers.ChamadoLeveSerializer
+    filtros = {
+        'status': 'status',
+        'departamento': 'departamento_id',
+        'suporte_responsavel': 'suporte_responsavel_id',
+        'desde': 'criado_em__gte',
+        'ate': 'criado_em__lt',
+    }
+
+    def get_queryset(self):
+        queryset = models.Chamado.objects.all()
+        if self.request.user.tipo_usuario != 'suporte':
+            queryset = queryset.filter(usuario=self.request.user)
+        return queryset
+
+
+class InteracaoChamadoViewSet(LeituraLeveViewSet):
+    """Mensagens do chat (?chamado= para um chamado só), da mais antiga para a mais nova"""
+    serializador = serializers.InteracaoLeveSerializer
+    pagination_class = CursorCriacaoCrescente
+    filtros = {
+        'chamado': 'chamado_id',
+        'remetente': 'remetente',
+        'desde': 'criado_em__gte',
+        'ate': 'criado_em__lt',
+    }
+
+    def get_queryset(self):
+        queryset = models.InteracaoChamado.objects.all()
+        if self.request.user.tipo_usuario != 'suporte':
+            queryset = queryset.filter(chamado__usuario=self.request.user)
+        return queryset
+
+
+class NotificacaoViewSet(LeituraLeveViewSet):
+    """Notificações do próprio usuário"""
+    serializador = serializers.NotificacaoLeveSerializer
+    filtros = {
+        'lida': 'lida',
+        'tipo': 'tipo',
+        'chamado': 'chamado_id',
+    }
+
+    def get_queryset(self):
+        return models.Notificacao.objects.filter(usuario=self.request.user)
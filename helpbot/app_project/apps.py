@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AppProjectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_project'
+
+    def ready(self):
+        # Registra os receivers de invalidação de cache e os assinantes de eventos de domínio
+        from . import signals  # noqa: F401
+        from . import assinantes  # noqa: F401
@@ -0,0 +1,75 @@
+"""
+Aquecimento do worker: paga na inicialização o custo que cairia na primeira requisição.
+
+Chamado por chatAI_project/wsgi.py e asgi.py depois de criar a aplicação
+(com --preload no gunicorn roda uma vez no master, antes do fork):
+
+- monta o URLConf (rotas, DRF, views async)
+- importa os subsistemas de views de AQUECIMENTO_VIEWS (os demais ficam sob demanda)
+  e, com VIEWS_POLLING_ASYNC, as views async de polling
+- compila os templates das páginas (com o loader em cache, fora do DEBUG)
+- carrega o registro de departamentos e os contadores de versão
+
+Falha numa etapa (ex: banco ainda sem migrações) só gera um aviso: a
+requisição paga o custo normalmente.
+"""
+import logging
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Templates renderizados pelas views de página
+TEMPLATES = ('home.html', 'initial.html', 'dashboard.html', 'todos_chamados.html')
+
+# Subsistemas de views importados no aquecimento (estatisticas traz o numpy das métricas de SLA)
+VIEWS_PADRAO = ('base', 'autenticacao', 'chamados', 'chat', 'notificacoes', 'suporte')
+
+
+def aquecer(views=None):
+    """Executa o aquecimento; devolve {etapa: milissegundos}"""
+    if views is None:
+        views = getattr(settings, 'AQUECIMENTO_VIEWS', VIEWS_PADRAO)
+    tempos = {}
+
+    def etapa(nome, funcao):
+        inicio = time.perf_counter()
+        try:
+            funcao()
+        except Exception as e:
+            # Aquecimento nunca impede o worker de subir
+            logger.warning(f"Aquecimento: etapa {nome} falhou: {e}")
+        tempos[nome] = (time.perf_counter() - inicio) * 1000
+
+    etapa('urls', lambda: get_resolver().url_patterns)
+    etapa('views', lambda: [import_module(f'app_project.views.{modulo}') for modulo in views])
+    if getattr(settings, 'VIEWS_POLLING_ASYNC', True):
+        etapa('views_async', lambda: import_module('app_project.views_async'))
+    etapa('templates', lambda: [get_template(nome) for nome in TEMPLATES])
+    etapa('dados', _carregar_dados)
+
+    # Conexões abertas aqui não podem ser herdadas pelos workers após o fork
+    connections.close_all()
+    resumo = ', '.join(f'{nome}={ms:.0f}ms' for nome, ms in tempos.items())
+    logger.info(f"Aquecimento concluído: {resumo}")
+    return tempos
+
+
+def _carregar_dados():
+    from .departamentos import registro_departamentos
+    from .versoes import obter_versao
+
+    registro_departamentos.todos()
+    obter_versao('chamados')
+
+
+def aquecer_se_configurado():
+    """Hook de wsgi.py/asgi.py: aquece se AQUECIMENTO_AO_INICIAR"""
+    if getattr(settings, 'AQUECIMENTO_AO_INICIAR', True):
+        return aquecer()
+    return None
@@ -0,0 +1,144 @@
+"""
+Assinantes dos eventos de domínio (registrados em AppProjectConfig.ready).
+Todos são idempotentes: um evento pode ser entregue mais de uma vez.
+"""
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .bot_dialogos import bot_dialogos
+from . import volume
+from .duplicidade import indice_duplicados
+from .eventos import assinante, CHAMADO_CRIADO, STATUS_ALTERADO, MENSAGEM_ENVIADA, CONTROLE_ASSUMIDO
+from .longpoll import registro_espera, canal_chamado
+from .models import Chamado, EventoDominio, InteracaoChamado, Notificacao
+
+logger = logging.getLogger(__name__)
+
+# Contadores diários por tipo de evento (aproximados: uma re-entrega conta de novo)
+TIMEOUT_CONTADORES = 60 * 60 * 24 * 8
+
+
+def _chave_contador(tipo, dia):
+    return f"eventos_{tipo}_{dia:%Y%m%d}"
+
+
+def contadores_do_dia(dia=None):
+    """Totais de eventos por tipo no dia informado (padrão: hoje)"""
+    dia = dia or timezone.localdate()
+    tipos = [tipo for tipo, _ in EventoDominio.TIPO_CHOICES]
+    valores = cache.get_many([_chave_contador(tipo, dia) for tipo in tipos])
+    return {tipo: valores.get(_chave_contador(tipo, dia), 0) for tipo in tipos}
+
+
+def _mensagem_bot_unica(evento, dados_bot):
+    """Cria a mensagem do bot só se ela ainda não foi criada para este evento"""
+    # A mensagem guarda o evento que a gerou: outro evento igual (resolve -> reabre -> resolve)
+    # ganha a sua, a re-entrega do mesmo não
+    if InteracaoChamado.objects.filter(evento=evento, acao_bot=dados_bot['acao_bot']).exists():
+        return
+    InteracaoChamado.objects.create(
+        chamado_id=evento.chamado_id,
+        remetente='bot',
+        mensagem=dados_bot['mensagem'],
+        acao_bot=dados_bot['acao_bot'],
+        evento=evento
+    )
+
+
+# ===== NOTIFICAÇÕES =====
+
+@assinante(CHAMADO_CRIADO)
+def notificar_chamado_criado(evento):
+    """Mensagem de boas-vindas do bot e notificações (colaborador + todos os suportes)"""
+    if evento.chamado_id:
+        # Importado aqui: o ready() não carrega o subsistema de chamados (views sob demanda)
+        from .views.chamados import processar_chamado_criado
+        processar_chamado_criado(evento.chamado_id)
+
+
+@assinante(STATUS_ALTERADO)
+def atualizar_notificacoes_status(evento):
+    """Chamado resolvido: notificações de novo chamado deixam de ser pendência"""
+    if evento.dados['status_novo'] != 'resolvido' or not evento.chamado_id:
+        return
+    atualizadas = Notificacao.objects.filter(
+        chamado_id=evento.chamado_id, tipo='novo_chamado', lida=False
+    ).update(lida=True)
+    logger.info(f"Chamado resolvido: {atualizadas} notificações marcadas como lidas")
+
+
+@assinante(STATUS_ALTERADO)
+def mensagens_bot_status(evento):
+    """Mensagens do bot conforme a origem da mudança de status"""
+    if not evento.chamado_id:
+        return
+    origem = evento.dados['origem']
+    status_novo = evento.dados['status_novo']
+
+    if origem == 'atualizacao':
+        _mensagem_bot_unica(evento, {
+            'mensagem': f"📊 **Status atualizado:** {dict(Chamado.STATUS_CHOICES)[status_novo]}",
+            'acao_bot': 'atualizacao_status'
+        })
+    elif status_novo == 'resolvido' and origem in ('suporte', 'confirmacao_usuario'):
+        finalizacao = (bot_dialogos.get_finalizacao_suporte() if origem == 'suporte'
+                       else bot_dialogos.get_finalizacao_usuario())
+        _mensagem_bot_unica(evento, finalizacao)
+        _mensagem_bot_unica(evento, bot_dialogos.get_mensagem_finalizacao_completa())
+
+
+@assinante(CONTROLE_ASSUMIDO)
+def mensagem_bot_intermediacao(evento):
+    if evento.chamado_id and evento.dados.get('modo') == 'intermediacao':
+        _mensagem_bot_unica(evento, {
+            'mensagem': "🤖 **Modo de intermediação ativado**\nA partir de agora, o suporte técnico está acompanhando nossa conversa e pode intervir quando necessário para agilizar a solução.",
+            'acao_bot': 'intermediacao_ativa'
+        })
+
+
+@assinante(STATUS_ALTERADO)
+def remover_indice_duplicados(evento):
+    """Chamado resolvido deixa de ser candidato a original de duplicados"""
+    if evento.dados['status_novo'] == 'resolvido' and evento.chamado_id:
+        indice_duplicados.remover(evento.chamado_id)
+
+
+# ===== ESTATÍSTICAS =====
+
+@assinante(CHAMADO_CRIADO, STATUS_ALTERADO, MENSAGEM_ENVIADA, CONTROLE_ASSUMIDO)
+def contar_evento(evento):
+    chave = _chave_contador(evento.tipo, timezone.localdate(evento.criado_em))
+    if not cache.add(chave, 1, timeout=TIMEOUT_CONTADORES):
+        try:
+            cache.incr(chave)
+        except ValueError:
+            # Expirou entre o add e o incr
+            cache.add(chave, 1, timeout=TIMEOUT_CONTADORES)
+
+
+@assinante(CHAMADO_CRIADO, STATUS_ALTERADO)
+def atualizar_volume(evento):
+    """Reconta as horas do chamado na consolidação de volume (recontagem: idempotente)"""
+    if evento.chamado_id:
+        volume.recalcular_chamado(evento.chamado_id)
+
+
+# ===== PUSH =====
+
+@assinante(STATUS_ALTERADO, CONTROLE_ASSUMIDO)
+def avisar_clientes_chat(evento):
+    """Acorda o long-poll do chat: status/controle aparecem sem esperar uma mensagem nova"""
+    if evento.chamado_id:
+        registro_espera.notificar_apos_commit(canal_chamado(evento.chamado_id))
+
+
+# ===== AGENDADOR =====
+
+@assinante(CHAMADO_CRIADO)
+def agendar_verificacao(evento):
+    if evento.chamado_id:
+        from .views.chamados import verificar_chamado_apos_10_minutos
+        verificar_chamado_apos_10_minutos(evento.chamado_id)
+        logger.info(f"Verificação agendada para o chamado {evento.chamado_id} após 10 minutos")
@@ -92,6 +92,23 @@ class BibliotecaDialogosBot:
             'notificacao': True
         }
     
+    @staticmethod
+    def get_aviso_chamado_duplicado(original):
+        """Chamado quase igual a outro já aberto (ex: queda de sistema)"""
+        return {
+            'mensagem': f"🔗 **Problema já conhecido:** já existe um chamado semelhante em atendimento ({original.id_legivel}). Seu chamado foi vinculado a ele e a equipe de suporte já está ciente.",
+            'acao_bot': 'chamado_duplicado'
+        }
+    
+    @staticmethod
+    def get_notificacao_duplicado(chamado, original):
+        """Aviso ao suporte responsável pelo chamado original"""
+        return {
+            'mensagem': f"🔗 **Chamado semelhante vinculado**<br>📝 {chamado.titulo}<br>👤 {chamado.nome_solicitante}<br>🆔 {chamado.id_legivel} → {original.id_legivel}",
+            'acao_bot': 'notificacao_duplicado',
+            'notificacao': True
+        }
+    
     @staticmethod
     def get_verificacao_tempo():
         """Verificação após 10 minutos"""
@@ -213,9 +230,7 @@ class BibliotecaDialogosBot:
                 if palavra in mensagem_lower:
                     # Executar ação se houver
                     if dados['acao'] == 'marcar_resolvido':
-                        chamado.status = 'resolvido'
-                        chamado.data_resolucao = timezone.now()
-                        chamado.save()
+                        chamado.alterar_status('resolvido', 'bot', autor=usuario)
                     
                     return {
                         'mensagem': dados['resposta'],
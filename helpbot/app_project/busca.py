@@ -0,0 +1,318 @@
+"""
+Busca textual indexada em chamados (título + descrição) e mensagens do chat.
+
+- SQLite: tabela virtual FTS5 (tokenizer unicode61 com remove_diacritics)
+- PostgreSQL: tabela com tsvector ('portuguese') e índice GIN
+- Outros bancos, ou SQLite sem FTS5: LIKE sem índice, só para não quebrar
+
+A interface é a mesma para todos (motor_busca()). O índice é mantido de forma
+incremental pelos signals de criação de Chamado/InteracaoChamado e pode ser
+reconstruído com "manage.py reindexar_busca". Acentos são ignorados tanto no
+texto quanto na consulta: "manutencao" encontra "manutenção".
+
+No FTS5 as colunas UNINDEXED (documento, chamado) não têm índice: um DELETE por
+elas varre a tabela virtual inteira. A tabela comum busca_documentos guarda
+documento/chamado -> rowid e as remoções são feitas por rowid.
+"""
+import html
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Chamado, InteracaoChamado
+
+TABELA_BUSCA = 'busca_textos'
+# Só SQLite: documento/chamado -> rowid no FTS5 (migração 0019)
+TABELA_DOCUMENTOS = 'busca_documentos'
+
+# Mensagens do bot são textos fixos: indexá-las só poluiria os resultados
+REMETENTES_INDEXADOS = ('usuario', 'suporte')
+
+MAX_TERMOS = 8
+TAMANHO_LOTE_INDEXACAO = 2000
+MARCADOR_DESTAQUE = '**'
+
+_motores = {}
+
+
+def remover_acentos(texto):
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+
+
+def texto_original(texto):
+    """Os textos são gravados com HTML escapado (sanitize_input)"""
+    return html.unescape(texto or '')
+
+
+def trecho_seguro(trecho):
+    """Trecho para exibição: texto do usuário com HTML escapado, só os marcadores de destaque preservados"""
+    return MARCADOR_DESTAQUE.join(html.escape(parte, quote=True) for parte in trecho.split(MARCADOR_DESTAQUE))
+
+
+def termos_da_consulta(consulta):
+    """Palavras da consulta, sem acentos e sem operadores (nada do usuário vai cru para o MATCH)"""
+    return re.findall(r'\w+', remover_acentos(consulta or '').lower())[:MAX_TERMOS]
+
+
+def documento_chamado(chamado):
+    return (
+        chamado.id_chamado.hex,
+        chamado.id_chamado.hex,
+        chamado.usuario_id.hex if chamado.usuario_id else '',
+        'chamado',
+        texto_original(f"{chamado.titulo}\n{chamado.descricao}"),
+    )
+
+
+def documento_interacao(interacao, usuario_id=None):
+    return (
+        interacao.id_interacao.hex,
+        interacao.chamado_id.hex,
+        usuario_id.hex if usuario_id else '',
+        'mensagem',
+        texto_original(interacao.mensagem),
+    )
+
+
+class MotorBusca:
+    """Interface comum; as subclasses implementam _inserir e _consultar"""
+
+    def indexar_chamado(self, chamado, novo=False):
+        """novo: chamado recém-criado, sem documento anterior a remover"""
+        if not novo:
+            self.remover_documento(chamado.id_chamado)
+        self._inserir([documento_chamado(chamado)])
+
+    def indexar_interacao(self, interacao):
+        if interacao.remetente not in REMETENTES_INDEXADOS:
+            return
+        if InteracaoChamado.chamado.is_cached(interacao):
+            usuario_id = interacao.chamado.usuario_id
+        else:
+            usuario_id = Chamado.objects.filter(pk=interacao.chamado_id).values_list('usuario_id', flat=True).first()
+        self._inserir([documento_interacao(interacao, usuario_id)])
+
+    def indexar_interacoes(self, interacoes):
+        """Várias mensagens de uma vez (criadas com bulk_create, que não dispara post_save)"""
+        interacoes = [interacao for interacao in interacoes if interacao.remetente in REMETENTES_INDEXADOS]
+        if not interacoes:
+            return
+        donos = dict(
+            Chamado.objects
+            .filter(pk__in={interacao.chamado_id for interacao in interacoes})
+            .values_list('pk', 'usuario_id')
+        )
+        self._inserir([documento_interacao(interacao, donos.get(interacao.chamado_id)) for interacao in interacoes])
+
+    def indexar_interacoes_apos_commit(self, interacoes):
+        transaction.on_commit(lambda: self.indexar_interacoes(interacoes))
+
+    def buscar(self, consulta, usuario_id=None, pagina=1, tamanho=20):
+        """
+        Resultados ordenados por relevância: lista de dicts (documento, chamado_id,
+        tipo, trecho, relevancia) e um flag tem_mais (sem COUNT sobre todos os matches).
+        """
+        termos = termos_da_consulta(consulta)
+        if not termos:
+            return [], False
+        deslocamento = (max(pagina, 1) - 1) * tamanho
+        linhas = self._consultar(termos, usuario_id.hex if usuario_id else None, tamanho + 1, deslocamento)
+        return linhas[:tamanho], len(linhas) > tamanho
+
+    def ids_chamados(self, consulta, limite=500):
+        """IDs dos chamados com algum documento correspondente (para filtrar listagens)"""
+        resultados, _ = self.buscar(consulta, tamanho=limite)
+        return list(dict.fromkeys(resultado['chamado_id'] for resultado in resultados))
+
+    def reconstruir(self):
+        """Recria o índice inteiro a partir das tabelas (em lotes)"""
+        with transaction.atomic():
+            self._limpar()
+            lote = []
+            for chamado in Chamado.objects.only('id_chamado', 'usuario_id', 'titulo', 'descricao').iterator(chunk_size=TAMANHO_LOTE_INDEXACAO):
+                lote.append(documento_chamado(chamado))
+                if len(lote) >= TAMANHO_LOTE_INDEXACAO:
+                    self._inserir(lote)
+                    lote = []
+            interacoes = InteracaoChamado.objects.filter(
+                remetente__in=REMETENTES_INDEXADOS
+            ).values_list('id_interacao', 'chamado_id', 'chamado__usuario_id', 'mensagem')
+            for id_interacao, chamado_id, usuario_id, mensagem in interacoes.iterator(chunk_size=TAMANHO_LOTE_INDEXACAO):
+                lote.append((id_interacao.hex, chamado_id.hex, usuario_id.hex if usuario_id else '', 'mensagem', texto_original(mensagem)))
+                if len(lote) >= TAMANHO_LOTE_INDEXACAO:
+                    self._inserir(lote)
+                    lote = []
+            if lote:
+                self._inserir(lote)
+
+    def remover_documento(self, documento):
+        self._executar(f"DELETE FROM {TABELA_BUSCA} WHERE documento = %s", [documento.hex])
+
+    def remover_chamado(self, id_chamado):
+        self._executar(f"DELETE FROM {TABELA_BUSCA} WHERE chamado = %s", [id_chamado.hex])
+
+    def _limpar(self):
+        self._executar(f"DELETE FROM {TABELA_BUSCA}")
+
+    def _executar(self, sql, parametros=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+
+    def _inserir(self, documentos):
+        raise NotImplementedError
+
+    def _consultar(self, termos, usuario_hex, limite, deslocamento):
+        raise NotImplementedError
+
+
+class BuscaFTS5(MotorBusca):
+    """SQLite FTS5: ranking bm25 e trecho com destaque gerados pelo próprio índice"""
+
+    def _inserir(self, documentos):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABELA_DOCUMENTOS} (documento, chamado) VALUES (%s, %s)",
+                [documento[:2] for documento in documentos]
+            )
+            # rowid no FTS5 = id em busca_documentos (busca pela chave única, com índice)
+            cursor.executemany(
+                f"INSERT INTO {TABELA_BUSCA} (rowid, documento, chamado, usuario, tipo, texto) "
+                f"VALUES ((SELECT id FROM {TABELA_DOCUMENTOS} WHERE documento = %s), %s, %s, %s, %s, %s)",
+                [documento[:1] + documento for documento in documentos]
+            )
+
+    def remover_documento(self, documento):
+        self._remover_onde('documento', documento.hex)
+
+    def remover_chamado(self, id_chamado):
+        self._remover_onde('chamado', id_chamado.hex)
+
+    def _remover_onde(self, coluna, valor):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {TABELA_DOCUMENTOS} WHERE {coluna} = %s", [valor])
+            rowids = cursor.fetchall()
+            if rowids:
+                cursor.executemany(f"DELETE FROM {TABELA_BUSCA} WHERE rowid = %s", rowids)
+                cursor.execute(f"DELETE FROM {TABELA_DOCUMENTOS} WHERE {coluna} = %s", [valor])
+
+    def _limpar(self):
+        self._executar(f"DELETE FROM {TABELA_BUSCA}")
+        self._executar(f"DELETE FROM {TABELA_DOCUMENTOS}")
+
+    def _consultar(self, termos, usuario_hex, limite, deslocamento):
+        # Termos entre aspas (sem operadores) e com prefixo: "impres"* encontra "impressora"
+        expressao = ' '.join(f'"{termo}"*' for termo in termos)
+        sql = (
+            f"SELECT chamado, documento, tipo, snippet({TABELA_BUSCA}, 4, %s, %s, '…', 16), rank "
+            f"FROM {TABELA_BUSCA} WHERE {TABELA_BUSCA} MATCH %s"
+        )
+        parametros = [MARCADOR_DESTAQUE, MARCADOR_DESTAQUE, expressao]
+        if usuario_hex:
+            sql += " AND usuario = %s"
+            parametros.append(usuario_hex)
+        sql += " ORDER BY rank LIMIT %s OFFSET %s"
+        parametros += [limite, deslocamento]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return [
+                {'chamado_id': chamado, 'documento': documento, 'tipo': tipo, 'trecho': trecho, 'relevancia': -rank}
+                for chamado, documento, tipo, trecho, rank in cursor.fetchall()
+            ]
+
+
+class BuscaPostgres(MotorBusca):
+    """PostgreSQL: tsvector pré-calculado (texto sem acentos) com índice GIN"""
+
+    def _inserir(self, documentos):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {TABELA_BUSCA} (documento, chamado, usuario, tipo, texto, vetor) "
+                f"VALUES (%s, %s, %s, %s, %s, to_tsvector('portuguese', %s)) ON CONFLICT (documento) DO NOTHING",
+                [documento + (remover_acentos(documento[4]),) for documento in documentos]
+            )
+
+    def _consultar(self, termos, usuario_hex, limite, deslocamento):
+        expressao = ' & '.join(f"{termo}:*" for termo in termos)
+        sql = (
+            f"SELECT chamado, documento, tipo, "
+            f"ts_headline('portuguese', texto, consulta, %s), ts_rank_cd(vetor, consulta) AS relevancia "
+            f"FROM {TABELA_BUSCA}, to_tsquery('portuguese', %s) consulta WHERE vetor @@ consulta"
+        )
+        opcoes = f"StartSel={MARCADOR_DESTAQUE}, StopSel={MARCADOR_DESTAQUE}, MaxWords=20, MinWords=8"
+        parametros = [opcoes, expressao]
+        if usuario_hex:
+            sql += " AND usuario = %s"
+            parametros.append(usuario_hex)
+        sql += " ORDER BY relevancia DESC LIMIT %s OFFSET %s"
+        parametros += [limite, deslocamento]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return [
+                {'chamado_id': chamado, 'documento': documento, 'tipo': tipo, 'trecho': trecho, 'relevancia': relevancia}
+                for chamado, documento, tipo, trecho, relevancia in cursor.fetchall()
+            ]
+
+
+class BuscaSimples(MotorBusca):
+    """Sem índice textual disponível: LIKE nas tabelas (lento, mas funcional)"""
+
+    def indexar_chamado(self, chamado, novo=False):
+        pass
+
+    def indexar_interacao(self, interacao):
+        pass
+
+    def indexar_interacoes(self, interacoes):
+        pass
+
+    def reconstruir(self):
+        pass
+
+    def remover_documento(self, documento):
+        pass
+
+    def remover_chamado(self, id_chamado):
+        pass
+
+    def _consultar(self, termos, usuario_hex, limite, deslocamento):
+        filtro_chamado = Q()
+        filtro_mensagem = Q(remetente__in=REMETENTES_INDEXADOS)
+        for termo in termos:
+            filtro_chamado &= Q(titulo__icontains=termo) | Q(descricao__icontains=termo)
+            filtro_mensagem &= Q(mensagem__icontains=termo)
+        if usuario_hex:
+            filtro_chamado &= Q(usuario_id=usuario_hex)
+            filtro_mensagem &= Q(chamado__usuario_id=usuario_hex)
+
+        fim = deslocamento + limite
+        resultados = [
+            {'chamado_id': id_chamado.hex, 'documento': id_chamado.hex, 'tipo': 'chamado',
+             'trecho': texto_original(titulo), 'relevancia': 0}
+            for id_chamado, titulo in Chamado.objects.filter(filtro_chamado).order_by('-criado_em').values_list('id_chamado', 'titulo')[:fim]
+        ]
+        resultados += [
+            {'chamado_id': chamado_id.hex, 'documento': id_interacao.hex, 'tipo': 'mensagem',
+             'trecho': texto_original(mensagem)[:200], 'relevancia': 0}
+            for id_interacao, chamado_id, mensagem in InteracaoChamado.objects.filter(filtro_mensagem).order_by('-criado_em').values_list('id_interacao', 'chamado_id', 'mensagem')[:fim]
+        ]
+        return resultados[deslocamento:fim]
+
+
+def motor_busca():
+    """Motor adequado ao banco da conexão padrão (FTS5, tsvector ou LIKE)"""
+    chave = (connection.alias, connection.settings_dict['NAME'])
+    if chave not in _motores:
+        tabelas = connection.introspection.table_names()
+        if TABELA_BUSCA not in tabelas or (connection.vendor == 'sqlite' and TABELA_DOCUMENTOS not in tabelas):
+            # Migrações ainda não aplicadas: LIKE sem guardar, a próxima chamada confere de novo
+            return BuscaSimples()
+        if connection.vendor == 'postgresql':
+            _motores[chave] = BuscaPostgres()
+        elif connection.vendor == 'sqlite':
+            _motores[chave] = BuscaFTS5()
+        else:
+            _motores[chave] = BuscaSimples()
+    return _motores[chave]
@@ -0,0 +1,103 @@
+"""
+Registro de departamentos em memória (um por processo).
+
+Os departamentos quase nunca mudam e aparecem em todas as telas; antes cada
+página rodava criar_departamentos_iniciais() (7 get_or_create) e mais um
+SELECT de todos. Agora:
+
+- os departamentos iniciais vêm da migração 0016_departamentos_iniciais
+- a lista é carregada uma vez e servida da memória (zero consultas)
+- a validade é conferida no próprio banco no máximo a cada
+  INTERVALO_VERIFICACAO segundos (uma consulta das poucas linhas da tabela):
+  alterações feitas em outro processo, no admin ou por bulk_create aparecem
+  sem depender de um cache compartilhado. A versão é uma soma das linhas,
+  igual em todos os processos, e entra nas chaves dos fragmentos em cache
+"""
+import logging
+import threading
+import time
+import uuid
+import zlib
+
+from django.conf import settings
+
+from .models import Departamento
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_VERIFICACAO = getattr(settings, 'DEPARTAMENTOS_INTERVALO_VERIFICACAO', 5)
+
+
+def _versao(linhas):
+    """Soma das linhas (id, nome, descrição): muda com qualquer alteração"""
+    return zlib.crc32(repr(tuple(linhas)).encode())
+
+
+class _Carga:
+    """Foto imutável dos departamentos (trocada inteira a cada recarga)"""
+
+    def __init__(self, departamentos):
+        self.departamentos = tuple(departamentos)
+        self.versao = _versao(
+            (str(departamento.id_departamento), departamento.nome, departamento.descricao)
+            for departamento in self.departamentos
+        )
+        self.por_id = {departamento.id_departamento: departamento for departamento in self.departamentos}
+        self.por_nome = {departamento.nome: departamento for departamento in self.departamentos}
+
+
+class RegistroDepartamentos:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._carga = None
+        self._proxima_verificacao = 0
+
+    def todos(self):
+        """Departamentos em ordem alfabética"""
+        return self._atual().departamentos
+
+    def obter(self, id_departamento):
+        """Departamento pelo id (UUID ou texto); None se não existir ou for inválido"""
+        if not isinstance(id_departamento, uuid.UUID):
+            try:
+                id_departamento = uuid.UUID(str(id_departamento))
+            except ValueError:
+                return None
+        return self._atual().por_id.get(id_departamento)
+
+    def por_nome(self, nome):
+        return self._atual().por_nome.get(nome)
+
+    def nomes(self):
+        """{id: nome} - para montar gráficos/relatórios a partir de contagens por departamento_id"""
+        return {id_departamento: departamento.nome for id_departamento, departamento in self._atual().por_id.items()}
+
+    def versao(self):
+        """Para as chaves dos fragmentos em cache que dependem dos departamentos"""
+        return self._atual().versao
+
+    def invalidar(self):
+        """Força a recarga na próxima leitura (alteração feita neste processo)"""
+        with self._lock:
+            self._carga = None
+
+    def _atual(self):
+        carga = self._carga
+        agora = time.monotonic()
+        if carga is not None and agora < self._proxima_verificacao:
+            return carga
+
+        versao = _versao(
+            (str(id_departamento), nome, descricao)
+            for id_departamento, nome, descricao in
+            Departamento.objects.order_by('nome').values_list('id_departamento', 'nome', 'descricao')
+        )
+        with self._lock:
+            self._proxima_verificacao = agora + INTERVALO_VERIFICACAO
+            if self._carga is None or self._carga.versao != versao:
+                self._carga = _Carga(Departamento.objects.order_by('nome'))
+                logger.info(f"Registro de departamentos carregado: {len(self._carga.departamentos)} departamentos")
+            return self._carga
+
+# Instância global do registro (uma por processo)
+registro_departamentos = RegistroDepartamentos()
@@ -0,0 +1,220 @@
+"""
+Detecção de chamados quase duplicados no momento da criação.
+
+Em quedas de sistema chegam dezenas de chamados "sistema fora do ar" quase
+iguais; cada um disparava o broadcast para todos os suportes. Aqui cada
+chamado aberto recente vira uma assinatura MinHash (shingles de caracteres do
+título, com peso maior, e da descrição) guardada em memória e dividida em
+bandas (LSH):
+
+- procurar() consulta um balde por banda (dict), sem varrer os chamados abertos
+- só os candidatos que caem no mesmo balde têm a similaridade estimada
+- só um chamado do mesmo departamento vira o original (a mesma queixa em
+  departamentos diferentes são atendimentos diferentes)
+- o índice é por processo: carregado do banco no primeiro uso e atualizado de
+  forma incremental (novos chamados de outros processos a cada
+  INTERVALO_SINCRONIZACAO segundos, expiração pela janela de tempo)
+"""
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .busca import remover_acentos, texto_original
+from .models import Chamado
+
+logger = logging.getLogger(__name__)
+
+JANELA_DUPLICADOS = timedelta(hours=getattr(settings, 'DUPLICADOS_JANELA_HORAS', 6))
+LIMIAR_SIMILARIDADE = getattr(settings, 'DUPLICADOS_LIMIAR', 0.5)
+INTERVALO_SINCRONIZACAO = 5
+# criado_em é gravado antes do commit: um chamado de transação mais lenta aparece depois de
+# outros mais novos. A sincronização revê esse trecho antes da marca (já vistos são ignorados)
+SOBREPOSICAO_SINCRONIZACAO = timedelta(seconds=getattr(settings, 'DUPLICADOS_SOBREPOSICAO_SEGUNDOS', 60))
+
+# 32 bandas x 2 linhas: pares com similaridade 0.5 dividem algum balde com probabilidade ~1
+BANDAS = 32
+LINHAS_POR_BANDA = 2
+TAMANHO_SHINGLE = 4
+MAX_CARACTERES_DESCRICAO = 200
+PESO_TITULO = 3
+
+_PRIMO = (1 << 61) - 1
+_aleatorio = random.Random(20240501)
+_PERMUTACOES = [
+    (_aleatorio.randrange(1, _PRIMO), _aleatorio.randrange(0, _PRIMO))
+    for _ in range(BANDAS * LINHAS_POR_BANDA)
+]
+
+
+def _normalizar(texto):
+    return ' '.join(re.findall(r'\w+', remover_acentos(texto_original(texto)).lower()))
+
+
+def _trechos(texto):
+    if len(texto) <= TAMANHO_SHINGLE:
+        return {texto} if texto else set()
+    return {texto[i:i + TAMANHO_SHINGLE] for i in range(len(texto) - TAMANHO_SHINGLE + 1)}
+
+
+def shingles(titulo, descricao=''):
+    """
+    Hashes dos trechos de TAMANHO_SHINGLE caracteres do texto normalizado.
+    Cada trecho do título entra PESO_TITULO vezes (com sufixos diferentes): em
+    quedas o título se repete e a descrição varia de pessoa para pessoa.
+    """
+    conjunto = {
+        zlib.crc32(f"{trecho}#{copia}".encode())
+        for trecho in _trechos(_normalizar(titulo))
+        for copia in range(PESO_TITULO)
+    }
+    conjunto.update(zlib.crc32(trecho.encode()) for trecho in _trechos(_normalizar(descricao)[:MAX_CARACTERES_DESCRICAO]))
+    return conjunto
+
+
+def assinatura_minhash(conjunto):
+    """Mínimo de cada permutação (a*x + b mod p) sobre os shingles"""
+    valores = list(conjunto)
+    return tuple(
+        min([(a * valor + b) % _PRIMO for valor in valores])
+        for a, b in _PERMUTACOES
+    )
+
+
+def similaridade_estimada(assinatura, outra):
+    """Fração de posições iguais ~ similaridade de Jaccard dos shingles"""
+    return sum(1 for x, y in zip(assinatura, outra) if x == y) / len(assinatura)
+
+
+def _bandas(assinatura):
+    for banda in range(BANDAS):
+        inicio = banda * LINHAS_POR_BANDA
+        yield banda, assinatura[inicio:inicio + LINHAS_POR_BANDA]
+
+
+class IndiceDuplicados:
+    """Índice LSH em memória dos chamados abertos dentro da janela"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._assinaturas = {}
+        self._departamentos = {}
+        self._baldes = {}
+        self._ordem = deque()  # (criado_em, id_chamado) em ordem de criação, para expirar
+        self._carregado = False
+        self._ultimo_criado_em = None
+        self._proxima_sincronizacao = 0
+
+    def procurar(self, titulo, descricao, departamento_id):
+        """id_chamado do chamado aberto mais parecido do departamento (acima do limiar) ou None"""
+        conjunto = shingles(titulo, descricao)
+        if not conjunto:
+            return None
+        self._sincronizar()
+        assinatura = assinatura_minhash(conjunto)
+
+        with self._lock:
+            candidatos = set()
+            for chave in _bandas(assinatura):
+                candidatos |= self._baldes.get(chave, set())
+            pontuados = sorted(
+                ((similaridade_estimada(assinatura, self._assinaturas[id_chamado]), id_chamado)
+                 for id_chamado in candidatos
+                 if self._departamentos[id_chamado] == departamento_id),
+                reverse=True
+            )
+
+        for similaridade, id_chamado in pontuados:
+            if similaridade < LIMIAR_SIMILARIDADE:
+                break
+            # O índice pode estar atrasado (chamado resolvido em outro processo)
+            if Chamado.objects.filter(pk=id_chamado, status='em_andamento', departamento_id=departamento_id).exists():
+                return id_chamado
+            self.remover(id_chamado)
+        return None
+
+    def adicionar(self, chamado):
+        """Novo chamado original (não duplicado) aberto"""
+        self._adicionar(chamado.id_chamado, chamado.criado_em, chamado.departamento_id, chamado.titulo, chamado.descricao)
+
+    def remover(self, id_chamado):
+        with self._lock:
+            assinatura = self._assinaturas.pop(id_chamado, None)
+            if assinatura is None:
+                return
+            del self._departamentos[id_chamado]
+            for chave in _bandas(assinatura):
+                balde = self._baldes.get(chave)
+                if balde is not None:
+                    balde.discard(id_chamado)
+                    if not balde:
+                        del self._baldes[chave]
+
+    def limpar(self):
+        with self._lock:
+            self._assinaturas.clear()
+            self._departamentos.clear()
+            self._baldes.clear()
+            self._ordem.clear()
+            self._carregado = False
+            self._ultimo_criado_em = None
+            self._proxima_sincronizacao = 0
+
+    def __len__(self):
+        return len(self._assinaturas)
+
+    def _adicionar(self, id_chamado, criado_em, departamento_id, titulo, descricao):
+        conjunto = shingles(titulo, descricao)
+        if not conjunto:
+            return
+        assinatura = assinatura_minhash(conjunto)
+        with self._lock:
+            if id_chamado in self._assinaturas:
+                return
+            self._assinaturas[id_chamado] = assinatura
+            self._departamentos[id_chamado] = departamento_id
+            for chave in _bandas(assinatura):
+                self._baldes.setdefault(chave, set()).add(id_chamado)
+            self._ordem.append((criado_em, id_chamado))
+            if self._ultimo_criado_em is None or criado_em > self._ultimo_criado_em:
+                self._ultimo_criado_em = criado_em
+
+    def _sincronizar(self):
+        """Carga inicial, chamados criados por outros processos e expiração da janela"""
+        agora_monotonic = time.monotonic()
+        if agora_monotonic < self._proxima_sincronizacao:
+            return
+        self._proxima_sincronizacao = agora_monotonic + INTERVALO_SINCRONIZACAO
+
+        limite = timezone.now() - JANELA_DUPLICADOS
+        novos = Chamado.objects.filter(
+            status='em_andamento', duplicado_de__isnull=True, criado_em__gte=limite
+        )
+        if self._carregado and self._ultimo_criado_em is not None:
+            novos = novos.filter(criado_em__gte=max(limite, self._ultimo_criado_em - SOBREPOSICAO_SINCRONIZACAO))
+        for id_chamado, criado_em, departamento_id, titulo, descricao in novos.order_by('criado_em').values_list(
+            'id_chamado', 'criado_em', 'departamento_id', 'titulo', 'descricao'
+        ):
+            if id_chamado not in self._assinaturas:
+                self._adicionar(id_chamado, criado_em, departamento_id, titulo, descricao)
+        if not self._carregado:
+            self._carregado = True
+            logger.info(f"Índice de duplicados carregado com {len(self)} chamados abertos")
+
+        expirados = []
+        with self._lock:
+            while self._ordem and self._ordem[0][0] < limite:
+                expirados.append(self._ordem.popleft()[1])
+        for id_chamado in expirados:
+            self.remover(id_chamado)
+
+
+# Instância global do índice (uma por processo)
+indice_duplicados = IndiceDuplicados()
@@ -0,0 +1,222 @@
+"""
+Escrita adiada (write-behind) das marcações de leitura.
+
+Marcar notificação como lida, chamado como visualizado e o cursor de leitura
+do chat geravam cada um uma escrita mínima por clique, disputando o lock de
+escrita do SQLite com a criação de chamados. Agora:
+
+- A marcação entra num buffer em memória do próprio processo, separado por
+  usuário (nada passa pelo cache: LocMem é por processo e descarta entradas)
+- O buffer é gravado a cada INTERVALO_MS, ao juntar MAX_ITENS marcações e na
+  saída do processo, com UPDATEs por conjunto (IN/OR) e um upsert, numa única
+  transação
+- O próprio usuário vê o estado mesclado na hora quando a requisição seguinte
+  cai no mesmo processo: o cursor de leitura é lido do buffer e, havendo
+  marcações pendentes dele (ou em gravação), a requisição grava o buffer antes
+  de consultar (usuario_required / autenticação da API). Nos demais processos
+  a mudança aparece em até INTERVALO_MS.
+"""
+import atexit
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Chamado, CursorLeitura, Notificacao
+from .tarefas import agendar_em, executor_tarefas
+from .versoes import incrementar_versao_apos_commit
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_MS = getattr(settings, 'ESCRITA_ADIADA_INTERVALO_MS', 500)
+MAX_ITENS = getattr(settings, 'ESCRITA_ADIADA_MAX_ITENS', 200)
+
+TIPO_BROADCAST = 'novo_chamado_broadcast'
+
+
+def _vazio():
+    return {
+        'notificacoes': set(),    # id_notificacao (dono já conferido pela view)
+        'visualizados': set(),    # chamado_id: broadcasts lidos + visualizado_suporte
+        'cursores': {},           # chamado_id -> lido_ate
+    }
+
+
+def _total(marcacoes):
+    return len(marcacoes['notificacoes']) + len(marcacoes['visualizados']) + len(marcacoes['cursores'])
+
+
+def _mesclar(destino, origem):
+    destino['notificacoes'] |= origem['notificacoes']
+    destino['visualizados'] |= origem['visualizados']
+    for chamado_id, lido_ate in origem['cursores'].items():
+        atual = destino['cursores'].get(chamado_id)
+        if atual is None or lido_ate > atual:
+            destino['cursores'][chamado_id] = lido_ate
+
+
+class BufferEscrita:
+    def __init__(self):
+        # _lock protege o buffer (trechos curtos, nunca durante o banco);
+        # _gravacao serializa as gravações do processo (cursores não voltam no tempo)
+        self._lock = threading.Lock()
+        self._gravacao = threading.Lock()
+        self._pendentes = {}      # usuario_id -> marcações ainda não gravadas
+        self._em_gravacao = {}    # usuario_id -> marcações da gravação em andamento
+        self._total = 0
+        self._agendada = False
+
+    def notificacao_lida(self, usuario_id, id_notificacao):
+        self._registrar(usuario_id, lambda marcacoes: marcacoes['notificacoes'].add(id_notificacao))
+
+    def chamado_visualizado(self, usuario_id, chamado_id):
+        self._registrar(usuario_id, lambda marcacoes: marcacoes['visualizados'].add(chamado_id))
+
+    def cursor_leitura(self, usuario_id, chamado_id, lido_ate):
+        def alterar(marcacoes):
+            atual = marcacoes['cursores'].get(chamado_id)
+            if atual is None or lido_ate > atual:
+                marcacoes['cursores'][chamado_id] = lido_ate
+        self._registrar(usuario_id, alterar)
+
+    def cursor_pendente(self, usuario_id, chamado_id):
+        """lido_ate ainda no buffer ou em gravação (None se não houver)"""
+        with self._lock:
+            valores = [
+                marcacoes['cursores'][chamado_id]
+                for marcacoes in (self._pendentes.get(usuario_id), self._em_gravacao.get(usuario_id))
+                if marcacoes and chamado_id in marcacoes['cursores']
+            ]
+        return max(valores, default=None)
+
+    def pendente(self, usuario_id):
+        """True se o usuário tem marcações que o banco ainda não mostra"""
+        with self._lock:
+            return usuario_id in self._pendentes or usuario_id in self._em_gravacao
+
+    def _registrar(self, usuario_id, alterar):
+        with self._lock:
+            marcacoes = self._pendentes.setdefault(usuario_id, _vazio())
+            antes = _total(marcacoes)
+            alterar(marcacoes)
+            self._total += _total(marcacoes) - antes
+            cheio = self._total >= MAX_ITENS
+            agendar = not cheio and not self._agendada
+            if agendar:
+                self._agendada = True
+
+        if cheio:
+            # Fora da requisição: o clique não espera a gravação
+            executor_tarefas.submeter(self.gravar)
+        elif agendar:
+            # Um agendamento por janela, não importa quantas marcações cheguem
+            agendar_em(INTERVALO_MS / 1000, self.gravar)
+
+    def sincronizar(self, usuario_id):
+        """Grava o buffer se o usuário tem marcações pendentes (leituras dele enxergam o que marcou)"""
+        if self.pendente(usuario_id):
+            self.gravar()
+
+    def sincronizar_varios(self, usuario_ids):
+        """sincronizar() de vários usuários com uma única gravação"""
+        if any(self.pendente(usuario_id) for usuario_id in usuario_ids):
+            self.gravar()
+
+    async def asincronizar(self, usuario_id):
+        if self.pendente(usuario_id):
+            await sync_to_async(self.gravar)()
+
+    def gravar(self):
+        """Aplica o buffer no banco; devolve quantas marcações foram gravadas"""
+        # Quem sincroniza durante uma gravação espera por ela (o usuário segue pendente até o COMMIT)
+        with self._gravacao:
+            with self._lock:
+                pendentes, self._pendentes = self._pendentes, {}
+                self._em_gravacao = pendentes
+                self._total = 0
+                self._agendada = False
+            if not pendentes:
+                return 0
+
+            try:
+                self._aplicar(pendentes)
+            except Exception:
+                # Devolve as marcações ao buffer para a próxima gravação
+                with self._lock:
+                    for usuario_id, marcacoes in pendentes.items():
+                        atual = self._pendentes.setdefault(usuario_id, _vazio())
+                        antes = _total(atual)
+                        _mesclar(atual, marcacoes)
+                        self._total += _total(atual) - antes
+                raise
+            finally:
+                with self._lock:
+                    self._em_gravacao = {}
+
+        total = sum(_total(marcacoes) for marcacoes in pendentes.values())
+        logger.debug(f"Escrita adiada: {total} marcações gravadas")
+        return total
+
+    def encerrar(self):
+        """Grava o que sobrou na saída do processo"""
+        try:
+            self.gravar()
+        except Exception as e:
+            logger.error(f"❌ Escrita adiada: marcações perdidas no encerramento: {str(e)}")
+
+    def _aplicar(self, pendentes):
+        agora = timezone.now()
+        with transaction.atomic():
+            notificacoes = set().union(*(marcacoes['notificacoes'] for marcacoes in pendentes.values()))
+            if notificacoes:
+                Notificacao.objects.filter(pk__in=notificacoes, lida=False).update(lida=True)
+
+            visualizados = {
+                usuario_id: marcacoes['visualizados']
+                for usuario_id, marcacoes in pendentes.items()
+                if marcacoes['visualizados']
+            }
+            if visualizados:
+                condicao = Q()
+                for usuario_id, chamados in visualizados.items():
+                    condicao |= Q(usuario_id=usuario_id, chamado_id__in=chamados)
+                Notificacao.objects.filter(condicao, tipo=TIPO_BROADCAST, lida=False).update(lida=True)
+
+                chamados = set().union(*visualizados.values())
+                # update() não dispara signals: a versão de cache dos chamados é incrementada aqui
+                if Chamado.objects.filter(pk__in=chamados, visualizado_suporte=False).update(
+                    visualizado_suporte=True, atualizado_em=agora
+                ):
+                    incrementar_versao_apos_commit('chamados')
+
+            cursores = {
+                (usuario_id, chamado_id): lido_ate
+                for usuario_id, marcacoes in pendentes.items()
+                for chamado_id, lido_ate in marcacoes['cursores'].items()
+            }
+            if cursores:
+                # Chamados excluídos depois da marcação quebrariam a FK do lote inteiro
+                existentes = set(
+                    Chamado.objects
+                    .filter(pk__in={chamado_id for _, chamado_id in cursores})
+                    .values_list('pk', flat=True)
+                )
+                CursorLeitura.objects.bulk_create(
+                    [
+                        CursorLeitura(usuario_id=usuario_id, chamado_id=chamado_id, lido_ate=lido_ate, atualizado_em=agora)
+                        for (usuario_id, chamado_id), lido_ate in cursores.items()
+                        if chamado_id in existentes
+                    ],
+                    update_conflicts=True,
+                    unique_fields=['usuario', 'chamado'],
+                    update_fields=['lido_ate', 'atualizado_em'],
+                )
+
+
+# Instância global do buffer (uma por processo; gravada também na saída)
+buffer_escrita = BufferEscrita()
+atexit.register(buffer_escrita.encerrar)
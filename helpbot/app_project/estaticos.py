@@ -0,0 +1,215 @@
+"""
+Minificação e pré-compressão dos arquivos estáticos.
+Executado apenas no collectstatic - nada é comprimido por requisição.
+"""
+import gzip
+import re
+
+try:
+    import brotli
+except ImportError:  # Dependência opcional: sem ela só geramos .gz
+    brotli = None
+
+# Extensões que valem a pena pré-comprimir
+EXTENSOES_COMPRIMIVEIS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map')
+
+# Abaixo disso a compressão não compensa o cabeçalho extra
+TAMANHO_MINIMO_COMPRESSAO = 256
+
+_ESPACOS_CSS = re.compile(r'\s+')
+_ESPACOS_AO_REDOR_CSS = re.compile(r'\s*([{};,>])\s*')
+
+# Caracteres após os quais uma "/" inicia uma regex e não uma divisão
+_PRECEDE_REGEX = set('(,=:[!&|?{};+-*%<>~^')
+_PALAVRAS_PRECEDE_REGEX = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'throw', 'delete', 'new')
+
+
+def _fim_string(texto, inicio):
+    """Índice logo após a string iniciada em texto[inicio] (respeita escapes)"""
+    aspas = texto[inicio]
+    i = inicio + 1
+    tamanho = len(texto)
+    while i < tamanho:
+        caractere = texto[i]
+        if caractere == '\\':
+            i += 2
+            continue
+        if caractere == aspas:
+            return i + 1
+        i += 1
+    return tamanho
+
+
+def minificar_css(conteudo):
+    """Remove comentários e espaços redundantes preservando strings"""
+    partes = []
+    i = 0
+    inicio_trecho = 0
+    tamanho = len(conteudo)
+
+    def compactar(trecho):
+        trecho = _ESPACOS_CSS.sub(' ', trecho)
+        return _ESPACOS_AO_REDOR_CSS.sub(r'\1', trecho)
+
+    while i < tamanho:
+        caractere = conteudo[i]
+        if caractere in '"\'':
+            fim = _fim_string(conteudo, i)
+            partes.append(compactar(conteudo[inicio_trecho:i]))
+            partes.append(conteudo[i:fim])
+            i = inicio_trecho = fim
+        elif conteudo.startswith('/*', i):
+            fim = conteudo.find('*/', i + 2)
+            fim = tamanho if fim == -1 else fim + 2
+            partes.append(compactar(conteudo[inicio_trecho:i]))
+            i = inicio_trecho = fim
+        else:
+            i += 1
+    partes.append(compactar(conteudo[inicio_trecho:]))
+
+    return ''.join(partes).replace(';}', '}').strip()
+
+
+def minificar_js(conteudo):
+    """
+    Minificação conservadora de JavaScript: remove comentários, indentação,
+    espaços repetidos e linhas vazias fora de strings/regex/template literals.
+    As quebras de linha são mantidas para não depender da inserção automática
+    de ponto e vírgula.
+    """
+    saida = []
+    i = 0
+    tamanho = len(conteudo)
+    # Profundidade de chaves de cada ${...} aberto dentro de template literals
+    pilha_template = []
+    ultimo_significativo = ''
+    ultima_palavra = ''
+
+    def ler_template(inicio):
+        """Consome um template literal até o fechamento ou até um ${"""
+        j = inicio
+        while j < tamanho:
+            caractere = conteudo[j]
+            if caractere == '\\':
+                j += 2
+                continue
+            if caractere == '`':
+                return j + 1, False
+            if caractere == '$' and j + 1 < tamanho and conteudo[j + 1] == '{':
+                return j + 2, True
+            j += 1
+        return tamanho, False
+
+    def emitir_espaco():
+        if saida and saida[-1][-1] not in ' \n':
+            saida.append(' ')
+
+    def emitir_quebra():
+        if saida and saida[-1] == ' ':
+            saida.pop()
+        if saida and saida[-1][-1] != '\n':
+            saida.append('\n')
+
+    while i < tamanho:
+        caractere = conteudo[i]
+
+        if caractere == '\n':
+            emitir_quebra()
+            i += 1
+            continue
+
+        if caractere in ' \t\r':
+            emitir_espaco()
+            i += 1
+            continue
+
+        if caractere in '"\'':
+            fim = _fim_string(conteudo, i)
+            saida.append(conteudo[i:fim])
+            i = fim
+            ultimo_significativo, ultima_palavra = caractere, ''
+            continue
+
+        if caractere == '`' or (caractere == '}' and pilha_template and pilha_template[-1] == 0):
+            if caractere == '}':
+                pilha_template.pop()
+            fim, abriu_expressao = ler_template(i + 1)
+            saida.append(conteudo[i:fim])
+            if abriu_expressao:
+                pilha_template.append(0)
+            i = fim
+            ultimo_significativo, ultima_palavra = '`', ''
+            continue
+
+        if caractere == '/' and i + 1 < tamanho:
+            proximo = conteudo[i + 1]
+            if proximo == '/':
+                fim = conteudo.find('\n', i)
+                i = tamanho if fim == -1 else fim
+                continue
+            if proximo == '*':
+                fim = conteudo.find('*/', i + 2)
+                i = tamanho if fim == -1 else fim + 2
+                emitir_espaco()
+                continue
+            if not ultimo_significativo or ultimo_significativo in _PRECEDE_REGEX or ultima_palavra in _PALAVRAS_PRECEDE_REGEX:
+                # Regex literal: copia até a barra de fechamento fora de [...]
+                j = i + 1
+                dentro_classe = False
+                while j < tamanho and conteudo[j] != '\n':
+                    atual = conteudo[j]
+                    if atual == '\\':
+                        j += 2
+                        continue
+                    if atual == '[':
+                        dentro_classe = True
+                    elif atual == ']':
+                        dentro_classe = False
+                    elif atual == '/' and not dentro_classe:
+                        j += 1
+                        break
+                    j += 1
+                while j < tamanho and conteudo[j].isalpha():
+                    j += 1
+                saida.append(conteudo[i:j])
+                i = j
+                ultimo_significativo, ultima_palavra = '/', ''
+                continue
+
+        if caractere.isalnum() or caractere in '_$':
+            j = i
+            while j < tamanho and (conteudo[j].isalnum() or conteudo[j] in '_$'):
+                j += 1
+            ultima_palavra = conteudo[i:j]
+            ultimo_significativo = conteudo[j - 1]
+            saida.append(ultima_palavra)
+            i = j
+            continue
+
+        if caractere == '{' and pilha_template:
+            pilha_template[-1] += 1
+        elif caractere == '}' and pilha_template:
+            pilha_template[-1] -= 1
+
+        ultimo_significativo, ultima_palavra = caractere, ''
+        saida.append(caractere)
+        i += 1
+
+    return ''.join(saida).strip()
+
+
+MINIFICADORES = {
+    '.css': minificar_css,
+    '.js': minificar_js,
+}
+
+
+def comprimir_gzip(dados):
+    # mtime=0 garante saída determinística (mesmo conteúdo -> mesmo .gz)
+    return gzip.compress(dados, compresslevel=9, mtime=0)
+
+
+def comprimir_brotli(dados):
+    if brotli is None:
+        return None
+    return brotli.compress(dados, quality=11)
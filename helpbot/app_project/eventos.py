@@ -0,0 +1,161 @@
+"""
+Eventos de domínio do ciclo de vida do chamado (outbox transacional).
+
+- publicar() grava o evento na tabela eventos_dominio NA MESMA transação da
+  alteração: se ela sofrer rollback, o evento some junto
+- Depois do commit o despachante entrega os pendentes em lote aos assinantes
+  (notificações, estatísticas, push, agendador), fora da requisição
+- Entrega "pelo menos uma vez": o evento só é marcado como processado quando
+  todos os assinantes terminam; se algum falhar ele é entregue de novo
+  (por isso os assinantes devem ser idempotentes)
+- Cada evento é entregue na sua própria transação: o lock de escrita do SQLite
+  não fica preso durante o lote inteiro
+- Evento que falhou é reagendado com espera crescente (ESPERA_BASE * 2^tentativas),
+  sem depender de outra publicação para ser tentado de novo
+- O comando despachar_eventos recupera o que ficou pendente (ex: processo
+  reiniciado antes do despacho)
+"""
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EventoDominio
+from .tarefas import agendar_em, executor_tarefas
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento (mesmos valores de EventoDominio.TIPO_CHOICES)
+CHAMADO_CRIADO = 'chamado_criado'
+STATUS_ALTERADO = 'status_alterado'
+MENSAGEM_ENVIADA = 'mensagem_enviada'
+CONTROLE_ASSUMIDO = 'controle_assumido'
+
+TAMANHO_LOTE = getattr(settings, 'EVENTOS_TAMANHO_LOTE', 100)
+MAX_TENTATIVAS = getattr(settings, 'EVENTOS_MAX_TENTATIVAS', 5)
+ESPERA_BASE = getattr(settings, 'EVENTOS_ESPERA_BASE', 5)
+ESPERA_MAXIMA = 15 * 60
+
+_assinantes = defaultdict(list)
+
+
+def assinante(*tipos):
+    """Decorator: registra a função como assinante dos tipos informados"""
+    def decorator(funcao):
+        for tipo in tipos:
+            _assinantes[tipo].append(funcao)
+        return funcao
+    return decorator
+
+
+def publicar(tipo, chamado=None, **dados):
+    """Grava o evento na transação atual e agenda o despacho para depois do commit"""
+    evento = EventoDominio.objects.create(tipo=tipo, chamado=chamado, dados=dados)
+    transaction.on_commit(despachante.solicitar)
+    return evento
+
+
+def publicar_em_lote(tipo, ids_chamados, **dados):
+    """Mesmo evento para vários chamados num único INSERT (operações em lote)"""
+    eventos = EventoDominio.objects.bulk_create([
+        EventoDominio(tipo=tipo, chamado_id=id_chamado, dados=dados) for id_chamado in ids_chamados
+    ])
+    transaction.on_commit(despachante.solicitar)
+    return eventos
+
+
+def pendentes():
+    return EventoDominio.objects.filter(processado_em__isnull=True, tentativas__lt=MAX_TENTATIVAS)
+
+
+def prontos():
+    """Pendentes cuja espera após falha (se houver) já passou"""
+    return pendentes().filter(Q(proxima_tentativa_em__isnull=True) | Q(proxima_tentativa_em__lte=timezone.now()))
+
+
+def espera_apos_falha(tentativas):
+    return min(ESPERA_BASE * 2 ** (tentativas - 1), ESPERA_MAXIMA)
+
+
+def despachar_lote(limite=TAMANHO_LOTE):
+    """
+    Entrega até `limite` eventos prontos, em ordem de criação, cada um na sua transação.
+    Retorna (selecionados, processados com sucesso).
+    """
+    ids = list(prontos().order_by('criado_em').values_list('pk', flat=True)[:limite])
+    return len(ids), sum(_entregar_por_id(pk) for pk in ids)
+
+
+def despachar_pendentes(limite=TAMANHO_LOTE):
+    """Entrega um lote de eventos prontos; retorna quantos foram processados com sucesso"""
+    return despachar_lote(limite)[1]
+
+
+def _entregar_por_id(pk):
+    with transaction.atomic():
+        consulta = pendentes().filter(pk=pk)
+        if connection.features.has_select_for_update_skip_locked:
+            # Vários despachantes (workers/comando) dividem a fila sem entregar o mesmo evento
+            consulta = consulta.select_for_update(skip_locked=True)
+        evento = consulta.first()
+        # Já entregue (ou em entrega) por outro despachante
+        return _entregar(evento) if evento is not None else False
+
+
+def _entregar(evento):
+    try:
+        # Savepoint: a falha de um evento desfaz só o que os assinantes dele gravaram
+        with transaction.atomic():
+            for funcao in _assinantes[evento.tipo]:
+                funcao(evento)
+    except Exception as e:
+        evento.tentativas += 1
+        evento.ultimo_erro = str(e)[:1000]
+        campos = ['tentativas', 'ultimo_erro']
+        if evento.tentativas < MAX_TENTATIVAS:
+            espera = espera_apos_falha(evento.tentativas)
+            evento.proxima_tentativa_em = timezone.now() + timedelta(seconds=espera)
+            campos.append('proxima_tentativa_em')
+            # Nova tentativa sem depender de outra publicação (o despachante agrupa os pedidos)
+            transaction.on_commit(lambda: agendar_em(espera, despachante.solicitar))
+        evento.save(update_fields=campos)
+        logger.error(f"❌ Evento {evento.tipo} {evento.id_evento} falhou (tentativa {evento.tentativas}): {str(e)}", exc_info=True)
+        return False
+
+    evento.processado_em = timezone.now()
+    evento.save(update_fields=['processado_em'])
+    return True
+
+
+class Despachante:
+    """Agrupa os pedidos de despacho: no máximo um na fila e um executando por processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executando = threading.Lock()
+        self._agendado = False
+
+    def solicitar(self):
+        with self._lock:
+            if self._agendado:
+                return
+            self._agendado = True
+        executor_tarefas.submeter(self._executar)
+
+    def _executar(self):
+        with self._executando:
+            with self._lock:
+                # Eventos publicados a partir daqui pedem um novo despacho
+                self._agendado = False
+            while despachar_lote()[0] == TAMANHO_LOTE:
+                pass
+
+
+# Instância global do despachante
+despachante = Despachante()
@@ -0,0 +1,186 @@
+"""
+Exportação em streaming de chamados e transcrições (CSV ou JSONL, gzip opcional).
+
+Memória constante, independente do volume:
+- chamados e interações são lidos com values_list().iterator(chunk_size)
+  (cursor do lado do servidor no PostgreSQL, fetchmany no SQLite)
+- as transcrições são juntadas por merge: as duas consultas vêm ordenadas por
+  id do chamado, então só a transcrição do chamado atual fica em memória
+- a saída é produzida em blocos de ~TAMANHO_BLOCO bytes (e comprimida bloco a
+  bloco quando gzip=True)
+"""
+import csv
+import zlib
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .busca import texto_original
+from .models import InteracaoChamado
+
+TAMANHO_LOTE = 2000
+TAMANHO_BLOCO = 64 * 1024
+
+CAMPOS_CHAMADO = (
+    ('id', 'id_chamado'),
+    ('id_legivel', 'id_legivel'),
+    ('titulo', 'titulo'),
+    ('descricao', 'descricao'),
+    ('status', 'status'),
+    ('urgencia', 'urgencia'),
+    ('departamento', 'departamento__nome'),
+    ('solicitante', 'nome_solicitante'),
+    ('suporte_responsavel', 'suporte_responsavel__username'),
+    ('presencial', 'modalidade_presencial'),
+    ('criado_em', 'criado_em'),
+    ('data_resolucao', 'data_resolucao'),
+)
+
+CAMPOS_INTERACAO = (
+    ('mensagem_em', 'criado_em'),
+    ('remetente', 'remetente'),
+    ('mensagem_suporte', 'suporte_responsavel__username'),
+    ('acao_bot', 'acao_bot'),
+    ('mensagem', 'mensagem'),
+)
+
+# Campos com HTML escapado na gravação (sanitize_input)
+CAMPOS_TEXTO = {'titulo', 'descricao', 'mensagem'}
+
+FORMATOS = ('csv', 'jsonl')
+
+# Planilhas executam como fórmula a célula que começa com estes caracteres (CSV injection)
+INICIO_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _linhas(queryset, campos):
+    """Dicts por linha a partir de values_list em lotes (sem instanciar modelos)"""
+    nomes = [nome for nome, _ in campos]
+    textos = [indice for indice, nome in enumerate(nomes) if nome in CAMPOS_TEXTO]
+    for valores in queryset.values_list(*[lookup for _, lookup in campos]).iterator(chunk_size=TAMANHO_LOTE):
+        valores = list(valores)
+        for indice in textos:
+            valores[indice] = texto_original(valores[indice])
+        yield dict(zip(nomes, valores))
+
+
+def chamados_com_transcricao(chamados_query):
+    """(chamado, [interações]) com merge das duas consultas ordenadas por chamado"""
+    chamados_query = chamados_query.order_by('id_chamado')
+    interacoes = _linhas_interacao(
+        InteracaoChamado.objects.filter(chamado__in=chamados_query.values('id_chamado'))
+        .order_by('chamado_id', 'criado_em')
+    )
+    pendente = next(interacoes, None)
+    for chamado in _linhas(chamados_query, CAMPOS_CHAMADO):
+        transcricao = []
+        # Mensagens de chamados que não estão na primeira consulta (criados no meio da exportação)
+        while pendente is not None and pendente[0] < chamado['id']:
+            pendente = next(interacoes, None)
+        while pendente is not None and pendente[0] == chamado['id']:
+            transcricao.append(pendente[1])
+            pendente = next(interacoes, None)
+        yield chamado, transcricao
+
+
+def _linhas_interacao(queryset):
+    for linha in _linhas(queryset, (('chamado_id', 'chamado_id'),) + CAMPOS_INTERACAO):
+        yield linha.pop('chamado_id'), linha
+
+
+def _celula_csv(valor):
+    """Texto que abriria como fórmula ganha um apóstrofo na frente (só no CSV)"""
+    if isinstance(valor, str) and valor.startswith(INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def _linha_csv(valores):
+    return [_celula_csv(valor) for valor in valores]
+
+
+class _Linha:
+    """Buffer de uma linha para o csv.writer (devolve o texto em vez de gravar)"""
+
+    def write(self, valor):
+        return valor
+
+
+def _texto_csv(chamados_query, transcricao):
+    escritor = csv.writer(_Linha())
+    cabecalho = [nome for nome, _ in CAMPOS_CHAMADO]
+    if not transcricao:
+        yield escritor.writerow(cabecalho)
+        for chamado in _linhas(chamados_query, CAMPOS_CHAMADO):
+            yield escritor.writerow(_linha_csv(chamado.values()))
+        return
+
+    # Uma linha por mensagem, com os dados do chamado repetidos
+    yield escritor.writerow(cabecalho + [nome for nome, _ in CAMPOS_INTERACAO])
+    vazia = [''] * len(CAMPOS_INTERACAO)
+    for chamado, interacoes in chamados_com_transcricao(chamados_query):
+        valores = _linha_csv(chamado.values())
+        if not interacoes:
+            yield escritor.writerow(valores + vazia)
+        for interacao in interacoes:
+            yield escritor.writerow(valores + _linha_csv(interacao.values()))
+
+
+def _texto_jsonl(chamados_query, transcricao):
+    codificador = DjangoJSONEncoder(ensure_ascii=False)
+    if not transcricao:
+        for chamado in _linhas(chamados_query, CAMPOS_CHAMADO):
+            yield codificador.encode(chamado) + '\n'
+        return
+
+    for chamado, interacoes in chamados_com_transcricao(chamados_query):
+        chamado['transcricao'] = interacoes
+        yield codificador.encode(chamado) + '\n'
+
+
+def _em_blocos(partes):
+    """Junta as linhas em blocos de bytes (menos iterações no servidor/rede)"""
+    bloco = []
+    tamanho = 0
+    for parte in partes:
+        codificada = parte.encode('utf-8')
+        bloco.append(codificada)
+        tamanho += len(codificada)
+        if tamanho >= TAMANHO_BLOCO:
+            yield b''.join(bloco)
+            bloco = []
+            tamanho = 0
+    if bloco:
+        yield b''.join(bloco)
+
+
+def _comprimir(blocos):
+    """gzip incremental: cada bloco é comprimido assim que é gerado"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: cabeçalho gzip
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+
+def exportar(chamados_query, formato='csv', transcricao=True, gzip=False):
+    """Gerador de bytes com a exportação completa"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}")
+    partes = _texto_csv(chamados_query, transcricao) if formato == 'csv' else _texto_jsonl(chamados_query, transcricao)
+    blocos = _em_blocos(partes)
+    return _comprimir(blocos) if gzip else blocos
+
+
+def filtrar_mes(chamados_query, mes):
+    """mes='AAAA-MM' (dump mensal); ValueError se o formato for inválido"""
+    inicio = timezone.make_aware(datetime.strptime(mes, '%Y-%m'))
+    fim = inicio.replace(year=inicio.year + 1, month=1) if inicio.month == 12 else inicio.replace(month=inicio.month + 1)
+    return chamados_query.filter(criado_em__gte=inicio, criado_em__lt=fim)
+
+
+def nome_arquivo(formato, gzip=False, sufixo=''):
+    nome = f"chamados{sufixo}.{formato}"
+    return f"{nome}.gz" if gzip else nome
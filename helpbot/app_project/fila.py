@@ -0,0 +1,144 @@
+"""
+Fila de atendimento do suporte: cada suporte "puxa" o próximo chamado em vez
+de varrer a lista inteira de chamados abertos.
+
+- Ordem: prioridade (urgência) e depois idade do chamado
+- reivindicar() reserva o chamado por DURACAO_RESERVA segundos (lease); se o
+  suporte não assumir nem renovar, a reserva expira e o chamado volta à fila
+- PostgreSQL/MySQL: SELECT ... FOR UPDATE SKIP LOCKED, vários suportes puxam
+  ao mesmo tempo sem esperar uns pelos outros
+- SQLite (sem SKIP LOCKED): compare-and-set, UPDATE ... WHERE ainda-disponível;
+  quem perde a corrida tenta o próximo candidato
+- assumir() também é um compare-and-set: dois suportes nunca ficam como
+  responsáveis pelo mesmo chamado
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Chamado
+from .versoes import incrementar_versao
+
+logger = logging.getLogger(__name__)
+
+DURACAO_RESERVA = getattr(settings, 'FILA_DURACAO_RESERVA', 300)
+MAX_REIVINDICACAO = getattr(settings, 'FILA_MAX_REIVINDICACAO', 10)
+
+
+def _reserva_livre(suporte=None, agora=None):
+    """Sem reserva, reserva vencida (ou do próprio suporte)"""
+    agora = agora or timezone.now()
+    condicao = Q(reservado_por__isnull=True) | Q(reserva_expira_em__lt=agora)
+    if suporte is not None:
+        condicao |= Q(reservado_por=suporte)
+    return condicao
+
+
+def disponiveis(agora=None):
+    """Chamados abertos, sem responsável e sem reserva válida, na ordem da fila"""
+    return Chamado.objects.filter(
+        _reserva_livre(agora=agora),
+        status='em_andamento',
+        suporte_responsavel__isnull=True,
+    ).order_by('prioridade', 'criado_em')
+
+
+def reservas_ativas(suporte, agora=None):
+    return Chamado.objects.filter(
+        reservado_por=suporte,
+        reserva_expira_em__gte=agora or timezone.now(),
+        suporte_responsavel__isnull=True,
+        status='em_andamento',
+    ).order_by('prioridade', 'criado_em')
+
+
+def reivindicar(suporte, quantidade=1):
+    """Reserva até `quantidade` chamados para o suporte; retorna a lista reservada"""
+    quantidade = max(1, min(quantidade, MAX_REIVINDICACAO))
+    agora = timezone.now()
+    expira_em = agora + timedelta(seconds=DURACAO_RESERVA)
+
+    if connection.features.has_select_for_update_skip_locked:
+        ids = _reivindicar_skip_locked(suporte, quantidade, agora, expira_em)
+    else:
+        ids = _reivindicar_compare_and_set(suporte, quantidade, agora, expira_em)
+
+    if ids:
+        logger.info(f"Suporte {suporte.username} reservou {len(ids)} chamado(s) da fila")
+    return list(Chamado.objects.filter(pk__in=ids).select_related('departamento').order_by('prioridade', 'criado_em'))
+
+
+def _reivindicar_skip_locked(suporte, quantidade, agora, expira_em):
+    with transaction.atomic():
+        # Linhas já travadas por outro suporte são puladas, não aguardadas
+        ids = list(
+            disponiveis(agora).select_for_update(skip_locked=True).values_list('pk', flat=True)[:quantidade]
+        )
+        Chamado.objects.filter(pk__in=ids).update(
+            reservado_por=suporte, reserva_expira_em=expira_em, atualizado_em=agora
+        )
+    return ids
+
+
+def _reivindicar_compare_and_set(suporte, quantidade, agora, expira_em):
+    ids = []
+    while len(ids) < quantidade:
+        # Candidatos extras: alguns serão levados por suportes concorrentes
+        candidatos = list(disponiveis(agora).values_list('pk', flat=True)[:(quantidade - len(ids)) * 3])
+        if not candidatos:
+            break
+        for pk in candidatos:
+            reservou = Chamado.objects.filter(
+                _reserva_livre(agora=agora),
+                pk=pk,
+                status='em_andamento',
+                suporte_responsavel__isnull=True,
+            ).update(reservado_por=suporte, reserva_expira_em=expira_em, atualizado_em=agora)
+            if reservou:
+                ids.append(pk)
+                if len(ids) == quantidade:
+                    break
+    return ids
+
+
+def renovar(suporte, id_chamado):
+    """Estende a reserva ainda válida do suporte; False se ela já expirou ou é de outro"""
+    agora = timezone.now()
+    return bool(Chamado.objects.filter(
+        pk=id_chamado, reservado_por=suporte, reserva_expira_em__gte=agora
+    ).update(reserva_expira_em=agora + timedelta(seconds=DURACAO_RESERVA)))
+
+
+def liberar(suporte, id_chamado):
+    """Devolve o chamado à fila"""
+    return bool(Chamado.objects.filter(pk=id_chamado, reservado_por=suporte).update(
+        reservado_por=None, reserva_expira_em=None, atualizado_em=timezone.now()
+    ))
+
+
+def assumir(suporte, id_chamado):
+    """
+    Torna o suporte responsável pelo chamado numa única instrução UPDATE.
+    Só tem sucesso se não houver outro responsável nem reserva válida de outro suporte.
+    """
+    agora = timezone.now()
+    assumiu = bool(Chamado.objects.filter(
+        Q(suporte_responsavel__isnull=True) | Q(suporte_responsavel=suporte),
+        _reserva_livre(suporte, agora),
+        pk=id_chamado,
+    ).update(
+        suporte_responsavel=suporte,
+        controle_chat_suporte=True,
+        visualizado_suporte=True,
+        reservado_por=None,
+        reserva_expira_em=None,
+        atualizado_em=agora,
+    ))
+    if assumiu:
+        # update() não dispara post_save
+        incrementar_versao('chamados')
+    return assumiu
@@ -0,0 +1,76 @@
+"""Filtros de chamados da tela "todos os chamados", compartilhados com a exportação"""
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .busca import motor_busca, termos_da_consulta
+from .models import Chamado
+
+# Máximo de documentos do índice de busca considerados no filtro
+LIMITE_FILTRO_BUSCA = 500
+
+DIAS_PERIODO = {
+    'semana': 7,
+    'mes': 30,
+    'trimestre': 90,
+}
+
+
+def filtros_padrao():
+    return {
+        'periodo': 'todos',
+        'urgencia': 'todos',
+        'departamento': 'todos',
+        'status': 'todos',
+        'busca': '',
+    }
+
+
+def filtrar_chamados(parametros, chamados_query=None):
+    """
+    Aplica os filtros (periodo, urgencia, departamento, status, busca) vindos de
+    um QueryDict/dict. Retorna (queryset, filtros_ativos).
+    """
+    if chamados_query is None:
+        chamados_query = Chamado.objects.all()
+    filtros_ativos = filtros_padrao()
+
+    periodo = parametros.get('periodo', 'todos')
+    if periodo != 'todos':
+        filtros_ativos['periodo'] = periodo
+        agora = timezone.now()
+
+        if periodo == 'hoje':
+            inicio_dia = timezone.localtime(agora).replace(hour=0, minute=0, second=0, microsecond=0)
+            chamados_query = chamados_query.filter(criado_em__gte=inicio_dia)
+        elif periodo in DIAS_PERIODO:
+            chamados_query = chamados_query.filter(
+                criado_em__gte=agora - timezone.timedelta(days=DIAS_PERIODO[periodo])
+            )
+
+    urgencia = parametros.get('urgencia', 'todos')
+    if urgencia != 'todos':
+        filtros_ativos['urgencia'] = urgencia
+        chamados_query = chamados_query.filter(urgencia=urgencia)
+
+    departamento_id = parametros.get('departamento', 'todos')
+    if departamento_id != 'todos':
+        filtros_ativos['departamento'] = departamento_id
+        try:
+            chamados_query = chamados_query.filter(departamento_id=departamento_id)
+        except (ValueError, ValidationError):
+            pass
+
+    status = parametros.get('status', 'todos')
+    if status != 'todos':
+        filtros_ativos['status'] = status
+        chamados_query = chamados_query.filter(status=status)
+
+    # ✅ Busca textual no índice (título, descrição e mensagens do chat)
+    busca = ' '.join(termos_da_consulta(parametros.get('busca', '')))
+    if busca:
+        filtros_ativos['busca'] = busca
+        chamados_query = chamados_query.filter(
+            id_chamado__in=motor_busca().ids_chamados(busca, limite=LIMITE_FILTRO_BUSCA)
+        )
+
+    return chamados_query, filtros_ativos
@@ -0,0 +1,64 @@
+"""
+Cursores de leitura do chat: até onde cada usuário leu cada chamado.
+
+Antes o timestamp ia para request.session (ultima_visualizacao_<id>): cada
+marcação regravava a sessão inteira, o estado não acompanhava o usuário entre
+dispositivos e a sessão crescia sem limite para quem atende milhares de chamados.
+
+- Uma linha por (usuario, chamado) em CursorLeitura
+- Marcações passam pelo buffer de escrita adiada (app_project/escrita_adiada.py)
+  e são gravadas juntas num único upsert (INSERT ... ON CONFLICT DO UPDATE)
+- Leituras enxergam o buffer; contagens de não lidas de vários chamados
+  saem de uma consulta (LEFT JOIN do cursor do usuário + COUNT das interações)
+"""
+from django.db.models import Count, F, FilteredRelation, Q
+
+from .escrita_adiada import buffer_escrita
+from .models import CursorLeitura
+
+# Remetentes que contam como "não lido" para cada tipo de usuário (as próprias mensagens não contam)
+REMETENTES_NAO_LIDOS = {
+    'suporte': ('usuario',),
+    'colaborador': ('bot', 'suporte'),
+}
+
+
+class CursoresLeitura:
+    def marcar(self, usuario_id, chamado_id, lido_ate):
+        """Registra a leitura; a gravação no banco sai no próximo lote do buffer"""
+        buffer_escrita.cursor_leitura(usuario_id, chamado_id, lido_ate)
+
+    def lido_ate(self, usuario_id, chamado_id):
+        """Momento da última leitura (None se o usuário nunca abriu o chat)"""
+        pendente = buffer_escrita.cursor_pendente(usuario_id, chamado_id)
+        if pendente is not None:
+            return pendente
+        return (
+            CursorLeitura.objects
+            .filter(usuario_id=usuario_id, chamado_id=chamado_id)
+            .values_list('lido_ate', flat=True)
+            .first()
+        )
+
+    def nao_lidas(self, usuario, chamados):
+        """{id_chamado: mensagens não lidas} de vários chamados em uma consulta"""
+        # O JOIN precisa ver as marcações ainda no buffer
+        buffer_escrita.sincronizar(usuario.pk)
+        remetentes = REMETENTES_NAO_LIDOS.get(usuario.tipo_usuario, REMETENTES_NAO_LIDOS['colaborador'])
+        consulta = (
+            chamados
+            .annotate(cursor=FilteredRelation('cursores_leitura', condition=Q(cursores_leitura__usuario=usuario)))
+            .annotate(nao_lidas=Count(
+                'interacoes',
+                filter=Q(interacoes__remetente__in=remetentes) & (
+                    Q(cursor__lido_ate__isnull=True) | Q(interacoes__criado_em__gt=F('cursor__lido_ate'))
+                ),
+            ))
+            .order_by()
+            .values_list('pk', 'nao_lidas')
+        )
+        return dict(consulta)
+
+
+# Instância global dos cursores (uma por processo)
+cursores_leitura = CursoresLeitura()
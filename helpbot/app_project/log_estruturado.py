@@ -0,0 +1,152 @@
+"""
+Pipeline de log assíncrono, estruturado e amostrado (configurado em settings.LOGGING).
+
+Antes todo logger.info das views (dashboard, polling, mensagens) era formatado
+e escrito no console dentro da thread da requisição. Agora:
+
+- HandlerFila: a requisição só enfileira o LogRecord (fila limitada; se encher,
+  descarta e conta em vez de bloquear); uma thread QueueListener por processo
+  formata e escreve. A mensagem (%-args) só é montada na thread do listener
+- FormatadorJSON: uma linha JSON por registro, com o modelo da mensagem
+  (agrupável) e os campos passados em extra={...}
+- FiltroAmostragem: para loggers de alto volume, mantém 1 a cada N registros
+  abaixo de WARNING (avisos e erros passam sempre); o JSON leva "amostragem": N
+
+Este módulo é carregado pelo dictConfig antes dos apps: não importa models.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Atributos padrão do LogRecord: o que não está aqui veio de extra={...}
+_ATRIBUTOS_PADRAO = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'amostragem'}
+
+
+class FormatadorJSON(logging.Formatter):
+    def format(self, record):
+        dados = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage(),
+        }
+        if record.args:
+            dados['modelo'] = str(record.msg)
+        amostragem = getattr(record, 'amostragem', None)
+        if amostragem:
+            dados['amostragem'] = amostragem
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO:
+                dados[chave] = valor
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            dados['excecao'] = record.exc_text
+        if record.stack_info:
+            dados['pilha'] = record.stack_info
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FiltroAmostragem(logging.Filter):
+    """{prefixo do logger: N} - mantém 1 a cada N registros abaixo de WARNING"""
+
+    def __init__(self, taxas=None):
+        super().__init__()
+        self.taxas = dict(taxas or {})
+        self._contadores = {}
+        self._cache_taxas = {}
+        self._lock = threading.Lock()
+
+    def _taxa(self, nome):
+        taxa = self._cache_taxas.get(nome)
+        if taxa is None:
+            # Prefixo mais longo vence: 'app_project.views' antes de 'app_project'
+            candidatos = [prefixo for prefixo in self.taxas if nome == prefixo or nome.startswith(prefixo + '.')]
+            taxa = self.taxas[max(candidatos, key=len)] if candidatos else 1
+            self._cache_taxas[nome] = taxa
+        return taxa
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        taxa = self._taxa(record.name)
+        if taxa <= 1:
+            return True
+        with self._lock:
+            contador = self._contadores.get(record.name, 0)
+            self._contadores[record.name] = contador + 1
+        if contador % taxa:
+            return False
+        record.amostragem = taxa
+        return True
+
+
+class HandlerFila(QueueHandler):
+    """
+    Enfileira sem formatar; o QueueListener (uma thread por processo, iniciada
+    no primeiro registro - sobrevive ao fork de workers) escreve no destino.
+    """
+
+    def __init__(self, tamanho_fila=10000, stream=None):
+        super().__init__(queue.Queue(maxsize=tamanho_fila))
+        self.destino = logging.StreamHandler(stream or sys.stderr)
+        self.destino.setFormatter(FormatadorJSON())
+        self.descartados = 0
+        self._listener = None
+        self._pid = None
+        self._lock_listener = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # O formatador vale para o destino (a formatação acontece no listener)
+        self.destino.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Exceção vira texto aqui: o traceback prende frames da requisição
+        if record.exc_info:
+            record.exc_text = self.destino.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._iniciar_listener()
+        super().emit(record)
+
+    def _iniciar_listener(self):
+        with self._lock_listener:
+            if self._pid == os.getpid():
+                return
+            self._listener = QueueListener(self.queue, self.destino, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.parar)
+
+    def parar(self):
+        """Esvazia a fila e encerra o listener (chamado no atexit)"""
+        with self._lock_listener:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                self._listener = None
+                self._pid = None
+        if self.descartados:
+            self.destino.handle(logging.makeLogRecord({
+                'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                'msg': 'Registros de log descartados (fila cheia): %d', 'args': (self.descartados,),
+            }))
+
+    def close(self):
+        self.parar()
+        self.destino.close()
+        super().close()
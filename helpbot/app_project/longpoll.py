@@ -0,0 +1,161 @@
+"""
+Long-poll: a requisição fica aguardando até surgir novidade no canal
+(ex: nova mensagem no chat) ou até o tempo de espera acabar.
+
+- No mesmo processo o aviso é imediato (threading.Condition para views sync,
+  asyncio.Event para views async).
+- Entre workers o aviso passa pelo cache (contador de versão do canal),
+  consultado a cada INTERVALO_VERIFICACAO_BROKER segundos. Com LocMemCache
+  isso só funciona dentro do processo; em produção use Redis/Memcached.
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .versoes import obter_versao, aobter_versao, incrementar_versao
+
+# Limite superior do parâmetro ?wait= (segundos); abaixo do timeout típico de proxies
+ESPERA_MAXIMA = getattr(settings, 'LONGPOLL_ESPERA_MAXIMA', 25)
+
+# De quanto em quanto tempo o aguardo consulta o contador compartilhado no cache
+INTERVALO_VERIFICACAO_BROKER = getattr(settings, 'LONGPOLL_INTERVALO_BROKER', 1.0)
+
+
+def canal_chamado(id_chamado):
+    return f"longpoll_chamado_{id_chamado}"
+
+
+def canal_notificacoes(id_usuario):
+    return f"longpoll_notificacoes_{id_usuario}"
+
+
+def segundos_espera(request):
+    """Lê ?wait= da requisição (0 = resposta imediata, comportamento antigo)"""
+    try:
+        espera = float(request.GET.get('wait', 0))
+    except (TypeError, ValueError):
+        return 0
+    return max(0, min(espera, ESPERA_MAXIMA))
+
+
+def timestamp_desde(request):
+    """Lê ?desde= (timestamp da última verificação do cliente) ou None"""
+    try:
+        return float(request.GET['desde'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RegistroEspera:
+    """Registro em memória de quem está aguardando cada canal"""
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self._geracoes = defaultdict(int)
+        self._eventos = defaultdict(set)
+
+    def marca(self, canal):
+        """Estado atual do canal; deve ser obtido ANTES de consultar o banco"""
+        with self._condicao:
+            geracao = self._geracoes[canal]
+        return geracao, obter_versao(canal)
+
+    async def amarca(self, canal):
+        with self._condicao:
+            geracao = self._geracoes[canal]
+        return geracao, await aobter_versao(canal)
+
+    def notificar(self, canal):
+        with self._condicao:
+            self._geracoes[canal] += 1
+            eventos = list(self._eventos.get(canal, ()))
+            self._condicao.notify_all()
+        for loop, evento in eventos:
+            loop.call_soon_threadsafe(evento.set)
+        # Avisa os outros workers
+        incrementar_versao(canal)
+
+    def notificar_apos_commit(self, canal):
+        """Só acorda os clientes depois que a linha nova estiver visível no banco"""
+        transaction.on_commit(lambda: self.notificar(canal))
+
+    def esperar(self, canal, marca, timeout):
+        """Bloqueia a thread até o canal mudar desde a marca. Retorna False no timeout."""
+        geracao, versao = marca
+        fim = time.monotonic() + timeout
+        while True:
+            with self._condicao:
+                if self._geracoes[canal] != geracao:
+                    return True
+                restante = fim - time.monotonic()
+                if restante <= 0:
+                    return False
+                self._condicao.wait(min(restante, INTERVALO_VERIFICACAO_BROKER))
+                if self._geracoes[canal] != geracao:
+                    return True
+            if obter_versao(canal) != versao:
+                return True
+
+    async def aesperar(self, canal, marca, timeout):
+        """Versão async: aguarda sem ocupar thread"""
+        geracao, versao = marca
+        fim = time.monotonic() + timeout
+        evento = asyncio.Event()
+        registro = (asyncio.get_running_loop(), evento)
+        with self._condicao:
+            if self._geracoes[canal] != geracao:
+                return True
+            self._eventos[canal].add(registro)
+        try:
+            while True:
+                restante = fim - time.monotonic()
+                if restante <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(evento.wait(), min(restante, INTERVALO_VERIFICACAO_BROKER))
+                    return True
+                except asyncio.TimeoutError:
+                    if await aobter_versao(canal) != versao:
+                        return True
+        finally:
+            with self._condicao:
+                self._eventos[canal].discard(registro)
+                if not self._eventos[canal]:
+                    del self._eventos[canal]
+
+
+# Instância global do registro de espera
+registro_espera = RegistroEspera()
+
+
+def aguardar_novidades(canal, espera, consultar, tem_novidade):
+    """
+    Executa consultar() e, se não houver novidade, aguarda o canal e consulta de novo
+    até a novidade aparecer ou a espera acabar.
+    """
+    if espera <= 0:
+        return consultar()
+    fim = time.monotonic() + espera
+    while True:
+        marca = registro_espera.marca(canal)
+        dados = consultar()
+        restante = fim - time.monotonic()
+        if tem_novidade(dados) or restante <= 0 or not registro_espera.esperar(canal, marca, restante):
+            return dados
+
+
+async def aaguardar_novidades(canal, espera, consultar, tem_novidade):
+    """Versão async de aguardar_novidades (consultar é uma coroutine function)"""
+    if espera <= 0:
+        return await consultar()
+    fim = time.monotonic() + espera
+    while True:
+        marca = await registro_espera.amarca(canal)
+        dados = await consultar()
+        restante = fim - time.monotonic()
+        if tem_novidade(dados) or restante <= 0 or not await registro_espera.aesperar(canal, marca, restante):
+            return dados
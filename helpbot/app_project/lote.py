@@ -0,0 +1,201 @@
+"""
+Operações em lote sobre chamados e notificações (limpeza de backlog).
+
+Cada lote faz UMA consulta de permissão (os IDs visíveis para o usuário),
+aplica a operação com um único UPDATE e cria as mensagens/eventos gerados
+com bulk_create. O resultado é por item:
+
+- 'ok'              operação aplicada
+- 'id_invalido'     não é um UUID
+- 'nao_encontrado'  não existe ou o usuário não tem acesso (não diferenciamos)
+- 'ja_resolvido' / 'ja_visualizado' / 'ja_lida'  nada a fazer
+
+update() e bulk_create não disparam signals: a versão de cache dos chamados é
+incrementada aqui e o push/contadores saem pelos eventos de domínio. Marcar
+como visualizado passa pelo buffer da escrita adiada, como o endpoint individual.
+"""
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .agrupamento import agrupador_notificacoes
+from .busca import motor_busca
+from .escrita_adiada import TIPO_BROADCAST, buffer_escrita
+from .eventos import publicar_em_lote, STATUS_ALTERADO, CONTROLE_ASSUMIDO
+from .models import Chamado, InteracaoChamado, Notificacao
+from .transcricoes import transcricoes
+from .versoes import incrementar_versao_apos_commit
+
+logger = logging.getLogger(__name__)
+
+MAX_ITENS_LOTE = getattr(settings, 'LOTE_MAX_ITENS', 200)
+
+OK = 'ok'
+ID_INVALIDO = 'id_invalido'
+NAO_ENCONTRADO = 'nao_encontrado'
+JA_RESOLVIDO = 'ja_resolvido'
+JA_VISUALIZADO = 'ja_visualizado'
+JA_LIDA = 'ja_lida'
+
+
+def normalizar_ids(ids):
+    """{id_original: UUID ou None}, sem repetidos e na ordem recebida"""
+    normalizados = {}
+    for valor in ids:
+        try:
+            normalizados[str(valor)] = uuid.UUID(str(valor))
+        except (TypeError, ValueError, AttributeError):
+            normalizados[str(valor)] = None
+    return normalizados
+
+
+def _resultados(normalizados, situacao):
+    """Monta a lista por item a partir de {UUID: resultado} (ausente = não encontrado)"""
+    return [
+        {'id': original, 'resultado': situacao.get(valor, NAO_ENCONTRADO) if valor else ID_INVALIDO}
+        for original, valor in normalizados.items()
+    ]
+
+
+def _chamados_permitidos(usuario, ids):
+    """Única consulta de permissão do lote: suporte vê todos, colaborador só os seus"""
+    consulta = Chamado.objects.filter(pk__in=ids)
+    if usuario.tipo_usuario != 'suporte':
+        consulta = consulta.filter(usuario=usuario)
+    return consulta
+
+
+def resolver(usuario, ids, observacao=''):
+    normalizados = normalizar_ids(ids)
+    validos = [valor for valor in normalizados.values() if valor]
+    origem = 'suporte' if usuario.tipo_usuario == 'suporte' else 'usuario'
+    agora = timezone.now()
+
+    with transaction.atomic():
+        situacao = dict(
+            _chamados_permitidos(usuario, validos).select_for_update().values_list('pk', 'status')
+        )
+        abertos = [pk for pk, status in situacao.items() if status != 'resolvido']
+        situacao = {pk: JA_RESOLVIDO if status == 'resolvido' else OK for pk, status in situacao.items()}
+
+        if abertos:
+            Chamado.objects.filter(pk__in=abertos).update(
+                status='resolvido', data_resolucao=agora, atualizado_em=agora
+            )
+            mensagem = "📊 **Status alterado:** Em Andamento → Resolvido"
+            if observacao:
+                mensagem += f"\n💬 **Observação:** {observacao}"
+            criadas = InteracaoChamado.objects.bulk_create([
+                InteracaoChamado(
+                    chamado_id=pk,
+                    remetente=origem,
+                    mensagem=mensagem,
+                    suporte_responsavel=usuario if origem == 'suporte' else None
+                )
+                for pk in abertos
+            ])
+            # bulk_create não dispara post_save: as transcrições em cache são remontadas
+            # e as mensagens entram no índice de busca aqui
+            transcricoes.invalidar_apos_commit(*abertos)
+            motor_busca().indexar_interacoes_apos_commit(criadas)
+            # Mensagens de finalização do bot e notificações: assinantes de StatusAlterado
+            publicar_em_lote(
+                STATUS_ALTERADO, abertos,
+                status_anterior='em_andamento',
+                status_novo='resolvido',
+                origem=origem,
+                autor_id=usuario.id_usuario,
+                observacao=observacao,
+            )
+            incrementar_versao_apos_commit('chamados')
+
+    logger.info(f"Lote: {len(abertos)} chamados resolvidos por {usuario.username}")
+    return _resultados(normalizados, situacao), len(abertos)
+
+
+def reatribuir(usuario, ids, suporte_destino):
+    """Passa os chamados abertos para outro suporte (limpa reservas da fila)"""
+    normalizados = normalizar_ids(ids)
+    validos = [valor for valor in normalizados.values() if valor]
+    agora = timezone.now()
+
+    with transaction.atomic():
+        situacao = dict(
+            _chamados_permitidos(usuario, validos).select_for_update().values_list('pk', 'status')
+        )
+        abertos = [pk for pk, status in situacao.items() if status != 'resolvido']
+        situacao = {pk: JA_RESOLVIDO if status == 'resolvido' else OK for pk, status in situacao.items()}
+
+        if abertos:
+            Chamado.objects.filter(pk__in=abertos).update(
+                suporte_responsavel=suporte_destino,
+                controle_chat_suporte=True,
+                reservado_por=None,
+                reserva_expira_em=None,
+                atualizado_em=agora,
+            )
+            InteracaoChamado.objects.bulk_create([
+                InteracaoChamado(
+                    chamado_id=pk,
+                    remetente='bot',
+                    mensagem=f"🔄 **Chamado transferido:** {suporte_destino.username} é agora o responsável pelo seu atendimento.",
+                    acao_bot='reatribuicao'
+                )
+                for pk in abertos
+            ])
+            transcricoes.invalidar_apos_commit(*abertos)
+            if suporte_destino != usuario:
+                # Reatribuições repetidas do mesmo chamado viram uma notificação com contador
+                agrupador_notificacoes.notificar_em_lote([
+                    {
+                        'usuario_id': suporte_destino.id_usuario,
+                        'chamado_id': pk,
+                        'mensagem': f"🔄 **Chamado atribuído a você** por {usuario.username}",
+                        'tipo': 'atualizacao',
+                    }
+                    for pk in abertos
+                ])
+            publicar_em_lote(
+                CONTROLE_ASSUMIDO, abertos,
+                suporte_id=suporte_destino.id_usuario, modo='reatribuicao', autor_id=usuario.id_usuario
+            )
+            incrementar_versao_apos_commit('chamados')
+
+    logger.info(f"Lote: {len(abertos)} chamados reatribuídos a {suporte_destino.username} por {usuario.username}")
+    return _resultados(normalizados, situacao), len(abertos)
+
+
+def marcar_visualizados(usuario, ids):
+    """Mesma marcação do endpoint individual: broadcasts do usuário lidos + visualizado_suporte, via escrita adiada"""
+    normalizados = normalizar_ids(ids)
+    validos = [valor for valor in normalizados.values() if valor]
+
+    situacao = dict(_chamados_permitidos(usuario, validos).values_list('pk', 'visualizado_suporte'))
+    com_broadcast = set(
+        Notificacao.objects
+        .filter(usuario=usuario, chamado_id__in=situacao, tipo=TIPO_BROADCAST, lida=False)
+        .values_list('chamado_id', flat=True)
+    )
+    pendentes = [pk for pk, visualizado in situacao.items() if not visualizado or pk in com_broadcast]
+    situacao = {pk: OK if pk in pendentes else JA_VISUALIZADO for pk in situacao}
+
+    for pk in pendentes:
+        buffer_escrita.chamado_visualizado(usuario.pk, pk)
+    return _resultados(normalizados, situacao), len(pendentes)
+
+
+def marcar_lidas(usuario, ids):
+    """Só as notificações do próprio usuário"""
+    normalizados = normalizar_ids(ids)
+    validos = [valor for valor in normalizados.values() if valor]
+
+    situacao = dict(Notificacao.objects.filter(usuario=usuario, pk__in=validos).values_list('pk', 'lida'))
+    pendentes = [pk for pk, lida in situacao.items() if not lida]
+    situacao = {pk: JA_LIDA if lida else OK for pk, lida in situacao.items()}
+
+    if pendentes:
+        Notificacao.objects.filter(pk__in=pendentes).update(lida=True)
+    return _resultados(normalizados, situacao), len(pendentes)
@@ -0,0 +1,50 @@
+"""Utilitários compartilhados pelos comandos de benchmark"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def banco_temporario():
+    """Cria um banco de teste descartável para não tocar no db.sqlite3 real"""
+    nome_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=0, keepdb=False)
+
+
+def cronometrar(funcao, repeticoes=5):
+    """Executa a função N vezes e retorna (melhor, mediana) em segundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), statistics.median(tempos)
+
+
+def formatar_resultado(nome, melhor, mediana, linhas=None):
+    """Linha de relatório com custo por linha quando aplicável"""
+    texto = f"{nome:<40} melhor={melhor * 1000:8.2f}ms  mediana={mediana * 1000:8.2f}ms"
+    if linhas:
+        texto += f"  por_linha={melhor / linhas * 1_000_000:7.2f}µs"
+    return texto
+
+
+@contextmanager
+def datas_manuais(*campos):
+    """Desliga auto_now/auto_now_add dos campos (modelo, nome) para gravar datas históricas"""
+    originais = []
+    for modelo, nome in campos:
+        campo = modelo._meta.get_field(nome)
+        originais.append((campo, campo.auto_now, campo.auto_now_add))
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in originais:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,85 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, viewsets
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from app_project.api.viewsets import ChamadoViewSet
+from app_project.models import Usuario, Departamento, Chamado
+from ._bench import banco_temporario, cronometrar, formatar_resultado
+
+
+class _ChamadoModelSerializer(serializers.ModelSerializer):
+    """Caminho "padrão" do DRF, mantido apenas como referência de comparação"""
+    departamento = serializers.CharField(source='departamento.nome')
+    suporte_responsavel = serializers.CharField(source='suporte_responsavel.username', default=None)
+
+    class Meta:
+        model = Chamado
+        fields = '__all__'
+
+
+class _Paginas(PageNumberPagination):
+    page_size = 50
+
+
+class _ChamadoModelViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = _ChamadoModelSerializer
+    pagination_class = _Paginas
+    queryset = Chamado.objects.select_related('departamento', 'suporte_responsavel').order_by('-criado_em')
+
+
+class Command(BaseCommand):
+    help = 'Compara a API de leitura de chamados (values + cursor) com ModelSerializer + paginação por página'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chamados', type=int, default=20000)
+        parser.add_argument('--pagina', type=int, default=200, help='Página "profunda" a medir')
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+        fabrica = APIRequestFactory(SERVER_NAME='localhost')
+
+        with banco_temporario():
+            suporte = Usuario.objects.create(username='bench_suporte', codigo_suporte=100001, tipo_usuario='suporte')
+            departamento = Departamento.objects.create(nome='TI')
+            Chamado.objects.bulk_create(
+                Chamado(titulo=f'Chamado {i}', descricao='Descrição gerada para benchmark ' * 4,
+                        departamento=departamento, usuario=suporte, suporte_responsavel=suporte if i % 2 else None,
+                        id_legivel=f'TKT-{i:07d}')
+                for i in range(options['chamados'])
+            )
+
+            def chamar(view, url):
+                request = fabrica.get(url)
+                force_authenticate(request, user=suporte)
+                resposta = view(request)
+                resposta.render()
+                return resposta
+
+            padrao = _ChamadoModelViewSet.as_view({'get': 'list'})
+            leve = ChamadoViewSet.as_view({'get': 'list'})
+
+            # Cursor da página profunda: segue os links "next" uma vez, fora da medição
+            url_profunda = '/api/chamados/'
+            for _ in range(options['pagina'] - 1):
+                url_profunda = chamar(leve, url_profunda).data['next']
+
+            casos = [
+                ('ModelSerializer, página 1', lambda: chamar(padrao, '/api/chamados/')),
+                (f"ModelSerializer, página {options['pagina']}", lambda: chamar(padrao, f"/api/chamados/?page={options['pagina']}")),
+                ('values + cursor, página 1', lambda: chamar(leve, '/api/chamados/')),
+                (f"values + cursor, página {options['pagina']}", lambda: chamar(leve, url_profunda)),
+                ('values + cursor, ?fields=id,titulo,status', lambda: chamar(leve, '/api/chamados/?fields=id,titulo,status')),
+            ]
+
+            self.stdout.write(f"{options['chamados']} chamados, 50 por página")
+            for nome, funcao in casos:
+                with CaptureQueriesContext(connection) as consultas:
+                    funcao()
+                melhor, mediana = cronometrar(funcao, options['repeticoes'])
+                self.stdout.write(formatar_resultado(nome, melhor, mediana, 50) + f'  consultas={len(consultas)}')
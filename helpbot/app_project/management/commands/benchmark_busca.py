@@ -0,0 +1,78 @@
+import itertools
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_project.busca import motor_busca
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado
+from ._bench import banco_temporario, cronometrar, formatar_resultado
+
+VOCABULARIO = (
+    'impressora computador rede internet senha email sistema acesso lento travando '
+    'manutenção instalação configuração atualização backup servidor monitor teclado '
+    'mouse notebook licença programa planilha arquivo pasta permissão usuário conexão '
+    'vpn wifi cabo energia tela erro falha reiniciar bloqueado desbloquear suporte'
+).split()
+
+CONSULTAS = ['impressora', 'manutencao servidor', 'senh', 'erro conexão vpn', 'licença planilha bloqueado']
+
+# Texto real: poucas palavras do domínio no meio de muitas outras (distribuição de Zipf)
+PROPORCAO_DOMINIO = 0.1
+TAMANHO_VOCABULARIO_GERAL = 20000
+
+
+class Command(BaseCommand):
+    help = 'Mede a latência da busca textual indexada com N mensagens (banco temporário)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mensagens', type=int, default=200000)
+        parser.add_argument('--chamados', type=int, default=5000)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+        aleatorio = random.Random(42)
+        gerais = [f"termo{i}" for i in range(TAMANHO_VOCABULARIO_GERAL)]
+        pesos_acumulados = list(itertools.accumulate(1 / posicao for posicao in range(1, TAMANHO_VOCABULARIO_GERAL + 1)))
+
+        def palavra():
+            if aleatorio.random() < PROPORCAO_DOMINIO:
+                return aleatorio.choice(VOCABULARIO)
+            return aleatorio.choices(gerais, cum_weights=pesos_acumulados)[0]
+
+        def frase(palavras):
+            return ' '.join(palavra() for _ in range(palavras))
+
+        with banco_temporario():
+            colaborador = Usuario.objects.create(username='bench_colab', codigo_suporte=200001, tipo_usuario='colaborador')
+            departamento = Departamento.objects.create(nome='TI')
+            # bulk_create não dispara signals: o índice é montado de uma vez no final
+            chamados = Chamado.objects.bulk_create(
+                Chamado(titulo=frase(5), descricao=frase(20), departamento=departamento,
+                        usuario=colaborador, id_legivel=f'TKT-{i:07d}')
+                for i in range(options['chamados'])
+            )
+            for inicio in range(0, options['mensagens'], 10000):
+                InteracaoChamado.objects.bulk_create(
+                    InteracaoChamado(chamado=aleatorio.choice(chamados), remetente='usuario', mensagem=frase(15))
+                    for _ in range(min(10000, options['mensagens'] - inicio))
+                )
+
+            motor = motor_busca()
+            inicio = time.perf_counter()
+            motor.reconstruir()
+            self.stdout.write(
+                f"{type(motor).__name__}: {options['chamados']} chamados + {options['mensagens']} mensagens "
+                f"indexados em {time.perf_counter() - inicio:.1f}s"
+            )
+
+            for consulta in CONSULTAS:
+                melhor, mediana = cronometrar(lambda: motor.buscar(consulta, tamanho=20), options['repeticoes'])
+                self.stdout.write(formatar_resultado(f"buscar('{consulta}')", melhor, mediana))
+                melhor, mediana = cronometrar(
+                    lambda: motor.buscar(consulta, usuario_id=colaborador.id_usuario, pagina=5, tamanho=20),
+                    options['repeticoes']
+                )
+                self.stdout.write(formatar_resultado("  colaborador, página 5", melhor, mediana))
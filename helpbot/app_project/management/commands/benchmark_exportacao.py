@@ -0,0 +1,72 @@
+import logging
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from app_project import exportacao
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado
+from ._bench import banco_temporario
+
+LOTE_CRIACAO = 5000
+
+
+def _memoria_residente_mb():
+    """RSS atual (Linux: /proc/self/statm); fora do Linux, o pico do processo"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = 'Mede tempo e memória da exportação em streaming com N mensagens (banco temporário)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mensagens', type=int, default=1000000)
+        parser.add_argument('--chamados', type=int, default=50000)
+        parser.add_argument('--formato', choices=exportacao.FORMATOS, default='csv')
+        parser.add_argument('--gzip', action='store_true')
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+
+        # DEBUG=False: o log de SQL do DEBUG guardaria os INSERTs gigantes e mascararia a medição
+        with override_settings(DEBUG=False), banco_temporario():
+            colaborador = Usuario.objects.create(username='bench_colab', codigo_suporte=200001, tipo_usuario='colaborador')
+            departamento = Departamento.objects.create(nome='TI')
+            ids = []
+            for inicio in range(0, options['chamados'], LOTE_CRIACAO):
+                ids += [chamado.pk for chamado in Chamado.objects.bulk_create(
+                    Chamado(titulo=f'Chamado {i}', descricao='Descrição gerada para benchmark',
+                            departamento=departamento, usuario=colaborador, id_legivel=f'TKT-{i:07d}')
+                    for i in range(inicio, min(inicio + LOTE_CRIACAO, options['chamados']))
+                )]
+            for inicio in range(0, options['mensagens'], LOTE_CRIACAO):
+                InteracaoChamado.objects.bulk_create(
+                    InteracaoChamado(chamado_id=ids[i % len(ids)], remetente='usuario',
+                                     mensagem=f'Mensagem {i} do benchmark de exportação')
+                    for i in range(inicio, min(inicio + LOTE_CRIACAO, options['mensagens']))
+                )
+
+            memoria_inicial = _memoria_residente_mb()
+            pico = memoria_inicial
+            total = 0
+            inicio = time.perf_counter()
+            for numero, bloco in enumerate(exportacao.exportar(Chamado.objects.all(), options['formato'], True, options['gzip'])):
+                total += len(bloco)
+                if numero % 50 == 0:
+                    pico = max(pico, _memoria_residente_mb())
+            duracao = time.perf_counter() - inicio
+
+            self.stdout.write(
+                f"{options['chamados']} chamados + {options['mensagens']} mensagens ({options['formato']}"
+                f"{', gzip' if options['gzip'] else ''}): {total / 1024 / 1024:.1f} MB em {duracao:.1f}s "
+                f"({options['mensagens'] / duracao:,.0f} mensagens/s)"
+            )
+            self.stdout.write(
+                f"memória residente: antes={memoria_inicial:.0f} MB  pico={pico:.0f} MB  "
+                f"crescimento={pico - memoria_inicial:.0f} MB"
+            )
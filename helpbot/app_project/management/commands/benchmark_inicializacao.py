@@ -0,0 +1,77 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Executado em um processo novo por medição: importa o wsgi.py como o servidor faria
+SCRIPT_PROCESSO = r'''
+import json, os, sys, time
+inicio = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatAI_project.settings')
+from django.conf import settings
+settings.AQUECIMENTO_AO_INICIAR = {aquecer}
+settings.AQUECIMENTO_VIEWS = {views}
+settings.LOGGING_CONFIG = None
+from chatAI_project.wsgi import application
+pronto = time.perf_counter()
+from django.test import Client
+cliente = Client()
+cliente.get('/', HTTP_HOST='localhost')
+primeira = time.perf_counter()
+cliente.get('/api/dados-grafico/', HTTP_HOST='localhost')
+estatisticas = time.perf_counter()
+print(json.dumps({{
+    'inicializacao': pronto - inicio,
+    'primeira': primeira - pronto,
+    'estatisticas': estatisticas - primeira,
+    'modulos': len(sys.modules),
+}}))
+'''
+
+TODOS = ('base', 'autenticacao', 'chamados', 'chat', 'notificacoes', 'suporte', 'estatisticas')
+
+
+class Command(BaseCommand):
+    help = 'Mede a inicialização do worker (import + setup + aquecimento) e o tempo até a primeira resposta'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticoes', type=int, default=5, help='Processos por cenário')
+
+    def handle(self, *args, **options):
+        cenarios = [
+            ('sem aquecimento (views sob demanda)', False, ()),
+            ('aquecimento padrão (AQUECIMENTO_VIEWS)', True, tuple(settings.AQUECIMENTO_VIEWS)),
+            ('aquecimento com todas as views', True, TODOS),
+        ]
+        medicoes = {nome: [] for nome, _, _ in cenarios}
+        # Cenários intercalados: variação da máquina afeta todos igualmente
+        for _ in range(options['repeticoes']):
+            for nome, aquecer, views in cenarios:
+                medicoes[nome].append(self._medir(aquecer, views))
+
+        self.stdout.write(f"Inicialização de worker ({options['repeticoes']} processos por cenário, medianas)")
+        for nome, _, _ in cenarios:
+            resultados = medicoes[nome]
+
+            def mediana(campo):
+                return statistics.median(resultado[campo] for resultado in resultados) * 1000
+
+            total = mediana('inicializacao') + mediana('primeira')
+            self.stdout.write(
+                f"{nome:<42} inicialização={mediana('inicializacao'):7.1f}ms  "
+                f"primeira resposta={mediana('primeira'):6.1f}ms  até servir={total:7.1f}ms  "
+                f"1ª estatística={mediana('estatisticas'):6.1f}ms  "
+                f"módulos={int(statistics.median(r['modulos'] for r in resultados))}"
+            )
+
+    def _medir(self, aquecer, views):
+        script = SCRIPT_PROCESSO.format(aquecer=aquecer, views=repr(views))
+        saida = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=settings.BASE_DIR, env=dict(os.environ), capture_output=True, text=True, check=True,
+        )
+        return json.loads(saida.stdout.strip().splitlines()[-1])
@@ -0,0 +1,124 @@
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from app_project import views
+from app_project.log_estruturado import FiltroAmostragem, HandlerFila
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado, Notificacao
+from ._bench import banco_temporario, cronometrar, formatar_resultado
+
+
+def _configurar(raiz, handler):
+    for anterior in list(raiz.handlers):
+        raiz.removeHandler(anterior)
+    if handler is not None:
+        raiz.addHandler(handler)
+
+
+class Command(BaseCommand):
+    help = 'Mede o custo do log na thread da requisição: console síncrono x fila assíncrona + JSON + amostragem'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requisicoes', type=int, default=300)
+        parser.add_argument('--chamadas', type=int, default=20000, help='Chamadas de log no micro-benchmark')
+        parser.add_argument('--repeticoes', type=int, default=3)
+        parser.add_argument('--saida', default=os.devnull, help='Destino das linhas (arquivo ou /dev/stderr)')
+
+    def handle(self, *args, **options):
+        raiz = logging.getLogger()
+        handlers_originais = list(raiz.handlers)
+        nivel_original = raiz.level
+        raiz.setLevel(logging.INFO)
+
+        with open(options['saida'], 'w') as saida:
+            console = logging.StreamHandler(saida)
+            fila = HandlerFila(stream=saida)
+            fila.addFilter(FiltroAmostragem(getattr(settings, 'LOG_AMOSTRAGEM', {})))
+            configuracoes = [
+                ('sem saída (NullHandler)', logging.NullHandler()),
+                ('console síncrono (anterior)', console),
+                ('fila + JSON + amostragem', fila),
+            ]
+            try:
+                self._micro(raiz, configuracoes, options)
+                with banco_temporario(), override_settings(DEBUG=False):
+                    self._requisicoes(raiz, configuracoes, options)
+            finally:
+                fila.parar()
+                _configurar(raiz, None)
+                for handler in handlers_originais:
+                    raiz.addHandler(handler)
+                raiz.setLevel(nivel_original)
+
+    def _micro(self, raiz, configuracoes, options):
+        chamadas = options['chamadas']
+        logger = logging.getLogger('app_project.views')
+        logger_frequente = logging.getLogger('app_project.views.frequente')
+        usuario, tipo = 'bench_suporte', 'suporte'
+
+        def anterior():
+            # Padrão antigo das views: f-string montada na chamada
+            for _ in range(chamadas):
+                logger.info(f"Dashboard carregado para {usuario} (tipo: {tipo})")
+
+        def atual():
+            for _ in range(chamadas):
+                logger_frequente.info("Dashboard carregado para %s (tipo: %s)", usuario, tipo)
+
+        self.stdout.write(f'Chamada de log na thread da requisição ({chamadas} chamadas)')
+        for nome, handler in configuracoes[1:]:
+            _configurar(raiz, handler)
+            funcao = atual if isinstance(handler, HandlerFila) else anterior
+            melhor, mediana = cronometrar(funcao, options['repeticoes'])
+            self.stdout.write(formatar_resultado(nome, melhor, mediana, chamadas))
+
+    def _requisicoes(self, raiz, configuracoes, options):
+        suporte = Usuario.objects.create(username='bench_suporte', codigo_suporte=100001, tipo_usuario='suporte')
+        colaborador = Usuario.objects.create(username='bench_colab', codigo_suporte=200001, tipo_usuario='colaborador')
+        departamento = Departamento.objects.create(nome='TI')
+        chamado = Chamado.objects.create(
+            titulo='Computador não liga', descricao='Computador não liga desde ontem',
+            departamento=departamento, usuario=colaborador, nome_solicitante='Bench'
+        )
+        InteracaoChamado.objects.bulk_create(
+            InteracaoChamado(chamado=chamado, remetente='bot' if i % 2 else 'usuario', mensagem=f'Mensagem {i}')
+            for i in range(30)
+        )
+        Notificacao.objects.create(usuario=suporte, chamado=chamado, mensagem='Novo chamado', tipo='novo_chamado_broadcast')
+
+        fabrica = RequestFactory()
+        sessoes = {}
+        for usuario in (suporte, colaborador):
+            sessao = SessionStore()
+            sessao['usuario_id'] = str(usuario.id_usuario)
+            sessao.save()
+            sessoes[usuario.pk] = sessao.session_key
+
+        def requisicao(usuario, view, *argumentos):
+            def executar():
+                # IP diferente por requisição: o rate limit das views não entra na medição
+                cache.clear()
+                for i in range(options['requisicoes']):
+                    request = fabrica.get('/', REMOTE_ADDR=f'10.0.{i // 250}.{i % 250 + 1}')
+                    request.session = SessionStore(session_key=sessoes[usuario.pk])
+                    view(request, *argumentos)
+            return executar
+
+        casos = [
+            ('dashboard', requisicao(suporte, views.dashboard)),
+            ('verificar_novas_mensagens_inteligente', requisicao(
+                colaborador, views.verificar_novas_mensagens_inteligente, str(chamado.id_chamado)
+            )),
+        ]
+        for caso, funcao in casos:
+            self.stdout.write(f'{caso} ({options["requisicoes"]} requisições)')
+            for nome, handler in configuracoes:
+                _configurar(raiz, handler)
+                melhor, mediana = cronometrar(funcao, options['repeticoes'])
+                self.stdout.write(formatar_resultado(nome, melhor, mediana, options['requisicoes']))
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+
+from app_project import views, views_async
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado, Notificacao
+from ._bench import banco_temporario
+
+
+class MonitorThreads:
+    """Amostra threading.active_count() para registrar o pico durante a carga"""
+
+    def __init__(self):
+        self.pico = threading.active_count()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+
+    def _amostrar(self):
+        while not self._parar.wait(0.001):
+            self.pico = max(self.pico, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+
+
+class Command(BaseCommand):
+    help = 'Compara os endpoints de polling sync x async com N clientes simultâneos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clientes', type=int, default=200)
+        parser.add_argument('--requisicoes', type=int, default=5, help='Requisições por cliente')
+        parser.add_argument('--threads', type=int, default=16, help='Threads do worker sync (simula gunicorn --threads)')
+
+    def handle(self, *args, **options):
+        # Os logs INFO das views dominariam o tempo medido
+        logging.disable(logging.INFO)
+        with banco_temporario():
+            requisicoes = self._preparar_dados()
+            for nome, fabrica in requisicoes:
+                self.stdout.write(nome)
+                self._medir(nome, fabrica, options)
+
+    def _preparar_dados(self):
+        suporte = Usuario.objects.create(username='bench_suporte', codigo_suporte=100001, tipo_usuario='suporte')
+        colaborador = Usuario.objects.create(username='bench_colab', codigo_suporte=200001, tipo_usuario='colaborador')
+        departamento = Departamento.objects.create(nome='TI')
+        chamados = [
+            Chamado.objects.create(
+                titulo=f'Chamado {i}', descricao='Computador não liga',
+                departamento=departamento, usuario=colaborador, nome_solicitante='Bench'
+            )
+            for i in range(20)
+        ]
+        InteracaoChamado.objects.bulk_create(
+            InteracaoChamado(chamado=chamados[0], remetente='usuario', mensagem=f'Mensagem {i}')
+            for i in range(50)
+        )
+        Notificacao.objects.bulk_create(
+            Notificacao(usuario=suporte, chamado=chamado, mensagem='Novo chamado', tipo='novo_chamado_broadcast')
+            for chamado in chamados
+        )
+
+        sessoes = {}
+        for usuario in (suporte, colaborador):
+            sessao = SessionStore()
+            sessao['usuario_id'] = str(usuario.id_usuario)
+            sessao.save()
+            sessoes[usuario.pk] = sessao.session_key
+
+        fabrica = RequestFactory()
+
+        def requisicao(usuario, caminho='/'):
+            def criar():
+                request = fabrica.get(caminho)
+                request.session = SessionStore(session_key=sessoes[usuario.pk])
+                return request
+            return criar
+
+        id_chamado = str(chamados[0].id_chamado)
+        return [
+            ('verificar_notificacoes', (requisicao(suporte), ())),
+            ('verificar_novas_mensagens_inteligente', (requisicao(colaborador), (id_chamado,))),
+            ('verificar_status_chamado', (requisicao(colaborador), (id_chamado,))),
+            ('verificar_chamados_abertos_para_suporte', (requisicao(suporte), ())),
+        ]
+
+    def _medir(self, nome, fabrica, options):
+        criar_request, argumentos = fabrica
+        total = options['clientes'] * options['requisicoes']
+        view_sync = getattr(views, nome)
+        view_async = getattr(views_async, nome)
+
+        # Sync: cada cliente ocupa uma thread do pool enquanto é atendido
+        def cliente_sync(_):
+            for _ in range(options['requisicoes']):
+                view_sync(criar_request(), *argumentos)
+            connections.close_all()
+
+        with MonitorThreads() as monitor, ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            inicio = time.perf_counter()
+            list(executor.map(cliente_sync, range(options['clientes'])))
+            duracao_sync = time.perf_counter() - inicio
+        pico_sync = monitor.pico
+
+        # Async: todos os clientes ficam abertos ao mesmo tempo no mesmo event loop
+        async def cliente_async():
+            for _ in range(options['requisicoes']):
+                await view_async(criar_request(), *argumentos)
+
+        async def carga():
+            await asyncio.gather(*(cliente_async() for _ in range(options['clientes'])))
+
+        with MonitorThreads() as monitor:
+            inicio = time.perf_counter()
+            asyncio.run(carga())
+            duracao_async = time.perf_counter() - inicio
+        pico_async = monitor.pico
+
+        for rotulo, duracao, pico in (('sync ', duracao_sync, pico_sync), ('async', duracao_async, pico_async)):
+            self.stdout.write(
+                f"  {rotulo} {total / duracao:8.0f} req/s  total={duracao:6.2f}s  "
+                f"clientes_simultaneos={options['threads'] if rotulo == 'sync ' else options['clientes']}  "
+                f"pico_threads={pico}"
+            )
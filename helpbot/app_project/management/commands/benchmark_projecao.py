@@ -0,0 +1,112 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app_project.models import Usuario, Departamento, Chamado
+from app_project.projecao import ProjecaoChamados, projetar_chamados, CAMPOS_CHAMADO
+from ._bench import banco_temporario, cronometrar, datas_manuais, formatar_resultado
+
+LOTE_CRIACAO = 5000
+
+# Mesmos campos da linha de todos_chamados.html, nas duas versões
+TEMPLATE_ANTERIOR = (
+    "{% for chamado in chamados %}{{ chamado.id_legivel }}|{{ chamado.titulo }}|{{ chamado.get_nome_exibicao }}|"
+    "{{ chamado.departamento.nome }}|{{ chamado.get_status_display }}|{{ chamado.get_urgencia_display }}|"
+    "{{ chamado.get_modalidade_display }}|{{ chamado.criado_em|date:'d/m/Y H:i' }}\n{% endfor %}"
+)
+TEMPLATE_ATUAL = (
+    "{% for chamado in chamados %}{{ chamado.id_legivel }}|{{ chamado.titulo }}|{{ chamado.nome_exibicao }}|"
+    "{{ chamado.departamento_nome }}|{{ chamado.status_display }}|{{ chamado.urgencia_display }}|"
+    "{{ chamado.modalidade_display }}|{{ chamado.criado_em|date:'d/m/Y H:i' }}\n{% endfor %}"
+)
+
+
+def _resumo_anterior(chamados):
+    """Loop anterior das views de chamados abertos/pendentes (objetos do modelo)"""
+    dados = []
+    for chamado in chamados:
+        hora_local = timezone.localtime(chamado.criado_em)
+        dados.append({
+            'chamado_id': str(chamado.id_chamado),
+            'chamado_legivel': chamado.id_legivel,
+            'titulo': chamado.titulo,
+            'nome_solicitante': chamado.nome_solicitante,
+            'departamento': chamado.departamento.nome,
+            'urgencia': chamado.get_urgencia_display(),
+            'urgencia_valor': chamado.urgencia,
+            'status': chamado.get_status_display(),
+            'criado_em': hora_local.strftime('%d/%m/%Y %H:%M'),
+            'tempo_decorrido': chamado.tempo_decorrido,
+        })
+    return dados
+
+
+class Command(BaseCommand):
+    help = 'Listas de chamados: objetos do modelo x projeção values_list + LinhaChamado (__slots__)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=10000)
+        parser.add_argument('--repeticoes', type=int, default=3)
+
+    def handle(self, *args, **options):
+        linhas = options['linhas']
+        repeticoes = options['repeticoes']
+        aleatorio = random.Random(49)
+        agora = timezone.now()
+
+        with banco_temporario():
+            solicitante = Usuario.objects.create(username='bench_colab', codigo_suporte=200001, tipo_usuario='colaborador')
+            departamentos = [Departamento.objects.create(nome=f'Departamento {i}') for i in range(7)]
+            with datas_manuais((Chamado, 'criado_em')):
+                for inicio in range(0, linhas, LOTE_CRIACAO):
+                    Chamado.objects.bulk_create([
+                        Chamado(
+                            titulo=f'Chamado benchmark {i}',
+                            descricao='Descrição gerada para benchmark',
+                            nome_solicitante='' if i % 10 == 0 else f'Solicitante {i % 50}',
+                            usuario=solicitante,
+                            departamento=departamentos[i % len(departamentos)],
+                            modalidade_presencial=bool(i % 2),
+                            urgencia=('baixa', 'media', 'urgente')[i % 3],
+                            status='resolvido' if i % 4 == 0 else 'em_andamento',
+                            criado_em=agora - timedelta(minutes=aleatorio.uniform(0, 30 * 1440)),
+                            id_legivel=f'TKT-{i:06d}',
+                        )
+                        for i in range(inicio, min(inicio + LOTE_CRIACAO, linhas))
+                    ])
+
+            consulta = Chamado.objects.order_by('-criado_em')
+            anterior = engines['django'].from_string(TEMPLATE_ANTERIOR)
+            atual = engines['django'].from_string(TEMPLATE_ATUAL)
+
+            casos = [
+                ('JSON: objetos do modelo (anterior)',
+                 lambda: _resumo_anterior(consulta.select_related('departamento'))),
+                ('JSON: projeção + resumo()',
+                 lambda: [linha.resumo() for linha in projetar_chamados(consulta.values_list(*CAMPOS_CHAMADO))]),
+                ('template: objetos do modelo (anterior)',
+                 lambda: anterior.render({'chamados': consulta.select_related('departamento')})),
+                ('template: ProjecaoChamados',
+                 lambda: atual.render({'chamados': ProjecaoChamados(consulta)})),
+            ]
+
+            self.stdout.write(f'{linhas} chamados, {repeticoes} repetições')
+            for nome, funcao in casos:
+                with CaptureQueriesContext(connection) as consultas:
+                    funcao()
+                melhor, mediana = cronometrar(funcao, repeticoes)
+                self.stdout.write(formatar_resultado(nome, melhor, mediana, linhas) + f'  consultas={len(consultas)}')
+
+            # Mesmo JSON; tempo_decorrido fica de fora (o anterior lia o relógio a cada linha)
+            def sem_tempo(dados):
+                return [{chave: valor for chave, valor in item.items() if chave != 'tempo_decorrido'} for item in dados]
+
+            iguais = sem_tempo(_resumo_anterior(consulta.select_related('departamento'))) == sem_tempo(
+                linha.resumo() for linha in projetar_chamados(consulta.values_list(*CAMPOS_CHAMADO))
+            )
+            self.stdout.write(f'JSON idêntico ao anterior: {iguais}')
@@ -0,0 +1,76 @@
+import html
+import re
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils.html import strip_tags
+
+from app_project.security import security
+from ._bench import cronometrar, formatar_resultado
+
+
+def _sanitize_legado(text, max_length=500):
+    """sanitize_input original (strip_tags + escape + corte), mantido apenas como referência de comparação"""
+    if not text:
+        return ""
+    clean_text = html.escape(strip_tags(str(text)))
+    if len(clean_text) > max_length:
+        clean_text = clean_text[:max_length]
+    return clean_text.strip()
+
+
+def _validate_uuid_legado(uuid_string):
+    uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
+    return bool(uuid_pattern.match(str(uuid_string)))
+
+
+def _aninhado(tamanho):
+    """'<<<b>b>b>': o strip_tags do Django remove uma camada por passada do HTMLParser"""
+    texto = ''
+    for _ in range(tamanho):
+        texto = '<' + texto + 'b>'
+    return texto
+
+
+def entradas(tamanho):
+    """(nome, texto) - um caso comum e os casos maliciosos"""
+    return [
+        ('comum', 'Olá <b>equipe</b>, a impressora do 2º andar & o scanner pararam. ' * 4),
+        ('tags em excesso', '<script>alert(1)</script>' * tamanho),
+        ('tags aninhadas', _aninhado(tamanho)),
+        ("'<' soltos", '< ' * tamanho * 4 + '>'),
+        ("'<a' após o último '>'", '>' + '<a' * tamanho * 2),
+        ('comentários abertos', '<!--' * tamanho + '>'),
+        ("'&' em excesso", '&' * tamanho * 10),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compara o sanitizador/validador de entradas com a implementação anterior em entradas maliciosas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanho', type=int, default=1000, help='Repetições do padrão em cada entrada maliciosa')
+        parser.add_argument('--repeticoes', type=int, default=3)
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+
+        self.stdout.write('sanitize_input (max_length=500)')
+        for nome, texto in entradas(options['tamanho']):
+            legado = _sanitize_legado(texto)
+            novo = security.sanitize_input(texto)
+            for versao, funcao in (('legado', _sanitize_legado), ('novo', security.sanitize_input)):
+                melhor, mediana = cronometrar(lambda: funcao(texto), repeticoes)
+                self.stdout.write(formatar_resultado(f'{nome} [{len(texto)}] ({versao})', melhor, mediana))
+            # Divergências esperadas só em HTML malformado (o resultado continua escapado)
+            self.stdout.write(f"  mesmo resultado: {'sim' if legado == novo else 'não'}")
+
+        self.stdout.write('validate_uuid (10000 chamadas)')
+        casos_uuid = [
+            ('uuid válido', str(uuid.uuid4())),
+            ('texto longo', 'a' * 10000),
+        ]
+        for nome, valor in casos_uuid:
+            for versao, funcao in (('legado', _validate_uuid_legado), ('novo', security.validate_uuid)):
+                melhor, mediana = cronometrar(lambda: [funcao(valor) for _ in range(10000)], repeticoes)
+                self.stdout.write(formatar_resultado(f'{nome} ({versao})', melhor, mediana, 10000))
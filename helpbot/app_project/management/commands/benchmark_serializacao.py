@@ -0,0 +1,97 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado, Notificacao
+from app_project.serializacao import serializar_notificacoes, serializar_interacoes
+from ._bench import banco_temporario, cronometrar, formatar_resultado
+
+
+def _notificacoes_legado(queryset):
+    """Loop original das views, mantido apenas como referência de comparação"""
+    dados = []
+    for notificacao in queryset:
+        hora_local = timezone.localtime(notificacao.criado_em)
+        dados.append({
+            'id': str(notificacao.id_notificacao),
+            'mensagem': notificacao.mensagem,
+            'chamado_id': str(notificacao.chamado.id_chamado) if notificacao.chamado else None,
+            'chamado_legivel': notificacao.chamado.id_legivel if notificacao.chamado else 'N/A',
+            'hora': hora_local.strftime('%H:%M'),
+            'data_completa': hora_local.strftime('%d/%m/%Y %H:%M'),
+            'tipo': notificacao.tipo,
+            'lida': notificacao.lida,
+            'timestamp': notificacao.criado_em.timestamp(),
+        })
+    return dados
+
+
+def _interacoes_legado(queryset):
+    dados = []
+    for interacao in queryset:
+        hora_local = timezone.localtime(interacao.criado_em)
+        dados.append({
+            'id': str(interacao.id_interacao),
+            'remetente': interacao.remetente,
+            'mensagem': interacao.mensagem,
+            'hora': hora_local.strftime('%H:%M'),
+            'acao_bot': interacao.acao_bot,
+            'suporte_responsavel': interacao.suporte_responsavel.username if interacao.suporte_responsavel else None
+        })
+    return dados
+
+
+class Command(BaseCommand):
+    help = 'Compara o custo por linha da serialização de notificações/interações (legado x values_list)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=2000)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        linhas = options['linhas']
+        repeticoes = options['repeticoes']
+
+        with banco_temporario():
+            suporte = Usuario.objects.create(username='bench_suporte', codigo_suporte=100001, tipo_usuario='suporte')
+            departamento = Departamento.objects.create(nome='TI')
+            chamados = [
+                Chamado.objects.create(
+                    titulo=f'Chamado benchmark {i}',
+                    descricao='Descrição gerada para benchmark',
+                    departamento=departamento,
+                    usuario=suporte,
+                )
+                for i in range(max(1, linhas // 20))
+            ]
+            Notificacao.objects.bulk_create([
+                Notificacao(usuario=suporte, chamado=chamados[i % len(chamados)], mensagem=f'Notificação {i}')
+                for i in range(linhas)
+            ])
+            InteracaoChamado.objects.bulk_create([
+                InteracaoChamado(
+                    chamado=chamados[0],
+                    remetente='suporte' if i % 2 else 'bot',
+                    mensagem=f'Mensagem {i}',
+                    suporte_responsavel=suporte if i % 2 else None,
+                )
+                for i in range(linhas)
+            ])
+
+            notificacoes = Notificacao.objects.filter(usuario=suporte).order_by('-criado_em')
+            interacoes = InteracaoChamado.objects.filter(chamado=chamados[0]).order_by('criado_em')
+
+            casos = [
+                ('notificacoes (legado)', lambda: _notificacoes_legado(notificacoes.all())),
+                ('notificacoes (serializacao)', lambda: serializar_notificacoes(notificacoes.all())),
+                ('interacoes (legado)', lambda: _interacoes_legado(interacoes.all())),
+                ('interacoes (serializacao)', lambda: serializar_interacoes(interacoes.all())),
+            ]
+
+            self.stdout.write(f'{linhas} linhas por caso, {repeticoes} repetições')
+            for nome, funcao in casos:
+                with CaptureQueriesContext(connection) as consultas:
+                    funcao()
+                melhor, mediana = cronometrar(funcao, repeticoes)
+                self.stdout.write(formatar_resultado(nome, melhor, mediana, linhas) + f'  consultas={len(consultas)}')
@@ -0,0 +1,97 @@
+import logging
+import random
+import statistics
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from app_project import sla
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado
+from ._bench import banco_temporario, cronometrar, datas_manuais, formatar_resultado
+
+LOTE_CRIACAO = 5000
+
+
+def _sla_em_python():
+    """Abordagem ingênua: percorre os objetos do ORM e agrupa em dicts"""
+    grupos = defaultdict(list)
+    chamados = Chamado.objects.select_related('departamento', 'suporte_responsavel').prefetch_related('interacoes')
+    for chamado in chamados:
+        respostas = [i.criado_em for i in chamado.interacoes.all() if i.remetente == 'suporte']
+        if respostas:
+            minutos = (min(respostas) - chamado.criado_em).total_seconds() / 60
+            grupos[('departamento', chamado.departamento.nome)].append(minutos)
+            grupos[('urgencia', chamado.urgencia)].append(minutos)
+            if chamado.suporte_responsavel:
+                grupos[('suporte', chamado.suporte_responsavel.username)].append(minutos)
+    return {
+        chave: statistics.quantiles(valores, n=100)
+        for chave, valores in grupos.items() if len(valores) > 1
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compara as métricas de SLA em NumPy com um laço Python sobre o ORM (banco temporário)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chamados', type=int, default=100000)
+        parser.add_argument('--repeticoes', type=int, default=3)
+        parser.add_argument('--sem-python', action='store_true', help='Não mede a abordagem ingênua (lenta)')
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+        aleatorio = random.Random(39)
+        total = options['chamados']
+
+        with override_settings(DEBUG=False), banco_temporario():
+            departamentos = [Departamento.objects.create(nome=nome) for nome in ('TI', 'RH', 'Financeiro', 'Vendas')]
+            suportes = [
+                Usuario.objects.create(username=f'bench_suporte_{i}', codigo_suporte=300000 + i, tipo_usuario='suporte')
+                for i in range(20)
+            ]
+            agora = timezone.now()
+
+            with datas_manuais((Chamado, 'criado_em'), (InteracaoChamado, 'criado_em')):
+                for inicio in range(0, total, LOTE_CRIACAO):
+                    chamados = []
+                    for i in range(inicio, min(inicio + LOTE_CRIACAO, total)):
+                        criado_em = agora - timedelta(minutes=aleatorio.uniform(0, 90 * 1440))
+                        resolvido = aleatorio.random() < 0.7
+                        chamados.append(Chamado(
+                            titulo=f'Chamado {i}', descricao='Benchmark de SLA', id_legivel=f'TKT-{i:07d}',
+                            departamento=aleatorio.choice(departamentos),
+                            urgencia=aleatorio.choice(('baixa', 'media', 'urgente')),
+                            suporte_responsavel=aleatorio.choice(suportes),
+                            status='resolvido' if resolvido else 'em_andamento',
+                            criado_em=criado_em, atualizado_em=criado_em,
+                            data_resolucao=criado_em + timedelta(minutes=aleatorio.expovariate(1 / 600)) if resolvido else None,
+                        ))
+                    Chamado.objects.bulk_create(chamados)
+                    InteracaoChamado.objects.bulk_create(
+                        InteracaoChamado(
+                            chamado=chamado, remetente=remetente, mensagem='Mensagem do benchmark',
+                            criado_em=chamado.criado_em + timedelta(minutes=atraso),
+                        )
+                        for chamado in chamados
+                        for remetente, atraso in (('usuario', 0), ('suporte', aleatorio.expovariate(1 / 45)))
+                    )
+
+            self.stdout.write(f"{total} chamados, {total * 2} mensagens")
+            melhor, mediana = cronometrar(lambda: sla.colunas('todos'), options['repeticoes'])
+            self.stdout.write(formatar_resultado('consulta colunar (values_list)', melhor, mediana, total))
+            melhor, mediana = cronometrar(lambda: sla.calcular('todos'), options['repeticoes'])
+            self.stdout.write(formatar_resultado('sla.calcular (consulta + NumPy)', melhor, mediana, total))
+
+            dados = sla.colunas('todos')
+            codigos, chaves = dados['suporte']
+            melhor, mediana = cronometrar(
+                lambda: sla.percentis_por_grupo(codigos, dados['primeira_resposta'], len(chaves)), options['repeticoes']
+            )
+            self.stdout.write(formatar_resultado('percentis por grupo (só NumPy)', melhor, mediana, total))
+
+            if not options['sem_python']:
+                melhor, mediana = cronometrar(_sla_em_python, 1)
+                self.stdout.write(formatar_resultado('laço Python sobre o ORM', melhor, mediana, total))
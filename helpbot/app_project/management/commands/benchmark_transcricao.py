@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app_project.models import Usuario, Departamento, Chamado, InteracaoChamado
+from app_project.serializacao import serializar_interacoes
+from app_project.transcricoes import transcricoes
+from ._bench import banco_temporario, cronometrar, formatar_resultado
+
+
+class Command(BaseCommand):
+    help = 'Abertura do chat: transcrição montada do banco x cache de transcrições (acerto e anexação)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanhos', type=int, nargs='+', default=[50, 500, 2000], help='Mensagens por chamado')
+        parser.add_argument('--repeticoes', type=int, default=5)
+        parser.add_argument('--anexacoes', type=int, default=200, help='Mensagens novas anexadas no último caso')
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+        with banco_temporario():
+            cache.clear()
+            suporte = Usuario.objects.create(username='bench_suporte', codigo_suporte=100001, tipo_usuario='suporte')
+            departamento = Departamento.objects.create(nome='TI')
+
+            for tamanho in options['tamanhos']:
+                chamado = Chamado.objects.create(
+                    titulo=f'Chamado com {tamanho} mensagens', descricao='Descrição gerada para benchmark',
+                    departamento=departamento, usuario=suporte,
+                )
+                InteracaoChamado.objects.bulk_create([
+                    InteracaoChamado(
+                        chamado=chamado,
+                        remetente='suporte' if i % 2 else 'bot',
+                        mensagem=f'Mensagem {i}',
+                        suporte_responsavel=suporte if i % 2 else None,
+                    )
+                    for i in range(tamanho)
+                ])
+                interacoes = InteracaoChamado.objects.filter(chamado=chamado).order_by('criado_em')
+                transcricoes.mensagens(chamado.pk)
+
+                casos = [
+                    ('banco + serialização (anterior)', lambda: serializar_interacoes(interacoes.all())),
+                    ('cache de transcrições (acerto)', lambda: transcricoes.mensagens(chamado.pk)),
+                ]
+                self.stdout.write(f'Chamado com {tamanho} mensagens ({repeticoes} repetições)')
+                for nome, funcao in casos:
+                    with CaptureQueriesContext(connection) as consultas:
+                        funcao()
+                    melhor, mediana = cronometrar(funcao, repeticoes)
+                    self.stdout.write(formatar_resultado(nome, melhor, mediana) + f'  consultas={len(consultas)}')
+
+            # Mensagem nova: entra na lista em cache em vez de invalidá-la
+            anexacoes = options['anexacoes']
+            # Gravadas sem signals: a anexação é medida isolada, como no on_commit do post_save
+            novas = InteracaoChamado.objects.bulk_create([
+                InteracaoChamado(chamado=chamado, remetente='usuario', mensagem=f'Nova {i}')
+                for i in range(anexacoes)
+            ])
+
+            def anexar():
+                for interacao in novas:
+                    transcricoes.anexar(interacao)
+
+            melhor, mediana = cronometrar(anexar, 1)
+            self.stdout.write(f'Anexação no chamado de {tamanho} mensagens ({anexacoes} mensagens novas)')
+            self.stdout.write(formatar_resultado('anexar (por mensagem)', melhor, mediana, anexacoes))
+            em_cache = [mensagem['id'] for mensagem in transcricoes.mensagens(chamado.pk)]
+            do_banco = [mensagem['id'] for mensagem in serializar_interacoes(interacoes.all())]
+            correto = len(em_cache) == len(do_banco) and set(em_cache) == set(do_banco)
+            self.stdout.write(f'transcrição em cache igual à do banco: {correto}')
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_project.assinantes import contadores_do_dia
+from app_project.eventos import despachar_lote, pendentes, TAMANHO_LOTE
+from app_project.models import EventoDominio
+
+
+class Command(BaseCommand):
+    help = 'Entrega os eventos de domínio pendentes no outbox (recuperação ou despachante dedicado)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help='Fica em loop consultando o outbox')
+        parser.add_argument('--intervalo', type=float, default=2.0, help='Segundos entre consultas no modo contínuo')
+        parser.add_argument('--lote', type=int, default=TAMANHO_LOTE)
+        parser.add_argument('--limpar-dias', type=int, default=None,
+                            help='Remove eventos já processados há mais de N dias')
+        parser.add_argument('--estatisticas', action='store_true', help='Mostra os contadores de eventos de hoje')
+
+    def handle(self, *args, **options):
+        if options['estatisticas']:
+            for tipo, total in contadores_do_dia().items():
+                self.stdout.write(f"{tipo:20} {total}")
+            self.stdout.write(f"{'pendentes':20} {pendentes().count()}")
+            return
+
+        if options['limpar_dias'] is not None:
+            limite = timezone.now() - timedelta(days=options['limpar_dias'])
+            removidos, _ = EventoDominio.objects.filter(processado_em__lt=limite).delete()
+            self.stdout.write(f"{removidos} eventos processados removidos")
+
+        while True:
+            total = 0
+            while True:
+                selecionados, processados = despachar_lote(options['lote'])
+                total += processados
+                if selecionados < options['lote']:
+                    break
+            if total:
+                self.stdout.write(f"{total} eventos entregues")
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
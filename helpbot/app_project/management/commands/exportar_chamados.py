@@ -0,0 +1,53 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_project import exportacao
+from app_project.filtros import filtrar_chamados
+
+
+class Command(BaseCommand):
+    help = 'Exporta chamados e transcrições em streaming (CSV/JSONL, gzip opcional), com memória constante'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--formato', choices=exportacao.FORMATOS, default='csv')
+        parser.add_argument('--saida', help='Arquivo de destino (padrão: stdout)')
+        parser.add_argument('--sem-transcricao', action='store_true', help='Só os chamados, sem as mensagens')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--mes', help='AAAA-MM (dump mensal)')
+        # Mesmos filtros da tela "todos os chamados"
+        parser.add_argument('--periodo', default='todos', choices=['todos', 'hoje', 'semana', 'mes', 'trimestre'])
+        parser.add_argument('--urgencia', default='todos')
+        parser.add_argument('--departamento', default='todos')
+        parser.add_argument('--status', default='todos')
+        parser.add_argument('--busca', default='')
+
+    def handle(self, *args, **options):
+        chamados_query, filtros_ativos = filtrar_chamados(options)
+        if options['mes']:
+            try:
+                chamados_query = exportacao.filtrar_mes(chamados_query, options['mes'])
+            except ValueError:
+                raise CommandError('Mês inválido (use AAAA-MM).')
+
+        blocos = exportacao.exportar(
+            chamados_query, options['formato'], not options['sem_transcricao'], options['gzip']
+        )
+        inicio = time.perf_counter()
+        total = 0
+        destino = open(options['saida'], 'wb') if options['saida'] else sys.stdout.buffer
+        try:
+            for bloco in blocos:
+                destino.write(bloco)
+                total += len(bloco)
+        finally:
+            if options['saida']:
+                destino.close()
+            else:
+                destino.flush()
+
+        ativos = {chave: valor for chave, valor in filtros_ativos.items() if valor not in ('todos', '')}
+        self.stderr.write(
+            f"{total / 1024 / 1024:.1f} MB exportados em {time.perf_counter() - inicio:.1f}s (filtros: {ativos or 'nenhum'})"
+        )
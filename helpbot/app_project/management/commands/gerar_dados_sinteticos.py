@@ -0,0 +1,338 @@
+import bisect
+import itertools
+import random
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import signals
+from django.utils import timezone
+
+from app_project.models import (
+    ConfirmacaoResolucao, Chamado, Departamento, InteracaoChamado, Notificacao, Usuario, PRIORIDADE_URGENCIA,
+)
+from app_project.versoes import incrementar_versao
+from ._bench import datas_manuais
+
+# Prefixos que identificam os dados gerados (usados também pelo --limpar)
+PREFIXO_SUPORTE = 'sint_sup_'
+PREFIXO_COLABORADOR = 'sint_col_'
+PREFIXO_CHAMADO = 'SIN-'
+
+DEPARTAMENTOS = ('Atendimento', 'Vendas', 'Marketing', 'TI', 'Recursos Humanos', 'Financeiro', 'Operações')
+PESOS_DEPARTAMENTO = (10, 8, 5, 40, 12, 15, 10)
+
+PROBLEMAS = (
+    'Computador não liga', 'Sistema fora do ar', 'Erro ao emitir nota fiscal', 'Impressora com papel preso',
+    'Senha expirada', 'VPN não conecta', 'E-mail não sincroniza', 'Dúvida sobre férias', 'Acesso bloqueado ao ERP',
+    'Planilha corrompida', 'Sugestão de melhoria no portal', 'Monitor piscando', 'Consulta sobre reembolso',
+    'Queda da rede no andar', 'Teclado quebrado', 'Relatório com valores errados', 'Lentidão no CRM',
+    'Orientação para cadastro de cliente', 'Certificado digital vencido', 'Telefone sem linha',
+)
+COMPLEMENTOS = (
+    'desde hoje cedo', 'após a atualização de ontem', 'só acontece na minha máquina', 'afeta toda a equipe',
+    'já reiniciei e continua', 'precisamos resolver antes do fechamento', 'aparece uma mensagem de erro',
+    'acontece de forma intermitente',
+)
+FRASES_USUARIO = (
+    'Continua acontecendo.', 'Reiniciei como pediu, mas não resolveu.', 'Agora funcionou, obrigado!',
+    'Consegue verificar com prioridade?', 'Segue o print do erro.', 'Ok, aguardo o retorno.',
+)
+FRASES_SUPORTE = (
+    'Olá! Já estou verificando o seu chamado.', 'Pode reiniciar o equipamento e testar novamente?',
+    'Identificamos o problema e aplicamos a correção.', 'Consegue me enviar um print da tela?',
+    'Vou encaminhar para a equipe responsável.', 'Acesso liberado, por favor confirme.',
+)
+FRASES_BOT = (
+    ('saudacao', 'Olá! Recebemos o seu chamado e já avisamos a equipe de suporte.'),
+    ('verificacao_tempo', 'Seu chamado continua em andamento. Em breve um técnico responde.'),
+)
+
+# Fluxo de atendimento: horário comercial pesa mais (índice = hora do dia)
+PESOS_HORA = (1, 1, 1, 1, 1, 2, 4, 8, 14, 16, 16, 14, 10, 14, 16, 15, 12, 8, 5, 3, 2, 2, 1, 1)
+PESO_FIM_DE_SEMANA = 0.2
+
+# Minutos médios até a primeira resposta e até a resolução, por urgência
+MINUTOS_RESPOSTA = {'urgente': 10, 'media': 45, 'baixa': 180}
+MINUTOS_RESOLUCAO = {'urgente': 120, 'media': 600, 'baixa': 2400}
+
+PESOS_SATISFACAO = (5, 5, 15, 35, 40)
+
+
+@contextmanager
+def sinais_desligados(*lista):
+    """Desconecta temporariamente todos os receivers (cache, índice de busca, long-poll)"""
+    guardados = [(sinal, sinal.receivers) for sinal in lista]
+    for sinal, _ in guardados:
+        sinal.receivers = []
+        sinal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for sinal, receivers in guardados:
+            sinal.receivers = receivers
+            sinal.sender_receivers_cache.clear()
+
+
+def _distribuir(total, quantidade, aleatorio, minimo=0):
+    """
+    Divide `total` em `quantidade` partes com cauda longa (poucos chamados com
+    muitas mensagens), somando exatamente o total
+    """
+    if not quantidade:
+        return array('I')
+    livre = max(total - minimo * quantidade, 0)
+    pesos = [aleatorio.expovariate(1.0) for _ in range(quantidade)]
+    escala = livre / sum(pesos)
+    partes = array('I', (minimo + int(peso * escala) for peso in pesos))
+    for indice in range(total - sum(partes)):
+        partes[indice % quantidade] += 1
+    return partes
+
+
+class Gerador:
+    """Gera os objetos de forma determinística a partir da semente"""
+
+    def __init__(self, semente, referencia, dias):
+        self.aleatorio = random.Random(semente)
+        self.referencia = referencia
+        self.dias = dias
+        self._horas_acumuladas = list(itertools.accumulate(PESOS_HORA))
+
+    def uuid(self):
+        return uuid.UUID(int=self.aleatorio.getrandbits(128), version=4)
+
+    def momento_abertura(self):
+        """Dia útil com mais probabilidade; hora conforme o horário comercial"""
+        aleatorio = self.aleatorio
+        while True:
+            dia = self.referencia - timedelta(days=aleatorio.randint(1, self.dias))
+            if dia.weekday() < 5 or aleatorio.random() < PESO_FIM_DE_SEMANA:
+                break
+        hora = bisect.bisect_right(self._horas_acumuladas, aleatorio.random() * self._horas_acumuladas[-1])
+        return dia.replace(hour=hora, minute=aleatorio.randrange(60), second=aleatorio.randrange(60))
+
+    def minutos(self, media):
+        return timedelta(minutes=self.aleatorio.lognormvariate(0, 0.8) * media)
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera dados sintéticos realistas (usuários, chamados, mensagens, notificações e confirmações) '
+        'em escala configurável e de forma determinística pela semente'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semente', type=int, default=42)
+        parser.add_argument('--suportes', type=int, default=1000)
+        parser.add_argument('--colaboradores', type=int, default=20000)
+        parser.add_argument('--chamados', type=int, default=500000)
+        parser.add_argument('--interacoes', type=int, default=5000000)
+        parser.add_argument('--notificacoes', type=int, default=1000000)
+        parser.add_argument('--taxa-confirmacao', type=float, default=0.6,
+                            help='Fração dos chamados resolvidos com confirmação do colaborador')
+        parser.add_argument('--dias', type=int, default=365, help='Histórico coberto pelos chamados')
+        parser.add_argument('--referencia', help='Fim do histórico, exclusivo (AAAA-MM-DD); padrão: hoje')
+        parser.add_argument('--lote', type=int, default=5000, help='Chamados por transação/bulk_create')
+        parser.add_argument('--limpar', action='store_true', help='Remove os dados sintéticos gerados antes')
+        parser.add_argument('--reindexar', action='store_true',
+                            help='Ao final, reconstrói o índice de busca e a consolidação de volume')
+
+    def handle(self, *args, **options):
+        if options['referencia']:
+            try:
+                referencia = datetime.strptime(options['referencia'], '%Y-%m-%d')
+            except ValueError:
+                raise CommandError('Data de referência inválida (use AAAA-MM-DD)')
+        else:
+            referencia = datetime.combine(timezone.localdate(), datetime.min.time())
+        referencia = timezone.make_aware(referencia)
+
+        sinais = (signals.pre_save, signals.post_save, signals.pre_delete, signals.post_delete)
+        inicio = time.perf_counter()
+        with sinais_desligados(*sinais):
+            if options['limpar']:
+                self._limpar()
+            elif Usuario.objects.filter(username__startswith=PREFIXO_SUPORTE).exists():
+                raise CommandError('Já existem dados sintéticos; use --limpar para gerar de novo')
+
+            gerador = Gerador(options['semente'], referencia, options['dias'])
+            with datas_manuais(
+                (Usuario, 'criado_em'), (Chamado, 'criado_em'), (Chamado, 'atualizado_em'),
+                (InteracaoChamado, 'criado_em'), (Notificacao, 'criado_em'),
+                (ConfirmacaoResolucao, 'data_confirmacao'),
+            ):
+                departamentos = self._departamentos()
+                suportes, colaboradores = self._usuarios(gerador, options, referencia)
+                totais = self._chamados(gerador, options, departamentos, suportes, colaboradores)
+
+        # Os bulk_create não disparam os signals de invalidação
+        incrementar_versao('chamados')
+
+        self.stdout.write(
+            f"Gerados {len(suportes)} suportes, {len(colaboradores)} colaboradores, {totais['chamados']} chamados, "
+            f"{totais['interacoes']} interações, {totais['notificacoes']} notificações e "
+            f"{totais['confirmacoes']} confirmações em {time.perf_counter() - inicio:.1f}s"
+        )
+
+        if options['reindexar']:
+            from app_project import volume
+            from app_project.busca import motor_busca
+
+            etapa = time.perf_counter()
+            motor_busca().reconstruir()
+            volume.reconstruir()
+            self.stdout.write(f"Índice de busca e consolidação de volume reconstruídos em {time.perf_counter() - etapa:.1f}s")
+        else:
+            self.stdout.write("Rode reindexar_busca e reconstruir_volume para incluir os dados gerados")
+
+    def _limpar(self):
+        # CASCADE remove mensagens, notificações e confirmações junto com os chamados
+        removidos, _ = Chamado.objects.filter(id_legivel__startswith=PREFIXO_CHAMADO).delete()
+        removidos += Usuario.objects.filter(username__startswith='sint_').delete()[0]
+        self.stdout.write(f"Removidos {removidos} registros sintéticos anteriores")
+
+    def _departamentos(self):
+        departamentos = []
+        for nome in DEPARTAMENTOS:
+            departamento, _ = Departamento.objects.get_or_create(nome=nome, defaults={'descricao': f'Departamento {nome}'})
+            departamentos.append(departamento.pk)
+        return departamentos
+
+    def _usuarios(self, gerador, options, referencia):
+        inicio_historico = referencia - timedelta(days=options['dias'])
+
+        def criar(quantidade, prefixo, tipo, codigo_base):
+            usuarios = [
+                Usuario(
+                    id_usuario=gerador.uuid(), username=f"{prefixo}{numero:06d}", tipo_usuario=tipo,
+                    codigo_suporte=codigo_base + numero, criado_em=inicio_historico,
+                )
+                for numero in range(quantidade)
+            ]
+            Usuario.objects.bulk_create(usuarios, batch_size=options['lote'])
+            return [usuario.pk for usuario in usuarios]
+
+        return (
+            criar(options['suportes'], PREFIXO_SUPORTE, 'suporte', 900000),
+            criar(options['colaboradores'], PREFIXO_COLABORADOR, 'colaborador', 1000000),
+        )
+
+    def _chamados(self, gerador, options, departamentos, suportes, colaboradores):
+        aleatorio = gerador.aleatorio
+        total = options['chamados']
+        mensagens_por_chamado = _distribuir(options['interacoes'], total, aleatorio, minimo=1)
+        notificacoes_por_chamado = _distribuir(options['notificacoes'], total, aleatorio)
+        departamentos_acumulados = list(itertools.accumulate(PESOS_DEPARTAMENTO))
+        satisfacao_acumulada = list(itertools.accumulate(PESOS_SATISFACAO))
+        totais = dict.fromkeys(('chamados', 'interacoes', 'notificacoes', 'confirmacoes'), 0)
+
+        for inicio_lote in range(0, total, options['lote']):
+            chamados, interacoes, notificacoes, confirmacoes = [], [], [], []
+            for numero in range(inicio_lote, min(inicio_lote + options['lote'], total)):
+                criado_em = gerador.momento_abertura()
+                titulo = aleatorio.choice(PROBLEMAS)
+                indice_colaborador = aleatorio.randrange(len(colaboradores))
+                colaborador = colaboradores[indice_colaborador]
+                suporte = aleatorio.choice(suportes)
+                chamado = Chamado(
+                    id_chamado=gerador.uuid(),
+                    id_legivel=f"{PREFIXO_CHAMADO}{numero:08d}",
+                    titulo=titulo,
+                    descricao=f"{titulo} {aleatorio.choice(COMPLEMENTOS)}.",
+                    nome_solicitante=f"{PREFIXO_COLABORADOR}{indice_colaborador:06d}",
+                    departamento_id=departamentos[bisect.bisect_right(
+                        departamentos_acumulados, aleatorio.random() * departamentos_acumulados[-1]
+                    )],
+                    modalidade_presencial=aleatorio.random() < 0.6,
+                    usuario_id=colaborador,
+                    suporte_responsavel_id=suporte,
+                    visualizado_suporte=True,
+                    criado_em=criado_em,
+                )
+                chamado.urgencia = chamado.determinar_urgencia()
+                chamado.prioridade = PRIORIDADE_URGENCIA[chamado.urgencia]
+
+                resolucao = criado_em + gerador.minutos(MINUTOS_RESOLUCAO[chamado.urgencia])
+                if resolucao < gerador.referencia:
+                    chamado.status = 'resolvido'
+                    chamado.data_resolucao = resolucao
+                chamado.atualizado_em = chamado.data_resolucao or criado_em
+                chamados.append(chamado)
+
+                interacoes += self._mensagens(gerador, chamado, mensagens_por_chamado[numero], suporte)
+                notificacoes += self._notificacoes(gerador, chamado, notificacoes_por_chamado[numero], suporte)
+
+                if chamado.status == 'resolvido' and aleatorio.random() < options['taxa_confirmacao']:
+                    confirmacoes.append(ConfirmacaoResolucao(
+                        id_confirmacao=gerador.uuid(),
+                        chamado_id=chamado.pk,
+                        confirmado_por_id=colaborador,
+                        data_confirmacao=chamado.data_resolucao + gerador.minutos(60),
+                        satisfacao=bisect.bisect_right(
+                            satisfacao_acumulada, aleatorio.random() * satisfacao_acumulada[-1]
+                        ) + 1,
+                    ))
+
+            with transaction.atomic():
+                Chamado.objects.bulk_create(chamados)
+                InteracaoChamado.objects.bulk_create(interacoes, batch_size=options['lote'])
+                Notificacao.objects.bulk_create(notificacoes, batch_size=options['lote'])
+                ConfirmacaoResolucao.objects.bulk_create(confirmacoes, batch_size=options['lote'])
+
+            totais['chamados'] += len(chamados)
+            totais['interacoes'] += len(interacoes)
+            totais['notificacoes'] += len(notificacoes)
+            totais['confirmacoes'] += len(confirmacoes)
+            self.stdout.write(f"  {totais['chamados']}/{total} chamados, {totais['interacoes']} interações")
+        return totais
+
+    def _mensagens(self, gerador, chamado, quantidade, suporte):
+        """Abertura do colaborador, saudação do bot e conversa alternada até a resolução"""
+        aleatorio = gerador.aleatorio
+        momento = chamado.criado_em
+        fim = chamado.data_resolucao or gerador.referencia
+        mensagens = []
+        for ordem in range(quantidade):
+            if ordem == 0:
+                remetente, texto, acao = 'usuario', chamado.descricao, None
+            elif ordem == 1:
+                remetente, (acao, texto) = 'bot', FRASES_BOT[0]
+                momento += timedelta(seconds=aleatorio.randint(1, 5))
+            else:
+                remetente = 'suporte' if ordem % 2 == 0 else 'usuario'
+                texto = aleatorio.choice(FRASES_SUPORTE if remetente == 'suporte' else FRASES_USUARIO)
+                acao = None
+                atraso = MINUTOS_RESPOSTA[chamado.urgencia] if ordem == 2 else 20
+                momento = min(momento + gerador.minutos(atraso), fim)
+            mensagens.append(InteracaoChamado(
+                id_interacao=gerador.uuid(),
+                chamado_id=chamado.pk,
+                remetente=remetente,
+                mensagem=texto,
+                acao_bot=acao,
+                suporte_responsavel_id=suporte if remetente == 'suporte' else None,
+                visualizada_automatica=chamado.status == 'resolvido',
+                criado_em=momento,
+            ))
+        return mensagens
+
+    def _notificacoes(self, gerador, chamado, quantidade, suporte):
+        """Primeiro o aviso de novo chamado ao suporte; depois atualizações ao colaborador"""
+        notificacoes = []
+        for ordem in range(quantidade):
+            novo = ordem == 0
+            notificacoes.append(Notificacao(
+                id_notificacao=gerador.uuid(),
+                usuario_id=suporte if novo else chamado.usuario_id,
+                chamado_id=chamado.pk,
+                tipo='novo_chamado' if novo else 'atualizacao',
+                mensagem=f"Novo chamado {chamado.id_legivel}" if novo else f"Chamado {chamado.id_legivel} atualizado",
+                lida=chamado.status == 'resolvido' or gerador.aleatorio.random() < 0.5,
+                criado_em=chamado.criado_em + timedelta(minutes=ordem * 15),
+            ))
+        return notificacoes
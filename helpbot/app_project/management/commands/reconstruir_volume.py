@@ -0,0 +1,37 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app_project import volume
+
+
+def _data(texto):
+    try:
+        return timezone.make_aware(datetime.strptime(texto, '%Y-%m-%d'))
+    except ValueError:
+        raise CommandError(f"Data inválida (use AAAA-MM-DD): {texto}")
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói a consolidação de volume de chamados (por hora e por dia) a partir do histórico'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help='Primeiro dia (AAAA-MM-DD); padrão: chamado mais antigo')
+        parser.add_argument('--ate', help='Último dia, inclusive (AAAA-MM-DD); padrão: hoje')
+        parser.add_argument('--dias', type=int, help='Atalho para os últimos N dias')
+
+    def handle(self, *args, **options):
+        desde = _data(options['desde']) if options['desde'] else None
+        ate = _data(options['ate']) + timedelta(days=1) if options['ate'] else None
+        if options['dias']:
+            ate = volume.inicio_dia(timezone.now()) + timedelta(days=1)
+            desde = ate - timedelta(days=options['dias'])
+
+        def progresso(inicio, fim):
+            self.stdout.write(f"  {timezone.localtime(inicio):%Y-%m-%d} → {timezone.localtime(fim):%Y-%m-%d}")
+
+        inicio = time.perf_counter()
+        dias = volume.reconstruir(desde, ate, progresso=progresso)
+        self.stdout.write(f"Consolidação de {dias} dias reconstruída em {time.perf_counter() - inicio:.1f}s")
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_project.busca import motor_busca
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca textual (chamados + mensagens do chat)'
+
+    def handle(self, *args, **options):
+        motor = motor_busca()
+        inicio = time.perf_counter()
+        motor.reconstruir()
+        self.stdout.write(f"Índice {type(motor).__name__} reconstruído em {time.perf_counter() - inicio:.1f}s")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from app_project import agrupamento
+
+
+class Command(BaseCommand):
+    help = 'Junta as notificações não lidas de chamados de baixa urgência num resumo por usuário (rodar periodicamente, ex: cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--idade', type=int, default=30, help='Só notificações mais velhas que N minutos (padrão: 30)')
+
+    def handle(self, *args, **options):
+        resumos, removidas = agrupamento.resumir(options['idade'])
+        self.stdout.write(f"{removidas} notificações juntadas em {resumos} resumos")
@@ -0,0 +1,74 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Arquivos com hash no nome nunca mudam: o navegador pode guardar por 1 ano
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+CACHE_PADRAO = 'public, max-age=3600'
+
+# Ordem de preferência das variantes pré-comprimidas geradas no collectstatic
+VARIANTES_COMPRIMIDAS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class EstaticosPrecomprimidosMiddleware:
+    """
+    Serve o STATIC_ROOT já minificado, com hash e pré-comprimido (.br/.gz).
+    Nenhuma compressão acontece por requisição. Se o arquivo não existir
+    a requisição segue normalmente.
+
+    Desligado com DEBUG=True: um collectstatic antigo deixaria o STATIC_ROOT
+    (que também guarda cópias sem hash) escondendo as edições em static/.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG:
+            raise MiddlewareNotUsed('Estáticos pré-comprimidos só fora do DEBUG')
+        self.get_response = get_response
+        self.prefixo = settings.STATIC_URL or ''
+        self.raiz = str(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+        self.nomes_com_hash = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if (self.raiz and self.prefixo and request.method in ('GET', 'HEAD')
+                and request.path.startswith(self.prefixo)):
+            resposta = self._servir(request, request.path[len(self.prefixo):])
+            if resposta is not None:
+                return resposta
+        return self.get_response(request)
+
+    def _servir(self, request, nome):
+        try:
+            caminho = safe_join(self.raiz, nome)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(caminho):
+            return None
+
+        estatisticas = os.stat(caminho)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), estatisticas.st_mtime):
+            return HttpResponseNotModified()
+
+        tipo, _ = mimetypes.guess_type(caminho)
+        codificacao, caminho_servido = self._escolher_variante(request, caminho)
+
+        resposta = FileResponse(open(caminho_servido, 'rb'), content_type=tipo or 'application/octet-stream')
+        resposta['Last-Modified'] = http_date(estatisticas.st_mtime)
+        resposta['Cache-Control'] = CACHE_IMUTAVEL if nome in self.nomes_com_hash else CACHE_PADRAO
+        resposta['Vary'] = 'Accept-Encoding'
+        if codificacao:
+            resposta['Content-Encoding'] = codificacao
+        return resposta
+
+    def _escolher_variante(self, request, caminho):
+        aceitas = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        for codificacao, sufixo in VARIANTES_COMPRIMIDAS:
+            if codificacao in aceitas and os.path.isfile(caminho + sufixo):
+                return codificacao, caminho + sufixo
+        return None, caminho
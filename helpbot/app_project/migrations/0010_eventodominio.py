@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-19 00:56
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0009_notificacao_broadcast_notificacao_broadcast_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoDominio',
+            fields=[
+                ('id_evento', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('chamado_criado', 'Chamado Criado'), ('status_alterado', 'Status Alterado'), ('mensagem_enviada', 'Mensagem Enviada'), ('controle_assumido', 'Controle Assumido')], max_length=30)),
+                ('dados', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('processado_em', models.DateTimeField(blank=True, null=True)),
+                ('tentativas', models.PositiveSmallIntegerField(default=0)),
+                ('ultimo_erro', models.TextField(blank=True, default='')),
+                ('chamado', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos', to='app_project.chamado')),
+            ],
+            options={
+                'verbose_name': 'Evento de Domínio',
+                'verbose_name_plural': 'Eventos de Domínio',
+                'db_table': 'eventos_dominio',
+                'ordering': ['criado_em'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eventodominio',
+            index=models.Index(fields=['processado_em', 'criado_em'], name='evento_pendente_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-19 00:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def preencher_prioridade(apps, schema_editor):
+    Chamado = apps.get_model('app_project', 'Chamado')
+    for urgencia, prioridade in (('urgente', 0), ('media', 1), ('baixa', 2)):
+        Chamado.objects.filter(urgencia=urgencia).update(prioridade=prioridade)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0010_eventodominio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chamado',
+            name='prioridade',
+            field=models.PositiveSmallIntegerField(default=1, verbose_name='Prioridade na Fila'),
+        ),
+        migrations.AddField(
+            model_name='chamado',
+            name='reserva_expira_em',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Reserva expira em'),
+        ),
+        migrations.AddField(
+            model_name='chamado',
+            name='reservado_por',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chamados_reservados', to='app_project.usuario', verbose_name='Reservado por'),
+        ),
+        migrations.RunPython(preencher_prioridade, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='chamado',
+            index=models.Index(fields=['status', 'prioridade', 'criado_em'], name='chamado_fila_idx'),
+        ),
+    ]
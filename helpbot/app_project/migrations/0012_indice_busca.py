@@ -0,0 +1,89 @@
+# Índice de busca textual: FTS5 no SQLite, tsvector + GIN no PostgreSQL.
+# Em outros bancos (ou SQLite sem FTS5) nada é criado e a busca usa LIKE.
+
+import html
+import itertools
+import unicodedata
+
+from django.db import migrations, OperationalError, transaction
+
+REMETENTES_INDEXADOS = ('usuario', 'suporte')
+
+
+def _remover_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _documentos(apps):
+    Chamado = apps.get_model('app_project', 'Chamado')
+    InteracaoChamado = apps.get_model('app_project', 'InteracaoChamado')
+    for id_chamado, usuario_id, titulo, descricao in Chamado.objects.values_list(
+        'id_chamado', 'usuario_id', 'titulo', 'descricao'
+    ).iterator():
+        yield (id_chamado.hex, id_chamado.hex, usuario_id.hex if usuario_id else '', 'chamado',
+               html.unescape(f"{titulo}\n{descricao}"))
+    for id_interacao, chamado_id, usuario_id, mensagem in InteracaoChamado.objects.filter(
+        remetente__in=REMETENTES_INDEXADOS
+    ).values_list('id_interacao', 'chamado_id', 'chamado__usuario_id', 'mensagem').iterator():
+        yield (id_interacao.hex, chamado_id.hex, usuario_id.hex if usuario_id else '', 'mensagem',
+               html.unescape(mensagem or ''))
+
+
+def _inserir_em_lotes(conexao, sql, documentos, tamanho=2000):
+    with conexao.cursor() as cursor:
+        while True:
+            lote = list(itertools.islice(documentos, tamanho))
+            if not lote:
+                break
+            cursor.executemany(sql, lote)
+
+
+def criar_indice(apps, schema_editor):
+    conexao = schema_editor.connection
+    if conexao.vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=conexao.alias):
+                schema_editor.execute(
+                    "CREATE VIRTUAL TABLE busca_textos USING fts5("
+                    "documento UNINDEXED, chamado UNINDEXED, usuario UNINDEXED, tipo UNINDEXED, texto, "
+                    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+                )
+        except OperationalError:
+            # SQLite compilado sem FTS5 (ou < 3.27): a busca cai no LIKE
+            return
+        _inserir_em_lotes(
+            conexao,
+            "INSERT INTO busca_textos (documento, chamado, usuario, tipo, texto) VALUES (%s, %s, %s, %s, %s)",
+            _documentos(apps)
+        )
+    elif conexao.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE busca_textos ("
+            "documento varchar(32) PRIMARY KEY, chamado varchar(32) NOT NULL, "
+            "usuario varchar(32) NOT NULL DEFAULT '', tipo varchar(10) NOT NULL, "
+            "texto text NOT NULL, vetor tsvector NOT NULL)"
+        )
+        schema_editor.execute("CREATE INDEX busca_textos_vetor_idx ON busca_textos USING GIN (vetor)")
+        schema_editor.execute("CREATE INDEX busca_textos_chamado_idx ON busca_textos (chamado)")
+        _inserir_em_lotes(
+            conexao,
+            "INSERT INTO busca_textos (documento, chamado, usuario, tipo, texto, vetor) "
+            "VALUES (%s, %s, %s, %s, %s, to_tsvector('portuguese', %s))",
+            (documento + (_remover_acentos(documento[4]),) for documento in _documentos(apps))
+        )
+
+
+def remover_indice(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS busca_textos")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0011_fila_atendimento'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
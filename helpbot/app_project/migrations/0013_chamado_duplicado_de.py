@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-19 01:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0012_indice_busca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chamado',
+            name='duplicado_de',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicados', to='app_project.chamado', verbose_name='Duplicado de'),
+        ),
+    ]
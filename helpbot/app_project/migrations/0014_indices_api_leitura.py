@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-19 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0013_chamado_duplicado_de'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chamado',
+            index=models.Index(fields=['criado_em'], name='chamado_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chamado',
+            index=models.Index(fields=['status', 'criado_em'], name='chamado_status_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chamado',
+            index=models.Index(fields=['usuario', 'criado_em'], name='chamado_usuario_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interacaochamado',
+            index=models.Index(fields=['chamado', 'criado_em'], name='interacao_chamado_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interacaochamado',
+            index=models.Index(fields=['criado_em'], name='interacao_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(fields=['usuario', 'criado_em'], name='notificacao_usuario_criado_idx'),
+        ),
+    ]
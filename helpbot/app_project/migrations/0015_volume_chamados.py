@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 01:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0014_indices_api_leitura'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolumeChamados',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularidade', models.CharField(choices=[('hora', 'Hora'), ('dia', 'Dia')], max_length=4)),
+                ('inicio', models.DateTimeField(verbose_name='Início do intervalo')),
+                ('urgencia', models.CharField(choices=[('baixa', 'Baixa'), ('media', 'Média'), ('urgente', 'Urgente')], max_length=10)),
+                ('status', models.CharField(choices=[('em_andamento', 'Em Andamento'), ('resolvido', 'Resolvido')], max_length=15)),
+                ('criados', models.PositiveIntegerField(default=0)),
+                ('resolvidos', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Volume de Chamados',
+                'verbose_name_plural': 'Volume de Chamados',
+                'db_table': 'volume_chamados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='chamado',
+            index=models.Index(fields=['status', 'data_resolucao'], name='chamado_resolucao_idx'),
+        ),
+        migrations.AddField(
+            model_name='volumechamados',
+            name='departamento',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='volumes', to='app_project.departamento'),
+        ),
+        migrations.AddConstraint(
+            model_name='volumechamados',
+            constraint=models.UniqueConstraint(fields=('granularidade', 'inicio', 'departamento', 'urgencia', 'status'), name='volume_chamados_unico'),
+        ),
+    ]
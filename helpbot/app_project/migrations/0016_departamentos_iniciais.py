@@ -0,0 +1,31 @@
+# Departamentos iniciais (antes criados por criar_departamentos_iniciais() a cada página)
+
+from django.db import migrations
+
+DEPARTAMENTOS_INICIAIS = [
+    ('Atendimento', 'Departamento de Atendimento'),
+    ('Vendas', 'Departamento de Vendas'),
+    ('Marketing', 'Departamento de Marketing'),
+    ('TI', 'Tecnologia da Informação'),
+    ('Recursos Humanos', 'Departamento de RH'),
+    ('Financeiro', 'Departamento Financeiro'),
+    ('Operações', 'Departamento de Operações'),
+]
+
+
+def criar_departamentos(apps, schema_editor):
+    Departamento = apps.get_model('app_project', 'Departamento')
+    for nome, descricao in DEPARTAMENTOS_INICIAIS:
+        Departamento.objects.get_or_create(nome=nome, defaults={'descricao': descricao})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0015_volume_chamados'),
+    ]
+
+    operations = [
+        # Reversão não apaga: os departamentos podem já ter chamados
+        migrations.RunPython(criar_departamentos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-19 02:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0016_departamentos_iniciais'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CursorLeitura',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lido_ate', models.DateTimeField(verbose_name='Lido até')),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('chamado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cursores_leitura', to='app_project.chamado')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cursores_leitura', to='app_project.usuario')),
+            ],
+            options={
+                'verbose_name': 'Cursor de Leitura',
+                'verbose_name_plural': 'Cursores de Leitura',
+                'db_table': 'cursor_leitura',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='cursorleitura',
+            constraint=models.UniqueConstraint(fields=('usuario', 'chamado'), name='cursor_leitura_unico'),
+        ),
+    ]
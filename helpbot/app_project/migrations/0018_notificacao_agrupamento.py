@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-19 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0017_cursor_leitura'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificacao',
+            name='contador',
+            field=models.PositiveIntegerField(default=1, verbose_name='Ocorrências'),
+        ),
+        migrations.AlterField(
+            model_name='notificacao',
+            name='tipo',
+            field=models.CharField(choices=[('novo_chamado', 'Novo Chamado'), ('atualizacao', 'Atualização'), ('mensagem', 'Nova Mensagem'), ('novo_chamado_broadcast', 'Novo Chamado (Broadcast)'), ('sistema_novo_chamado', 'Sistema - Novo Chamado'), ('resumo', 'Resumo')], default='novo_chamado', max_length=30),
+        ),
+        migrations.AddIndex(
+            model_name='notificacao',
+            index=models.Index(fields=['usuario', 'chamado', 'tipo', 'lida'], name='notificacao_agrupamento_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Mapa documento/chamado -> rowid do FTS5 (só SQLite).
+# documento e chamado são UNINDEXED no FTS5: DELETE por eles varre a tabela virtual
+# inteira; com este mapa (tabela comum, com índices) a remoção é feita por rowid.
+
+from django.db import migrations
+
+
+def _tem_indice_fts(conexao):
+    return conexao.vendor == 'sqlite' and 'busca_textos' in conexao.introspection.table_names()
+
+
+def criar_mapa(apps, schema_editor):
+    if not _tem_indice_fts(schema_editor.connection):
+        return
+    schema_editor.execute(
+        "CREATE TABLE busca_documentos ("
+        "id INTEGER PRIMARY KEY, documento varchar(32) NOT NULL UNIQUE, chamado varchar(32) NOT NULL)"
+    )
+    schema_editor.execute("CREATE INDEX busca_documentos_chamado_idx ON busca_documentos (chamado)")
+    # Documentos repetidos (reindexação antiga sem remoção) ficam só com a primeira cópia
+    schema_editor.execute(
+        "DELETE FROM busca_textos WHERE rowid NOT IN (SELECT MIN(rowid) FROM busca_textos GROUP BY documento)"
+    )
+    schema_editor.execute(
+        "INSERT INTO busca_documentos (id, documento, chamado) SELECT rowid, documento, chamado FROM busca_textos"
+    )
+
+
+def remover_mapa(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS busca_documentos")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0018_notificacao_agrupamento'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_mapa, remover_mapa),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-19 02:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0019_busca_documentos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interacaochamado',
+            name='evento',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='interacoes', to='app_project.eventodominio', verbose_name='Evento de origem'),
+        ),
+    ]
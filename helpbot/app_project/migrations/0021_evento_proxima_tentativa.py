@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0020_interacao_evento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventodominio',
+            name='proxima_tentativa_em',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_project', '0021_evento_proxima_tentativa'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interacaochamado',
+            name='acao_bot',
+            field=models.CharField(blank=True, choices=[('saudacao', 'Saudação Inicial'), ('confirmacao', 'Confirmação do Chamado'), ('classificacao', 'Classificação da Urgência'), ('status', 'Atualização de Status'), ('resposta', 'Resposta Automática'), ('verificacao_tempo', 'Verificação de Tempo'), ('verificacao_urgente', 'Verificação Urgente'), ('finalizacao', 'Finalização'), ('notificacao_novo_chamado', 'Notificação Novo Chamado'), ('atualizacao_status', 'Atualização de Status'), ('mensagem', 'Mensagem'), ('inicio', 'Início'), ('intermediacao_ativa', 'Intermediação Ativa'), ('mensagem_fallback', 'Mensagem Fallback'), ('reatribuicao', 'Reatribuição')], max_length=50, null=True, verbose_name='Ação do Bot'),
+        ),
+    ]
@@ -1,9 +1,34 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction, IntegrityError
+import re
 import uuid
 import random
 import string
 from django.utils import timezone
 
+# ✅ Palavras-chave de urgência compiladas uma única vez (uma busca por texto em vez de um loop)
+PALAVRAS_URGENTE = [
+    'urgente', 'crítico', 'critico', 'emergência', 'emergencia', 
+    'parado', 'fora do ar', 'queda', 'não funciona', 'nao funciona',
+    'quebrado', 'prioridade', 'impeditivo', 'bloqueado', 'crash',
+    'erro crítico', 'sistema down', 'indisponível', 'paralisado'
+]
+
+PALAVRAS_BAIXA = [
+    'dúvida', 'duvida', 'consulta', 'informação', 'informacao',
+    'sugestão', 'sugestao', 'melhoria', 'questionamento', 
+    'orientação', 'orientacao', 'curiosidade', 'dica'
+]
+
+REGEX_URGENTE = re.compile('|'.join(re.escape(palavra) for palavra in PALAVRAS_URGENTE))
+REGEX_BAIXA = re.compile('|'.join(re.escape(palavra) for palavra in PALAVRAS_BAIXA))
+
+# Tentativas de sortear um id_legivel livre antes de desistir
+TENTATIVAS_ID_LEGIVEL = 10
+
+# ✅ Ordem da fila de atendimento (menor = atendido primeiro), gravada em Chamado.prioridade
+PRIORIDADE_URGENCIA = {'urgente': 0, 'media': 1, 'baixa': 2}
+
 class Usuario(models.Model):
     id_usuario = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     codigo_suporte = models.IntegerField(verbose_name='Código Suporte')
@@ -92,65 +117,104 @@ class Chamado(models.Model):
     # ID legível para exibição
     id_legivel = models.CharField(max_length=20, unique=True, blank=True, verbose_name='ID Legível')
     
+    # ✅ FILA DE ATENDIMENTO: prioridade indexável e reserva temporária (lease) do suporte
+    prioridade = models.PositiveSmallIntegerField(default=1, verbose_name='Prioridade na Fila')
+    reservado_por = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='chamados_reservados',
+        verbose_name='Reservado por'
+    )
+    reserva_expira_em = models.DateTimeField(null=True, blank=True, verbose_name='Reserva expira em')
+    
+    # ✅ Quase duplicado de um chamado aberto (detectado na criação): não gera novo broadcast
+    duplicado_de = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicados',
+        verbose_name='Duplicado de'
+    )
+    
     def save(self, *args, **kwargs):
         # ✅ CORREÇÃO: Garantir que nome_solicitante seja preenchido
         if not self.nome_solicitante and self.usuario:
             self.nome_solicitante = self.usuario.username
         
-        # Gerar ID legível se não existir
-        if not self.id_legivel:
-            self.id_legivel = self.gerar_id_legivel()
-        
-        # Determinar urgência automaticamente baseada no título
-        if not self.pk:  # Apenas na criação
+        # ✅ CORREÇÃO: pk é UUID com default (nunca vazio) - usar _state.adding para detectar criação
+        if self._state.adding:
+            # Determinar urgência automaticamente baseada no título
             self.urgencia = self.determinar_urgencia()
+        self.prioridade = PRIORIDADE_URGENCIA.get(self.urgencia, 1)
         
-        # Registrar data de resolução se o status mudou para resolvido
-        if self.pk:
-            try:
-                original = Chamado.objects.get(pk=self.pk)
-                if original.status != 'resolvido' and self.status == 'resolvido':
+        if self._state.adding:
+            if not self.id_legivel:
+                return self._inserir_com_id_legivel(*args, **kwargs)
+        else:
+            # Registrar data de resolução se o status mudou para resolvido
+            if self.status == 'resolvido':
+                status_original = Chamado.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+                if status_original is not None and status_original != 'resolvido':
                     self.data_resolucao = timezone.now()
-            except Chamado.DoesNotExist:
-                pass
         
         super().save(*args, **kwargs)
     
-    def gerar_id_legivel(self):
-        """Gera ID legível único"""
-        while True:
-            # ✅ CORREÇÃO: ID mais curto e garantia de unicidade
-            novo_id = f"TKT-{random.randint(10000, 99999)}"
-            if not Chamado.objects.filter(id_legivel=novo_id).exists():
-                return novo_id
+    def _inserir_com_id_legivel(self, *args, **kwargs):
+        """
+        Sorteia o ID legível e deixa a constraint UNIQUE validar (sem SELECT prévio).
+        Em caso de colisão, sorteia outro dentro de um savepoint.
+        """
+        for tentativa in range(TENTATIVAS_ID_LEGIVEL):
+            self.id_legivel = self.sortear_id_legivel()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                colisao = Chamado.objects.filter(id_legivel=self.id_legivel).exists()
+                if not colisao or tentativa == TENTATIVAS_ID_LEGIVEL - 1:
+                    raise
+    
+    def alterar_status(self, novo_status, origem, autor=None, observacao=''):
+        """
+        ✅ Ponto único de mudança de status: grava o chamado e publica StatusAlterado
+        na mesma transação (mensagens do bot e notificações ficam com os assinantes)
+        """
+        from .eventos import publicar, STATUS_ALTERADO
+        
+        status_anterior = self.status
+        with transaction.atomic():
+            self.status = novo_status
+            if novo_status == 'resolvido' and status_anterior != 'resolvido':
+                self.data_resolucao = timezone.now()
+            self.save()
+            publicar(
+                STATUS_ALTERADO, self,
+                status_anterior=status_anterior,
+                status_novo=novo_status,
+                origem=origem,
+                autor_id=autor.id_usuario if autor else None,
+                observacao=observacao,
+            )
+        return status_anterior
+    
+    @staticmethod
+    def sortear_id_legivel():
+        # ✅ CORREÇÃO: ID mais curto; a unicidade é garantida pela constraint do banco
+        return f"TKT-{random.randint(10000, 99999)}"
     
     def determinar_urgencia(self):
-        """Determina urgência automaticamente baseada no título"""
-        titulo_lower = self.titulo.lower()
-        descricao_lower = self.descricao.lower()
-        texto_completo = f"{titulo_lower} {descricao_lower}"
-        
-        # ✅ CORREÇÃO: Palavras-chave mais abrangentes
-        urgent_keywords = [
-            'urgente', 'crítico', 'critico', 'emergência', 'emergencia', 
-            'parado', 'fora do ar', 'queda', 'não funciona', 'nao funciona',
-            'quebrado', 'prioridade', 'impeditivo', 'bloqueado', 'crash',
-            'erro crítico', 'sistema down', 'indisponível', 'paralisado'
-        ]
+        """Determina urgência automaticamente baseada no título e na descrição"""
+        texto_completo = f"{self.titulo} {self.descricao}".lower()
         
-        low_keywords = [
-            'dúvida', 'duvida', 'consulta', 'informação', 'informacao',
-            'sugestão', 'sugestao', 'melhoria', 'questionamento', 
-            'orientação', 'orientacao', 'curiosidade', 'dica'
-        ]
-        
-        for keyword in urgent_keywords:
-            if keyword in texto_completo:
-                return 'urgente'
+        if REGEX_URGENTE.search(texto_completo):
+            return 'urgente'
         
-        for keyword in low_keywords:
-            if keyword in texto_completo:
-                return 'baixa'
+        if REGEX_BAIXA.search(texto_completo):
+            return 'baixa'
         
         return 'media'
     
@@ -166,36 +230,48 @@ class Chamado(models.Model):
         return "Presencial" if self.modalidade_presencial else "Home Office"
     
     def get_urgencia_display(self):
-        for choice in self.URGENCIA_CHOICES:
-            if choice[0] == self.urgencia:
-                return choice[1]
-        return self.urgencia
+        return URGENCIA_DISPLAY.get(self.urgencia, self.urgencia)
     
     def get_status_display(self):
-        for choice in self.STATUS_CHOICES:
-            if choice[0] == self.status:
-                return choice[1]
-        return self.status
+        return STATUS_DISPLAY.get(self.status, self.status)
     
     @property
     def tempo_decorrido(self):
-        diferenca = timezone.now() - self.criado_em
-        dias = diferenca.days
-        horas = diferenca.seconds // 3600
-        minutos = (diferenca.seconds % 3600) // 60
-        
-        if dias > 0:
-            return f"{dias}d {horas}h"
-        elif horas > 0:
-            return f"{horas}h {minutos}min"
-        else:
-            return f"{minutos}min"
+        return formatar_tempo_decorrido(timezone.now() - self.criado_em)
     
     def __str__(self):
         return f"{self.id_legivel} - {self.titulo}"
     
     class Meta:
         ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['status', 'prioridade', 'criado_em'], name='chamado_fila_idx'),
+            # API de leitura: filtros + paginação por cursor em criado_em
+            models.Index(fields=['criado_em'], name='chamado_criado_idx'),
+            models.Index(fields=['status', 'criado_em'], name='chamado_status_criado_idx'),
+            models.Index(fields=['usuario', 'criado_em'], name='chamado_usuario_criado_idx'),
+            # Consolidação de volume: recontagem dos resolvidos numa hora (status='resolvido' + intervalo)
+            models.Index(fields=['status', 'data_resolucao'], name='chamado_resolucao_idx'),
+        ]
+
+# ✅ Rótulos das choices em dicionário (busca direta em vez de percorrer a lista)
+URGENCIA_DISPLAY = dict(Chamado.URGENCIA_CHOICES)
+STATUS_DISPLAY = dict(Chamado.STATUS_CHOICES)
+
+
+def formatar_tempo_decorrido(diferenca):
+    """'2d 3h', '4h 12min' ou '7min' a partir de um timedelta"""
+    dias = diferenca.days
+    horas = diferenca.seconds // 3600
+    minutos = (diferenca.seconds % 3600) // 60
+    
+    if dias > 0:
+        return f"{dias}d {horas}h"
+    elif horas > 0:
+        return f"{horas}h {minutos}min"
+    else:
+        return f"{minutos}min"
+
 
 class InteracaoChamado(models.Model):
     TIPO_REMETENTE = [
@@ -219,6 +295,7 @@ class InteracaoChamado(models.Model):
         ('inicio', 'Início'),
         ('intermediacao_ativa', 'Intermediação Ativa'),
         ('mensagem_fallback', 'Mensagem Fallback'),
+        ('reatribuicao', 'Reatribuição'),
     ]
     
     id_interacao = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -244,8 +321,22 @@ class InteracaoChamado(models.Model):
         verbose_name='Suporte Responsável'
     )
     
+    # ✅ Evento de domínio que gerou a mensagem do bot (re-entrega do evento não a repete)
+    evento = models.ForeignKey(
+        'EventoDominio',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='interacoes',
+        verbose_name='Evento de origem'
+    )
+    
     class Meta:
         ordering = ['criado_em']
+        indexes = [
+            models.Index(fields=['chamado', 'criado_em'], name='interacao_chamado_criado_idx'),
+            models.Index(fields=['criado_em'], name='interacao_criado_idx'),
+        ]
         verbose_name = 'Interação do Chamado'
         verbose_name_plural = 'Interações dos Chamados'
     
@@ -275,6 +366,7 @@ class Notificacao(models.Model):
         ('mensagem', 'Nova Mensagem'),
         ('novo_chamado_broadcast', 'Novo Chamado (Broadcast)'),  # ✅ ADICIONE
         ('sistema_novo_chamado', 'Sistema - Novo Chamado'),  # ✅ ADICIONE
+        ('resumo', 'Resumo'),  # ✅ Resumo periódico (manage.py resumir_notificacoes)
     ]
     
     id_notificacao = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -284,6 +376,8 @@ class Notificacao(models.Model):
     tipo = models.CharField(max_length=30, choices=TIPO_CHOICES, default='novo_chamado')  # ✅ ATUALIZE max_length
     lida = models.BooleanField(default=False)
     criado_em = models.DateTimeField(auto_now_add=True)
+    # ✅ Notificações agrupadas nesta linha (app_project/agrupamento.py); criado_em é a da mais recente
+    contador = models.PositiveIntegerField(default=1, verbose_name='Ocorrências')
     
     # ✅ ADICIONE ESTES CAMPOS PARA BROADCAST:
     broadcast = models.BooleanField(default=False, verbose_name="Notificação Broadcast")
@@ -292,8 +386,104 @@ class Notificacao(models.Model):
     class Meta:
         db_table = 'notificacoes'
         ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['usuario', 'criado_em'], name='notificacao_usuario_criado_idx'),
+            # Agrupamento: última não lida de (usuario, chamado, tipo)
+            models.Index(fields=['usuario', 'chamado', 'tipo', 'lida'], name='notificacao_agrupamento_idx'),
+        ]
         verbose_name = 'Notificação'
         verbose_name_plural = 'Notificações'
     
     def __str__(self):
-        return f"Notificação para {self.usuario.username} - {self.get_tipo_display()}"
\ No newline at end of file
+        return f"Notificação para {self.usuario.username} - {self.get_tipo_display()}"
+
+
+class EventoDominio(models.Model):
+    """Outbox: eventos do ciclo de vida do chamado, gravados na mesma transação da alteração"""
+    TIPO_CHOICES = [
+        ('chamado_criado', 'Chamado Criado'),
+        ('status_alterado', 'Status Alterado'),
+        ('mensagem_enviada', 'Mensagem Enviada'),
+        ('controle_assumido', 'Controle Assumido'),
+    ]
+    
+    id_evento = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tipo = models.CharField(max_length=30, choices=TIPO_CHOICES)
+    chamado = models.ForeignKey(Chamado, on_delete=models.SET_NULL, null=True, blank=True, related_name='eventos')
+    dados = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    processado_em = models.DateTimeField(null=True, blank=True)
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    ultimo_erro = models.TextField(blank=True, default='')
+    # Após uma falha o evento só volta a ser entregue a partir daqui (espera crescente)
+    proxima_tentativa_em = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'eventos_dominio'
+        ordering = ['criado_em']
+        indexes = [
+            models.Index(fields=['processado_em', 'criado_em'], name='evento_pendente_idx'),
+        ]
+        verbose_name = 'Evento de Domínio'
+        verbose_name_plural = 'Eventos de Domínio'
+    
+    def __str__(self):
+        return f"{self.get_tipo_display()} - {self.criado_em.strftime('%d/%m/%Y %H:%M')}"
+
+
+class VolumeChamados(models.Model):
+    """
+    Consolidação (rollup) do volume de chamados por hora e por dia, por
+    departamento/urgência/status. Mantida por app_project/volume.py.
+    """
+    GRANULARIDADE_CHOICES = [
+        ('hora', 'Hora'),
+        ('dia', 'Dia'),
+    ]
+    
+    granularidade = models.CharField(max_length=4, choices=GRANULARIDADE_CHOICES)
+    inicio = models.DateTimeField(verbose_name='Início do intervalo')
+    departamento = models.ForeignKey(Departamento, on_delete=models.CASCADE, related_name='volumes')
+    urgencia = models.CharField(max_length=10, choices=Chamado.URGENCIA_CHOICES)
+    status = models.CharField(max_length=15, choices=Chamado.STATUS_CHOICES)
+    # Chamados criados no intervalo que estão hoje neste status
+    criados = models.PositiveIntegerField(default=0)
+    # Chamados resolvidos no intervalo (só nas linhas com status 'resolvido')
+    resolvidos = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'volume_chamados'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularidade', 'inicio', 'departamento', 'urgencia', 'status'],
+                name='volume_chamados_unico',
+            ),
+        ]
+        verbose_name = 'Volume de Chamados'
+        verbose_name_plural = 'Volume de Chamados'
+    
+    def __str__(self):
+        return f"{self.get_granularidade_display()} {self.inicio:%d/%m/%Y %H:%M} - {self.departamento_id} {self.urgencia}/{self.status}"
+
+
+class CursorLeitura(models.Model):
+    """
+    Até onde cada usuário leu o chat de cada chamado (uma linha por usuário/chamado,
+    gravada com upsert em lote por app_project/leitura.py).
+    """
+    usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name='cursores_leitura')
+    chamado = models.ForeignKey(Chamado, on_delete=models.CASCADE, related_name='cursores_leitura')
+    lido_ate = models.DateTimeField(verbose_name='Lido até')
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'cursor_leitura'
+        constraints = [
+            # O índice da restrição também atende ao LEFT JOIN das contagens de não lidas
+            models.UniqueConstraint(fields=['usuario', 'chamado'], name='cursor_leitura_unico'),
+        ]
+        verbose_name = 'Cursor de Leitura'
+        verbose_name_plural = 'Cursores de Leitura'
+    
+    def __str__(self):
+        return f"{self.usuario_id} - {self.chamado_id} até {self.lido_ate:%d/%m/%Y %H:%M:%S}"
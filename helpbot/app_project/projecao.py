@@ -0,0 +1,126 @@
+"""
+Projeção de chamados para listas (dashboard, todos_chamados, chamados abertos).
+
+As listas instanciavam o modelo Chamado inteiro por linha e, para cada uma,
+percorriam as choices (get_*_display), calculavam tempo_decorrido com um
+timezone.now() próprio e formatavam a data local. Agora:
+
+- values_list com só as colunas exibidas (departamento e solicitante no mesmo JOIN)
+- rótulos das choices por dicionário (URGENCIA_DISPLAY / STATUS_DISPLAY)
+- um único "agora" por lista para o tempo decorrido
+- data local formatada uma vez por minuto (FormatadorHorario)
+- LinhaChamado com __slots__: atributos para os templates, resumo() para o JSON
+"""
+from django.utils import timezone
+
+from .models import URGENCIA_DISPLAY, STATUS_DISPLAY, formatar_tempo_decorrido
+from .serializacao import FormatadorHorario
+
+CAMPOS_CHAMADO = (
+    'id_chamado',
+    'id_legivel',
+    'titulo',
+    'descricao',
+    'nome_solicitante',
+    'usuario__username',
+    'departamento_id',
+    'departamento__nome',
+    'modalidade_presencial',
+    'urgencia',
+    'status',
+    'criado_em',
+)
+
+
+class LinhaChamado:
+    __slots__ = (
+        'id_chamado', 'id_legivel', 'titulo', 'descricao', 'nome_solicitante', 'nome_exibicao',
+        'departamento_id', 'departamento_nome', 'modalidade_presencial', 'modalidade_display',
+        'urgencia', 'urgencia_display', 'status', 'status_display',
+        'criado_em', 'criado_em_local', 'tempo_decorrido',
+    )
+
+    def resumo(self):
+        """Campos comuns dos JSON de listas de chamados"""
+        return {
+            'chamado_id': str(self.id_chamado),
+            'chamado_legivel': self.id_legivel,
+            'titulo': self.titulo,
+            'nome_solicitante': self.nome_solicitante,
+            'departamento': self.departamento_nome,
+            'urgencia': self.urgencia_display,
+            'urgencia_valor': self.urgencia,
+            'status': self.status_display,
+            'criado_em': self.criado_em_local,
+            'tempo_decorrido': self.tempo_decorrido,
+        }
+
+
+def projetar_chamados(linhas, agora=None):
+    """Tuplas de CAMPOS_CHAMADO -> [LinhaChamado]"""
+    agora = agora or timezone.now()
+    formatar = FormatadorHorario()
+    resultado = []
+
+    for (id_chamado, id_legivel, titulo, descricao, nome_solicitante, username, departamento_id,
+         departamento_nome, presencial, urgencia, status, criado_em) in linhas:
+        linha = LinhaChamado()
+        linha.id_chamado = id_chamado
+        linha.id_legivel = id_legivel
+        linha.titulo = titulo
+        linha.descricao = descricao
+        linha.nome_solicitante = nome_solicitante
+        # Mesma regra de Chamado.get_nome_exibicao
+        linha.nome_exibicao = nome_solicitante or username or "Solicitante"
+        linha.departamento_id = departamento_id
+        linha.departamento_nome = departamento_nome
+        linha.modalidade_presencial = presencial
+        linha.modalidade_display = "Presencial" if presencial else "Home Office"
+        linha.urgencia = urgencia
+        linha.urgencia_display = URGENCIA_DISPLAY.get(urgencia, urgencia)
+        linha.status = status
+        linha.status_display = STATUS_DISPLAY.get(status, status)
+        linha.criado_em = criado_em
+        linha.criado_em_local = formatar(criado_em)[1]
+        linha.tempo_decorrido = formatar_tempo_decorrido(agora - criado_em)
+        resultado.append(linha)
+
+    return resultado
+
+
+class ProjecaoChamados:
+    """
+    Queryset de chamados projetado em LinhaChamado, avaliado só quando iterado:
+    fragmentos de template em cache continuam sem consulta. Fatiável (Paginator).
+    """
+
+    def __init__(self, queryset, agora=None):
+        self.queryset = queryset
+        self.agora = agora
+        self._linhas = None
+
+    @property
+    def ordered(self):
+        return self.queryset.ordered
+
+    def count(self):
+        return len(self._linhas) if self._linhas is not None else self.queryset.count()
+
+    def _avaliar(self):
+        if self._linhas is None:
+            self._linhas = projetar_chamados(self.queryset.values_list(*CAMPOS_CHAMADO), self.agora)
+        return self._linhas
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return ProjecaoChamados(self.queryset[indice], self.agora)
+        return self._avaliar()[indice]
+
+    def __iter__(self):
+        return iter(self._avaliar())
+
+    def __len__(self):
+        return len(self._avaliar())
+
+    def __bool__(self):
+        return bool(self._avaliar())
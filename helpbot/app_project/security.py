@@ -1,86 +1,148 @@
-import re
+"""
+Validação e sanitização de entradas (módulo único, usado pelas views, views_async e API).
+
+- Padrões compilados uma vez no import (validate_uuid roda em toda requisição via usuario_required)
+- Checagens de tamanho antes de qualquer regex
+- remover_tags: uma passada com str.find, tempo linear mesmo com entradas maliciosas
+  (strip_tags do Django reprocessa o texto com HTMLParser até estabilizar); para de
+  ler assim que junta o texto visível necessário para o max_length
+"""
 import html
+import logging
+import re
+import string
+import uuid
+
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.utils.html import strip_tags
 
-class SecurityManager:
+logger = logging.getLogger(__name__)
+
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.I)
+_USERNAME_RE = re.compile(r'[a-zA-Z0-9_.-]+')
+
+TAMANHO_UUID = 36
+USERNAME_MIN = 3
+USERNAME_MAX = 30
+
+USERNAMES_BLOQUEADOS = frozenset({'admin', 'administrator', 'root', 'system', 'suporte', 'support'})
+
+# Caracteres após '<' que abrem tag, fechamento, declaração ou instrução (mesmo critério do HTMLParser)
+_INICIO_TAG = frozenset(string.ascii_letters + '/!?')
+
+
+def remover_tags(texto, limite=None):
     """
-    Gerenciador centralizado de medidas de segurança
+    Remove tags e comentários HTML em uma única passada.
+    '<' que não abre tag é mantido como texto; tag ou comentário sem fechamento
+    deixa o restante como texto (igual ao HTMLParser). Com limite, devolve no
+    máximo `limite` caracteres de texto visível.
     """
-    
+    if limite is None:
+        limite = len(texto)
+    if '<' not in texto or '>' not in texto:
+        return texto[:limite]
+
+    partes = []
+    visiveis = 0
+    posicao = 0  # início do trecho de texto ainda não copiado
+    busca = 0
+    while True:
+        inicio = texto.find('<', busca)
+        if inicio == -1 or visiveis + inicio - posicao >= limite:
+            break
+        if texto.startswith('<!--', inicio):
+            fim, salto = texto.find('-->', inicio + 4), 3
+        elif texto[inicio + 1:inicio + 2] in _INICIO_TAG:
+            fim, salto = texto.find('>', inicio + 1), 1
+        else:
+            busca = inicio + 1
+            continue
+        if fim == -1:
+            break
+        partes.append(texto[posicao:inicio])
+        visiveis += inicio - posicao
+        posicao = busca = fim + salto
+
+    partes.append(texto[posicao:posicao + limite - visiveis])
+    return ''.join(partes)
+
+
+class SecurityManager:
+    """Gerenciador centralizado de medidas de segurança"""
+
     @staticmethod
-    def sanitize_input(text, max_length=500):
-        """
-        Sanitiza entrada de usuário removendo ou escapando conteúdo perigoso
-        """
+    def sanitize_input(text, max_length=500, allow_html=False):
+        """Sanitiza entrada de usuário removendo ou escapando conteúdo perigoso"""
         if not text:
             return ""
-        
-        # Remove tags HTML
-        clean_text = strip_tags(str(text))
-        
-        # Escapa caracteres especiais
-        clean_text = html.escape(clean_text)
-        
-        # Limita o tamanho
-        if len(clean_text) > max_length:
-            clean_text = clean_text[:max_length]
-            
-        return clean_text
-    
+
+        text = str(text)
+        if allow_html:
+            return text[:max_length].strip()
+
+        # O escape só aumenta o texto: max_length caracteres visíveis bastam para o corte final
+        clean_text = html.escape(remover_tags(text, max_length))
+        return clean_text[:max_length].strip()
+
     @staticmethod
     def validate_username(username):
-        """
-        Valida formato do username
-        """
-        if not username or len(username) < 3:
+        """Valida formato do username"""
+        if not username or len(username) < USERNAME_MIN:
             raise ValidationError("Username deve ter pelo menos 3 caracteres")
-        
-        if len(username) > 50:
-            raise ValidationError("Username muito longo")
-            
+
+        if len(username) > USERNAME_MAX:
+            raise ValidationError("Username muito longo (máximo 30 caracteres)")
+
         # Permite apenas letras, números e alguns caracteres especiais
-        if not re.match(r'^[a-zA-Z0-9_.-]+$', username):
-            raise ValidationError("Username contém caracteres inválidos")
-        
+        if not _USERNAME_RE.fullmatch(username):
+            raise ValidationError("Username contém caracteres inválidos. Use apenas letras, números, '.', '-' e '_'")
+
+        # Previne usernames comuns que podem ser usados em ataques
+        if username.lower() in USERNAMES_BLOQUEADOS:
+            raise ValidationError("Este username não está disponível")
+
         return username
-    
+
     @staticmethod
     def validate_codigo_suporte(codigo):
-        """
-        Valida código de suporte
-        """
-        try:
-            codigo_int = int(codigo)
-            if codigo_int < 1000 or codigo_int > 99999:
-                raise ValidationError("Código de suporte inválido")
-            return codigo_int
-        except (ValueError, TypeError):
-            raise ValidationError("Código de suporte deve ser um número")
-    
+        """Valida código de suporte (6 dígitos: 100000-199999 = Suporte, 200000-999999 = Colaborador)"""
+        codigo_str = str(codigo).strip()
+
+        if not codigo_str:
+            raise ValidationError("Código de suporte é obrigatório")
+
+        if not (codigo_str.isascii() and codigo_str.isdigit()):
+            raise ValidationError("Código de suporte deve conter apenas números")
+
+        # Tamanho antes do int(): números enormes são recusados sem conversão
+        if len(codigo_str) != 6 or codigo_str[0] == '0':
+            raise ValidationError("Código de suporte deve ter 6 dígitos (ex: 100001 para suporte, 200001 para colaborador)")
+
+        return int(codigo_str)
+
+    @staticmethod
+    def validate_uuid(uuid_string):
+        """Valida formato UUID"""
+        if isinstance(uuid_string, uuid.UUID):
+            return True
+        uuid_string = str(uuid_string)
+        return len(uuid_string) == TAMANHO_UUID and _UUID_RE.fullmatch(uuid_string) is not None
+
     @staticmethod
     def prevent_brute_force(request, operation_type, max_attempts=5, window_seconds=300):
-        """
-        Prevenção básica contra ataques de força bruta
-        """
-        from django.core.cache import cache
-        
-        key = f"brute_force_{operation_type}_{request.META.get('REMOTE_ADDR')}"
+        """Prevenção básica contra ataques de força bruta"""
+        client_ip = request.META.get('REMOTE_ADDR', 'unknown')
+        key = f"brute_force_{operation_type}_{client_ip}"
         attempts = cache.get(key, 0)
-        
+
         if attempts >= max_attempts:
+            logger.warning(f"Brute force detectado: {client_ip} - {operation_type}")
             return False
-            
+
         cache.set(key, attempts + 1, window_seconds)
         return True
-    
-    @staticmethod
-    def validate_uuid(uuid_string):
-        """
-        Valida formato UUID
-        """
-        uuid_pattern = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I)
-        return bool(uuid_pattern.match(str(uuid_string)))
-
-# Instância global
-security = SecurityManager()
\ No newline at end of file
+
+
+# Instância global do gerenciador de segurança
+security = SecurityManager()
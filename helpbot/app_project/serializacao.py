@@ -0,0 +1,128 @@
+from django.utils import timezone
+
+# Colunas realmente usadas pelos endpoints - evita carregar o objeto inteiro
+# e o acesso preguiçoso a notificacao.chamado / interacao.suporte_responsavel
+CAMPOS_NOTIFICACAO = (
+    'id_notificacao',
+    'mensagem',
+    'chamado_id',
+    'chamado__id_legivel',
+    'tipo',
+    'lida',
+    'criado_em',
+    'contador',
+)
+
+CAMPOS_INTERACAO = (
+    'id_interacao',
+    'remetente',
+    'mensagem',
+    'criado_em',
+    'acao_bot',
+    'suporte_responsavel__username',
+)
+
+
+class FormatadorHorario:
+    """
+    Converte datas para o fuso local uma única vez por minuto.
+    Linhas do mesmo minuto reaproveitam 'hora' e 'data_completa' já formatadas.
+    """
+
+    def __init__(self):
+        self.fuso = timezone.get_current_timezone()
+        self._por_minuto = {}
+
+    def __call__(self, data_hora, timestamp=None):
+        if timestamp is None:
+            timestamp = data_hora.timestamp()
+        minuto = int(timestamp // 60)
+        formatado = self._por_minuto.get(minuto)
+        if formatado is None:
+            local = data_hora.astimezone(self.fuso)
+            hora = f"{local.hour:02d}:{local.minute:02d}"
+            formatado = (hora, f"{local.day:02d}/{local.month:02d}/{local.year} {hora}")
+            self._por_minuto[minuto] = formatado
+        return formatado
+
+
+def _notificacoes_de_linhas(linhas, pode_marcar_lida=None):
+    formatar = FormatadorHorario()
+    notificacoes_data = []
+
+    for id_notificacao, mensagem, chamado_id, chamado_legivel, tipo, lida, criado_em, contador in linhas:
+        timestamp = criado_em.timestamp()
+        hora, data_completa = formatar(criado_em, timestamp)
+        item = {
+            'id': str(id_notificacao),
+            'mensagem': mensagem,
+            'chamado_id': str(chamado_id) if chamado_id else None,
+            'chamado_legivel': chamado_legivel if chamado_id else 'N/A',
+            'hora': hora,
+            'data_completa': data_completa,
+            'tipo': tipo,
+            'lida': lida,
+            'timestamp': timestamp,
+            'contador': contador,
+        }
+        if pode_marcar_lida is not None:
+            item['pode_marcar_lida'] = pode_marcar_lida
+        notificacoes_data.append(item)
+
+    return notificacoes_data
+
+
+def serializar_notificacoes(queryset, pode_marcar_lida=None):
+    """
+    Serializa notificações a partir de uma única consulta values_list.
+    Se pode_marcar_lida for informado, a flag é incluída em cada item.
+    """
+    return _notificacoes_de_linhas(queryset.values_list(*CAMPOS_NOTIFICACAO), pode_marcar_lida)
+
+
+async def aserializar_notificacoes(queryset, pode_marcar_lida=None):
+    """Versão assíncrona (ORM async) de serializar_notificacoes"""
+    linhas = [linha async for linha in queryset.values_list(*CAMPOS_NOTIFICACAO)]
+    return _notificacoes_de_linhas(linhas, pode_marcar_lida)
+
+
+def _interacoes_de_linhas(linhas, incluir_timestamp=False):
+    formatar = FormatadorHorario()
+    mensagens = []
+
+    for id_interacao, remetente, mensagem, criado_em, acao_bot, suporte_username in linhas:
+        timestamp = criado_em.timestamp()
+        item = {
+            'id': str(id_interacao),
+            'remetente': remetente,
+            'mensagem': mensagem,
+            'hora': formatar(criado_em, timestamp)[0],
+            'acao_bot': acao_bot,
+            'suporte_responsavel': suporte_username,
+        }
+        if incluir_timestamp:
+            item['timestamp'] = timestamp
+        mensagens.append(item)
+
+    return mensagens
+
+
+def serializar_interacoes(queryset, incluir_timestamp=False):
+    """Serializa mensagens do chat (InteracaoChamado) em uma única consulta"""
+    return _interacoes_de_linhas(queryset.values_list(*CAMPOS_INTERACAO), incluir_timestamp)
+
+
+def serializar_interacao(interacao, incluir_timestamp=False):
+    """Item de uma interação já carregada (mesmo formato de serializar_interacoes)"""
+    suporte = interacao.suporte_responsavel if interacao.suporte_responsavel_id else None
+    linha = (
+        interacao.id_interacao, interacao.remetente, interacao.mensagem,
+        interacao.criado_em, interacao.acao_bot, suporte.username if suporte else None,
+    )
+    return _interacoes_de_linhas([linha], incluir_timestamp)[0]
+
+
+async def aserializar_interacoes(queryset, incluir_timestamp=False):
+    """Versão assíncrona (ORM async) de serializar_interacoes"""
+    linhas = [linha async for linha in queryset.values_list(*CAMPOS_INTERACAO)]
+    return _interacoes_de_linhas(linhas, incluir_timestamp)
@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .busca import motor_busca
+from .departamentos import registro_departamentos
+from .longpoll import registro_espera, canal_chamado, canal_notificacoes
+from .models import Chamado, Departamento, InteracaoChamado, Notificacao
+from .transcricoes import transcricoes
+from .versoes import incrementar_versao_apos_commit
+
+
+@receiver(post_save, sender=Chamado)
+@receiver(post_delete, sender=Chamado)
+def invalidar_cache_chamados(sender, **kwargs):
+    """Qualquer alteração de chamado invalida cartões, tabelas e contadores em cache (depois do commit)"""
+    incrementar_versao_apos_commit('chamados')
+
+
+@receiver(post_save, sender=Departamento)
+@receiver(post_delete, sender=Departamento)
+def invalidar_cache_departamentos(sender, **kwargs):
+    """Depois do commit recarrega já neste processo (os demais conferem o banco a cada intervalo)"""
+    transaction.on_commit(registro_departamentos.invalidar)
+
+
+@receiver(post_save, sender=InteracaoChamado)
+def avisar_nova_mensagem(sender, instance, created, **kwargs):
+    """Acorda quem está em long-poll no chat deste chamado"""
+    if created:
+        registro_espera.notificar_apos_commit(canal_chamado(instance.chamado_id))
+
+
+@receiver(post_save, sender=InteracaoChamado)
+def atualizar_transcricao(sender, instance, created, **kwargs):
+    """Mensagem nova entra na transcrição em cache; edição força a remontagem"""
+    if created:
+        transcricoes.anexar_apos_commit(instance)
+    else:
+        transcricoes.invalidar_apos_commit(instance.chamado_id)
+
+
+@receiver(post_delete, sender=InteracaoChamado)
+def remover_da_transcricao(sender, instance, **kwargs):
+    transcricoes.invalidar_apos_commit(instance.chamado_id)
+
+
+@receiver(post_save, sender=Notificacao)
+def avisar_nova_notificacao(sender, instance, created, **kwargs):
+    """Acorda o destinatário e o dono do chamado (colaborador vê as notificações dos seus chamados)"""
+    if not created:
+        return
+    registro_espera.notificar_apos_commit(canal_notificacoes(instance.usuario_id))
+    dono_id = _dono_do_chamado(instance) if instance.chamado_id else None
+    if dono_id and dono_id != instance.usuario_id:
+        registro_espera.notificar_apos_commit(canal_notificacoes(dono_id))
+
+
+def _dono_do_chamado(notificacao):
+    """usuario_id do chamado sem carregar o Chamado inteiro quando ele não veio junto"""
+    if Notificacao._meta.get_field('chamado').is_cached(notificacao):
+        return notificacao.chamado.usuario_id
+    return Chamado.objects.filter(pk=notificacao.chamado_id).values_list('usuario_id', flat=True).first()
+
+
+@receiver(post_save, sender=Chamado)
+def indexar_chamado(sender, instance, created, update_fields=None, **kwargs):
+    """Índice de busca incremental: só quando título/descrição entram ou podem ter mudado"""
+    if created:
+        motor_busca().indexar_chamado(instance, novo=True)
+    elif update_fields is None or {'titulo', 'descricao'} & set(update_fields):
+        # save() sem update_fields grava todas as colunas: título/descrição podem ter mudado
+        motor_busca().indexar_chamado(instance)
+
+
+@receiver(post_delete, sender=Chamado)
+def remover_chamado_indice(sender, instance, **kwargs):
+    motor_busca().remover_chamado(instance.id_chamado)
+
+
+@receiver(post_save, sender=InteracaoChamado)
+def indexar_interacao(sender, instance, created, **kwargs):
+    if created:
+        motor_busca().indexar_interacao(instance)
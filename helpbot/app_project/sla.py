@@ -0,0 +1,237 @@
+"""
+Métricas de SLA: tempo até a primeira resposta do suporte e tempo de resolução
+(criado_em → data_resolucao), com percentis e histogramas por departamento,
+urgência e suporte responsável.
+
+- Uma única consulta traz as colunas (values_list); as durações já vêm
+  calculadas pelo banco em minutos e viram arrays NumPy
+- Percentis de todos os grupos de uma vez: ordena por (grupo, valor) e
+  interpola nas posições de cada quantil, sem laço Python por chamado
+- Resultado em cache por período (SLA_CACHE_SEGUNDOS)
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FloatField, Func, OuterRef, Subquery
+from django.utils import timezone
+
+from .filtros import DIAS_PERIODO, filtrar_chamados
+from .models import Chamado, InteracaoChamado
+
+logger = logging.getLogger(__name__)
+
+TEMPO_CACHE = getattr(settings, 'SLA_CACHE_SEGUNDOS', 300)
+
+PERIODOS = ('todos', 'hoje') + tuple(DIAS_PERIODO)
+
+QUANTIS = (50, 90, 95, 99)
+
+# Limites (em minutos) das faixas do histograma
+LIMITES_HISTOGRAMA = (15, 30, 60, 120, 240, 480, 1440, 2880, 10080)
+
+METRICAS = ('primeira_resposta', 'resolucao')
+DIMENSOES = ('departamento', 'urgencia', 'suporte')
+
+NOME_SEM_RESPONSAVEL = 'Sem responsável'
+
+
+class MinutosEntre(Func):
+    """
+    (fim - inicio) em minutos como float, calculado no banco.
+    Evita a subtração genérica do Django, que no SQLite passa por uma função
+    Python por linha e ainda devolve timedelta para converter.
+    """
+    arity = 2
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL
+        return super().as_sql(
+            compiler, connection,
+            template='EXTRACT(EPOCH FROM (%(expressions)s)) / 60', arg_joiner=' - ',
+            **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='(julianday(%(expressions)s)) * 1440', arg_joiner=') - julianday(',
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        fim, inicio = self.get_source_expressions()
+        return Func(inicio, fim, template='TIMESTAMPDIFF(MICROSECOND, %(expressions)s) / 60000000').as_sql(
+            compiler, connection, **extra_context
+        )
+
+
+def _consulta(periodo):
+    chamados_query, _ = filtrar_chamados({'periodo': periodo})
+    primeira_resposta = (
+        InteracaoChamado.objects
+        .filter(chamado=OuterRef('pk'), remetente='suporte')
+        .order_by('criado_em')
+        .values('criado_em')[:1]
+    )
+    return (
+        chamados_query
+        .annotate(primeira_resposta_em=Subquery(primeira_resposta))
+        .values_list(
+            'departamento__nome',
+            'urgencia',
+            'suporte_responsavel__username',
+            MinutosEntre(F('primeira_resposta_em'), F('criado_em')),
+            MinutosEntre(F('data_resolucao'), F('criado_em')),
+        )
+        .order_by()
+    )
+
+
+def colunas(periodo='todos'):
+    """Arrays por coluna: códigos de grupo (int) e durações em minutos (NaN = sem valor)"""
+    linhas = list(_consulta(periodo))
+    total = len(linhas)
+    if not total:
+        departamentos = urgencias = suportes = ()
+        primeira_resposta = resolucao = ()
+    else:
+        departamentos, urgencias, suportes, primeira_resposta, resolucao = zip(*linhas)
+
+    resultado = {'total': total}
+    for dimensao, valores in zip(DIMENSOES, (departamentos, urgencias, suportes)):
+        chaves = {}
+        resultado[dimensao] = (
+            np.fromiter((chaves.setdefault(valor, len(chaves)) for valor in valores), dtype=np.int64, count=total),
+            list(chaves),
+        )
+    for metrica, minutos in zip(METRICAS, (primeira_resposta, resolucao)):
+        # None (sem resposta / não resolvido) vira NaN
+        resultado[metrica] = np.array(minutos, dtype=np.float64)
+    return resultado
+
+
+def percentis_por_grupo(codigos, valores, total_grupos):
+    """
+    (contagens, medias, percentis[grupo, quantil]) de cada grupo.
+    Valores NaN são ignorados; grupos vazios ficam com NaN.
+    """
+    validos = ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+    contagens = np.bincount(codigos, minlength=total_grupos)
+    percentis = np.full((total_grupos, len(QUANTIS)), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        medias = np.bincount(codigos, weights=valores, minlength=total_grupos) / contagens
+    if not len(valores):
+        return contagens, medias, percentis
+
+    ordem = np.lexsort((valores, codigos))
+    valores = valores[ordem]
+    inicios = np.concatenate(([0], np.cumsum(contagens)[:-1]))
+    # Índice do último valor de cada grupo (limitado ao array para grupos vazios no fim)
+    ultimos = np.minimum(inicios + np.maximum(contagens - 1, 0), len(valores) - 1)[:, None]
+
+    # Interpolação linear (mesmo critério do np.percentile) feita para todos os grupos juntos
+    posicoes = inicios[:, None] + np.asarray(QUANTIS)[None, :] / 100 * (ultimos - inicios[:, None])
+    abaixo = np.minimum(np.floor(posicoes).astype(np.int64), ultimos)
+    acima = np.minimum(abaixo + 1, ultimos)
+    interpolados = valores[abaixo] + (valores[acima] - valores[abaixo]) * (posicoes - abaixo)
+
+    preenchidos = contagens > 0
+    percentis[preenchidos] = interpolados[preenchidos]
+    return contagens, medias, percentis
+
+
+def histograma(valores):
+    """Contagens por faixa de LIMITES_HISTOGRAMA (a última faixa é aberta)"""
+    valores = valores[~np.isnan(valores)]
+    indices = np.searchsorted(LIMITES_HISTOGRAMA, valores, side='right')
+    return np.bincount(indices, minlength=len(LIMITES_HISTOGRAMA) + 1).tolist()
+
+
+def _rotulo_minutos(minutos):
+    if minutos % 1440 == 0:
+        return f"{minutos // 1440}d"
+    if minutos % 60 == 0:
+        return f"{minutos // 60}h"
+    return f"{minutos}min"
+
+
+def rotulos_histograma():
+    rotulos = [f"< {_rotulo_minutos(LIMITES_HISTOGRAMA[0])}"]
+    for inicio, fim in zip(LIMITES_HISTOGRAMA, LIMITES_HISTOGRAMA[1:]):
+        rotulos.append(f"{_rotulo_minutos(inicio)} - {_rotulo_minutos(fim)}")
+    rotulos.append(f"≥ {_rotulo_minutos(LIMITES_HISTOGRAMA[-1])}")
+    return rotulos
+
+
+def _arredondar(valor):
+    return None if np.isnan(valor) else round(float(valor), 1)
+
+
+def _resumo(contagem, media, percentis):
+    resumo = {'total': int(contagem), 'media': _arredondar(media)}
+    for quantil, valor in zip(QUANTIS, percentis):
+        resumo[f"p{quantil}"] = _arredondar(valor)
+    return resumo
+
+
+def _nomes(dimensao, chaves):
+    if dimensao == 'urgencia':
+        rotulos = dict(Chamado.URGENCIA_CHOICES)
+        return [rotulos.get(chave, chave) for chave in chaves]
+    if dimensao == 'suporte':
+        return [chave or NOME_SEM_RESPONSAVEL for chave in chaves]
+    return chaves
+
+
+def calcular(periodo='todos'):
+    """Métricas completas do período (sem cache)"""
+    dados = colunas(periodo)
+    geral = np.zeros(dados['total'], dtype=np.int64)
+    metricas = {}
+
+    for metrica in METRICAS:
+        valores = dados[metrica]
+        contagens, medias, percentis = percentis_por_grupo(geral, valores, 1)
+        resultado = {
+            'geral': _resumo(contagens[0], medias[0], percentis[0]),
+            'histograma': histograma(valores),
+        }
+        for dimensao in DIMENSOES:
+            codigos, chaves = dados[dimensao]
+            contagens, medias, percentis = percentis_por_grupo(codigos, valores, len(chaves))
+            nomes = _nomes(dimensao, chaves)
+            grupos = [
+                dict(chave=chave, nome=nome, **_resumo(*linha))
+                for chave, nome, *linha in zip(chaves, nomes, contagens, medias, percentis)
+                if linha[0]
+            ]
+            resultado[dimensao] = sorted(grupos, key=lambda grupo: grupo['nome'])
+        metricas[metrica] = resultado
+
+    return {
+        'periodo': periodo,
+        'total_chamados': dados['total'],
+        'unidade': 'minutos',
+        'quantis': [f"p{quantil}" for quantil in QUANTIS],
+        'faixas_histograma': rotulos_histograma(),
+        'metricas': metricas,
+        'gerado_em': timezone.now().isoformat(),
+    }
+
+
+def metricas_sla(periodo='todos'):
+    """Métricas do período, em cache por TEMPO_CACHE segundos"""
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido: {periodo}")
+    # 'hoje' muda de janela à meia-noite
+    chave = f"sla:{periodo}:{timezone.localdate().isoformat()}"
+    resultado = cache.get(chave)
+    if resultado is None:
+        resultado = calcular(periodo)
+        cache.set(chave, resultado, TEMPO_CACHE)
+        logger.info(f"📈 Métricas de SLA calculadas ({periodo}): {resultado['total_chamados']} chamados")
+    return resultado
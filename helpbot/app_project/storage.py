@@ -0,0 +1,62 @@
+import logging
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .estaticos import (
+    EXTENSOES_COMPRIMIVEIS, MINIFICADORES, TAMANHO_MINIMO_COMPRESSAO,
+    comprimir_gzip, comprimir_brotli,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ArmazenamentoEstaticoComprimido(ManifestStaticFilesStorage):
+    """
+    Storage do collectstatic que:
+    1. minifica CSS/JS antes do hash (o hash reflete o conteúdo servido);
+    2. gera nomes com impressão digital (ex: chat-bot.3f2a9c.js) via manifest;
+    3. grava irmãos .gz e .br de cada arquivo final para servir pré-comprimido.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+
+        paths = dict(paths)
+        for caminho in list(paths):
+            minificador = MINIFICADORES.get(os.path.splitext(caminho)[1])
+            if minificador is None:
+                continue
+            with self.open(caminho) as arquivo:
+                conteudo = arquivo.read().decode('utf-8')
+            self.delete(caminho)
+            self._save(caminho, ContentFile(minificador(conteudo).encode('utf-8')))
+            # Faz o hash ser calculado sobre a cópia minificada já coletada
+            paths[caminho] = (self, caminho)
+
+        for nome, nome_hash, processado in super().post_process(paths, dry_run, **options):
+            if nome_hash and not isinstance(processado, Exception):
+                self._gravar_comprimidos(nome_hash)
+            yield nome, nome_hash, processado
+
+    def _gravar_comprimidos(self, nome):
+        if not nome.endswith(EXTENSOES_COMPRIMIVEIS):
+            return
+        with self.open(nome) as arquivo:
+            dados = arquivo.read()
+        if len(dados) < TAMANHO_MINIMO_COMPRESSAO:
+            return
+
+        for sufixo, compressor in (('.gz', comprimir_gzip), ('.br', comprimir_brotli)):
+            comprimido = compressor(dados)
+            # Só vale a pena se realmente ficou menor
+            if comprimido is None or len(comprimido) >= len(dados):
+                continue
+            destino = nome + sufixo
+            if self.exists(destino):
+                self.delete(destino)
+            self._save(destino, ContentFile(comprimido))
+
+        logger.info(f"Variantes pré-comprimidas geradas para {nome}")
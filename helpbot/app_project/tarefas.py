@@ -0,0 +1,148 @@
+"""
+Executor limitado para efeitos colaterais pós-commit (notificações, mensagens
+do bot, verificações agendadas). A requisição só grava o essencial e agenda o
+resto: a latência de resposta não cresce com o tamanho da equipe de suporte.
+
+- agendar(): executa após o COMMIT da transação atual, em um pool fixo de threads
+- agendar_em(): executa depois de N segundos (uma única thread de agendamento
+  para todas as tarefas atrasadas, em vez de uma thread dormindo por chamado)
+- Falhas são re-tentadas com espera exponencial; as tarefas devem ser idempotentes
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = getattr(settings, 'TAREFAS_MAX_WORKERS', 4)
+MAX_PENDENTES = getattr(settings, 'TAREFAS_MAX_PENDENTES', 1000)
+TENTATIVAS = getattr(settings, 'TAREFAS_TENTATIVAS', 3)
+ESPERA_BASE_RETENTATIVA = getattr(settings, 'TAREFAS_ESPERA_BASE', 0.5)
+
+
+class ExecutorPosCommit:
+    """Pool fixo de threads com fila limitada e re-tentativas"""
+
+    def __init__(self, max_workers=MAX_WORKERS, max_pendentes=MAX_PENDENTES,
+                 tentativas=TENTATIVAS, espera_base=ESPERA_BASE_RETENTATIVA):
+        self.max_workers = max_workers
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self._vagas = threading.BoundedSemaphore(max_pendentes)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _obter_executor(self):
+        # Criado sob demanda: comandos de management não sobem threads à toa
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tarefas')
+            return self._executor
+
+    def agendar(self, funcao, *args, **kwargs):
+        """Executa funcao(*args, **kwargs) depois do commit da transação atual"""
+        transaction.on_commit(lambda: self.submeter(funcao, *args, **kwargs))
+
+    def submeter(self, funcao, *args, **kwargs):
+        if getattr(settings, 'TAREFAS_SINCRONAS', False):
+            self._executar(funcao, args, kwargs)
+            return
+
+        if not self._vagas.acquire(blocking=False):
+            # Fila cheia: quem agendou executa (pressão de volta em vez de perder a tarefa)
+            logger.warning(f"Fila de tarefas cheia, executando {funcao.__name__} na thread atual")
+            self._executar(funcao, args, kwargs)
+            return
+
+        try:
+            self._obter_executor().submit(self._executar_no_pool, funcao, args, kwargs)
+        except RuntimeError:
+            # Executor encerrado (desligamento do processo)
+            self._vagas.release()
+            self._executar(funcao, args, kwargs)
+
+    def _executar_no_pool(self, funcao, args, kwargs):
+        close_old_connections()
+        try:
+            self._executar(funcao, args, kwargs)
+        finally:
+            self._vagas.release()
+            connection.close()
+
+    def _executar(self, funcao, args, kwargs):
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                return funcao(*args, **kwargs)
+            except Exception as e:
+                if tentativa == self.tentativas:
+                    logger.error(f"❌ Tarefa {funcao.__name__} falhou após {tentativa} tentativas: {str(e)}", exc_info=True)
+                    return None
+                espera = self.espera_base * (2 ** (tentativa - 1))
+                logger.warning(f"⚠️ Tarefa {funcao.__name__} falhou (tentativa {tentativa}), nova tentativa em {espera}s: {str(e)}")
+                time.sleep(espera)
+
+    def encerrar(self, aguardar=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=aguardar)
+                self._executor = None
+
+
+class AgendadorTarefas:
+    """Uma thread com heap de prazos; ao vencer, a tarefa vai para o executor"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._heap = []
+        self._sequencia = itertools.count()
+        self._condicao = threading.Condition()
+        self._thread = None
+
+    def agendar_em(self, segundos, funcao, *args, **kwargs):
+        prazo = time.monotonic() + segundos
+        with self._condicao:
+            heapq.heappush(self._heap, (prazo, next(self._sequencia), funcao, args, kwargs))
+            self._iniciar()
+            self._condicao.notify()
+
+    def _iniciar(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name='agendador-tarefas', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._condicao:
+                while not self._heap:
+                    self._condicao.wait()
+                prazo, _, funcao, args, kwargs = self._heap[0]
+                restante = prazo - time.monotonic()
+                if restante > 0:
+                    self._condicao.wait(restante)
+                    continue
+                heapq.heappop(self._heap)
+            self.executor.submeter(funcao, *args, **kwargs)
+
+    @property
+    def pendentes(self):
+        with self._condicao:
+            return len(self._heap)
+
+
+# Instâncias globais
+executor_tarefas = ExecutorPosCommit()
+agendador_tarefas = AgendadorTarefas(executor_tarefas)
+
+
+def agendar(funcao, *args, **kwargs):
+    executor_tarefas.agendar(funcao, *args, **kwargs)
+
+
+def agendar_em(segundos, funcao, *args, **kwargs):
+    agendador_tarefas.agendar_em(segundos, funcao, *args, **kwargs)
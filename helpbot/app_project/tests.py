@@ -1,3 +1,211 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from . import escrita_adiada, eventos, fila
+from .models import Chamado, CursorLeitura, Departamento, EventoDominio, InteracaoChamado, Notificacao, Usuario
+
+
+def _criar_chamados(usuario, quantidade):
+    departamento = Departamento.objects.get(nome='TI')
+    return [
+        Chamado.objects.create(
+            titulo=f'Chamado de teste {i}', descricao='Descrição', usuario=usuario, departamento=departamento
+        )
+        for i in range(quantidade)
+    ]
+
+
+class FilaAtendimentoTests(TestCase):
+    """Reservas da fila (compare-and-set no SQLite) e assumir()"""
+
+    def setUp(self):
+        self.suporte1 = Usuario.objects.create(username='suporte1', codigo_suporte=100001, tipo_usuario='suporte')
+        self.suporte2 = Usuario.objects.create(username='suporte2', codigo_suporte=100002, tipo_usuario='suporte')
+        colaborador = Usuario.objects.create(username='colab', codigo_suporte=200001, tipo_usuario='colaborador')
+        self.chamados = _criar_chamados(colaborador, 3)
+
+    def test_dois_suportes_nao_reservam_o_mesmo_chamado(self):
+        reservados1 = fila.reivindicar(self.suporte1, quantidade=2)
+        reservados2 = fila.reivindicar(self.suporte2, quantidade=2)
+
+        ids1 = {chamado.pk for chamado in reservados1}
+        ids2 = {chamado.pk for chamado in reservados2}
+        self.assertEqual(len(ids1), 2)
+        self.assertEqual(len(ids2), 1)
+        self.assertFalse(ids1 & ids2)
+        self.assertEqual(fila.reivindicar(self.suporte2), [])
+
+    def test_compare_and_set_com_candidatos_desatualizados(self):
+        """Quem perde a corrida (candidato já reservado) não rouba a reserva e tenta o próximo"""
+        fila.reivindicar(self.suporte1, quantidade=2)
+        desatualizados = Chamado.objects.filter(status='em_andamento').order_by('prioridade', 'criado_em')
+        disponiveis = fila.disponiveis
+
+        with mock.patch.object(fila, 'disponiveis', side_effect=[desatualizados, disponiveis()]):
+            reservados = fila.reivindicar(self.suporte2, quantidade=3)
+
+        self.assertEqual(len(reservados), 1)
+        self.assertEqual(
+            Chamado.objects.filter(reservado_por=self.suporte1).count(), 2
+        )
+
+    def test_assumir_respeita_reserva_de_outro_suporte(self):
+        chamado = fila.reivindicar(self.suporte1)[0]
+
+        self.assertFalse(fila.assumir(self.suporte2, chamado.pk))
+        self.assertTrue(fila.assumir(self.suporte1, chamado.pk))
+        self.assertFalse(fila.assumir(self.suporte2, chamado.pk))
+
+        chamado.refresh_from_db()
+        self.assertEqual(chamado.suporte_responsavel, self.suporte1)
+        self.assertIsNone(chamado.reservado_por)
+
+    def test_reserva_vencida_volta_para_a_fila(self):
+        chamado = fila.reivindicar(self.suporte1)[0]
+        Chamado.objects.filter(pk=chamado.pk).update(reserva_expira_em=timezone.now() - timedelta(seconds=1))
+
+        reservados = fila.reivindicar(self.suporte2, quantidade=3)
+        self.assertIn(chamado.pk, {reservado.pk for reservado in reservados})
+        # O lease vencido não pode ser renovado por quem o perdeu
+        self.assertFalse(fila.renovar(self.suporte1, chamado.pk))
+        self.assertFalse(fila.assumir(self.suporte1, chamado.pk))
+        self.assertTrue(fila.assumir(self.suporte2, chamado.pk))
+
+
+class OutboxEventosTests(TestCase):
+    """Entrega pelo menos uma vez: a re-entrega não repete as mensagens do bot"""
+
+    def setUp(self):
+        colaborador = Usuario.objects.create(username='colab', codigo_suporte=200001, tipo_usuario='colaborador')
+        self.chamado = _criar_chamados(colaborador, 1)[0]
+
+    def _publicar_resolucao(self):
+        return eventos.publicar(
+            eventos.STATUS_ALTERADO, self.chamado,
+            status_anterior='em_andamento', status_novo='resolvido', origem='suporte'
+        )
+
+    def _mensagens_bot(self):
+        return InteracaoChamado.objects.filter(chamado=self.chamado, remetente='bot')
+
+    def test_reentrega_nao_duplica_mensagens_do_bot(self):
+        evento = self._publicar_resolucao()
+        self.assertEqual(eventos.despachar_pendentes(), 1)
+        total = self._mensagens_bot().count()
+        self.assertEqual(total, 2)  # finalização + finalização completa
+
+        # Simula o processo caindo depois dos assinantes, antes de marcar o evento
+        EventoDominio.objects.filter(pk=evento.pk).update(processado_em=None)
+        self.assertEqual(eventos.despachar_pendentes(), 1)
+        self.assertEqual(self._mensagens_bot().count(), total)
+
+    def test_eventos_iguais_no_mesmo_lote_geram_cada_um_sua_mensagem(self):
+        """Resolve -> reabre -> resolve despachados juntos: duas finalizações"""
+        self._publicar_resolucao()
+        eventos.publicar(
+            eventos.STATUS_ALTERADO, self.chamado,
+            status_anterior='resolvido', status_novo='em_andamento', origem='reabertura'
+        )
+        self._publicar_resolucao()
+
+        self.assertEqual(eventos.despachar_pendentes(), 3)
+        self.assertEqual(self._mensagens_bot().filter(acao_bot='finalizacao').count(), 2)
+
+    def test_falha_reagenda_com_espera(self):
+        evento = self._publicar_resolucao()
+        with mock.patch.object(eventos, 'agendar_em') as agendar, \
+                mock.patch.dict(eventos._assinantes, {eventos.STATUS_ALTERADO: [mock.Mock(side_effect=RuntimeError('falha'))]}), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(eventos.despachar_pendentes(), 0)
+
+        evento.refresh_from_db()
+        self.assertEqual(evento.tentativas, 1)
+        self.assertIsNotNone(evento.proxima_tentativa_em)
+        self.assertFalse(eventos.prontos().filter(pk=evento.pk).exists())
+        self.assertEqual(self._mensagens_bot().count(), 0)
+        # Nova tentativa agendada sem depender de outra publicação
+        agendar.assert_called_once_with(eventos.espera_apos_falha(1), eventos.despachante.solicitar)
+
+
+class EscritaAdiadaTests(TestCase):
+    """Buffer por processo: gravação em lote, leitura mesclada e falhas na gravação"""
+
+    def setUp(self):
+        self.suporte = Usuario.objects.create(username='suporte1', codigo_suporte=100001, tipo_usuario='suporte')
+        self.outro = Usuario.objects.create(username='suporte2', codigo_suporte=100002, tipo_usuario='suporte')
+        colaborador = Usuario.objects.create(username='colab', codigo_suporte=200001, tipo_usuario='colaborador')
+        self.chamado = _criar_chamados(colaborador, 1)[0]
+        self.notificacao = Notificacao.objects.create(
+            usuario=self.suporte, chamado=self.chamado, tipo='novo_chamado', mensagem='Novo chamado'
+        )
+        self.buffer = escrita_adiada.BufferEscrita()
+        agendar = mock.patch.object(escrita_adiada, 'agendar_em')
+        self.agendar = agendar.start()
+        self.addCleanup(agendar.stop)
+
+    def _marcar(self):
+        self.buffer.notificacao_lida(self.suporte.pk, self.notificacao.pk)
+        self.buffer.chamado_visualizado(self.suporte.pk, self.chamado.pk)
+        self.buffer.cursor_leitura(self.suporte.pk, self.chamado.pk, timezone.now())
+
+    def test_gravar_aplica_o_lote(self):
+        self._marcar()
+        self.notificacao.refresh_from_db()
+        self.assertFalse(self.notificacao.lida)
+        # Um agendamento por janela, não um por marcação
+        self.agendar.assert_called_once_with(escrita_adiada.INTERVALO_MS / 1000, self.buffer.gravar)
+
+        self.assertEqual(self.buffer.gravar(), 3)
+        self.notificacao.refresh_from_db()
+        self.chamado.refresh_from_db()
+        self.assertTrue(self.notificacao.lida)
+        self.assertTrue(self.chamado.visualizado_suporte)
+        self.assertTrue(CursorLeitura.objects.filter(usuario=self.suporte, chamado=self.chamado).exists())
+        self.assertFalse(self.buffer.pendente(self.suporte.pk))
+        self.assertEqual(self.buffer.gravar(), 0)
+
+    def test_sincronizar_mescla_so_para_quem_tem_pendencias(self):
+        lido_ate = timezone.now()
+        self.buffer.cursor_leitura(self.suporte.pk, self.chamado.pk, lido_ate)
+        self.assertEqual(self.buffer.cursor_pendente(self.suporte.pk, self.chamado.pk), lido_ate)
+        self.assertIsNone(self.buffer.cursor_pendente(self.outro.pk, self.chamado.pk))
+
+        self.buffer.sincronizar(self.outro.pk)
+        self.assertFalse(CursorLeitura.objects.exists())
+
+        self.buffer.sincronizar(self.suporte.pk)
+        self.assertEqual(CursorLeitura.objects.get(usuario=self.suporte).lido_ate, lido_ate)
+        self.assertIsNone(self.buffer.cursor_pendente(self.suporte.pk, self.chamado.pk))
+
+    def test_falha_na_gravacao_devolve_as_marcacoes(self):
+        self._marcar()
+        with mock.patch.object(self.buffer, '_aplicar', side_effect=RuntimeError('banco travado')):
+            with self.assertRaises(RuntimeError):
+                self.buffer.gravar()
+
+        self.assertTrue(self.buffer.pendente(self.suporte.pk))
+        self.assertEqual(self.buffer.gravar(), 3)
+        self.notificacao.refresh_from_db()
+        self.assertTrue(self.notificacao.lida)
+
+    def test_marcacao_durante_a_gravacao_fica_para_a_proxima(self):
+        """O usuário segue pendente enquanto a gravação não termina e não perde o que marcou nela"""
+        aplicar = self.buffer._aplicar
+        lido_ate = timezone.now()
+
+        def aplicar_com_nova_marcacao(pendentes):
+            self.assertTrue(self.buffer.pendente(self.suporte.pk))
+            self.buffer.cursor_leitura(self.suporte.pk, self.chamado.pk, lido_ate)
+            aplicar(pendentes)
+
+        self.buffer.notificacao_lida(self.suporte.pk, self.notificacao.pk)
+        with mock.patch.object(self.buffer, '_aplicar', side_effect=aplicar_com_nova_marcacao):
+            self.assertEqual(self.buffer.gravar(), 1)
 
-# Create your tests here.
+        self.assertTrue(self.buffer.pendente(self.suporte.pk))
+        self.assertEqual(self.buffer.cursor_pendente(self.suporte.pk, self.chamado.pk), lido_ate)
+        self.assertEqual(self.buffer.gravar(), 1)
+        self.assertEqual(CursorLeitura.objects.get(usuario=self.suporte).lido_ate, lido_ate)
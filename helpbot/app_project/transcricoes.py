@@ -0,0 +1,93 @@
+"""
+Cache das transcrições do chat (mensagens serializadas de cada chamado).
+
+Abrir o chat (carregar_mensagens_chat) refazia a lista inteira a partir de
+InteracaoChamado a cada acesso. Agora:
+
+- A lista serializada fica no cache junto com a assinatura das interações do
+  chamado no banco (quantidade + criado_em mais recente)
+- Um acerto custa uma consulta de agregação coberta pelo índice
+  (chamado, criado_em) em vez de carregar e serializar todas as mensagens;
+  se a assinatura não bate (mensagem gravada por outro processo, criação em
+  lote, exclusão) a lista é remontada. Não depende de cache compartilhado.
+- Mensagem nova (post_save, depois do commit) é anexada à entrada em cache na
+  posição do seu horário, sem reconsultar o banco
+- Edição de interação descarta a entrada deste processo (interações não são
+  editadas pelas telas; o texto não entra na assinatura)
+"""
+import bisect
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import InteracaoChamado
+from .serializacao import serializar_interacao, serializar_interacoes
+
+logger = logging.getLogger(__name__)
+
+TEMPO_CACHE = getattr(settings, 'TRANSCRICAO_CACHE_SEGUNDOS', 3600)
+
+# Muda quando o formato dos itens muda: entradas antigas deixam de ser lidas
+FORMATO = 2
+
+
+def _chave_entrada(chamado_id):
+    return f"transcricao:v{FORMATO}:{chamado_id}"
+
+
+def _assinatura(chamado_id):
+    """(quantidade, criado_em mais recente) das interações do chamado"""
+    valores = InteracaoChamado.objects.filter(chamado_id=chamado_id).aggregate(total=Count('pk'), ultima=Max('criado_em'))
+    return valores['total'], valores['ultima']
+
+
+class CacheTranscricoes:
+    def mensagens(self, chamado_id):
+        """Mensagens do chamado em ordem (itens de serializar_interacoes, com timestamp)"""
+        chave_entrada = _chave_entrada(chamado_id)
+        # A assinatura é lida antes da lista: mensagem gravada no meio fica para a próxima leitura
+        assinatura = _assinatura(chamado_id)
+        entrada = cache.get(chave_entrada)
+        if entrada is not None and entrada[0] == assinatura:
+            return entrada[1]
+
+        mensagens = serializar_interacoes(
+            InteracaoChamado.objects.filter(chamado_id=chamado_id).order_by('criado_em'),
+            incluir_timestamp=True,
+        )
+        cache.set(chave_entrada, (assinatura, mensagens), TEMPO_CACHE)
+        return mensagens
+
+    def anexar(self, interacao):
+        """Mensagem nova já gravada: entra na lista em cache (se a lista estiver em dia)"""
+        chave_entrada = _chave_entrada(interacao.chamado_id)
+        entrada = cache.get(chave_entrada)
+        if entrada is None:
+            return
+
+        (total, ultima), mensagens = entrada
+        item = serializar_interacao(interacao, incluir_timestamp=True)
+        # A leitura que montou a entrada pode já ter visto esta mensagem
+        if any(mensagem['id'] == item['id'] for mensagem in mensagens):
+            return
+        posicao = bisect.bisect_right(mensagens, item['timestamp'], key=lambda mensagem: mensagem['timestamp'])
+        mensagens.insert(posicao, item)
+        # Se a entrada estava atrasada, a soma não bate com o banco e a próxima leitura remonta
+        ultima = interacao.criado_em if ultima is None else max(ultima, interacao.criado_em)
+        cache.set(chave_entrada, ((total + 1, ultima), mensagens), TEMPO_CACHE)
+
+    def anexar_apos_commit(self, interacao):
+        transaction.on_commit(lambda: self.anexar(interacao))
+
+    def invalidar(self, *chamado_ids):
+        cache.delete_many([_chave_entrada(chamado_id) for chamado_id in chamado_ids])
+
+    def invalidar_apos_commit(self, *chamado_ids):
+        transaction.on_commit(lambda: self.invalidar(*chamado_ids))
+
+
+# Instância global do cache de transcrições (a validade é conferida no banco)
+transcricoes = CacheTranscricoes()
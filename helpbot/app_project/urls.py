@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api.viewsets import UsuarioViewSet
+from .api.viewsets import UsuarioViewSet, ChamadoViewSet, InteracaoChamadoViewSet, NotificacaoViewSet
 
 router = DefaultRouter()
 router.register(r'usuarios', UsuarioViewSet)
+router.register(r'chamados', ChamadoViewSet, basename='chamado')
+router.register(r'interacoes', InteracaoChamadoViewSet, basename='interacao')
+router.register(r'notificacoes', NotificacaoViewSet, basename='notificacao')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -0,0 +1,52 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _chave_versao(nome):
+    return f"versao_{nome}"
+
+
+def obter_versao(nome):
+    """
+    Retorna o contador de versão global (ex: 'chamados').
+    Usado como parte das chaves de cache para invalidar tudo de uma vez.
+    """
+    chave = _chave_versao(nome)
+    versao = cache.get(chave)
+    if versao is None:
+        # Valor inicial baseado no relógio: se a chave for despejada do cache,
+        # a nova versão nunca colide com fragmentos gerados anteriormente
+        cache.add(chave, int(time.time() * 1000), timeout=None)
+        versao = cache.get(chave)
+    return versao
+
+
+async def aobter_versao(nome):
+    """Versão async de obter_versao (usada pelas views async / long-poll)"""
+    chave = _chave_versao(nome)
+    versao = await cache.aget(chave)
+    if versao is None:
+        await cache.aadd(chave, int(time.time() * 1000), timeout=None)
+        versao = await cache.aget(chave)
+    return versao
+
+
+def incrementar_versao(nome):
+    """Invalida todos os caches que dependem desta versão"""
+    chave = _chave_versao(nome)
+    try:
+        return cache.incr(chave)
+    except ValueError:
+        # Chave ainda não existe (ou foi despejada)
+        obter_versao(nome)
+        return cache.incr(chave)
+
+
+def incrementar_versao_apos_commit(nome):
+    """
+    Incrementa depois do COMMIT: incrementado dentro da transação, uma leitura
+    concorrente ainda vê os dados antigos e os guarda em cache sob a versão nova
+    """
+    transaction.on_commit(lambda: incrementar_versao(nome))
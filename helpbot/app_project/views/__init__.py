@@ -0,0 +1,150 @@
+"""
+Views do app, divididas por subsistema e carregadas sob demanda.
+
+O antigo views.py (3.500+ linhas) era importado inteiro no ready() e ao montar
+o URLConf, levando junto tudo de que qualquer view precisa (numpy das métricas
+de SLA, exportação, busca...). Agora cada subsistema é um módulo e:
+
+- `app_project.views.<nome>` continua funcionando: o módulo do subsistema é
+  importado no primeiro acesso (PEP 562)
+- O URLConf registra `vistas.<nome>` (VistaPreguicosa): o subsistema só é
+  importado quando a primeira requisição chega numa rota dele
+- Os endpoints de polling async (app_project/views_async.py) entram do mesmo
+  jeito por `vistas_async.<nome>`: a proxy já se apresenta como corrotina ao
+  handler, sem importar o módulo (que traz views.base, chat e suporte)
+- importar_todos() carrega tudo de uma vez (aquecimento: app_project/aquecimento.py)
+"""
+from importlib import import_module
+
+from asgiref.sync import markcoroutinefunction
+
+# Subsistema -> views e utilitários expostos em app_project.views
+SUBSISTEMAS = {
+    'base': (
+        'logger_frequente', 'rate_limit', 'usuario_required',
+    ),
+    'autenticacao': (
+        'home', 'logout_usuario', 'api_info',
+    ),
+    'chamados': (
+        'CACHE_DASHBOARD_TIMEOUT', 'dashboard', 'todos_chamados', 'sistema_chamados',
+        'formatar_mensagem_colaborador', 'formatar_mensagem_suporte', 'criar_chamado_api',
+        'processar_chamado_criado', 'notificar_suportes_novo_chamado',
+        'verificar_chamado_apos_10_minutos', 'verificar_chamado_apos_5_minutos',
+        'confirmar_atendimento', 'usuario_confirmar_resolucao', 'detalhes_chamado', 'meus_chamados',
+        'atualizar_status_chamado', 'exportar_chamados', 'buscar_chamados', 'chamados_em_lote',
+    ),
+    'chat': (
+        'proxima_mensagem_bot', 'carregar_mensagens_chat', 'enviar_mensagem', 'verificar_novas_mensagens',
+        'verificar_novas_mensagens_inteligente', 'marcar_mensagens_visualizadas', 'obter_ultima_visualizacao',
+        'contar_mensagens_nao_lidas', 'enviar_mensagem_bot_sequencia', 'verificar_status_chamado',
+        'reiniciar_sequencia_bot', 'enviar_sequencia_completa_bot',
+    ),
+    'notificacoes': (
+        'verificar_notificacoes_pendentes_suporte', 'verificar_notificacoes', 'verificar_notificacoes_configuravel',
+        'marcar_todas_notificacoes_lidas', 'marcar_notificacao_como_lida', 'marcar_notificacao_lida',
+        'marcar_notificacoes_lidas_em_lote', 'limpar_notificacoes', 'limpar_notificacoes_chamados_resolvidos',
+        'obter_notificacoes_usuario', 'carregar_notificacoes',
+    ),
+    'suporte': (
+        'intermediar_chat_bot', 'trocar_status_chamado', 'marcar_chamado_visualizado',
+        'TIPO_NOTIFICACAO_BROADCAST', 'ORDEM_URGENCIA', 'verificar_chamados_abertos_para_suporte',
+        'verificar_chamados_pendentes_globais', 'fila_atendimento', 'reivindicar_chamados',
+        'renovar_reserva_chamado', 'liberar_reserva_chamado', 'assumir_controle_chat', 'enviar_mensagem_suporte',
+    ),
+    'estatisticas': (
+        'api_dados_grafico', 'api_metricas_sla', 'api_volume_chamados', 'api_chamados_recentes',
+    ),
+}
+
+# Views async de polling (app_project/views_async.py), fora do pacote
+MODULO_ASYNC = 'app_project.views_async'
+VIEWS_ASYNC = (
+    'verificar_notificacoes', 'verificar_novas_mensagens_inteligente', 'verificar_status_chamado',
+    'verificar_chamados_abertos_para_suporte',
+)
+
+_SUBSISTEMA_DO_NOME = {nome: modulo for modulo, nomes in SUBSISTEMAS.items() for nome in nomes}
+
+
+def _importar(nome):
+    return getattr(import_module(f'{__name__}.{_SUBSISTEMA_DO_NOME[nome]}'), nome)
+
+
+def __getattr__(nome):
+    if nome not in _SUBSISTEMA_DO_NOME:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = _importar(nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBSISTEMA_DO_NOME))
+
+
+def importar_todos():
+    """Importa todos os subsistemas (evita o custo na primeira requisição de cada um)"""
+    for modulo in SUBSISTEMAS:
+        import_module(f'{__name__}.{modulo}')
+
+
+class VistaPreguicosa:
+    """
+    View em função resolvida no primeiro uso. __name__/__module__/__qualname__
+    ficam na instância: o URLConf (lookup_str, checks) não força a importação.
+    """
+
+    def __init__(self, nome, modulo=None):
+        self._view = None
+        self.__name__ = self.__qualname__ = nome
+        self.__module__ = modulo or f'{__name__}.{_SUBSISTEMA_DO_NOME[nome]}'
+
+    def _resolver(self):
+        if self._view is None:
+            self._view = getattr(import_module(self.__module__), self.__name__)
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self._resolver()(request, *args, **kwargs)
+
+    def __getattr__(self, atributo):
+        # Privados/dunder (cópia, pickle) e view_class (só views em função) não importam nada
+        if atributo.startswith('_') or atributo in ('view_class', 'view_initkwargs'):
+            raise AttributeError(atributo)
+        # csrf_exempt e afins: lidos pelo middleware já na requisição
+        return getattr(self._resolver(), atributo)
+
+    def __repr__(self):
+        return f'<VistaPreguicosa {self.__module__}.{self.__name__}>'
+
+
+class VistaAsyncPreguicosa(VistaPreguicosa):
+    """VistaPreguicosa de view async: marcada como corrotina, o handler a aguarda sem sync_to_async"""
+
+    def __init__(self, nome, modulo):
+        super().__init__(nome, modulo)
+        markcoroutinefunction(self)
+
+    async def __call__(self, request, *args, **kwargs):
+        return await self._resolver()(request, *args, **kwargs)
+
+
+class _Vistas:
+    """vistas.<nome> -> VistaPreguicosa (uma por nome)"""
+
+    def __init__(self, nomes, criar):
+        self._nomes = nomes
+        self._criar = criar
+
+    def __getattr__(self, nome):
+        if nome.startswith('_') or nome not in self._nomes:
+            raise AttributeError(nome)
+        vista = self._criar(nome)
+        setattr(self, nome, vista)
+        return vista
+
+
+# Instâncias globais usadas pelo URLConf (uma por processo)
+vistas = _Vistas(_SUBSISTEMA_DO_NOME, VistaPreguicosa)
+vistas_async = _Vistas(VIEWS_ASYNC, lambda nome: VistaAsyncPreguicosa(nome, MODULO_ASYNC))
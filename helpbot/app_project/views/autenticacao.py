@@ -0,0 +1,150 @@
+"""
+Views de entrada: página inicial, logout e informações da API
+"""
+import logging
+from django.shortcuts import render, redirect
+from django.http import JsonResponse
+from django.db import IntegrityError
+from django.core.exceptions import ValidationError
+from django.views.decorators.http import require_http_methods
+from ..models import Usuario
+from ..security import security
+from .base import rate_limit, usuario_required
+
+logger = logging.getLogger(__name__)
+
+@require_http_methods(["GET", "POST"])
+@rate_limit(max_requests=30, window=3600)
+def home(request):
+    """Página inicial com formulário para criar usuários - CORRIGIDA"""
+    
+    # ✅ CORREÇÃO: Verificar se usuário já está logado de forma mais simples
+    if 'usuario_id' in request.session:
+        try:
+            # Buscar usuário diretamente
+            usuario = Usuario.objects.get(id_usuario=request.session['usuario_id'])
+            # ✅ CORREÇÃO: Redirecionar para dashboard (não para initial.html)
+            return redirect('dashboard')
+        except (Usuario.DoesNotExist, ValueError):
+            # Se usuário não existe, limpar sessão
+            request.session.flush()
+    
+    # ✅ CORREÇÃO: Query separada para usuários recentes
+    usuarios_recentes = list(Usuario.objects.all().order_by('-criado_em')[:3])
+    
+    if request.method == 'POST':
+        # Prevenção contra brute force
+        if not security.prevent_brute_force(request, 'user_creation', max_attempts=3, window_seconds=900):
+            return render(request, 'home.html', {
+                'error': 'Muitas tentativas de criação de usuário. Aguarde 15 minutos.',
+                'usuarios': usuarios_recentes
+            })
+        
+        try:
+            username = security.sanitize_input(request.POST.get('username', '').strip())
+            codigo_suporte = request.POST.get('codigo_suporte')
+            
+            logger.info(f"Tentativa de criação de usuário: {username}")
+            
+            # Validações básicas
+            if not username or not codigo_suporte:
+                return render(request, 'home.html', {
+                    'error': 'Todos os campos são obrigatórios!',
+                    'usuarios': usuarios_recentes
+                })
+            
+            # Validar username
+            try:
+                security.validate_username(username)
+            except ValidationError as e:
+                return render(request, 'home.html', {
+                    'error': str(e),
+                    'usuarios': usuarios_recentes
+                })
+            
+            # Validar código de suporte
+            try:
+                codigo_int = security.validate_codigo_suporte(codigo_suporte)
+            except ValidationError as e:
+                return render(request, 'home.html', {
+                    'error': str(e),
+                    'usuarios': usuarios_recentes
+                })
+            
+            # Verificar se username já existe
+            if Usuario.objects.filter(username=username).exists():
+                return render(request, 'home.html', {
+                    'error': 'Este nome de usuário já está em uso. Escolha outro.',
+                    'usuarios': usuarios_recentes
+                })
+            
+            # Determinar tipo de usuário
+            if 100000 <= codigo_int <= 199999:
+                tipo_usuario = 'suporte'
+            else:
+                tipo_usuario = 'colaborador'
+            
+            # Criar usuário
+            usuario = Usuario.objects.create(
+                username=username,
+                codigo_suporte=codigo_int,
+                tipo_usuario=tipo_usuario
+            )
+            
+            logger.info(f"Usuário criado com sucesso: {username} (ID: {usuario.id_usuario}) - Tipo: {tipo_usuario}")
+            
+            # Configurar sessão
+            request.session['usuario_id'] = str(usuario.id_usuario)
+            request.session['username'] = usuario.username
+            request.session['tipo_usuario'] = usuario.tipo_usuario
+            request.session.set_expiry(86400)
+            request.session.modified = True
+            
+            # ✅ CORREÇÃO: Redirecionar para dashboard após criação
+            return redirect('dashboard')
+            
+        except IntegrityError as e:
+            logger.error(f"Erro de integridade ao criar usuário: {str(e)}")
+            return render(request, 'home.html', {
+                'error': 'Erro ao criar usuário. Tente novamente.',
+                'usuarios': usuarios_recentes
+            })
+        except Exception as e:
+            logger.error(f"Erro inesperado ao criar usuário: {str(e)}")
+            return render(request, 'home.html', {
+                'error': 'Erro no sistema. Por favor, tente novamente.',
+                'usuarios': usuarios_recentes
+            })
+    
+    return render(request, 'home.html', {'usuarios': usuarios_recentes})
+
+@require_http_methods(["GET", "POST"])
+def logout_usuario(request):
+    """View para fazer logout do usuário de forma segura"""
+    request.session.flush()
+    return redirect('home')
+
+@require_http_methods(["GET"])
+@usuario_required
+def api_info(request):
+    """Endpoint para API JSON com informações do sistema"""
+    return JsonResponse({
+        'message': '🚀 API Projeto AI - Online!',
+        'usuario': {
+            'username': request.usuario.username,
+            'tipo_usuario': request.usuario.tipo_usuario,
+        },
+        'endpoints': {
+            'admin': '/admin/',
+            'api_info': '/api/info/',
+            'home': '/',
+            'dashboard': '/dashboard/',
+            'sistema_chamados': '/chamados/',
+            'logout': '/logout/',
+            'chamados': '/api/chamados/',
+            'interacoes': '/api/interacoes/',
+            'notificacoes': '/api/notificacoes/',
+            'metricas_sla': '/api/sla/',
+            'volume_chamados': '/api/volume/',
+        }
+    })
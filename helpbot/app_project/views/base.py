@@ -0,0 +1,137 @@
+"""
+Infraestrutura comum das views: logger, rate limit e autenticação por sessão
+"""
+import logging
+from django.shortcuts import redirect
+from django.http import JsonResponse
+from functools import wraps
+from asgiref.sync import sync_to_async
+import asyncio
+from django.conf import settings
+from django.core.cache import cache
+from ..models import Usuario
+from ..security import security
+from ..escrita_adiada import buffer_escrita
+from ..longpoll import segundos_espera
+
+logger = logging.getLogger(__name__)
+# ✅ Eventos de alto volume (dashboard, polling, mensagens): amostrados via LOG_AMOSTRAGEM
+logger_frequente = logging.getLogger('app_project.views.frequente')
+
+def _resposta_rate_limit_excedido(request, view_func):
+    client_ip = request.META.get('REMOTE_ADDR', 'unknown')
+    logger.warning(f"Rate limit excedido: {client_ip} - {view_func.__name__}")
+    return JsonResponse({
+        'success': False,
+        'message': 'Limite de requisições excedido. Tente novamente mais tarde.'
+    }, status=429)
+
+# Long-poll (?wait=N): cada ciclo já espera no servidor e o cliente reabre logo em seguida;
+# contador próprio, com limite maior que o das verificações comuns
+LIMITE_LONGPOLL = getattr(settings, 'LONGPOLL_RATE_LIMIT', 1800)
+
+def _chave_rate_limit(request, view_func, max_requests):
+    """Chave e limite: por usuário (IP só sem sessão - vários usuários atrás de um NAT dividem o IP)"""
+    usuario = getattr(request, 'usuario', None)
+    identidade = f"u{usuario.pk}" if usuario is not None else request.META.get('REMOTE_ADDR', 'unknown')
+    if segundos_espera(request) > 0:
+        return f"rate_limit_{view_func.__name__}_espera_{identidade}", max(max_requests, LIMITE_LONGPOLL)
+    return f"rate_limit_{view_func.__name__}_{identidade}", max_requests
+
+def rate_limit(max_requests=100, window=3600):
+    """
+    Decorator para limitar taxa de requisições (funciona em views sync e async).
+    Aplicado depois de usuario_required, conta por usuário.
+    """
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view_async(request, *args, **kwargs):
+                if not settings.DEBUG:  # Só aplica em produção
+                    key, limite = _chave_rate_limit(request, view_func, max_requests)
+                    current = await cache.aget(key, 0)
+                    if current >= limite:
+                        return _resposta_rate_limit_excedido(request, view_func)
+                    await cache.aset(key, current + 1, window)
+
+                return await view_func(request, *args, **kwargs)
+            return _wrapped_view_async
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if not settings.DEBUG:  # Só aplica em produção
+                key, limite = _chave_rate_limit(request, view_func, max_requests)
+                current = cache.get(key, 0)
+                if current >= limite:
+                    return _resposta_rate_limit_excedido(request, view_func)
+                cache.set(key, current + 1, window)
+            
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+def usuario_required(view_func):
+    """Decorator para verificar se o usuário está cadastrado com segurança reforçada"""
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_view_async(request, *args, **kwargs):
+            # Sessão não tem API async no Django 4.2: o acesso ao backend roda em thread
+            usuario_id = await sync_to_async(request.session.get)('usuario_id')
+            if usuario_id is None:
+                logger.warning("Tentativa de acesso sem sessão de usuário")
+                return redirect('home')
+
+            try:
+                if not security.validate_uuid(usuario_id):
+                    logger.warning(f"ID de usuário inválido na sessão: {usuario_id}")
+                    await sync_to_async(request.session.flush)()
+                    return redirect('home')
+
+                try:
+                    request.usuario = await Usuario.objects.aget(id_usuario=usuario_id)
+                    # Marcações de leitura ainda no buffer entram antes das consultas deste usuário
+                    await buffer_escrita.asincronizar(request.usuario.pk)
+                except Usuario.DoesNotExist:
+                    logger.warning(f"Usuário não encontrado na sessão: {usuario_id}")
+                    await sync_to_async(request.session.flush)()
+                    return redirect('home')
+
+            except Exception as e:
+                logger.error(f"Erro no decorator de usuário: {str(e)}")
+                await sync_to_async(request.session.flush)()
+                return redirect('home')
+
+            return await view_func(request, *args, **kwargs)
+        return _wrapped_view_async
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if 'usuario_id' not in request.session:
+            logger.warning("Tentativa de acesso sem sessão de usuário")
+            return redirect('home')
+        
+        try:
+            # Validar UUID do usuário
+            usuario_id = request.session['usuario_id']
+            if not security.validate_uuid(usuario_id):
+                logger.warning(f"ID de usuário inválido na sessão: {usuario_id}")
+                request.session.flush()
+                return redirect('home')
+            
+            # ✅ CORREÇÃO CRÍTICA: Buscar usuário sem usar get_object_or_404 que pode causar problemas
+            try:
+                usuario = Usuario.objects.get(id_usuario=usuario_id)
+                request.usuario = usuario
+                # Marcações de leitura ainda no buffer entram antes das consultas deste usuário
+                buffer_escrita.sincronizar(usuario.pk)
+                return view_func(request, *args, **kwargs)
+            except Usuario.DoesNotExist:
+                logger.warning(f"Usuário não encontrado na sessão: {usuario_id}")
+                request.session.flush()
+                return redirect('home')
+            
+        except Exception as e:
+            logger.error(f"Erro no decorator de usuário: {str(e)}")
+            request.session.flush()
+            return redirect('home')
+    return _wrapped_view
@@ -0,0 +1,969 @@
+"""
+Views de chamados: dashboard, criação, detalhes, status, busca, exportação e lote
+"""
+import logging
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.db import transaction
+from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+import json
+import time
+from django.views.decorators.http import require_http_methods
+from django.conf import settings
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.cache import cache
+from urllib.parse import urlencode
+from ..models import Usuario, Chamado, InteracaoChamado, Notificacao
+from ..bot_dialogos import bot_dialogos
+from ..security import security
+from ..versoes import obter_versao
+from ..tarefas import agendar_em as agendar_tarefa_em
+from ..departamentos import registro_departamentos
+from ..duplicidade import indice_duplicados
+from ..eventos import publicar, CHAMADO_CRIADO
+from .. import exportacao, lote
+from ..busca import motor_busca, trecho_seguro
+from ..projecao import ProjecaoChamados
+from ..filtros import filtrar_chamados, filtros_padrao
+from ..longpoll import registro_espera, canal_notificacoes
+from .base import logger_frequente, rate_limit, usuario_required
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo (segundos) dos contadores do dashboard em cache; a versão global invalida antes disso
+CACHE_DASHBOARD_TIMEOUT = getattr(settings, 'CACHE_DASHBOARD_TIMEOUT', 300)
+
+def _contadores_chamados(chamados_query, escopo):
+    """Contadores dos cartões do dashboard, em cache até o próximo chamado alterado"""
+    chave = f"contadores_chamados:{obter_versao('chamados')}:{escopo}"
+    contadores = cache.get(chave)
+    if contadores is None:
+        total_chamados = chamados_query.count()
+        pendentes_count = chamados_query.filter(status='em_andamento').count()
+        contadores = {
+            'total_chamados': total_chamados,
+            'pendentes_count': pendentes_count,
+            'solucionados_count': chamados_query.filter(status='resolvido').count(),
+            'urgentes_count': chamados_query.filter(urgencia='urgente', status='em_andamento').count(),
+            # Lógica do Gráfico
+            'porcentagem_pendentes': round((pendentes_count / total_chamados) * 100) if total_chamados > 0 and pendentes_count > 0 else 0,
+        }
+        cache.set(chave, contadores, CACHE_DASHBOARD_TIMEOUT)
+    return contadores
+
+# === LÓGICA DO DASHBOARD DE ADMIN ===
+def _get_dashboard_context(request=None, page=1, items_per_page=10):
+    """Função helper para buscar os dados do dashboard - CORRIGIDA"""
+    
+    try:
+        # ✅ CORREÇÃO: Criar query inicial FRESCA
+        chamados_query = Chamado.objects.all().order_by('-criado_em')
+        filtros_ativos = filtros_padrao()
+        
+        if request and request.method == 'GET':
+            # Mesmos filtros da exportação (app_project/filtros.py)
+            chamados_query, filtros_ativos = filtrar_chamados(request.GET, chamados_query)
+        
+        chave_filtros = urlencode(sorted(filtros_ativos.items()))
+
+        # ✅ Contadores dos cartões em cache, versionados pelo contador global de chamados
+        contadores = _contadores_chamados(chamados_query, f"filtros:{chave_filtros}")
+        total_chamados = contadores['total_chamados']
+        
+        # ✅ Linhas projetadas (app_project/projecao.py), só consultadas se o template iterar
+        chamados_projetados = ProjecaoChamados(chamados_query)
+        
+        # Paginação - reaproveita o total já contado em vez de um novo COUNT
+        paginator = Paginator(chamados_projetados, items_per_page)
+        paginator.count = total_chamados
+        
+        try:
+            chamados_paginados = paginator.page(page)
+        except PageNotAnInteger:
+            chamados_paginados = paginator.page(1)
+        except EmptyPage:
+            chamados_paginados = paginator.page(paginator.num_pages)
+        
+        # ✅ Querysets preguiçosos: só são avaliados se o fragmento não estiver em cache
+        chamados_recentes = chamados_projetados[:5]
+
+        context = dict(contadores)
+        context.update({
+            'chamados_recentes': chamados_recentes,
+            'chamados_paginados': chamados_paginados,
+            'filtros_ativos': filtros_ativos,
+            'departamentos': registro_departamentos.todos(),
+            'versao_chamados': obter_versao('chamados'),
+            'versao_departamentos': registro_departamentos.versao(),
+            'chave_filtros': chave_filtros,
+            'chave_pagina': urlencode(sorted(request.GET.items())) if request else '',
+        })
+        
+        logger.info(f"Contexto retornado: Total={total_chamados}, Pendentes={contadores['pendentes_count']}")
+        return context
+        
+    except Exception as e:
+        logger.error(f"Erro em _get_dashboard_context: {str(e)}")
+        # Retornar contexto vazio em caso de erro
+        return {
+            'total_chamados': 0,
+            'pendentes_count': 0,
+            'solucionados_count': 0,
+            'urgentes_count': 0,
+            'chamados_recentes': [],
+            'chamados_paginados': [],
+            'porcentagem_pendentes': 0,
+            'filtros_ativos': {},
+            'departamentos': [],
+        }
+
+# ✅ CORREÇÃO: View dashboard corrigida para COLABORADORES E SUPORTE
+@usuario_required
+@require_http_methods(["GET"])
+def dashboard(request):
+    """Dashboard principal - CORRIGIDA PARA COLABORADORES E SUPORTE"""
+    
+    # ✅ CORREÇÃO: Verificar se o usuário existe na request
+    if not hasattr(request, 'usuario') or not request.usuario:
+        logger.warning("Usuário não encontrado na request, redirecionando para home")
+        return redirect('home')
+    
+    # ✅ CORREÇÃO CRÍTICA: Permitir que COLABORADORES acessem o dashboard
+    # Agora tanto suporte quanto colaboradores podem acessem o dashboard
+    page = request.GET.get('page', 1)
+    
+    try:
+        # ✅ CORREÇÃO: Para colaboradores, mostrar apenas seus próprios chamados
+        if request.usuario.tipo_usuario == 'colaborador':
+            # Buscar apenas os chamados do usuário colaborador
+            chamados_query = Chamado.objects.filter(usuario=request.usuario).order_by('-criado_em')
+            escopo_cartoes = f"usuario:{request.usuario.id_usuario}"
+            contadores = _contadores_chamados(chamados_query, escopo_cartoes)
+            
+            # Paginação para colaboradores
+            chamados_projetados = ProjecaoChamados(chamados_query)
+            paginator = Paginator(chamados_projetados, 10)
+            paginator.count = contadores['total_chamados']
+            
+            try:
+                chamados_paginados = paginator.page(page)
+            except PageNotAnInteger:
+                chamados_paginados = paginator.page(1)
+            except EmptyPage:
+                chamados_paginados = paginator.page(paginator.num_pages)
+            
+            context = dict(contadores)
+            context.update({
+                'chamados_recentes': chamados_projetados[:5],
+                'chamados_paginados': chamados_paginados,
+                'filtros_ativos': {},
+                'departamentos': registro_departamentos.todos(),
+                'usuario': request.usuario,
+                'versao_chamados': obter_versao('chamados'),
+                'chave_filtros': escopo_cartoes,
+            })
+            
+        else:
+            # Para suporte: mostrar o dashboard completo
+            context = _get_dashboard_context(request, page=page)
+            context['usuario'] = request.usuario
+        
+        # ✅ CORREÇÃO CRÍTICA: Buscar notificações de forma correta para ambos os tipos
+        try:
+            notificacoes = Notificacao.objects.filter(
+                usuario=request.usuario
+            ).order_by('-criado_em')[:10]
+            
+            notificacoes_nao_lidas_count = Notificacao.objects.filter(
+                usuario=request.usuario,
+                lida=False
+            ).count()
+            
+            context.update({
+                'notificacoes': notificacoes,
+                'notificacoes_nao_lidas_count': notificacoes_nao_lidas_count,
+            })
+            
+            logger_frequente.info("Notificações carregadas: %d não lidas", notificacoes_nao_lidas_count)
+            
+        except Exception as e:
+            logger.error(f"Erro ao buscar notificações: {str(e)}")
+            context.update({
+                'notificacoes': [],
+                'notificacoes_nao_lidas_count': 0,
+            })
+        
+        logger_frequente.info(
+            "Dashboard carregado para %s (tipo: %s)", request.usuario.username, request.usuario.tipo_usuario,
+            extra={'usuario': request.usuario.username}
+        )
+        return render(request, 'dashboard.html', context)
+        
+    except Exception as e:
+        logger.error(f"Erro ao carregar dashboard: {str(e)}")
+        # Contexto de fallback em caso de erro
+        return render(request, 'dashboard.html', {
+            'total_chamados': 0,
+            'pendentes_count': 0,
+            'solucionados_count': 0,
+            'urgentes_count': 0,
+            'chamados_recentes': [],
+            'chamados_paginados': [],
+            'porcentagem_pendentes': 0,
+            'filtros_ativos': {},
+            'departamentos': [],
+            'usuario': request.usuario,
+            'notificacoes': [],
+            'notificacoes_nao_lidas_count': 0,
+        })
+
+# ✅ CORREÇÃO: View todos_chamados corrigida para passar request
+@usuario_required
+@require_http_methods(["GET"])
+def todos_chamados(request):
+    """Página para listar todos os chamados (apenas para suporte)"""
+    if request.usuario.tipo_usuario != 'suporte':
+        logger.warning(f"Tentativa de acesso a todos_chamados por não-suporte: {request.usuario.username}")
+        return HttpResponseForbidden("Apenas usuários de suporte podem acessar esta página.")
+    
+    # ✅ CORREÇÃO: Reutiliza a lógica do dashboard COM FILTROS
+    page = request.GET.get('page', 1)
+    context = _get_dashboard_context(request, page=page)
+    context['usuario'] = request.usuario
+    
+    return render(request, 'todos_chamados.html', context)
+
+@usuario_required
+@require_http_methods(["GET", "POST"])
+@rate_limit(max_requests=50, window=3600)
+def sistema_chamados(request):
+    """View unificada para criação de chamados (página 'Novo Chamado')"""
+    departamentos = registro_departamentos.todos()
+    
+    if request.method == 'POST':
+        return criar_chamado_api(request)
+    
+    # Renderiza a página de formulário
+    return render(request, 'initial.html', {
+        'departamentos': departamentos,
+        'usuario': request.usuario
+    })
+
+# === FUNÇÕES AUXILIARES PARA FORMATAÇÃO DE MENSAGENS ===
+
+def formatar_mensagem_colaborador(chamado):
+    """Formata a mensagem para o colaborador conforme a imagem"""
+    data_hora = timezone.localtime(chamado.criado_em)
+    data_formatada = data_hora.strftime('%d/%m/%Y às %H:%M')
+    
+    return f"""**SEU CHAMADO FOI CRIADO!**  
+{chamado.titulo}  
+
+{chamado.id_legivel} Aguarde enquanto nossa equipe entra em contato.  
+
+{data_formatada}"""
+
+def formatar_mensagem_suporte(chamado, nome_solicitante, departamento):
+    """Formata a mensagem para o suporte com todas as informações"""
+    return f"""🚨 **NOVO CHAMADO CRIADO**
+📝 {chamado.titulo}
+👤 {nome_solicitante}
+🏢 {departamento.nome}
+🆔 {chamado.id_legivel}"""
+
+@usuario_required
+@require_http_methods(["POST"])
+@rate_limit(max_requests=20, window=3600)
+def criar_chamado_api(request):
+    """API para criar chamado via AJAX/JSON com segurança - CORRIGIDA"""
+    try:
+        # ✅ CORREÇÃO: Verificar se é requisição AJAX ou form tradicional
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+        
+        if request.content_type == 'application/json':
+            try:
+                # Limitar tamanho do body JSON
+                if len(request.body) > 10000:  # 10KB max
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Payload muito grande'
+                    }, status=413)
+                    
+                data = json.loads(request.body)
+            except json.JSONDecodeError as e:
+                logger.warning(f"JSON inválido recebido de {request.usuario.username}: {e}")
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Dados inválidos'
+                }, status=400)
+        else:
+            data = request.POST
+        
+        # ✅ CORREÇÃO: Sanitizar e validar dados de forma mais robusta
+        titulo = security.sanitize_input(data.get('titulo', '').strip(), max_length=200)
+        descricao = security.sanitize_input(data.get('descricao', '').strip(), max_length=1000)
+        departamento_id = data.get('departamento')
+        localizacao = data.get('localizacao', 'presencial')
+        modalidade_presencial = localizacao == 'presencial'
+        
+        logger.info(f"Tentativa de criar chamado: {titulo} - Dept: {departamento_id} - Local: {localizacao}")
+        
+        # ✅ CORREÇÃO: Validações mais detalhadas
+        if not titulo:
+            return JsonResponse({
+                'success': False,
+                'message': 'Título é obrigatório!'
+            }, status=400)
+        
+        if not descricao:
+            return JsonResponse({
+                'success': False,
+                'message': 'Descrição é obrigatória!'
+            }, status=400)
+        
+        if not departamento_id:
+            return JsonResponse({
+                'success': False,
+                'message': 'Departamento é obrigatório!'
+            }, status=400)
+        
+        if len(titulo) < 5:
+            return JsonResponse({
+                'success': False,
+                'message': 'Título muito curto (mínimo 5 caracteres)'
+            }, status=400)
+        
+        if len(descricao) < 10:
+            return JsonResponse({
+                'success': False,
+                'message': 'Descrição muito curta (mínimo 10 caracteres)'
+            }, status=400)
+        
+        # ✅ Registro em memória: sem consulta ao banco
+        departamento = registro_departamentos.obter(departamento_id)
+        if departamento is None:
+            logger.error(f"Departamento não encontrado: {departamento_id}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Departamento selecionado não encontrado!'
+            }, status=400)
+        
+        # ✅ Quase duplicado de um chamado aberto? (índice LSH em memória, sem varrer a tabela)
+        try:
+            duplicado_de_id = indice_duplicados.procurar(titulo, descricao, departamento.id_departamento)
+        except Exception as e:
+            logger.error(f"Erro ao procurar chamados duplicados: {str(e)}")
+            duplicado_de_id = None
+        
+        # ✅ CORREÇÃO: Criar chamado com tratamento de erro específico
+        # Transação curta: o INSERT do chamado e o evento ChamadoCriado. Mensagem do bot,
+        # notificações e verificação agendada ficam com os assinantes, depois do commit.
+        try:
+            with transaction.atomic():
+                chamado = Chamado.objects.create(
+                    titulo=titulo,
+                    descricao=descricao,
+                    nome_solicitante=request.usuario.username,
+                    departamento=departamento,
+                    modalidade_presencial=modalidade_presencial,
+                    status='em_andamento',
+                    usuario=request.usuario,
+                    duplicado_de_id=duplicado_de_id
+                )
+                publicar(CHAMADO_CRIADO, chamado, autor_id=request.usuario.id_usuario)
+            
+            if duplicado_de_id:
+                logger.info(f"Chamado {chamado.id_legivel} vinculado como duplicado de {duplicado_de_id}")
+            else:
+                indice_duplicados.adicionar(chamado)
+            logger.info(f"Chamado criado com sucesso: {chamado.id_legivel} por {request.usuario.username}")
+            
+        except Exception as e:
+            logger.error(f"Erro ao criar chamado no banco: {str(e)}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Erro ao salvar chamado no banco de dados'
+            }, status=500)
+        
+        # ✅ CORREÇÃO: Resposta de sucesso detalhada
+        response_data = {
+            'success': True,
+            'message': 'Chamado criado com sucesso!',
+            'chamado_id': str(chamado.id_chamado),
+            'chamado_legivel': chamado.id_legivel,
+            'nome_solicitante': request.usuario.username,
+            'departamento': departamento.nome,
+            'titulo': titulo,
+            'modalidade': 'Presencial' if modalidade_presencial else 'Home Office',
+            'status': chamado.get_status_display(),
+            'urgencia': chamado.get_urgencia_display(),
+            'sequencia_ativa': True,
+            'tipo_usuario': request.usuario.tipo_usuario,  # ✅ Adicionar tipo de usuário
+            'duplicado_de': (
+                Chamado.objects.filter(pk=duplicado_de_id).values_list('id_legivel', flat=True).first()
+                if duplicado_de_id else None
+            ),
+        }
+        
+        logger.info(f"Resposta enviada para criação de chamado: {chamado.id_legivel}")
+        return JsonResponse(response_data)
+        
+    except Exception as e:
+        logger.error(f"Erro crítico ao criar chamado via API: {str(e)}", exc_info=True)
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor. Tente novamente.'
+        }, status=500)
+
+def processar_chamado_criado(id_chamado):
+    """
+    ✅ Efeitos da criação do chamado (assinante de ChamadoCriado).
+    Idempotente: numa re-entrega não duplica mensagens nem notificações.
+    """
+    chamado = Chamado.objects.select_related(
+        'departamento', 'usuario', 'duplicado_de__suporte_responsavel'
+    ).get(id_chamado=id_chamado)
+    mensagem_colaborador = formatar_mensagem_colaborador(chamado)
+    
+    # 1. Criar mensagem no chat do colaborador formatada
+    if not InteracaoChamado.objects.filter(chamado=chamado, acao_bot='criacao_chamado').exists():
+        InteracaoChamado.objects.create(
+            chamado=chamado,
+            remetente='bot',
+            mensagem=mensagem_colaborador,
+            acao_bot='criacao_chamado'
+        )
+    
+    # 2. Criar notificação para o COLABORADOR
+    if chamado.usuario and not Notificacao.objects.filter(
+        chamado=chamado, usuario=chamado.usuario, tipo='meu_chamado'
+    ).exists():
+        Notificacao.objects.create(
+            usuario=chamado.usuario,
+            chamado=chamado,
+            mensagem=mensagem_colaborador,
+            tipo='meu_chamado'
+        )
+    
+    # 3. Quase duplicado: vínculo com o chamado original (broadcast só se ele não tiver responsável)
+    if chamado.duplicado_de:
+        _processar_chamado_duplicado(chamado, chamado.duplicado_de)
+        return
+    
+    # 4. Notificar SUPORTES com mensagem detalhada
+    _notificar_suportes(chamado, chamado.get_nome_exibicao(), chamado.departamento)
+
+def _processar_chamado_duplicado(chamado, original):
+    """Avisa o colaborador do vínculo e só o suporte responsável pelo original (sem responsável: todos)"""
+    if not InteracaoChamado.objects.filter(chamado=chamado, acao_bot='chamado_duplicado').exists():
+        aviso = bot_dialogos.get_aviso_chamado_duplicado(original)
+        InteracaoChamado.objects.create(
+            chamado=chamado,
+            remetente='bot',
+            mensagem=aviso['mensagem'],
+            acao_bot=aviso['acao_bot']
+        )
+    
+    suporte = original.suporte_responsavel
+    if suporte is None:
+        # Original ainda na fila: ninguém veria o novo chamado sem o broadcast
+        _notificar_suportes(chamado, chamado.get_nome_exibicao(), chamado.departamento)
+        logger.info(f"🔗 Chamado {chamado.id_legivel} é duplicado de {original.id_legivel} (sem responsável): broadcast enviado")
+        return
+
+    if not Notificacao.objects.filter(chamado=chamado, usuario=suporte, tipo='atualizacao').exists():
+        Notificacao.objects.create(
+            usuario=suporte,
+            chamado=chamado,
+            mensagem=bot_dialogos.get_notificacao_duplicado(chamado, original)['mensagem'],
+            tipo='atualizacao'
+        )
+    logger.info(f"🔗 Chamado {chamado.id_legivel} é duplicado de {original.id_legivel}: broadcast suprimido")
+
+def _notificar_suportes(chamado, nome_solicitante, departamento):
+    """Cria (em lote) a notificação broadcast dos suportes que ainda não a receberam"""
+    notificacao_data = bot_dialogos.get_notificacao_novo_chamado_broadcast(
+        chamado, nome_solicitante, departamento
+    )
+    
+    # ✅ UMA NOTIFICAÇÃO PARA CADA SUPORTE, num único INSERT
+    suportes_ja_notificados = Notificacao.objects.filter(
+        chamado=chamado, tipo='novo_chamado_broadcast'
+    ).values('usuario_id')
+    usuarios_suporte = Usuario.objects.filter(tipo_usuario='suporte').exclude(id_usuario__in=suportes_ja_notificados)
+    
+    novas_notificacoes = Notificacao.objects.bulk_create([
+        Notificacao(
+            usuario_id=id_suporte,
+            chamado=chamado,
+            mensagem=notificacao_data['mensagem'],
+            tipo='novo_chamado_broadcast',
+            lida=False,  # Sempre começa como não lida
+            broadcast=True,  # Marca como broadcast
+            broadcast_id=str(chamado.id_chamado)  # ID do chamado para agrupamento
+        )
+        for id_suporte in usuarios_suporte.values_list('id_usuario', flat=True)
+    ])
+    
+    # bulk_create não dispara post_save: avisar o long-poll de cada suporte
+    for notificacao in novas_notificacoes:
+        registro_espera.notificar_apos_commit(canal_notificacoes(notificacao.usuario_id))
+    
+    logger.info(f"✅ Notificações BROADCAST enviadas para {len(novas_notificacoes)} suportes - Chamado: {chamado.id_legivel}")
+    return len(novas_notificacoes)
+
+def notificar_suportes_novo_chamado(chamado, nome_solicitante, departamento):
+    """✅ CORREÇÃO FINAL: Notifica TODOS os suportes com mensagem detalhada usando broadcast"""
+    try:
+        return _notificar_suportes(chamado, nome_solicitante, departamento)
+    except Exception as e:
+        logger.error(f"❌ Erro ao notificar suportes: {str(e)}")
+        return 0
+
+def verificar_chamado_apos_10_minutos(id_chamado):
+    """✅ CORREÇÃO CRÍTICA: Verifica se o chamado foi atendido após 10 minutos - SEM DUPLICAÇÃO"""
+    # Agendador único em vez de uma thread dormindo 10 minutos por chamado
+    agendar_tarefa_em(600, _verificar_chamado_10_minutos, id_chamado)
+
+def _verificar_chamado_10_minutos(id_chamado):
+    """Executada pelo agendador de tarefas 10 minutos após a criação"""
+    logger.info(f"⏰ Iniciando verificação de 10min para chamado {id_chamado}")
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        if chamado.status == 'em_andamento':
+            # ✅ CORREÇÃO: Verificar se já existe uma mensagem de verificação
+            verificacao_existente = InteracaoChamado.objects.filter(
+                chamado=chamado,
+                acao_bot='verificacao_tempo'
+            ).exists()
+            
+            if not verificacao_existente:
+                verificacao = bot_dialogos.get_verificacao_tempo()
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='bot',
+                    mensagem=verificacao['mensagem'],
+                    acao_bot=verificacao['acao_bot']
+                )
+                logger.info(f"✅ Verificação de 10min criada para chamado {chamado.id_legivel}")
+                
+                # ✅ CORREÇÃO: Agendar APENAS UMA verificação adicional após 5 minutos
+                verificar_chamado_apos_5_minutos(id_chamado)
+            else:
+                logger.info(f"ℹ️ Verificação de 10min já existe para chamado {chamado.id_legivel}")
+        else:
+            logger.info(f"ℹ️ Chamado {chamado.id_legivel} já foi resolvido, ignorando verificação")
+    except Chamado.DoesNotExist:
+        logger.warning(f"❌ Chamado {id_chamado} não encontrado para verificação")
+    except Exception as e:
+        logger.error(f"❌ Erro na verificação de 10min do chamado {id_chamado}: {str(e)}")
+
+def verificar_chamado_apos_5_minutos(id_chamado):
+    """✅ CORREÇÃO: Verificação adicional após 5 minutos da primeira verificação - SEM DUPLICAÇÃO"""
+    agendar_tarefa_em(300, _verificar_chamado_5_minutos, id_chamado)
+
+def _verificar_chamado_5_minutos(id_chamado):
+    """Executada pelo agendador de tarefas 5 minutos após a primeira verificação"""
+    logger.info(f"⏰ Iniciando verificação de 5min adicional para chamado {id_chamado}")
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        if chamado.status == 'em_andamento':
+            # ✅ CORREÇÃO: Verificar se já existe uma mensagem de verificação urgente
+            verificacao_urgente_existente = InteracaoChamado.objects.filter(
+                chamado=chamado,
+                acao_bot='verificacao_urgente'
+            ).exists()
+            
+            if not verificacao_urgente_existente:
+                verificacao_urgente = bot_dialogos.get_verificacao_urgente()
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='bot',
+                    mensagem=verificacao_urgente['mensagem'],
+                    acao_bot=verificacao_urgente['acao_bot']
+                )
+                logger.info(f"✅ Verificação urgente criada para chamado {chamado.id_legivel}")
+            else:
+                logger.info(f"ℹ️ Verificação urgente já existe para chamado {chamado.id_legivel}")
+        else:
+            logger.info(f"ℹ️ Chamado {chamado.id_legivel} já foi resolvido, ignorando verificação urgente")
+    except Chamado.DoesNotExist:
+        logger.warning(f"❌ Chamado {id_chamado} não encontrado para verificação urgente")
+    except Exception as e:
+        logger.error(f"❌ Erro na verificação urgente do chamado {id_chamado}: {str(e)}")
+
+# === OPERAÇÕES EM LOTE ===
+
+def _ler_lote(request):
+    """(dados, ids) do corpo JSON; levanta ValueError com a mensagem para o usuário"""
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except json.JSONDecodeError:
+        raise ValueError('Dados inválidos')
+    ids = data.getlist('ids') if hasattr(data, 'getlist') else data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('Informe a lista de IDs.')
+    if len(ids) > lote.MAX_ITENS_LOTE:
+        raise ValueError(f'Máximo de {lote.MAX_ITENS_LOTE} itens por lote.')
+    return data, ids
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=60, window=3600)
+def chamados_em_lote(request):
+    """
+    ✅ Resolver, reatribuir ou marcar como visualizados vários chamados de uma vez.
+    Corpo: {"acao": "resolver"|"reatribuir"|"marcar_visualizado", "ids": [...],
+    "observacao": "...", "suporte_destino": "<id_usuario>"}
+    """
+    try:
+        data, ids = _ler_lote(request)
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+    acao = data.get('acao')
+    if acao not in ('resolver', 'reatribuir', 'marcar_visualizado'):
+        return JsonResponse({
+            'success': False,
+            'message': 'Ação inválida.'
+        }, status=400)
+
+    # Colaborador só pode resolver os próprios chamados (mesma regra do trocar_status_chamado)
+    if acao != 'resolver' and request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem executar esta ação.'
+        }, status=403)
+
+    try:
+        if acao == 'resolver':
+            observacao = security.sanitize_input(data.get('observacao', ''), max_length=200)
+            resultados, total = lote.resolver(request.usuario, ids, observacao)
+        elif acao == 'reatribuir':
+            id_destino = data.get('suporte_destino') or request.usuario.id_usuario
+            if not security.validate_uuid(id_destino):
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Suporte de destino inválido.'
+                }, status=400)
+            suporte_destino = Usuario.objects.filter(id_usuario=id_destino, tipo_usuario='suporte').first()
+            if not suporte_destino:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Suporte de destino não encontrado.'
+                }, status=400)
+            resultados, total = lote.reatribuir(request.usuario, ids, suporte_destino)
+        else:
+            resultados, total = lote.marcar_visualizados(request.usuario, ids)
+
+        return JsonResponse({
+            'success': True,
+            'message': f'{total} de {len(resultados)} chamado(s) atualizado(s).',
+            'total_aplicados': total,
+            'resultados': resultados
+        })
+    except Exception as e:
+        logger.error(f"Erro na operação em lote '{acao}': {str(e)}", exc_info=True)
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+# === VIEWS EXISTENTES (MANTIDAS PARA COMPATIBILIDADE) ===
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=10, window=3600)
+def confirmar_atendimento(request, id_chamado):
+    """API para o suporte confirmar que atendeu o chamado - ATUALIZADA COM NOTIFICAÇÕES"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Tentativa de confirmar atendimento sem permissão: {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem confirmar atendimentos.'
+            }, status=403)
+        
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        # ✅ Notificações e mensagens de finalização do bot saem pelos assinantes de StatusAlterado
+        chamado.alterar_status('resolvido', 'suporte', autor=request.usuario)
+        
+        logger.info(f"Chamado {id_chamado} marcado como resolvido por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Chamado marcado como resolvido com sucesso!'
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao confirmar atendimento: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=10, window=3600)
+def usuario_confirmar_resolucao(request, id_chamado):
+    """API para o usuário confirmar que o problema foi resolvido - ATUALIZADA COM MENSAGEM FINAL"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        if chamado.usuario != request.usuario:
+            logger.warning(f"Tentativa de confirmar resolução de chamado alheio: {request.usuario.username} -> {id_chamado}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Você só pode confirmar resolução dos seus próprios chamados.'
+            }, status=403)
+        
+        with transaction.atomic():
+            chamado.alterar_status('resolvido', 'confirmacao_usuario', autor=request.usuario)
+            
+            InteracaoChamado.objects.create(
+                chamado=chamado,
+                remetente='usuario',
+                mensagem="✅ Confirmo que meu problema foi resolvido!"
+            )
+        # ✅ Mensagens de finalização do bot saem pelo assinante de StatusAlterado
+        
+        logger.info(f"Chamado {id_chamado} finalizado pelo usuário {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Chamado finalizado com sucesso!'
+        })
+            
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao confirmar resolução: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@usuario_required
+def detalhes_chamado(request, id_chamado):
+    """Página de detalhes do chamado"""
+    if not security.validate_uuid(id_chamado):
+        return HttpResponseForbidden("ID de chamado inválido")
+    
+    chamado = get_object_or_404(Chamado, id_chamado=id_chamado)
+    
+    # ✅ CORREÇÃO: Permitir que COLABORADORES acessem seus próprios chamados
+    if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+        logger.warning(f"Tentativa de acesso não autorizado aos detalhes do chamado {id_chamado} por {request.usuario.username}")
+        return HttpResponseForbidden("Acesso não autorizado a este chamado.")
+    
+    # Buscar TODAS as interações do chat
+    interacoes = InteracaoChamado.objects.filter(chamado=chamado).order_by('criado_em')
+    
+    return render(request, 'detalhes_chamado.html', {
+        'chamado': chamado,
+        'interacoes': interacoes,
+        'usuario': request.usuario
+    })
+
+@require_http_methods(["GET"])
+@usuario_required
+def meus_chamados(request):
+    """Página para listar os chamados do usuário"""
+    departamentos = registro_departamentos.todos()
+    return render(request, 'initial.html', {
+        'departamentos': departamentos,
+        'usuario': request.usuario
+    })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def atualizar_status_chamado(request, id_chamado):
+    """API para atualizar o status de um chamado"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES atualizem seus próprios chamados
+        if request.usuario.tipo_usuario != 'suporte' and chamado.usuario != request.usuario:
+            logger.warning(f"Tentativa de atualizar status não autorizada: {request.usuario.username} -> {id_chamado}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado.'
+            }, status=403)
+        
+        # Verificar o content type para determinar como ler os dados
+        if request.content_type == 'application/json':
+            data = json.loads(request.body)
+        else:
+            data = request.POST
+        
+        novo_status = data.get('status')
+        
+        if novo_status not in dict(Chamado.STATUS_CHOICES):
+            return JsonResponse({
+                'success': False,
+                'message': 'Status inválido.'
+            }, status=400)
+        
+        # ✅ A mensagem "Status atualizado" do bot sai pelo assinante de StatusAlterado
+        chamado.alterar_status(novo_status, 'atualizacao', autor=request.usuario)
+        
+        logger.info(f"Status do chamado {id_chamado} atualizado para {novo_status} por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Status atualizado com sucesso!',
+            'novo_status': chamado.get_status_display()
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao atualizar status: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=30, window=3600)
+def exportar_chamados(request):
+    """
+    ✅ Exportação em streaming (CSV/JSONL, gzip opcional) com os mesmos filtros da
+    tela de chamados, mais ?mes=AAAA-MM. Memória constante: nada é carregado inteiro.
+    """
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem exportar chamados.'
+        }, status=403)
+    
+    formato = request.GET.get('formato', 'csv')
+    if formato not in exportacao.FORMATOS:
+        return JsonResponse({
+            'success': False,
+            'message': 'Formato inválido (use csv ou jsonl).'
+        }, status=400)
+    transcricao = request.GET.get('transcricao', '1') != '0'
+    comprimir = request.GET.get('gzip') == '1'
+    
+    chamados_query, _ = filtrar_chamados(request.GET)
+    mes = request.GET.get('mes')
+    if mes:
+        try:
+            chamados_query = exportacao.filtrar_mes(chamados_query, mes)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Mês inválido (use AAAA-MM).'
+            }, status=400)
+    
+    logger.info(f"Exportação de chamados ({formato}, transcrição={transcricao}, gzip={comprimir}) por {request.usuario.username}")
+    response = StreamingHttpResponse(
+        exportacao.exportar(chamados_query, formato, transcricao, comprimir),
+        content_type='application/gzip' if comprimir else (
+            'text/csv; charset=utf-8' if formato == 'csv' else 'application/x-ndjson; charset=utf-8'
+        )
+    )
+    nome = exportacao.nome_arquivo(formato, comprimir, f"-{mes}" if mes else '')
+    response['Content-Disposition'] = f'attachment; filename="{nome}"'
+    return response
+
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=300, window=3600)
+def buscar_chamados(request):
+    """✅ Busca textual (índice FTS5/tsvector) em chamados e mensagens, ordenada por relevância"""
+    consulta = request.GET.get('q', '').strip()[:200]
+    if len(consulta) < 2:
+        return JsonResponse({
+            'success': False,
+            'message': 'Digite pelo menos 2 caracteres para buscar.'
+        }, status=400)
+    
+    try:
+        pagina = max(1, int(request.GET.get('pagina', 1)))
+        tamanho = max(1, min(int(request.GET.get('tamanho', 20)), 50))
+    except ValueError:
+        pagina, tamanho = 1, 20
+    
+    try:
+        inicio = time.perf_counter()
+        # Colaborador só encontra os próprios chamados
+        usuario_id = request.usuario.id_usuario if request.usuario.tipo_usuario != 'suporte' else None
+        resultados, tem_mais = motor_busca().buscar(consulta, usuario_id=usuario_id, pagina=pagina, tamanho=tamanho)
+        
+        chamados = Chamado.objects.only('id_chamado', 'id_legivel', 'titulo', 'status').in_bulk(
+            {resultado['chamado_id'] for resultado in resultados}
+        )
+        chamados = {chamado.id_chamado.hex: chamado for chamado in chamados.values()}
+        
+        resultados_data = []
+        for resultado in resultados:
+            chamado = chamados.get(resultado['chamado_id'])
+            if chamado is None:
+                continue
+            resultados_data.append({
+                'chamado_id': str(chamado.id_chamado),
+                'chamado_legivel': chamado.id_legivel,
+                'titulo': chamado.titulo,
+                'status': chamado.status,
+                'tipo': resultado['tipo'],
+                # Texto do usuário: a página troca os ** por destaque, o resto não pode virar HTML
+                'trecho': trecho_seguro(resultado['trecho']),
+                'relevancia': round(resultado['relevancia'], 4)
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'resultados': resultados_data,
+            'pagina': pagina,
+            'tem_mais': tem_mais,
+            'tempo_ms': round((time.perf_counter() - inicio) * 1000, 1)
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro em buscar_chamados: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
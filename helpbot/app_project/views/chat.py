@@ -0,0 +1,1025 @@
+"""
+Views do chat do chamado: mensagens, polling, cursores de leitura e sequência do bot
+"""
+import logging
+from django.http import JsonResponse
+from django.db import transaction
+from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+import json
+from django.views.decorators.http import require_http_methods
+from datetime import datetime, timezone as dt_timezone
+from ..models import Chamado, InteracaoChamado
+from ..bot_dialogos import bot_dialogos
+from ..security import security
+from ..serializacao import serializar_interacoes
+from ..leitura import cursores_leitura
+from ..transcricoes import transcricoes
+from ..eventos import publicar, MENSAGEM_ENVIADA
+from .. import lote
+from ..longpoll import canal_chamado, segundos_espera, aguardar_novidades
+from .base import logger_frequente, rate_limit, usuario_required
+from .chamados import formatar_mensagem_colaborador
+
+logger = logging.getLogger(__name__)
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+@usuario_required
+@rate_limit(max_requests=30, window=3600)
+def proxima_mensagem_bot(request, id_chamado):
+    """API para adicionar próxima mensagem na sequência (UMA DE CADA VEZ)"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO CRÍTICA: Permitir que COLABORADORES acessem seus próprios chats
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username} (tipo: {request.usuario.tipo_usuario})")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        # Contar quantas mensagens do bot já existem
+        mensagens_count = InteracaoChamado.objects.filter(
+            chamado=chamado, 
+            remetente='bot'
+        ).count()
+        
+        # Pegar a sequência completa da biblioteca
+        sequencia = bot_dialogos.get_sequencia_inicial_completa(
+            chamado=chamado,
+            nome_solicitante=chamado.nome_solicitante,
+            departamento=chamado.departamento,
+            modalidade_presencial=chamado.modalidade_presencial
+        )
+        
+        # Verificar se já completou todas as mensagens
+        if mensagens_count >= len(sequencia):
+            return JsonResponse({
+                'success': True,
+                'completo': True,
+                'message': 'Sequência completa'
+            })
+        
+        # Pegar próxima mensagem da biblioteca
+        proxima_msg = sequencia[mensagens_count]
+        
+        # Criar a mensagem no banco
+        InteracaoChamado.objects.create(
+            chamado=chamado,
+            remetente='bot',
+            mensagem=proxima_msg['mensagem'],
+            acao_bot=proxima_msg.get('acao_bot', 'mensagem')
+        )
+        
+        # Verificar se é a última mensagem
+        completo = (mensagens_count + 1) >= len(sequencia)
+        
+        return JsonResponse({
+            'success': True,
+            'mensagem': proxima_msg['mensagem'],
+            'indice': mensagens_count + 1,
+            'total': len(sequencia),
+            'completo': completo
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em proxima_mensagem_bot: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=60, window=3600)
+def carregar_mensagens_chat(request, id_chamado):
+    """API para carregar todas as mensagens do chat - CORRIGIDA PARA COLABORADORES"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.select_related('suporte_responsavel').get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO CRÍTICA: Permitir que COLABORADORES acessem seus próprios chats
+        if chamado.usuario_id != request.usuario.pk and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username} (tipo: {request.usuario.tipo_usuario})")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        # ✅ Transcrição em cache (app_project/transcricoes.py): aberturas repetidas não consultam as interações
+        mensagens = transcricoes.mensagens(chamado.id_chamado)
+        
+        return JsonResponse({
+            'success': True,
+            'chamado_id': str(chamado.id_chamado),
+            'chamado_legivel': chamado.id_legivel,
+            'titulo': chamado.titulo,
+            'status': chamado.get_status_display(),
+            'urgencia': chamado.get_urgencia_display(),
+            'controle_suporte': chamado.controle_chat_suporte,
+            'suporte_responsavel': chamado.suporte_responsavel.username if chamado.suporte_responsavel else None,
+            'mensagens': mensagens
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em carregar_mensagens_chat: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=30, window=3600)
+def enviar_mensagem(request, id_chamado):
+    """API para enviar mensagens no chat do chamado com segurança"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        # ✅ CORREÇÃO: Verificar se o chamado existe ANTES de processar
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO CRÍTICA: Verificar se o chamado já está resolvido
+        if chamado.status == 'resolvido':
+            logger.info(f"Tentativa de enviar mensagem em chamado resolvido: {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Este chamado já foi resolvido e não aceita novas mensagens.'
+            }, status=400)
+        
+        if request.content_type == 'application/json':
+            if len(request.body) > 5000:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Mensagem muito longa'
+                }, status=413)
+            data = json.loads(request.body)
+        else:
+            data = request.POST
+            
+        mensagem = security.sanitize_input(data.get('mensagem', '').strip(), max_length=500)
+        
+        if not mensagem:
+            return JsonResponse({
+                'success': False,
+                'message': 'Mensagem não pode estar vazia'
+            }, status=400)
+        
+        if len(mensagem) < 2:
+            return JsonResponse({
+                'success': False,
+                'message': 'Mensagem muito curta'
+            }, status=400)
+        
+        # ✅ CORREÇÃO CRÍTICA: Permitir que COLABORADORES acessem seus próprios chats
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Tentativa de enviar mensagem em chamado alheio: {request.usuario.username} -> {id_chamado}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        resposta_data = None
+        intencao_detectada = None
+        
+        # Se for suporte e tiver controle, enviar como suporte
+        if request.usuario.tipo_usuario == 'suporte' and chamado.controle_chat_suporte:
+            with transaction.atomic():
+                interacao = InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='suporte',
+                    mensagem=mensagem,
+                    suporte_responsavel=request.usuario
+                )
+                publicar(MENSAGEM_ENVIADA, chamado, id_interacao=interacao.id_interacao, remetente='suporte')
+            
+            logger.info(f"Mensagem do suporte enviada no chamado {id_chamado} por {request.usuario.username}")
+            
+        else:
+            # Caso contrário, enviar como usuário normal
+            with transaction.atomic():
+                interacao = InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='usuario',
+                    mensagem=mensagem
+                )
+                publicar(MENSAGEM_ENVIADA, chamado, id_interacao=interacao.id_interacao, remetente='usuario')
+            
+            # ✅ CORREÇÃO: Resposta do bot apenas para usuários normais - com tratamento de erro
+            try:
+                resposta_data = bot_dialogos.get_resposta_inteligente(mensagem, chamado, request.usuario)
+                
+                # ✅ CORREÇÃO: Verificar se a resposta do bot indica resolução
+                if resposta_data and resposta_data.get('acao_bot') == 'finalizacao_usuario' and chamado.status != 'resolvido':
+                    # Se for uma finalização, marcar o chamado como resolvido
+                    chamado.alterar_status('resolvido', 'bot', autor=request.usuario)
+                    logger.info(f"Chamado {id_chamado} marcado como resolvido via resposta do bot")
+                
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='bot',
+                    mensagem=resposta_data['mensagem'],
+                    acao_bot=resposta_data['acao_bot']
+                )
+                
+                intencao_detectada = resposta_data.get('intencao_detectada', 'nao_identificada')
+                
+            except Exception as e:
+                logger.error(f"Erro ao gerar resposta do bot: {str(e)}")
+                # ✅ CORREÇÃO: Resposta de fallback em caso de erro no bot
+                resposta_data = {
+                    'mensagem': "🤖 Obrigado pela sua mensagem! Estou processando sua solicitação.",
+                    'acao_bot': 'mensagem_fallback',
+                    'intencao_detectada': 'nao_identificada'
+                }
+                
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='bot',
+                    mensagem=resposta_data['mensagem'],
+                    acao_bot=resposta_data['acao_bot']
+                )
+                
+                intencao_detectada = 'nao_identificada'
+        
+        logger_frequente.info(
+            "Mensagem enviada no chamado %s por %s", id_chamado, request.usuario.username,
+            extra={'chamado': str(id_chamado), 'usuario': request.usuario.username}
+        )
+        
+        # ✅ CORREÇÃO: Preparar resposta baseada no tipo de usuário
+        response_data = {
+            'success': True,
+        }
+        
+        if request.usuario.tipo_usuario != 'suporte':
+            response_data['resposta'] = resposta_data['mensagem'] if resposta_data else None
+            response_data['intencao_detectada'] = intencao_detectada
+            # ✅ CORREÇÃO: Adicionar flag se o chamado foi resolvido
+            response_data['chamado_resolvido'] = chamado.status == 'resolvido'
+        
+        return JsonResponse(response_data)
+        
+    except Chamado.DoesNotExist:
+        logger.error(f"Chamado não encontrado: {id_chamado}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao enviar mensagem: {str(e)}", exc_info=True)
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_novas_mensagens(request, id_chamado):
+    """API para verificar se há novas mensagens no chat"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES verifiquem seus próprios chats
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        # Buscar a última mensagem conhecida (se fornecida)
+        ultima_mensagem_id = request.GET.get('ultima_mensagem_id')
+        
+        # Buscar todas as mensagens do chamado
+        todas_mensagens = InteracaoChamado.objects.filter(
+            chamado=chamado
+        ).order_by('criado_em')
+        
+        # Se não há mensagens, retornar vazio
+        if not todas_mensagens.exists():
+            return JsonResponse({
+                'success': True,
+                'novas_mensagens': [],
+                'total_novas': 0,
+                'ultima_mensagem_id': None
+            })
+        
+        # Nova lógica usando UUID do chamado como referência
+        novas_mensagens = todas_mensagens
+        ultima_id_encontrada = None
+        
+        if ultima_mensagem_id:
+            try:
+                # Buscar a última mensagem conhecida pelo seu ID (se for UUID válido)
+                if security.validate_uuid(ultima_mensagem_id):
+                    ultima_mensagem_conhecida = InteracaoChamado.objects.filter(
+                        id_interacao=ultima_mensagem_id
+                    ).first()
+                    
+                    if ultima_mensagem_conhecida:
+                        # Buscar mensagens mais recentes que a última conhecida
+                        novas_mensagens = InteracaoChamado.objects.filter(
+                            chamado=chamado,
+                            criado_em__gt=ultima_mensagem_conhecida.criado_em
+                        ).order_by('criado_em')
+                    else:
+                        # Se não encontrou a mensagem específica, retornar todas
+                        novas_mensagens = todas_mensagens
+                else:
+                    # Se não é UUID, tentar como inteiro (backward compatibility)
+                    try:
+                        ultima_id_int = int(ultima_mensagem_id)
+                        ultima_mensagem_conhecida = InteracaoChamado.objects.filter(
+                            id_interacao=ultima_id_int
+                        ).first()
+                        
+                        if ultima_mensagem_conhecida:
+                            novas_mensagens = InteracaoChamado.objects.filter(
+                                chamado=chamado,
+                                criado_em__gt=ultima_mensagem_conhecida.criado_em
+                            ).order_by('criado_em')
+                        else:
+                            novas_mensagens = todas_mensagens
+                    except ValueError:
+                        # Se não é nem UUID nem inteiro, retornar todas as mensagens
+                        novas_mensagens = todas_mensagens
+            except Exception as e:
+                novas_mensagens = todas_mensagens
+        else:
+            # Se não há última mensagem ID, retornar todas as mensagens
+            novas_mensagens = todas_mensagens
+        
+        # Preparar dados das mensagens
+        mensagens_data = serializar_interacoes(novas_mensagens)
+        if mensagens_data:
+            ultima_id_encontrada = mensagens_data[-1]['id']
+        
+        return JsonResponse({
+            'success': True,
+            'novas_mensagens': mensagens_data,
+            'total_novas': len(mensagens_data),
+            'ultima_mensagem_id': ultima_id_encontrada or ultima_mensagem_id
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em verificar_novas_mensagens: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+# === CORREÇÕES CRÍTICAS PARA O PROBLEMA DAS NOTIFICAÇÕES ===
+def _filtrar_mensagens_notificaveis(mensagens):
+    """✅ EXCEÇÕES: Não notificar sobre certos tipos de mensagens do bot"""
+    limite_antiguidade = timezone.now().timestamp() - 3600  # 1 hora
+    mensagens_data = []
+    for mensagem in mensagens:
+        texto_lower = mensagem['mensagem'].lower()
+
+        # ✅ EXCEÇÃO 1: Não notificar mensagens de "status atualizado" do bot
+        if mensagem['remetente'] == 'bot' and 'status atualizado' in texto_lower:
+            logger_frequente.info("🚫 Ignorando mensagem de status atualizado: %.50s...", mensagem['mensagem'])
+            continue
+        
+        # ✅ EXCEÇÃO 2: Não notificar mensagens de "verificação" automática
+        if (mensagem['remetente'] == 'bot' and 
+            any(palavra in texto_lower for palavra in ['verificando', 'aguardando', 'confirmando'])):
+            logger_frequente.info("🚫 Ignorando mensagem de verificação automática: %.50s...", mensagem['mensagem'])
+            continue
+        
+        # ✅ EXCEÇÃO 3: Não notificar mensagens muito antigas (mais de 1 hora)
+        if mensagem['timestamp'] < limite_antiguidade:
+            logger_frequente.info("🚫 Ignorando mensagem muito antiga: %.50s...", mensagem['mensagem'])
+            continue
+        
+        mensagens_data.append(mensagem)
+    return mensagens_data
+
+def _ha_mensagens_novas(dados, ultima_visualizada_id):
+    """Long-poll termina com mensagem nova ou quando a referência do cliente avançou"""
+    return dados['total_novas'] > 0 or (dados['ultima_visualizada_id'] or '') != (ultima_visualizada_id or '')
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_novas_mensagens_inteligente(request, id_chamado):
+    """✅ API INTELIGENTE CORRIGIDA para verificar novas mensagens - CORREÇÃO CRÍTICA"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES verifiquem seus próprios chats
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        # ✅ CORREÇÃO CRÍTICA: Usar ID da última mensagem visualizada, não timestamp
+        ultima_mensagem_visualizada_id = request.GET.get('ultima_visualizada_id')
+        
+        logger_frequente.info("🔍 API verificar_novas_mensagens_inteligente - ultima_visualizada_id recebido: %s", ultima_mensagem_visualizada_id)
+        
+        def consultar():
+            # Buscar TODAS as mensagens do chamado
+            todas_mensagens = InteracaoChamado.objects.filter(
+                chamado=chamado
+            ).order_by('criado_em')
+        
+            if not todas_mensagens.exists():
+                return {
+                    'success': True,
+                    'novas_mensagens': [],
+                    'total_novas': 0,
+                    'ultima_verificacao': timezone.now().timestamp(),
+                    'ultima_visualizada_id': None
+                }
+        
+            # ✅ CORREÇÃO CRÍTICA: Filtrar por ID da última mensagem visualizada
+            novas_mensagens = todas_mensagens
+            if ultima_mensagem_visualizada_id and ultima_mensagem_visualizada_id not in ['undefined', 'null', '']:
+                try:
+                    # Buscar a última mensagem visualizada
+                    if security.validate_uuid(ultima_mensagem_visualizada_id):
+                        ultima_visualizada = InteracaoChamado.objects.filter(
+                            id_interacao=ultima_mensagem_visualizada_id
+                        ).first()
+                    
+                        if ultima_visualizada:
+                            # ✅ FILTRAR: Apenas mensagens MAIS RECENTES que a última visualizada
+                            novas_mensagens = InteracaoChamado.objects.filter(
+                                chamado=chamado,
+                                criado_em__gt=ultima_visualizada.criado_em
+                            ).order_by('criado_em')
+                            logger_frequente.info("✅ Filtro aplicado: mensagens após ID %s", ultima_mensagem_visualizada_id)
+                        else:
+                            # Se não encontrou a mensagem específica, considerar TODAS como não visualizadas
+                            logger_frequente.info("⚠️ Mensagem visualizada não encontrada: %s", ultima_mensagem_visualizada_id)
+                            novas_mensagens = todas_mensagens
+                    else:
+                        # Se não é UUID válido, considerar TODAS como não visualizadas
+                        logger_frequente.info("⚠️ ID de visualização inválido: %s", ultima_mensagem_visualizada_id)
+                        novas_mensagens = todas_mensagens
+                except Exception as e:
+                    logger_frequente.info("⚠️ Erro ao processar última mensagem visualizada, retornando todas: %s", e)
+                    novas_mensagens = todas_mensagens
+            else:
+                # ✅ Se não há última mensagem visualizada, TODAS são consideradas novas
+                logger_frequente.info("ℹ️ Nenhum ID de visualização válido fornecido, retornando todas as mensagens")
+                novas_mensagens = todas_mensagens
+        
+            mensagens_data = _filtrar_mensagens_notificaveis(serializar_interacoes(novas_mensagens, incluir_timestamp=True))
+        
+            logger_frequente.info("📨 Mensagens novas APÓS filtro de exceções: %d", len(mensagens_data))
+        
+            # ✅ CORREÇÃO CRÍTICA: Determinar a última mensagem visualizada (para próxima verificação)
+            ultima_visualizada_id = None
+            if todas_mensagens.exists():
+                ultima_mensagem_global = todas_mensagens.last()
+                ultima_visualizada_id = str(ultima_mensagem_global.id_interacao)
+                logger_frequente.info("📝 Última mensagem global ID: %s", ultima_visualizada_id)
+            else:
+                ultima_visualizada_id = ultima_mensagem_visualizada_id
+        
+            # ✅ CORREÇÃO: Garantir que ultima_visualizada_id nunca seja undefined
+            if not ultima_visualizada_id:
+                ultima_visualizada_id = ultima_mensagem_visualizada_id
+        
+            return {
+                'success': True,
+                'novas_mensagens': mensagens_data,
+                'total_novas': len(mensagens_data),
+                'ultima_verificacao': timezone.now().timestamp(),
+                'ultima_visualizada_id': ultima_visualizada_id,  # ✅ CORREÇÃO: Sempre retornar valor válido
+                'chamado_status': chamado.status,
+                'controle_suporte': chamado.controle_chat_suporte
+            }
+
+        # ✅ LONG-POLL: com ?wait=N a resposta aguarda até chegar mensagem nova (ou o tempo acabar)
+        espera = segundos_espera(request)
+        dados = aguardar_novidades(
+            canal_chamado(chamado.id_chamado),
+            espera,
+            consultar,
+            lambda dados: _ha_mensagens_novas(dados, ultima_mensagem_visualizada_id),
+        )
+        if espera and 'chamado_status' in dados:
+            # O status pode ter mudado enquanto a requisição aguardava
+            chamado.refresh_from_db(fields=['status', 'controle_chat_suporte'])
+            dados['chamado_status'] = chamado.status
+            dados['controle_suporte'] = chamado.controle_chat_suporte
+        return JsonResponse(dados)
+        
+    except Chamado.DoesNotExist:
+        logger.error(f"❌ Chamado não encontrado: {id_chamado}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em verificar_novas_mensagens_inteligente: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+def marcar_mensagens_visualizadas(request, id_chamado):
+    """✅ NOVA API: Marcar mensagens como visualizadas de forma persistente"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES marquem mensagens como visualizadas
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        if request.content_type == 'application/json':
+            data = json.loads(request.body)
+        else:
+            data = request.POST
+            
+        # ✅ CORREÇÃO: Usar timestamp em vez de IDs específicos
+        timestamp_visualizacao = data.get('timestamp_visualizacao')
+        
+        if timestamp_visualizacao:
+            try:
+                # ✅ Cursor de leitura persistente (upsert em lote), fora da sessão
+                lido_ate = min(
+                    datetime.fromtimestamp(float(timestamp_visualizacao), tz=dt_timezone.utc),
+                    timezone.now()
+                )
+                cursores_leitura.marcar(request.usuario.pk, chamado.pk, lido_ate)
+                
+                logger_frequente.info(
+                    "Mensagens do chamado %s marcadas como visualizadas por %s (timestamp: %s)",
+                    id_chamado, request.usuario.username, timestamp_visualizacao
+                )
+                
+                return JsonResponse({
+                    'success': True,
+                    'message': 'Mensagens marcadas como visualizadas!',
+                    'timestamp_confirmado': timestamp_visualizacao
+                })
+                
+            except (ValueError, TypeError, OverflowError, OSError):
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Timestamp de visualização inválido'
+                }, status=400)
+        else:
+            return JsonResponse({
+                'success': False,
+                'message': 'Timestamp de visualização é obrigatório'
+            }, status=400)
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao marcar mensagens como visualizadas: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+def obter_ultima_visualizacao(request, id_chamado):
+    """✅ NOVA API: Obter timestamp da última visualização do usuário"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        # ✅ CORREÇÃO: Permitir que COLABORADORES obtenham última visualização
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        lido_ate = cursores_leitura.lido_ate(request.usuario.pk, chamado.pk)
+        
+        return JsonResponse({
+            'success': True,
+            'timestamp_visualizacao': lido_ate.timestamp() if lido_ate else None,
+            'timestamp_atual': timezone.now().timestamp()
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao obter última visualização: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@usuario_required
+def contar_mensagens_nao_lidas(request):
+    """
+    ✅ Mensagens não lidas por chamado (cursor de leitura do usuário), em uma consulta.
+    ?ids=uuid1,uuid2 limita aos chamados informados; sem ids: os chamados abertos do
+    usuário (colaborador) ou sob sua responsabilidade (suporte).
+    """
+    ids = [valor for valor in request.GET.get('ids', '').split(',') if valor]
+    if len(ids) > lote.MAX_ITENS_LOTE:
+        return JsonResponse({
+            'success': False,
+            'message': f'Máximo de {lote.MAX_ITENS_LOTE} chamados por consulta.'
+        }, status=400)
+    if not all(security.validate_uuid(valor) for valor in ids):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    if request.usuario.tipo_usuario == 'suporte':
+        chamados = Chamado.objects.all() if ids else Chamado.objects.filter(suporte_responsavel=request.usuario)
+    else:
+        chamados = Chamado.objects.filter(usuario=request.usuario)
+    if ids:
+        chamados = chamados.filter(pk__in=ids)
+    else:
+        chamados = chamados.exclude(status='resolvido').order_by('-criado_em')[:lote.MAX_ITENS_LOTE]
+        chamados = Chamado.objects.filter(pk__in=list(chamados.values_list('pk', flat=True)))
+    
+    nao_lidas = cursores_leitura.nao_lidas(request.usuario, chamados)
+    return JsonResponse({
+        'success': True,
+        'nao_lidas': {str(id_chamado): total for id_chamado, total in nao_lidas.items()},
+        'total': sum(nao_lidas.values())
+    })
+
+# === NOVAS VIEWS PARA O SISTEMA DE CHAT CORRIGIDO ===
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])  # ✅ CORREÇÃO CRÍTICA: Permitir GET também
+@usuario_required
+@rate_limit(max_requests=30, window=3600)
+def enviar_mensagem_bot_sequencia(request, id_chamado, numero_mensagem):
+    """✅ API CORRIGIDA: Enviar mensagem específica da sequência do bot"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES acessem seus próprios chats
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        # Buscar sequência completa
+        sequencia = bot_dialogos.get_sequencia_inicial_completa(
+            chamado=chamado,
+            nome_solicitante=chamado.nome_solicitante,
+            departamento=chamado.departamento,
+            modalidade_presencial=chamado.modalidade_presencial
+        )
+        
+        # Verificar se o número da mensagem é válido
+        if numero_mensagem < 1 or numero_mensagem > len(sequencia):
+            return JsonResponse({
+                'success': False,
+                'message': 'Número de mensagem inválido'
+            }, status=400)
+        
+        # ✅ CORREÇÃO CRÍTICA: Verificar quantas mensagens do bot já existem
+        mensagens_existentes = InteracaoChamado.objects.filter(
+            chamado=chamado, 
+            remetente='bot'
+        ).count()
+        
+        # ✅ CORREÇÃO: Se já temos esta mensagem específica, retornar sucesso mas não criar duplicata
+        if mensagens_existentes >= numero_mensagem:
+            # Buscar a mensagem existente
+            mensagens_bot = InteracaoChamado.objects.filter(
+                chamado=chamado, 
+                remetente='bot'
+            ).order_by('criado_em')
+            
+            if mensagens_bot.count() >= numero_mensagem:
+                mensagem_existente = mensagens_bot[numero_mensagem - 1]
+                hora_local = timezone.localtime(mensagem_existente.criado_em)
+                
+                return JsonResponse({
+                    'success': True,
+                    'mensagem': mensagem_existente.mensagem,
+                    'mensagem_id': str(mensagem_existente.id_interacao),
+                    'hora': hora_local.strftime('%H:%M'),
+                    'numero_mensagem': numero_mensagem,
+                    'total_mensagens': len(sequencia),
+                    'ja_existia': True  # ✅ Nova flag para indicar que já existia
+                })
+        
+        # ✅ CORREÇÃO: Se estamos pulando mensagens, criar as anteriores também
+        if numero_mensagem > (mensagens_existentes + 1):
+            for i in range(mensagens_existentes + 1, numero_mensagem):
+                if i <= len(sequencia):
+                    mensagem_anterior = sequencia[i - 1]
+                    InteracaoChamado.objects.create(
+                        chamado=chamado,
+                        remetente='bot',
+                        mensagem=mensagem_anterior['mensagem'],
+                        acao_bot=mensagem_anterior.get('acao_bot', 'mensagem')
+                    )
+                    logger.info(f"Mensagem {i} do bot criada automaticamente para chamado {chamado.id_legivel}")
+        
+        # Pegar mensagem específica
+        mensagem_data = sequencia[numero_mensagem - 1]
+        
+        # Criar mensagem no banco
+        interacao = InteracaoChamado.objects.create(
+            chamado=chamado,
+            remetente='bot',
+            mensagem=mensagem_data['mensagem'],
+            acao_bot=mensagem_data.get('acao_bot', 'mensagem')
+        )
+        
+        hora_local = timezone.localtime(interacao.criado_em)
+        
+        logger.info(f"Mensagem {numero_mensagem} do bot enviada para chamado {chamado.id_legivel}")
+        
+        return JsonResponse({
+            'success': True,
+            'mensagem': mensagem_data['mensagem'],
+            'mensagem_id': str(interacao.id_interacao),
+            'hora': hora_local.strftime('%H:%M'),
+            'numero_mensagem': numero_mensagem,
+            'total_mensagens': len(sequencia),
+            'ja_existia': False
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em enviar_mensagem_bot_sequencia: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_status_chamado(request, id_chamado):
+    """✅ NOVA API: Verificar status atual do chamado"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO: Permitir que COLABORADORES verifiquem status dos seus próprios chamados
+        if chamado.usuario != request.usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+        
+        return JsonResponse({
+            'success': True,
+            'chamado_id': str(chamado.id_chamado),
+            'chamado_legivel': chamado.id_legivel,
+            'status': chamado.status,
+            'status_display': chamado.get_status_display(),
+            'urgencia': chamado.urgencia,
+            'urgencia_display': chamado.get_urgencia_display(),
+            'controle_suporte': chamado.controle_chat_suporte,
+            'suporte_responsavel': chamado.suporte_responsavel.username if chamado.suporte_responsavel else None,
+            'total_mensagens': InteracaoChamado.objects.filter(chamado=chamado).count()
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em verificar_status_chamado: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=50, window=3600)
+def reiniciar_sequencia_bot(request, id_chamado):
+    """✅ NOVA API: Reiniciar sequência do bot para um chamado"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        if chamado.usuario != request.usuario:
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas o criador do chamado pode reiniciar a sequência do bot.'
+            }, status=403)
+        
+        # Limpar mensagens existentes do bot (opcional)
+        # InteracaoChamado.objects.filter(chamado=chamado, remetente='bot').delete()
+        
+        # Recriar primeira mensagem
+        mensagem_colaborador = formatar_mensagem_colaborador(chamado)
+        InteracaoChamado.objects.create(
+            chamado=chamado,
+            remetente='bot',
+            mensagem=mensagem_colaborador,
+            acao_bot='criacao_chamado'
+        )
+        
+        logger.info(f"Sequência do bot reiniciada para chamado {chamado.id_legivel} por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Sequência do bot reiniciada com sucesso!'
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao reiniciar sequência do bot: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+# ✅ CORREÇÃO: View para enviar TODA a sequência de uma vez
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=10, window=3600)
+def enviar_sequencia_completa_bot(request, id_chamado):
+    """✅ NOVA API: Enviar toda a sequência do bot de uma vez"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        if chamado.usuario != request.usuario:
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas o criador do chamado pode iniciar a sequência do bot.'
+            }, status=403)
+        
+        # Buscar sequência completa
+        sequencia = bot_dialogos.get_sequencia_inicial_completa(
+            chamado=chamado,
+            nome_solicitante=chamado.nome_solicitante,
+            departamento=chamado.departamento,
+            modalidade_presencial=chamado.modalidade_presencial
+        )
+        
+        # Verificar quantas mensagens já existem
+        mensagens_existentes = InteracaoChamado.objects.filter(
+            chamado=chamado, 
+            remetente='bot'
+        ).count()
+        
+        mensagens_criadas = []
+        
+        # Criar apenas as mensagens que faltam
+        for i in range(mensagens_existentes + 1, len(sequencia) + 1):
+            if i <= len(sequencia):
+                mensagem_data = sequencia[i - 1]
+                interacao = InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='bot',
+                    mensagem=mensagem_data['mensagem'],
+                    acao_bot=mensagem_data.get('acao_bot', 'mensagem')
+                )
+                
+                hora_local = timezone.localtime(interacao.criado_em)
+                mensagens_criadas.append({
+                    'numero': i,
+                    'mensagem': mensagem_data['mensagem'],
+                    'mensagem_id': str(interacao.id_interacao),
+                    'hora': hora_local.strftime('%H:%M')
+                })
+                
+                logger.info(f"Mensagem {i} do bot criada para chamado {chamado.id_legivel}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{len(mensagens_criadas)} mensagens do bot criadas',
+            'mensagens_criadas': mensagens_criadas,
+            'total_sequencia': len(sequencia),
+            'mensagens_ja_existiam': mensagens_existentes
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em enviar_sequencia_completa_bot: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
@@ -0,0 +1,181 @@
+"""
+Views de estatísticas: gráficos, métricas de SLA e volume de chamados
+"""
+import logging
+from django.http import JsonResponse
+from django.utils import timezone
+from django.core.exceptions import ValidationError
+from django.views.decorators.http import require_http_methods
+from django.db.models import Count
+from datetime import datetime
+from django.utils.dateparse import parse_date, parse_datetime
+from ..models import Chamado
+from ..departamentos import registro_departamentos
+from .. import sla, volume
+from .base import usuario_required
+
+logger = logging.getLogger(__name__)
+
+@require_http_methods(["GET"])
+@usuario_required
+def api_dados_grafico(request):
+    """API: Retorna dados atualizados para o gráfico"""
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado'
+            }, status=403)
+        
+        # Dados reais por departamento: um COUNT agrupado, nomes do registro em memória
+        quantidades = dict(
+            Chamado.objects.order_by().values('departamento_id')
+            .annotate(quantidade=Count('pk')).values_list('departamento_id', 'quantidade')
+        )
+        departamentos_data = [
+            {'nome': dept.nome, 'quantidade': quantidades.get(dept.id_departamento, 0)}
+            for dept in registro_departamentos.todos()
+        ]
+        
+        # Dados de status para gráfico de pizza
+        status_data = {
+            'em_andamento': Chamado.objects.filter(status='em_andamento').count(),
+            'resolvido': Chamado.objects.filter(status='resolvido').count(),
+            'aguardando': Chamado.objects.filter(status='aguardando').count()
+        }
+        
+        # Estatísticas gerais
+        estatisticas = {
+            'total_chamados': Chamado.objects.count(),
+            'pendentes_count': Chamado.objects.filter(status='em_andamento').count(),
+            'solucionados_count': Chamado.objects.filter(status='resolvido').count(),
+            'urgentes_count': Chamado.objects.filter(urgencia='urgente', status='em_andamento').count(),
+            'novos_hoje': Chamado.objects.filter(
+                criado_em__date=timezone.now().date()
+            ).count()
+        }
+        
+        return JsonResponse({
+            'success': True,
+            'departamentos_data': departamentos_data,
+            'status_data': status_data,
+            'estatisticas': estatisticas,
+            'atualizado_em': timezone.now().strftime('%H:%M:%S')
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro em api_dados_grafico: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@usuario_required
+def api_metricas_sla(request):
+    """API: percentis e histogramas de primeira resposta e resolução (?periodo=)"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Acesso não autorizado'
+        }, status=403)
+
+    periodo = request.GET.get('periodo', 'todos')
+    if periodo not in sla.PERIODOS:
+        return JsonResponse({
+            'success': False,
+            'message': f"Período inválido. Use: {', '.join(sla.PERIODOS)}"
+        }, status=400)
+
+    try:
+        return JsonResponse({'success': True, **sla.metricas_sla(periodo)})
+    except Exception as e:
+        logger.error(f"Erro em api_metricas_sla: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+def _ler_momento(valor, padrao):
+    """Data (AAAA-MM-DD) ou data/hora ISO da query string; ValueError se inválida"""
+    if not valor:
+        return padrao
+    momento = parse_datetime(valor)
+    if momento is None:
+        data = parse_date(valor)
+        if data is None:
+            raise ValueError(f"Data inválida: {valor}")
+        momento = datetime.combine(data, datetime.min.time())
+    return timezone.make_aware(momento) if timezone.is_naive(momento) else momento
+
+@require_http_methods(["GET"])
+@usuario_required
+def api_volume_chamados(request):
+    """API: série de chamados criados/resolvidos lida da consolidação por hora/dia"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Acesso não autorizado'
+        }, status=403)
+
+    try:
+        fim = _ler_momento(request.GET.get('fim'), timezone.now())
+        inicio = _ler_momento(request.GET.get('inicio'), fim - timezone.timedelta(days=30))
+        resultado = volume.serie(
+            inicio, fim,
+            granularidade=request.GET.get('granularidade') or None,
+            agrupar_por=request.GET.get('agrupar_por') or None,
+            departamento=request.GET.get('departamento'),
+            urgencia=request.GET.get('urgencia'),
+            status=request.GET.get('status'),
+        )
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+    except ValidationError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Departamento inválido'
+        }, status=400)
+    except Exception as e:
+        logger.error(f"Erro em api_volume_chamados: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    return JsonResponse({'success': True, **resultado})
+
+@require_http_methods(["GET"])
+@usuario_required
+def api_chamados_recentes(request):
+    """API para verificar chamados recentes (últimos 5 minutos)"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Acesso não autorizado'
+        }, status=403)
+    
+    try:
+        # Calcular timestamp de 5 minutos atrás
+        cinco_minutos_atras = timezone.now() - timezone.timedelta(minutes=5)
+        
+        # Contar chamados criados nos últimos 5 minutos
+        novos_chamados_count = Chamado.objects.filter(
+            criado_em__gte=cinco_minutos_atras
+        ).count()
+        
+        return JsonResponse({
+            'success': True,
+            'novos_chamados': novos_chamados_count,
+            'ultima_verificacao': timezone.now().strftime('%H:%M:%S')
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro em api_chamados_recentes: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
@@ -0,0 +1,569 @@
+"""
+Views de notificações: consulta, polling e marcação de leitura
+"""
+import logging
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from ..models import Chamado, Notificacao
+from ..serializacao import serializar_notificacoes
+from ..escrita_adiada import buffer_escrita
+from .. import lote
+from ..longpoll import registro_espera, canal_notificacoes, segundos_espera, timestamp_desde, aguardar_novidades
+from .base import logger_frequente, rate_limit, usuario_required
+from .chamados import formatar_mensagem_suporte, _ler_lote
+
+logger = logging.getLogger(__name__)
+
+    
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_notificacoes_pendentes_suporte(request):
+    """✅ NOVA API: Verificar notificações pendentes para suporte (chamados não visualizados/resolvidos)"""
+    try:
+        # ✅ APENAS SUPORTE pode acessar esta API
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem acessar esta API.'
+            }, status=403)
+        
+        # Buscar TODOS os chamados em andamento que NÃO foram visualizados por este suporte
+        chamados_nao_visualizados = Chamado.objects.filter(
+            status='em_andamento'  # Apenas chamados em andamento
+        ).exclude(
+            id_chamado__in=Notificacao.objects.filter(
+                usuario=request.usuario,
+                tipo='novo_chamado',
+                lida=True  # Excluir notificações já marcadas como lidas
+            ).values_list('chamado__id_chamado', flat=True)
+        )
+        
+        # Buscar também notificações não lidas do usuário
+        notificacoes_nao_lidas = Notificacao.objects.filter(
+            usuario=request.usuario,
+            lida=False
+        ).order_by('-criado_em')
+        
+        chamados_nao_visualizados = list(chamados_nao_visualizados.select_related('departamento'))
+
+        # Uma única consulta para as notificações já existentes deste suporte
+        notificacoes_existentes = {}
+        for id_notificacao, chamado_id, lida in Notificacao.objects.filter(
+            usuario=request.usuario,
+            chamado_id__in=[chamado.id_chamado for chamado in chamados_nao_visualizados]
+        ).order_by('-criado_em').values_list('id_notificacao', 'chamado_id', 'lida'):
+            notificacoes_existentes.setdefault(chamado_id, (id_notificacao, lida))
+
+        # Criar em lote as notificações que ainda não existem
+        novas_notificacoes = [
+            Notificacao(
+                usuario=request.usuario,
+                chamado=chamado,
+                mensagem=formatar_mensagem_suporte(chamado, chamado.nome_solicitante, chamado.departamento),
+                tipo='novo_chamado',
+                lida=False
+            )
+            for chamado in chamados_nao_visualizados
+            if chamado.id_chamado not in notificacoes_existentes
+        ]
+        for notificacao in Notificacao.objects.bulk_create(novas_notificacoes):
+            notificacoes_existentes[notificacao.chamado_id] = (notificacao.id_notificacao, notificacao.lida)
+        if novas_notificacoes:
+            # bulk_create não dispara post_save: avisar o long-poll manualmente
+            registro_espera.notificar_apos_commit(canal_notificacoes(request.usuario.id_usuario))
+
+        # Preparar dados dos chamados pendentes
+        chamados_pendentes = []
+        for chamado in chamados_nao_visualizados:
+            notificacao_id, notificacao_lida = notificacoes_existentes[chamado.id_chamado]
+
+            hora_local = timezone.localtime(chamado.criado_em)
+            chamados_pendentes.append({
+                'chamado_id': str(chamado.id_chamado),
+                'chamado_legivel': chamado.id_legivel,
+                'titulo': chamado.titulo,
+                'nome_solicitante': chamado.nome_solicitante,
+                'departamento': chamado.departamento.nome,
+                'urgencia': chamado.get_urgencia_display(),
+                'status': chamado.get_status_display(),
+                'criado_em': hora_local.strftime('%d/%m/%Y %H:%M'),
+                'tempo_decorrido': chamado.tempo_decorrido,
+                'notificacao_id': str(notificacao_id),
+                'notificacao_lida': notificacao_lida
+            })
+
+        # Preparar notificações não lidas
+        notificacoes_data = serializar_notificacoes(notificacoes_nao_lidas)
+
+        return JsonResponse({
+            'success': True,
+            'chamados_pendentes': chamados_pendentes,
+            'notificacoes': notificacoes_data,
+            'total_chamados_pendentes': len(chamados_pendentes),
+            'total_notificacoes_nao_lidas': len(notificacoes_data),
+            'ultima_verificacao': timezone.now().timestamp(),
+            'mensagem': f'Encontrados {len(chamados_pendentes)} chamados pendentes para atendimento'
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao verificar notificações pendentes: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'chamados_pendentes': [],
+            'notificacoes': [],
+            'total_chamados_pendentes': 0,
+            'total_notificacoes_nao_lidas': 0,
+            'message': 'Erro ao carregar notificações pendentes'
+        })
+
+# === SISTEMA DE NOTIFICAÇÕES CORRIGIDO ===
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_notificacoes(request):
+    """✅ API CORRIGIDA: Verificar notificações para COLABORADORES E SUPORTE - ATUALIZADO: 45 SEGUNDOS"""
+    try:
+        # ✅ CORREÇÃO: Lógica diferente para colaboradores vs suporte
+        if request.usuario.tipo_usuario == 'colaborador':
+            # COLABORADOR: Ver apenas notificações dos SEUS chamados
+            notificacoes_nao_lidas = Notificacao.objects.filter(
+                chamado__usuario=request.usuario,
+                lida=False
+            ).order_by('-criado_em')
+            
+            # Buscar notificações recentes do usuário
+            notificacoes_recentes = Notificacao.objects.filter(
+                chamado__usuario=request.usuario
+            ).order_by('-criado_em')[:10]
+            
+        else:
+            # SUPORTE: Ver todas as notificações (comportamento original)
+            notificacoes_nao_lidas = Notificacao.objects.filter(
+                usuario=request.usuario,
+                lida=False
+            ).order_by('-criado_em')
+            
+            notificacoes_recentes = Notificacao.objects.filter(
+                usuario=request.usuario
+            ).order_by('-criado_em')[:10]
+        
+        def consultar():
+            # ✅ Somente suporte pode marcar como lida
+            notificacoes_data = serializar_notificacoes(
+                notificacoes_recentes,
+                pode_marcar_lida=request.usuario.tipo_usuario == 'suporte'
+            )
+            return notificacoes_data, notificacoes_nao_lidas.count()
+
+        # ✅ LONG-POLL: com ?wait=N&desde=T aguarda até surgir notificação mais nova que T
+        desde = timestamp_desde(request)
+        notificacoes_data, total_nao_lidas = aguardar_novidades(
+            canal_notificacoes(request.usuario.id_usuario),
+            segundos_espera(request) if desde is not None else 0,
+            consultar,
+            lambda dados: any(n['timestamp'] > desde for n in dados[0]),
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'notificacoes': notificacoes_data,
+            'total_nao_lidas': total_nao_lidas,
+            'ultima_verificacao': timezone.now().timestamp(),
+            'tipo_usuario': request.usuario.tipo_usuario,
+            'intervalo_verificacao': 45,
+            'permite_marcar_lidas': request.usuario.tipo_usuario == 'suporte'  # ✅ Flag importante
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao verificar notificações: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'notificacoes': [],
+            'total_nao_lidas': 0,
+            'message': 'Erro ao carregar notificações'
+        })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=50, window=3600)
+def marcar_todas_notificacoes_lidas(request):
+    """✅ API: Marcar TODAS as notificações como lidas - APENAS SUPORTE"""
+    try:
+        # ✅ CORREÇÃO: COLABORADORES NÃO PODEM marcar notificações como lidas
+        if request.usuario.tipo_usuario == 'colaborador':
+            logger.warning(f"🚫 COLABORADOR tentou marcar todas notificações como lidas: {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Colaboradores não têm permissão para marcar notificações como lidas.'
+            }, status=403)
+        
+        notificacoes_nao_lidas = Notificacao.objects.filter(
+            usuario=request.usuario,
+            lida=False
+        )
+        
+        count = notificacoes_nao_lidas.update(lida=True)
+        
+        logger.info(f"Todas as notificações ({count}) marcadas como lidas por {request.usuario.username} (SUPORTE)")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{count} notificações marcadas como lidas',
+            'total_marcadas': count
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao marcar todas notificações como lidas: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro ao marcar notificações como lidas'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=50, window=3600)
+def limpar_notificacoes(request):
+    """✅ API: Limpar/Deletar notificações antigas - APENAS SUPORTE"""
+    try:
+        # ✅ CORREÇÃO: COLABORADORES NÃO PODEM limpar notificações
+        if request.usuario.tipo_usuario == 'colaborador':
+            logger.warning(f"🚫 COLABORADOR tentou limpar notificações: {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Colaboradores não têm permissão para limpar notificações.'
+            }, status=403)
+        
+        # Manter apenas as últimas 20 notificações
+        notificacoes_para_manter = Notificacao.objects.filter(
+            usuario=request.usuario
+        ).order_by('-criado_em')[:20]
+        
+        ids_para_manter = [n.id_notificacao for n in notificacoes_para_manter]
+        
+        # Deletar notificações antigas
+        notificacoes_deletadas = Notificacao.objects.filter(
+            usuario=request.usuario
+        ).exclude(id_notificacao__in=ids_para_manter).delete()
+        
+        count = notificacoes_deletadas[0] if notificacoes_deletadas else 0
+        
+        logger.info(f"{count} notificações antigas removidas por {request.usuario.username} (SUPORTE)")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{count} notificações antigas removidas',
+            'total_removidas': count
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao limpar notificações: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro ao limpar notificações'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=50, window=3600)
+def marcar_notificacao_como_lida(request, id_notificacao):
+    """✅ FUNÇÃO CRÍTICA CORRIGIDA: Marcar notificação como lida com PERMISSÕES RESTRITAS"""
+    try:
+        logger_frequente.info(
+            "🔔 Tentando marcar notificação %s como lida para usuário %s (tipo: %s)",
+            id_notificacao, request.usuario.username, request.usuario.tipo_usuario
+        )
+        
+        # ✅ CORREÇÃO CRÍTICA: COLABORADORES NÃO PODEM marcar notificações como lidas
+        if request.usuario.tipo_usuario == 'colaborador':
+            logger.warning(f"🚫 COLABORADOR tentou marcar notificação como lida: {request.usuario.username} -> {id_notificacao}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Colaboradores não têm permissão para marcar notificações como lidas. Apenas o suporte pode gerenciar notificações.'
+            }, status=403)
+        
+        # ✅ APENAS SUPORTE pode marcar notificações como lidas
+        lida = Notificacao.objects.filter(
+            id_notificacao=id_notificacao,
+            usuario=request.usuario  # ✅ Apenas notificações do próprio usuário de suporte
+        ).values_list('lida', flat=True).get()
+        
+        # ✅ Marcar como lida via escrita adiada (gravada em lote com as demais marcações)
+        if not lida:
+            buffer_escrita.notificacao_lida(request.usuario.pk, id_notificacao)
+        
+        logger_frequente.info("✅ Notificação %s marcada como lida por %s (SUPORTE)", id_notificacao, request.usuario.username)
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Notificação marcada como lida',
+            'notificacao_id': str(id_notificacao),
+            'tipo_usuario': request.usuario.tipo_usuario
+        })
+        
+    except Notificacao.DoesNotExist:
+        logger.warning(f"🚫 Tentativa de marcar notificação inexistente: {id_notificacao} por {request.usuario.username}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Notificação não encontrada'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"❌ Erro ao marcar notificação como lida: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=100, window=3600)
+def obter_notificacoes_usuario(request):
+    """✅ FUNÇÃO CRÍTICA: Obter todas as notificações do usuário (com paginação)"""
+    try:
+        # Parâmetros de paginação
+        page = int(request.GET.get('page', 1))
+        limit = int(request.GET.get('limit', 20))
+        
+        # Buscar notificações do usuário
+        notificacoes_query = Notificacao.objects.filter(
+            usuario=request.usuario
+        ).order_by('-criado_em')
+        
+        # Paginação
+        paginator = Paginator(notificacoes_query, limit)
+        
+        try:
+            notificacoes_pagina = paginator.page(page)
+        except PageNotAnInteger:
+            notificacoes_pagina = paginator.page(1)
+        except EmptyPage:
+            notificacoes_pagina = paginator.page(paginator.num_pages)
+        
+        # Preparar dados das notificações
+        notificacoes_data = serializar_notificacoes(
+            notificacoes_pagina.object_list,
+            pode_marcar_lida=request.usuario.tipo_usuario == 'suporte'  # ✅ Flag para frontend
+        )
+        
+        # Estatísticas
+        total_nao_lidas = Notificacao.objects.filter(
+            usuario=request.usuario,
+            lida=False
+        ).count()
+        
+        return JsonResponse({
+            'success': True,
+            'notificacoes': notificacoes_data,
+            'pagina_atual': page,
+            'total_paginas': paginator.num_pages,
+            'total_notificacoes': notificacoes_query.count(),
+            'total_nao_lidas': total_nao_lidas,
+            'limite_por_pagina': limit,
+            'permite_gerenciar_notificacoes': request.usuario.tipo_usuario == 'suporte'
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter notificações do usuário: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'notificacoes': [],
+            'total_nao_lidas': 0,
+            'message': 'Erro ao carregar notificações'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=60, window=3600)
+def marcar_notificacoes_lidas_em_lote(request):
+    """✅ Marca várias notificações do suporte como lidas num único UPDATE"""
+    if request.usuario.tipo_usuario == 'colaborador':
+        return JsonResponse({
+            'success': False,
+            'message': 'Colaboradores não têm permissão para marcar notificações como lidas.'
+        }, status=403)
+
+    try:
+        _, ids = _ler_lote(request)
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'message': str(e)
+        }, status=400)
+
+    try:
+        resultados, total = lote.marcar_lidas(request.usuario, ids)
+        return JsonResponse({
+            'success': True,
+            'message': f'{total} notificações marcadas como lidas',
+            'total_aplicados': total,
+            'resultados': resultados
+        })
+    except Exception as e:
+        logger.error(f"Erro ao marcar notificações em lote: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def limpar_notificacoes_chamados_resolvidos(request):
+    """✅ NOVA API: Limpar automaticamente notificações de chamados já resolvidos"""
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem limpar notificações.'
+            }, status=403)
+        
+        # Buscar notificações de chamados já resolvidos
+        notificacoes_resolvidas = Notificacao.objects.filter(
+            usuario=request.usuario,
+            chamado__status='resolvido',
+            lida=False
+        )
+        
+        count = notificacoes_resolvidas.update(lida=True)
+        
+        logger.info(f"{count} notificações de chamados resolvidos marcadas como lidas por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'{count} notificações de chamados resolvidos marcadas como lidas',
+            'total_limpas': count
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao limpar notificações de chamados resolvidos: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro ao limpar notificações'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=60, window=3600)
+def carregar_notificacoes(request):
+    """API para carregar notificações do usuário"""
+    try:
+        # Buscar notificações do modelo
+        notificacoes = Notificacao.objects.filter(
+            usuario=request.usuario,
+            lida=False
+        ).order_by('-criado_em')[:10]
+        
+        notificacoes_data = serializar_notificacoes(notificacoes)
+        
+        return JsonResponse({
+            'success': True,
+            'notificacoes': notificacoes_data,
+            'total_nao_lidas': len(notificacoes_data)
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro ao carregar notificações: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'notificacoes': [],
+            'total_nao_lidas': 0
+        })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=30, window=3600)
+def marcar_notificacao_lida(request, id_notificacao):
+    """API para marcar notificação como lida"""
+    try:
+        lida = Notificacao.objects.filter(
+            id_notificacao=id_notificacao,
+            usuario=request.usuario
+        ).values_list('lida', flat=True).get()
+        if not lida:
+            buffer_escrita.notificacao_lida(request.usuario.pk, id_notificacao)
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Notificação marcada como lida'
+        })
+        
+    except Notificacao.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Notificação não encontrada'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao marcar notificação como lida: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=100, window=3600)
+def verificar_notificacoes_configuravel(request):
+    """✅ NOVA API: Verificar notificações com intervalo configurável (2 minutos)"""
+    try:
+        # Configuração do intervalo (2 minutos em segundos)
+        INTERVALO_VERIFICACAO = 120
+        
+        # Lógica baseada no tipo de usuário
+        if request.usuario.tipo_usuario == 'colaborador':
+            notificacoes_nao_lidas = Notificacao.objects.filter(
+                chamado__usuario=request.usuario,
+                lida=False
+            ).order_by('-criado_em')
+            
+            notificacoes_recentes = Notificacao.objects.filter(
+                chamado__usuario=request.usuario
+            ).order_by('-criado_em')[:15]  # Mais notificações para colaboradores
+            
+        else:
+            notificacoes_nao_lidas = Notificacao.objects.filter(
+                usuario=request.usuario,
+                lida=False
+            ).order_by('-criado_em')
+            
+            notificacoes_recentes = Notificacao.objects.filter(
+                usuario=request.usuario
+            ).order_by('-criado_em')[:20]
+        
+        notificacoes_data = serializar_notificacoes(
+            notificacoes_recentes,
+            pode_marcar_lida=request.usuario.tipo_usuario == 'suporte'  # ✅ Flag para frontend
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'notificacoes': notificacoes_data,
+            'total_nao_lidas': notificacoes_nao_lidas.count(),
+            'ultima_verificacao': timezone.now().timestamp(),
+            'tipo_usuario': request.usuario.tipo_usuario,
+            'intervalo_verificacao': INTERVALO_VERIFICACAO,
+            'permite_gerenciar_notificacoes': request.usuario.tipo_usuario == 'suporte'
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro em verificar_notificacoes_configuravel: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'notificacoes': [],
+            'total_nao_lidas': 0,
+            'message': 'Erro ao carregar notificações'
+        })
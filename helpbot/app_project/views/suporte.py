@@ -0,0 +1,640 @@
+"""
+Views do suporte: intermediação do chat, fila de atendimento e chamados abertos
+"""
+import logging
+from django.http import JsonResponse
+from django.db import transaction
+from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+import json
+from django.views.decorators.http import require_http_methods
+from django.db.models import Count
+from ..models import Usuario, Chamado, InteracaoChamado, Notificacao
+from ..security import security
+from ..escrita_adiada import buffer_escrita
+from ..eventos import publicar, MENSAGEM_ENVIADA, CONTROLE_ASSUMIDO
+from .. import fila
+from ..projecao import CAMPOS_CHAMADO, projetar_chamados
+from .base import rate_limit, usuario_required
+
+logger = logging.getLogger(__name__)
+
+# === FUNÇÕES DE SUPORTE QUE ESTAVAM FALTANDO ===
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def intermediar_chat_bot(request, id_chamado):
+    """API para o suporte intermediar o chat com o bot"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem intermediar o chat.'
+            }, status=403)
+        
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ Compare-and-set: dois suportes não conseguem intermediar o mesmo chamado
+        with transaction.atomic():
+            if not fila.assumir(request.usuario, chamado.id_chamado):
+                return _resposta_chamado_ocupado(chamado)
+            
+            # Criar mensagem informando que o suporte está intermediando
+            InteracaoChamado.objects.create(
+                chamado=chamado,
+                remetente='suporte',
+                mensagem=f"🛠️ **{request.usuario.username} está agora intermediando este chat**\nEstou aqui para ajudar no atendimento e garantir que tudo seja resolvido da melhor forma possível.",
+                suporte_responsavel=request.usuario
+            )
+            
+            # A mensagem do bot confirmando a intermediação sai pelo assinante do evento
+            publicar(CONTROLE_ASSUMIDO, chamado, suporte_id=request.usuario.id_usuario, modo='intermediacao')
+        
+        logger.info(f"Suporte {request.usuario.username} intermediando chat {id_chamado}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Chat intermediado com sucesso!',
+            'suporte_responsavel': request.usuario.username
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao intermediar chat: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def trocar_status_chamado(request, id_chamado):
+    """API para trocar status do chamado - ATUALIZADA"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # Verificar permissões
+        if request.usuario.tipo_usuario != 'suporte' and chamado.usuario != request.usuario:
+            logger.warning(f"Tentativa de alterar status não autorizada: {request.usuario.username} -> {id_chamado}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado.'
+            }, status=403)
+        
+        # Ler dados da requisição
+        if request.content_type == 'application/json':
+            data = json.loads(request.body)
+        else:
+            data = request.POST
+        
+        novo_status = data.get('status')
+        observacao = security.sanitize_input(data.get('observacao', ''), max_length=200)
+        
+        if not novo_status:
+            return JsonResponse({
+                'success': False,
+                'message': 'Status é obrigatório.'
+            }, status=400)
+        
+        if novo_status not in dict(Chamado.STATUS_CHOICES):
+            return JsonResponse({
+                'success': False,
+                'message': 'Status inválido.'
+            }, status=400)
+        
+        # ✅ Status + mensagem de atualização + evento StatusAlterado na mesma transação.
+        # Notificações e mensagens de finalização do bot ficam com os assinantes.
+        origem = 'suporte' if request.usuario.tipo_usuario == 'suporte' else 'usuario'
+        with transaction.atomic():
+            status_anterior = dict(Chamado.STATUS_CHOICES)[
+                chamado.alterar_status(novo_status, origem, autor=request.usuario, observacao=observacao)
+            ]
+            
+            # Criar mensagem de atualização
+            mensagem_status = f"📊 **Status alterado:** {status_anterior} → {chamado.get_status_display()}"
+            if observacao:
+                mensagem_status += f"\n💬 **Observação:** {observacao}"
+            
+            if origem == 'suporte':
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='suporte',
+                    mensagem=mensagem_status,
+                    suporte_responsavel=request.usuario
+                )
+            else:
+                InteracaoChamado.objects.create(
+                    chamado=chamado,
+                    remetente='usuario',
+                    mensagem=mensagem_status
+                )
+        
+        logger.info(f"Status do chamado {id_chamado} alterado para {novo_status} por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Status atualizado com sucesso!',
+            'novo_status': chamado.get_status_display(),
+            'novo_status_value': novo_status
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao trocar status: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def marcar_chamado_visualizado(request, id_chamado):
+    """API para marcar chamado como visualizado pelo suporte - CORRIGIDA"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem marcar chamados como visualizados.'
+            }, status=403)
+        
+        chamado = Chamado.objects.only('id_chamado', 'visualizado_suporte').get(id_chamado=id_chamado)
+        
+        # ✅ CORREÇÃO CRÍTICA: Marcar APENAS as notificações DESTE SUPORTE como visualizadas
+        notificacoes_atualizadas = Notificacao.objects.filter(
+            usuario=request.usuario,  # ✅ Apenas notificações DESTE usuário
+            chamado=chamado,
+            tipo='novo_chamado_broadcast',
+            lida=False
+        ).count()
+        
+        # ✅ Notificações lidas + chamado visualizado pelo suporte via escrita adiada
+        # (a visualização individual fica registrada nas notificações lidas)
+        if notificacoes_atualizadas or not chamado.visualizado_suporte:
+            buffer_escrita.chamado_visualizado(request.usuario.pk, chamado.pk)
+        
+        # ✅ CORREÇÃO: NÃO marcar as notificações de OUTROS SUPORTES!
+        logger.info(f"Chamado {id_chamado} marcado como visualizado por {request.usuario.username}. {notificacoes_atualizadas} notificações DESTE SUPORTE marcadas como lidas.")
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Chamado marcado como visualizado! {notificacoes_atualizadas} notificações suas marcadas como lidas.',
+            'notificacoes_atualizadas': notificacoes_atualizadas,
+            'visualizado_por': request.usuario.username
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao marcar chamado como visualizado: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+TIPO_NOTIFICACAO_BROADCAST = 'novo_chamado_broadcast'
+
+ORDEM_URGENCIA = {'urgente': 0, 'alta': 1}
+
+def _consultas_chamados_abertos(usuario):
+    """
+    Consultas (ainda não executadas) usadas pela lista de chamados abertos.
+    "Visualizado" = notificação broadcast do suporte marcada como lida.
+    Compartilhadas entre a view sync e a async.
+    """
+    # Tuplas para projetar_chamados (app_project/projecao.py)
+    chamados = Chamado.objects.filter(
+        status='em_andamento'
+    ).order_by('-criado_em').values_list(*CAMPOS_CHAMADO)
+
+    # Ordem crescente: no dicionário montado a partir daqui, a mais recente prevalece
+    minhas_notificacoes = Notificacao.objects.filter(
+        usuario=usuario,
+        tipo=TIPO_NOTIFICACAO_BROADCAST,
+        chamado__status='em_andamento'
+    ).order_by('criado_em').values_list('chamado_id', 'id_notificacao', 'lida')
+
+    visualizacoes = Notificacao.objects.filter(
+        tipo=TIPO_NOTIFICACAO_BROADCAST,
+        lida=True,
+        chamado__status='em_andamento'
+    ).values('chamado_id').annotate(total=Count('usuario', distinct=True)).values_list('chamado_id', 'total')
+
+    suportes = Usuario.objects.filter(tipo_usuario='suporte')
+    return chamados, minhas_notificacoes, visualizacoes, suportes
+
+def _resposta_chamados_abertos(chamados, minhas_notificacoes, visualizacoes, total_suportes):
+    """Monta o JSON de chamados abertos a partir dos resultados já carregados (tuplas de CAMPOS_CHAMADO)"""
+    notificacao_por_chamado = {chamado_id: (id_notificacao, lida) for chamado_id, id_notificacao, lida in minhas_notificacoes}
+    visualizacoes_por_chamado = dict(visualizacoes)
+
+    chamados_data = []
+    for chamado in projetar_chamados(chamados):
+        id_notificacao, notificacao_lida = notificacao_por_chamado.get(chamado.id_chamado, (None, False))
+        visualizacoes_count = visualizacoes_por_chamado.get(chamado.id_chamado, 0)
+        item = chamado.resumo()
+        item.update({
+            'departamento_id': str(chamado.departamento_id),
+            'visualizado_por_mim': notificacao_lida,
+            'notificacao_lida': notificacao_lida,
+            'notificacao_id': str(id_notificacao) if id_notificacao else None,
+            'visualizacoes_count': visualizacoes_count,
+            'total_suportes': total_suportes,
+            'percentual_visualizado': round((visualizacoes_count / total_suportes) * 100) if total_suportes > 0 else 0,
+            'prioridade': 'alta' if chamado.urgencia == 'urgente' else 'media' if chamado.urgencia == 'alta' else 'baixa',
+            'detalhes_url': f"/chamado/{chamado.id_chamado}/"
+        })
+        chamados_data.append(item)
+
+    # Ordenar por urgência; a consulta já vem do mais recente para o mais antigo (sort estável)
+    chamados_data.sort(key=lambda x: ORDEM_URGENCIA.get(x['urgencia_valor'], 2))
+
+    return {
+        'success': True,
+        'chamados_abertos': chamados_data,
+        'total_abertos': len(chamados_data),
+        'total_urgentes': len([c for c in chamados_data if c['urgencia_valor'] == 'urgente']),
+        'meus_visualizados': len([c for c in chamados_data if c['visualizado_por_mim']]),
+        'atualizado_em': timezone.now().strftime('%H:%M:%S'),
+        'mensagem': f'{len(chamados_data)} chamados abertos disponíveis para todos suportes'
+    }
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def verificar_chamados_abertos_para_suporte(request):
+    """✅ NOVA API: Verificar chamados abertos visíveis para TODOS os suportes"""
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem acessar esta API.'
+            }, status=403)
+        
+        chamados, minhas_notificacoes, visualizacoes, suportes = _consultas_chamados_abertos(request.usuario)
+        return JsonResponse(_resposta_chamados_abertos(
+            chamados, minhas_notificacoes, visualizacoes, suportes.count()
+        ))
+        
+    except Exception as e:
+        logger.error(f"Erro em verificar_chamados_abertos_para_suporte: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+    
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=60, window=3600)
+def verificar_chamados_pendentes_globais(request):
+    """✅ NOVA API: Verificar todos os chamados pendentes no sistema (para dashboard do suporte)"""
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado'
+            }, status=403)
+        
+        # Buscar TODOS os chamados em andamento
+        chamados_pendentes = Chamado.objects.filter(
+            status='em_andamento'
+        ).order_by('-criado_em')
+        
+        # ✅ Visualizações agregadas em duas consultas (antes eram três consultas por chamado)
+        visualizados_por_mim = set(Notificacao.objects.filter(
+            usuario=request.usuario,
+            chamado__status='em_andamento',
+            tipo='novo_chamado',
+            lida=True
+        ).values_list('chamado_id', flat=True))
+        visualizacoes_por_chamado = dict(Notificacao.objects.filter(
+            chamado__status='em_andamento',
+            tipo='novo_chamado',
+            lida=True
+        ).values('chamado_id').annotate(total=Count('usuario', distinct=True)).values_list('chamado_id', 'total'))
+        total_suportes = Usuario.objects.filter(tipo_usuario='suporte').count()
+        
+        # Preparar dados
+        chamados_data = []
+        for chamado in projetar_chamados(chamados_pendentes.values_list(*CAMPOS_CHAMADO)):
+            visualizacoes_count = visualizacoes_por_chamado.get(chamado.id_chamado, 0)
+            item = chamado.resumo()
+            item.update({
+                'visualizado_por_mim': chamado.id_chamado in visualizados_por_mim,
+                'visualizacoes_count': visualizacoes_count,
+                'total_suportes': total_suportes,
+                'percentual_visualizado': round((visualizacoes_count / total_suportes) * 100) if total_suportes > 0 else 0,
+                'prioridade': 'alta' if chamado.urgencia == 'urgente' else 'media' if chamado.urgencia == 'alta' else 'baixa'
+            })
+            chamados_data.append(item)
+        
+        # Estatísticas (da lista já carregada)
+        total_chamados_pendentes = len(chamados_data)
+        chamados_urgentes = sum(1 for item in chamados_data if item['urgencia_valor'] == 'urgente')
+        
+        return JsonResponse({
+            'success': True,
+            'chamados_pendentes': chamados_data,
+            'total_pendentes': total_chamados_pendentes,
+            'total_urgentes': chamados_urgentes,
+            'atualizado_em': timezone.now().strftime('%H:%M:%S'),
+            'mensagem': f'{total_chamados_pendentes} chamados pendentes ({chamados_urgentes} urgentes)'
+        })
+        
+    except Exception as e:
+        logger.error(f"Erro em verificar_chamados_pendentes_globais: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+def _resposta_chamado_ocupado(chamado):
+    """Resposta 409 quando outro suporte assumiu/reservou o chamado primeiro"""
+    chamado.refresh_from_db(fields=['suporte_responsavel', 'reservado_por', 'reserva_expira_em'])
+    if chamado.suporte_responsavel:
+        message = f'Este chamado já está sendo atendido por {chamado.suporte_responsavel.username}.'
+    else:
+        message = f'Este chamado está reservado por {chamado.reservado_por.username if chamado.reservado_por else "outro suporte"}.'
+    return JsonResponse({
+        'success': False,
+        'message': message
+    }, status=409)
+
+def _dados_chamado_fila(chamado):
+    return {
+        'id': str(chamado.id_chamado),
+        'id_legivel': chamado.id_legivel,
+        'titulo': chamado.titulo,
+        'urgencia': chamado.urgencia,
+        'urgencia_display': chamado.get_urgencia_display(),
+        'departamento': chamado.departamento.nome,
+        'criado_em': chamado.criado_em.strftime('%d/%m/%Y %H:%M'),
+        'tempo_aberto': chamado.tempo_decorrido,
+        'reserva_expira_em': chamado.reserva_expira_em.isoformat() if chamado.reserva_expira_em else None,
+    }
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+def fila_atendimento(request):
+    """✅ Próximos chamados da fila (urgência + idade) e as reservas ativas do suporte"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem acessar a fila.'
+        }, status=403)
+    
+    try:
+        limite = max(1, min(int(request.GET.get('limite', 10)), 50))
+    except ValueError:
+        limite = 10
+    
+    disponiveis = fila.disponiveis().select_related('departamento')
+    return JsonResponse({
+        'success': True,
+        'proximos': [_dados_chamado_fila(chamado) for chamado in disponiveis[:limite]],
+        'total_disponiveis': disponiveis.count(),
+        'minhas_reservas': [
+            _dados_chamado_fila(chamado)
+            for chamado in fila.reservas_ativas(request.usuario).select_related('departamento')
+        ],
+        'duracao_reserva': fila.DURACAO_RESERVA
+    })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=240, window=3600)
+def reivindicar_chamados(request):
+    """✅ Reserva (lease) os próximos chamados da fila para o suporte, sem disputa entre suportes"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem reivindicar chamados.'
+        }, status=403)
+    
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+        quantidade = int(data.get('quantidade', 1))
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return JsonResponse({
+            'success': False,
+            'message': 'Dados inválidos'
+        }, status=400)
+    
+    try:
+        reservados = fila.reivindicar(request.usuario, quantidade)
+        return JsonResponse({
+            'success': True,
+            'chamados': [_dados_chamado_fila(chamado) for chamado in reservados],
+            'total': len(reservados),
+            'message': 'Nenhum chamado disponível na fila.' if not reservados else f'{len(reservados)} chamado(s) reservado(s).'
+        })
+    except Exception as e:
+        logger.error(f"Erro ao reivindicar chamados: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=240, window=3600)
+def renovar_reserva_chamado(request, id_chamado):
+    """✅ Estende a reserva enquanto o suporte analisa o chamado"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem renovar reservas.'
+        }, status=403)
+    
+    if not fila.renovar(request.usuario, id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'Reserva expirada ou pertencente a outro suporte.'
+        }, status=409)
+    return JsonResponse({
+        'success': True,
+        'duracao_reserva': fila.DURACAO_RESERVA
+    })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=240, window=3600)
+def liberar_reserva_chamado(request, id_chamado):
+    """✅ Devolve o chamado reservado para a fila"""
+    if request.usuario.tipo_usuario != 'suporte':
+        return JsonResponse({
+            'success': False,
+            'message': 'Apenas usuários de suporte podem liberar reservas.'
+        }, status=403)
+    
+    return JsonResponse({
+        'success': fila.liberar(request.usuario, id_chamado)
+    })
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def assumir_controle_chat(request, id_chamado):
+    """API para o suporte assumir controle do chat"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem assumir controle do chat.'
+            }, status=403)
+        
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # ✅ Compare-and-set: responsável, controle e visualizado numa única instrução UPDATE
+        with transaction.atomic():
+            if not fila.assumir(request.usuario, chamado.id_chamado):
+                return _resposta_chamado_ocupado(chamado)
+            
+            # Criar mensagem informando que o suporte assumiu o controle
+            InteracaoChamado.objects.create(
+                chamado=chamado,
+                remetente='suporte',
+                mensagem=f"👨‍💼 **{request.usuario.username} assumiu o controle do chat**\nA partir de agora, você está em contato direto com o suporte técnico.",
+                suporte_responsavel=request.usuario
+            )
+            publicar(CONTROLE_ASSUMIDO, chamado, suporte_id=request.usuario.id_usuario, modo='controle')
+        
+        logger.info(f"Suporte {request.usuario.username} assumiu controle do chat {id_chamado}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Controle do chat assumido com sucesso!',
+            'suporte_responsavel': request.usuario.username
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao assumir controle do chat: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@usuario_required
+@rate_limit(max_requests=20, window=3600)
+def enviar_mensagem_suporte(request, id_chamado):
+    """API para o suporte enviar mensagem no chat (quando tem controle)"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+    
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem enviar mensagens diretas.'
+            }, status=403)
+        
+        if request.content_type == 'application/json':
+            data = json.loads(request.body)
+        else:
+            data = request.POST
+            
+        mensagem = security.sanitize_input(data.get('mensagem', '').strip(), max_length=500)
+        
+        if not mensagem:
+            return JsonResponse({
+                'success': False,
+                'message': 'Mensagem não pode estar vazia'
+            }, status=400)
+        
+        chamado = Chamado.objects.get(id_chamado=id_chamado)
+        
+        # Verificar se o suporte tem controle do chat ou é o responsável
+        if not chamado.controle_chat_suporte and chamado.suporte_responsavel != request.usuario:
+            return JsonResponse({
+                'success': False,
+                'message': 'Você precisa assumir o controle do chat antes de enviar mensagens.'
+            }, status=403)
+        
+        # Criar mensagem do suporte
+        with transaction.atomic():
+            interacao = InteracaoChamado.objects.create(
+                chamado=chamado,
+                remetente='suporte',
+                mensagem=mensagem,
+                suporte_responsavel=request.usuario
+            )
+            publicar(MENSAGEM_ENVIADA, chamado, id_interacao=interacao.id_interacao, remetente='suporte')
+        
+        logger.info(f"Mensagem do suporte enviada no chamado {id_chamado} por {request.usuario.username}")
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Mensagem enviada com sucesso!'
+        })
+        
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro ao enviar mensagem do suporte: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
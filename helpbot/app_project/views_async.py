@@ -0,0 +1,259 @@
+"""
+Versões assíncronas (ORM async) dos endpoints de polling mais chamados.
+Uma requisição aguardando o banco não prende uma thread do worker: sob ASGI
+um único processo atende milhares de clientes fazendo polling.
+A lógica de negócio é a mesma das views sync em views/chat.py e views/suporte.py.
+"""
+import logging
+from functools import wraps
+
+from django.http import JsonResponse, HttpResponseNotAllowed
+from django.utils import timezone
+from django.utils.log import log_response
+
+from .models import Chamado, InteracaoChamado, Notificacao
+from .longpoll import canal_chamado, canal_notificacoes, segundos_espera, timestamp_desde, aaguardar_novidades
+from .serializacao import aserializar_notificacoes, aserializar_interacoes
+from .security import security
+from .views.base import rate_limit, usuario_required
+from .views.chat import _filtrar_mensagens_notificaveis, _ha_mensagens_novas
+from .views.suporte import _consultas_chamados_abertos, _resposta_chamados_abertos
+
+logger = logging.getLogger(__name__)
+
+
+def require_http_methods_async(metodos):
+    """Equivalente async de django.views.decorators.http.require_http_methods (sync no Django 4.2)"""
+    def decorator(view_func):
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if request.method not in metodos:
+                response = HttpResponseNotAllowed(metodos)
+                log_response(
+                    "Method Not Allowed (%s): %s", request.method, request.path,
+                    response=response, request=request,
+                )
+                return response
+            return await view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+def csrf_exempt_async(view_func):
+    """Equivalente async de csrf_exempt: o middleware só olha o atributo"""
+    view_func.csrf_exempt = True
+    return view_func
+
+
+@csrf_exempt_async
+@require_http_methods_async(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+async def verificar_notificacoes(request):
+    """✅ Versão async: notificações para COLABORADORES E SUPORTE"""
+    try:
+        if request.usuario.tipo_usuario == 'colaborador':
+            # COLABORADOR: Ver apenas notificações dos SEUS chamados
+            filtro = {'chamado__usuario': request.usuario}
+        else:
+            filtro = {'usuario': request.usuario}
+
+        async def consultar():
+            notificacoes_data = await aserializar_notificacoes(
+                Notificacao.objects.filter(**filtro).order_by('-criado_em')[:10],
+                pode_marcar_lida=request.usuario.tipo_usuario == 'suporte'
+            )
+            return notificacoes_data, await Notificacao.objects.filter(lida=False, **filtro).acount()
+
+        # ✅ LONG-POLL: com ?wait=N&desde=T aguarda até surgir notificação mais nova que T
+        desde = timestamp_desde(request)
+        notificacoes_data, total_nao_lidas = await aaguardar_novidades(
+            canal_notificacoes(request.usuario.id_usuario),
+            segundos_espera(request) if desde is not None else 0,
+            consultar,
+            lambda dados: any(n['timestamp'] > desde for n in dados[0]),
+        )
+
+        return JsonResponse({
+            'success': True,
+            'notificacoes': notificacoes_data,
+            'total_nao_lidas': total_nao_lidas,
+            'ultima_verificacao': timezone.now().timestamp(),
+            'tipo_usuario': request.usuario.tipo_usuario,
+            'intervalo_verificacao': 45,
+            'permite_marcar_lidas': request.usuario.tipo_usuario == 'suporte'
+        })
+
+    except Exception as e:
+        logger.error(f"Erro ao verificar notificações: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'notificacoes': [],
+            'total_nao_lidas': 0,
+            'message': 'Erro ao carregar notificações'
+        })
+
+
+@csrf_exempt_async
+@require_http_methods_async(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+async def verificar_novas_mensagens_inteligente(request, id_chamado):
+    """✅ Versão async: novas mensagens após a última visualizada"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+
+    try:
+        chamado = await Chamado.objects.aget(id_chamado=id_chamado)
+
+        if chamado.usuario_id != request.usuario.id_usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chat do chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+
+        ultima_mensagem_visualizada_id = request.GET.get('ultima_visualizada_id')
+        mensagens_chamado = InteracaoChamado.objects.filter(chamado_id=chamado.id_chamado).order_by('criado_em')
+
+        async def consultar():
+            ultima_global_id = await mensagens_chamado.values_list('id_interacao', flat=True).alast()
+            if ultima_global_id is None:
+                return {
+                    'success': True,
+                    'novas_mensagens': [],
+                    'total_novas': 0,
+                    'ultima_verificacao': timezone.now().timestamp(),
+                    'ultima_visualizada_id': None
+                }
+
+            # Apenas mensagens MAIS RECENTES que a última visualizada (se ela existir)
+            novas_mensagens = mensagens_chamado
+            if ultima_mensagem_visualizada_id and security.validate_uuid(ultima_mensagem_visualizada_id):
+                criado_em_visualizada = await InteracaoChamado.objects.filter(
+                    id_interacao=ultima_mensagem_visualizada_id
+                ).values_list('criado_em', flat=True).afirst()
+                if criado_em_visualizada is not None:
+                    novas_mensagens = mensagens_chamado.filter(criado_em__gt=criado_em_visualizada)
+
+            mensagens_data = _filtrar_mensagens_notificaveis(
+                await aserializar_interacoes(novas_mensagens, incluir_timestamp=True)
+            )
+
+            return {
+                'success': True,
+                'novas_mensagens': mensagens_data,
+                'total_novas': len(mensagens_data),
+                'ultima_verificacao': timezone.now().timestamp(),
+                'ultima_visualizada_id': str(ultima_global_id),
+                'chamado_status': chamado.status,
+                'controle_suporte': chamado.controle_chat_suporte
+            }
+
+        # ✅ LONG-POLL: com ?wait=N a resposta aguarda até chegar mensagem nova (ou o tempo acabar)
+        espera = segundos_espera(request)
+        dados = await aaguardar_novidades(
+            canal_chamado(chamado.id_chamado),
+            espera,
+            consultar,
+            lambda dados: _ha_mensagens_novas(dados, ultima_mensagem_visualizada_id),
+        )
+        if espera and 'chamado_status' in dados:
+            # O status pode ter mudado enquanto a requisição aguardava
+            await chamado.arefresh_from_db(fields=['status', 'controle_chat_suporte'])
+            dados['chamado_status'] = chamado.status
+            dados['controle_suporte'] = chamado.controle_chat_suporte
+        return JsonResponse(dados)
+
+    except Chamado.DoesNotExist:
+        logger.error(f"❌ Chamado não encontrado: {id_chamado}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em verificar_novas_mensagens_inteligente: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+
+@csrf_exempt_async
+@require_http_methods_async(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+async def verificar_status_chamado(request, id_chamado):
+    """✅ Versão async: status atual do chamado"""
+    if not security.validate_uuid(id_chamado):
+        return JsonResponse({
+            'success': False,
+            'message': 'ID de chamado inválido'
+        }, status=400)
+
+    try:
+        chamado = await Chamado.objects.select_related('suporte_responsavel').aget(id_chamado=id_chamado)
+
+        if chamado.usuario_id != request.usuario.id_usuario and request.usuario.tipo_usuario != 'suporte':
+            logger.warning(f"Acesso não autorizado ao chamado {id_chamado} por {request.usuario.username}")
+            return JsonResponse({
+                'success': False,
+                'message': 'Acesso não autorizado a este chamado.'
+            }, status=403)
+
+        return JsonResponse({
+            'success': True,
+            'chamado_id': str(chamado.id_chamado),
+            'chamado_legivel': chamado.id_legivel,
+            'status': chamado.status,
+            'status_display': chamado.get_status_display(),
+            'urgencia': chamado.urgencia,
+            'urgencia_display': chamado.get_urgencia_display(),
+            'controle_suporte': chamado.controle_chat_suporte,
+            'suporte_responsavel': chamado.suporte_responsavel.username if chamado.suporte_responsavel else None,
+            'total_mensagens': await InteracaoChamado.objects.filter(chamado_id=chamado.id_chamado).acount()
+        })
+
+    except Chamado.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Chamado não encontrado'
+        }, status=404)
+    except Exception as e:
+        logger.error(f"Erro em verificar_status_chamado: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
+
+
+@csrf_exempt_async
+@require_http_methods_async(["GET"])
+@usuario_required
+@rate_limit(max_requests=120, window=3600)
+async def verificar_chamados_abertos_para_suporte(request):
+    """✅ Versão async: chamados abertos visíveis para TODOS os suportes"""
+    try:
+        if request.usuario.tipo_usuario != 'suporte':
+            return JsonResponse({
+                'success': False,
+                'message': 'Apenas usuários de suporte podem acessar esta API.'
+            }, status=403)
+
+        chamados, minhas_notificacoes, visualizacoes, suportes = _consultas_chamados_abertos(request.usuario)
+        return JsonResponse(_resposta_chamados_abertos(
+            [chamado async for chamado in chamados],
+            [linha async for linha in minhas_notificacoes],
+            [linha async for linha in visualizacoes],
+            await suportes.acount(),
+        ))
+
+    except Exception as e:
+        logger.error(f"Erro em verificar_chamados_abertos_para_suporte: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }, status=500)
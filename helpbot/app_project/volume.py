@@ -0,0 +1,295 @@
+"""
+Consolidação (rollup) do volume de chamados em intervalos de hora e de dia,
+por departamento/urgência/status (tabela volume_chamados).
+
+- Alimentada pelos eventos CHAMADO_CRIADO e STATUS_ALTERADO: o assinante
+  reconta a hora afetada direto da tabela de chamados (consulta pequena e
+  indexada) e refaz o dia a partir das horas. Recontar em vez de somar +1
+  deixa o assinante idempotente (re-entrega de evento não duplica nada)
+- O histórico (e qualquer divergência, como chamados apagados) é refeito
+  pelo comando reconstruir_volume
+- serie() lê só as linhas consolidadas: no máximo MAX_PONTOS intervalos
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Max, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import Chamado, VolumeChamados
+
+logger = logging.getLogger(__name__)
+
+MAX_PONTOS = getattr(settings, 'VOLUME_MAX_PONTOS', 400)
+
+# Dias processados por vez na reconstrução (limita a memória)
+DIAS_POR_LOTE = 31
+
+GRANULARIDADES = ('hora', 'dia')
+
+# Agrupamentos aceitos pela série -> campo consultado nas linhas consolidadas
+AGRUPAMENTOS = {
+    'departamento': 'departamento__nome',
+    'urgencia': 'urgencia',
+    'status': 'status',
+}
+
+_CAMPOS_UNICOS = ['granularidade', 'inicio', 'departamento', 'urgencia', 'status']
+
+
+def inicio_hora(momento):
+    """Início da hora (no fuso local) que contém o momento"""
+    return timezone.localtime(momento).replace(minute=0, second=0, microsecond=0)
+
+
+def inicio_dia(momento):
+    """Meia-noite local do dia que contém o momento"""
+    return timezone.make_aware(datetime.combine(timezone.localtime(momento).date(), time.min))
+
+
+def _proximo(granularidade, inicio):
+    if granularidade == 'hora':
+        # Soma em UTC: no fuso local a aritmética seria de relógio de parede
+        return timezone.localtime(inicio.astimezone(dt_timezone.utc) + timedelta(hours=1))
+    return timezone.make_aware(datetime.combine(timezone.localtime(inicio).date() + timedelta(days=1), time.min))
+
+
+def _gravar(granularidade, inicio, contagens):
+    """Grava as contagens de um intervalo (upsert) e remove os grupos que zeraram"""
+    linhas = [
+        VolumeChamados(
+            granularidade=granularidade, inicio=inicio, departamento_id=departamento,
+            urgencia=urgencia, status=status, criados=criados, resolvidos=resolvidos,
+        )
+        for (departamento, urgencia, status), (criados, resolvidos) in contagens.items()
+    ]
+    with transaction.atomic():
+        if linhas:
+            VolumeChamados.objects.bulk_create(
+                linhas, update_conflicts=True, unique_fields=_CAMPOS_UNICOS, update_fields=['criados', 'resolvidos']
+            )
+        obsoletas = [
+            pk for pk, *chave in VolumeChamados.objects.filter(granularidade=granularidade, inicio=inicio)
+            .values_list('pk', 'departamento_id', 'urgencia', 'status')
+            if tuple(chave) not in contagens
+        ]
+        if obsoletas:
+            VolumeChamados.objects.filter(pk__in=obsoletas).delete()
+
+
+def recalcular_hora(momento):
+    """Reconta a hora do momento a partir dos chamados e atualiza o dia correspondente"""
+    inicio = inicio_hora(momento)
+    fim = _proximo('hora', inicio)
+    contagens = defaultdict(lambda: [0, 0])
+
+    criados = (
+        Chamado.objects.filter(criado_em__gte=inicio, criado_em__lt=fim)
+        .order_by().values('departamento_id', 'urgencia', 'status')
+        .annotate(total=Count('pk')).values_list('departamento_id', 'urgencia', 'status', 'total')
+    )
+    for departamento, urgencia, status, total in criados:
+        contagens[(departamento, urgencia, status)][0] = total
+
+    resolvidos = (
+        Chamado.objects.filter(status='resolvido', data_resolucao__gte=inicio, data_resolucao__lt=fim)
+        .order_by().values('departamento_id', 'urgencia')
+        .annotate(total=Count('pk')).values_list('departamento_id', 'urgencia', 'total')
+    )
+    for departamento, urgencia, total in resolvidos:
+        contagens[(departamento, urgencia, 'resolvido')][1] = total
+
+    _gravar('hora', inicio, contagens)
+    recalcular_dia(inicio)
+
+
+def recalcular_dia(momento):
+    """Refaz as linhas diárias somando as linhas por hora do dia"""
+    inicio = inicio_dia(momento)
+    somas = (
+        VolumeChamados.objects.filter(granularidade='hora', inicio__gte=inicio, inicio__lt=_proximo('dia', inicio))
+        .values('departamento_id', 'urgencia', 'status')
+        .annotate(soma_criados=Sum('criados'), soma_resolvidos=Sum('resolvidos'))
+        .values_list('departamento_id', 'urgencia', 'status', 'soma_criados', 'soma_resolvidos')
+    )
+    _gravar('dia', inicio, {
+        (departamento, urgencia, status): (criados, resolvidos)
+        for departamento, urgencia, status, criados, resolvidos in somas
+    })
+
+
+def recalcular_chamado(id_chamado):
+    """Horas afetadas por um chamado: a da criação e a da resolução"""
+    datas = Chamado.objects.filter(pk=id_chamado).values_list('criado_em', 'data_resolucao').first()
+    if not datas:
+        return
+    criado_em, data_resolucao = datas
+    recalcular_hora(criado_em)
+    if data_resolucao and inicio_hora(data_resolucao) != inicio_hora(criado_em):
+        recalcular_hora(data_resolucao)
+
+
+# ===== RECONSTRUÇÃO (HISTÓRICO) =====
+
+def _contagens_por_hora(inicio, fim):
+    """Contagens de todas as horas do período em duas consultas agrupadas"""
+    fuso = timezone.get_current_timezone()
+    contagens = defaultdict(lambda: [0, 0])
+
+    criados = (
+        Chamado.objects.filter(criado_em__gte=inicio, criado_em__lt=fim)
+        .order_by().annotate(hora=TruncHour('criado_em', tzinfo=fuso))
+        .values('hora', 'departamento_id', 'urgencia', 'status')
+        .annotate(total=Count('pk')).values_list('hora', 'departamento_id', 'urgencia', 'status', 'total')
+    )
+    for hora, departamento, urgencia, status, total in criados:
+        contagens[(hora, departamento, urgencia, status)][0] = total
+
+    resolvidos = (
+        Chamado.objects.filter(status='resolvido', data_resolucao__gte=inicio, data_resolucao__lt=fim)
+        .order_by().annotate(hora=TruncHour('data_resolucao', tzinfo=fuso))
+        .values('hora', 'departamento_id', 'urgencia')
+        .annotate(total=Count('pk')).values_list('hora', 'departamento_id', 'urgencia', 'total')
+    )
+    for hora, departamento, urgencia, total in resolvidos:
+        contagens[(hora, departamento, urgencia, 'resolvido')][1] = total
+    return contagens
+
+
+def _reconstruir_lote(inicio, fim):
+    fuso = timezone.get_current_timezone()
+    with transaction.atomic():
+        VolumeChamados.objects.filter(inicio__gte=inicio, inicio__lt=fim).delete()
+        VolumeChamados.objects.bulk_create([
+            VolumeChamados(
+                granularidade='hora', inicio=hora, departamento_id=departamento,
+                urgencia=urgencia, status=status, criados=criados, resolvidos=resolvidos,
+            )
+            for (hora, departamento, urgencia, status), (criados, resolvidos) in _contagens_por_hora(inicio, fim).items()
+        ], batch_size=1000)
+
+        dias = (
+            VolumeChamados.objects.filter(granularidade='hora', inicio__gte=inicio, inicio__lt=fim)
+            .annotate(dia=TruncDay('inicio', tzinfo=fuso))
+            .values('dia', 'departamento_id', 'urgencia', 'status')
+            .annotate(soma_criados=Sum('criados'), soma_resolvidos=Sum('resolvidos'))
+            .values_list('dia', 'departamento_id', 'urgencia', 'status', 'soma_criados', 'soma_resolvidos')
+        )
+        linhas = [
+            VolumeChamados(
+                granularidade='dia', inicio=dia, departamento_id=departamento,
+                urgencia=urgencia, status=status, criados=criados, resolvidos=resolvidos,
+            )
+            for dia, departamento, urgencia, status, criados, resolvidos in dias
+        ]
+        VolumeChamados.objects.bulk_create(linhas, batch_size=1000)
+    return len(linhas)
+
+
+def reconstruir(desde=None, ate=None, progresso=None):
+    """
+    Refaz a consolidação de [desde, ate) em lotes de DIAS_POR_LOTE dias
+    (padrão: todo o histórico). Retorna quantos dias foram processados.
+    """
+    if desde is None or ate is None:
+        limites = Chamado.objects.aggregate(
+            primeiro=Min('criado_em'), ultimo=Max('criado_em'), ultima_resolucao=Max('data_resolucao')
+        )
+        if limites['primeiro'] is None:
+            return 0
+        desde = desde or limites['primeiro']
+        ate = ate or max(filter(None, (limites['ultimo'], limites['ultima_resolucao']))) + timedelta(seconds=1)
+
+    inicio = inicio_dia(desde)
+    fim = inicio_dia(ate - timedelta(microseconds=1))
+    fim = _proximo('dia', fim)
+    dias = 0
+    while inicio < fim:
+        lote_fim = min(fim, timezone.make_aware(datetime.combine(
+            timezone.localtime(inicio).date() + timedelta(days=DIAS_POR_LOTE), time.min
+        )))
+        _reconstruir_lote(inicio, lote_fim)
+        dias += (timezone.localtime(lote_fim).date() - timezone.localtime(inicio).date()).days
+        if progresso:
+            progresso(inicio, lote_fim)
+        inicio = lote_fim
+    return dias
+
+
+# ===== CONSULTA =====
+
+def intervalos(granularidade, inicio, fim):
+    """Inícios dos intervalos que cobrem [inicio, fim)"""
+    atual = inicio_hora(inicio) if granularidade == 'hora' else inicio_dia(inicio)
+    resultado = []
+    while atual < fim:
+        resultado.append(atual)
+        atual = _proximo(granularidade, atual)
+    return resultado
+
+
+def escolher_granularidade(inicio, fim):
+    """Hora enquanto couber em MAX_PONTOS intervalos; senão dia"""
+    return 'hora' if fim - inicio <= timedelta(hours=MAX_PONTOS) else 'dia'
+
+
+def serie(inicio, fim, granularidade=None, agrupar_por=None, **filtros):
+    """
+    Série temporal de criados/resolvidos em [inicio, fim), opcionalmente
+    agrupada (departamento, urgencia ou status) e filtrada pelos mesmos campos
+    (departamento=<id>, urgencia=..., status=...).
+    ValueError para parâmetros inválidos ou mais de MAX_PONTOS intervalos.
+    """
+    if fim <= inicio:
+        raise ValueError("O fim do intervalo deve ser depois do início")
+    granularidade = granularidade or escolher_granularidade(inicio, fim)
+    if granularidade not in GRANULARIDADES:
+        raise ValueError(f"Granularidade inválida: {granularidade}")
+    if agrupar_por and agrupar_por not in AGRUPAMENTOS:
+        raise ValueError(f"Agrupamento inválido: {agrupar_por}")
+
+    inicios = intervalos(granularidade, inicio, fim)
+    if len(inicios) > MAX_PONTOS:
+        raise ValueError(f"Intervalo longo demais: {len(inicios)} pontos (máximo {MAX_PONTOS})")
+    posicao = {momento: indice for indice, momento in enumerate(inicios)}
+
+    linhas = VolumeChamados.objects.filter(
+        granularidade=granularidade, inicio__gte=inicios[0], inicio__lt=fim
+    )
+    filtros_validos = {campo: valor for campo, valor in filtros.items() if campo in AGRUPAMENTOS and valor}
+    if 'departamento' in filtros_validos:
+        filtros_validos['departamento_id'] = filtros_validos.pop('departamento')
+    linhas = linhas.filter(**filtros_validos)
+
+    campos = ['inicio'] + ([AGRUPAMENTOS[agrupar_por]] if agrupar_por else [])
+    somas = (
+        linhas.values(*campos)
+        .annotate(soma_criados=Sum('criados'), soma_resolvidos=Sum('resolvidos'))
+        .values_list(*campos, 'soma_criados', 'soma_resolvidos')
+    )
+
+    series = {}
+    for linha in somas:
+        momento, criados, resolvidos = linha[0], linha[-2], linha[-1]
+        nome = linha[1] if agrupar_por else 'total'
+        if nome not in series:
+            series[nome] = {'nome': nome, 'criados': [0] * len(inicios), 'resolvidos': [0] * len(inicios)}
+        indice = posicao.get(momento)
+        if indice is not None:
+            series[nome]['criados'][indice] += criados
+            series[nome]['resolvidos'][indice] += resolvidos
+
+    if not series and not agrupar_por:
+        series['total'] = {'nome': 'total', 'criados': [0] * len(inicios), 'resolvidos': [0] * len(inicios)}
+
+    return {
+        'granularidade': granularidade,
+        'inicio': inicios[0].isoformat(),
+        'fim': fim.isoformat(),
+        'rotulos': [momento.isoformat() for momento in inicios],
+        'series': sorted(series.values(), key=lambda item: item['nome']),
+    }
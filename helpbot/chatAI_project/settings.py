@@ -26,6 +26,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'app_project.middleware.EstaticosPrecomprimidosMiddleware',  # ✅ Estáticos com hash + .br/.gz
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,8 +93,8 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 
-# Em produção, descomente a linha abaixo:
-# STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Destino do collectstatic (minificado, com hash e pré-comprimido em produção)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Em desenvolvimento, use STATICFILES_DIRS
 STATICFILES_DIRS = [
@@ -126,6 +127,8 @@ REST_FRAMEWORK = {
 }
 
 # Cache configuration (opcional - para melhor performance)
+# ⚠️ Em produção com vários workers use um cache compartilhado (Redis/Memcached):
+# os contadores de versão (app_project/versoes.py) precisam ser globais
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -133,6 +136,64 @@ CACHES = {
     }
 }
 
+# Tempo máximo dos contadores do dashboard em cache (segundos)
+CACHE_DASHBOARD_TIMEOUT = 300
+
+# Endpoints de polling em views async (app_project/views_async.py).
+# Sob ASGI (chatAI_project/asgi.py) cada cliente aguardando não ocupa uma thread.
+VIEWS_POLLING_ASYNC = True
+
+# Long-poll (?wait=N) dos endpoints de mensagens/notificações (app_project/longpoll.py)
+LONGPOLL_ESPERA_MAXIMA = 25       # segundos; fique abaixo do timeout do proxy
+LONGPOLL_INTERVALO_BROKER = 1.0   # consulta ao contador compartilhado entre workers
+LONGPOLL_RATE_LIMIT = 1800        # requisições ?wait=N por usuário e view a cada hora (limite próprio, separado do comum)
+
+# Executor de efeitos pós-commit (app_project/tarefas.py)
+TAREFAS_MAX_WORKERS = 4        # threads do pool por processo
+TAREFAS_MAX_PENDENTES = 1000   # acima disso quem agendou executa a tarefa (pressão de volta)
+TAREFAS_TENTATIVAS = 3         # re-tentativas com espera exponencial
+TAREFAS_SINCRONAS = False      # True executa tudo na própria thread (útil em testes)
+
+# Outbox de eventos de domínio (app_project/eventos.py; recuperação: manage.py despachar_eventos)
+EVENTOS_TAMANHO_LOTE = 100     # eventos selecionados por rodada do despachante (cada um na sua transação)
+EVENTOS_MAX_TENTATIVAS = 5     # depois disso o evento fica no outbox com ultimo_erro para análise
+EVENTOS_ESPERA_BASE = 5        # segundos até a 2ª tentativa; dobra a cada falha (máx. 15 min)
+
+# Fila de atendimento do suporte (app_project/fila.py)
+FILA_DURACAO_RESERVA = 300     # segundos de reserva de um chamado reivindicado (renovável)
+FILA_MAX_REIVINDICACAO = 10    # chamados por reivindicação
+LOTE_MAX_ITENS = 200           # IDs por requisição nas operações em lote (app_project/lote.py)
+
+# Chamados quase duplicados (app_project/duplicidade.py)
+DUPLICADOS_JANELA_HORAS = 6    # só chamados abertos criados nessa janela servem de original
+DUPLICADOS_LIMIAR = 0.5        # similaridade mínima estimada (Jaccard dos shingles)
+DUPLICADOS_SOBREPOSICAO_SEGUNDOS = 60   # a sincronização revê esse trecho (commits fora de ordem)
+
+# Métricas de SLA - percentis de primeira resposta e resolução (app_project/sla.py)
+SLA_CACHE_SEGUNDOS = 300       # resultado de cada período fica em cache por esse tempo
+
+# Consolidação do volume de chamados por hora/dia (app_project/volume.py; histórico: manage.py reconstruir_volume)
+VOLUME_MAX_PONTOS = 400        # intervalos por série: até ~16 dias por hora ou ~13 meses por dia
+
+# Escrita adiada das marcações de leitura: notificações, visualização e cursores do chat
+# (app_project/escrita_adiada.py; o buffer é por processo e também é gravado na saída)
+ESCRITA_ADIADA_INTERVALO_MS = 500   # tempo máximo entre a marcação e a gravação em lote
+ESCRITA_ADIADA_MAX_ITENS = 200      # marcações acumuladas que antecipam a gravação
+
+# Transcrições do chat em cache, atualizadas a cada mensagem nova e conferidas no banco (app_project/transcricoes.py)
+TRANSCRICAO_CACHE_SEGUNDOS = 3600   # chamados parados saem do cache; a próxima abertura remonta
+
+# Inicialização do worker (app_project/aquecimento.py; medição: manage.py benchmark_inicializacao)
+# As views são importadas sob demanda por subsistema (app_project/views/); o aquecimento,
+# chamado em wsgi.py/asgi.py, carrega antes da primeira requisição o que ela pagaria.
+AQUECIMENTO_AO_INICIAR = True
+AQUECIMENTO_VIEWS = ('base', 'autenticacao', 'chamados', 'chat', 'notificacoes', 'suporte')  # estatisticas fica sob demanda (numpy)
+
+# Agrupamento de notificações (app_project/agrupamento.py; resumo periódico: manage.py resumir_notificacoes)
+NOTIFICACOES_JANELA_AGRUPAMENTO = 600           # segundos: mesma (usuário, chamado, tipo) não lida vira uma linha com contador
+NOTIFICACOES_RESUMO_TIPOS = ('atualizacao', 'mensagem')   # tipos juntados no resumo (novo chamado/broadcast ficam de fora)
+NOTIFICACOES_RESUMO_URGENCIAS = ('baixa',)      # só chamados dessas urgências entram no resumo
+
 # Security settings (para desenvolvimento)
 if DEBUG:
     # Em produção, remova estas configurações
@@ -145,17 +206,54 @@ else:
     CSRF_COOKIE_SECURE = True
     SECURE_SSL_REDIRECT = True
 
-# Logging configuration
+    # Templates compilados uma única vez por processo
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+    # collectstatic minifica, gera nomes com hash e variantes .gz/.br
+    STORAGES = {
+        'default': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'app_project.storage.ArmazenamentoEstaticoComprimido',
+        },
+    }
+
+# Logging: fila assíncrona + JSON + amostragem (app_project/log_estruturado.py)
+# A requisição só enfileira o registro; uma thread por processo formata e escreve.
+LOG_AMOSTRAGEM = {
+    'app_project.views.frequente': 20,   # dashboard/polling/mensagens: 1 a cada 20 INFO
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'app_project.log_estruturado.FormatadorJSON',
+        },
+    },
+    'filters': {
+        'amostragem': {
+            '()': 'app_project.log_estruturado.FiltroAmostragem',
+            'taxas': LOG_AMOSTRAGEM,
+        },
+    },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
+        'fila': {
+            '()': 'app_project.log_estruturado.HandlerFila',
+            'formatter': 'json',
+            'filters': ['amostragem'],
         },
     },
     'root': {
-        'handlers': ['console'],
+        'handlers': ['fila'],
         'level': 'INFO',
     },
-}
\ No newline at end of file
+}
@@ -2,11 +2,19 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework import routers
 from app_project.api import viewsets as app_project_viewsets
-from app_project import views
+from django.conf import settings
+# ✅ Views carregadas sob demanda: cada subsistema é importado na primeira requisição a ele
+from app_project.views import vistas as views, vistas_async
+
+# ✅ Endpoints de polling: versões async não prendem threads do worker (ASGI), também sob demanda
+polling = vistas_async if getattr(settings, 'VIEWS_POLLING_ASYNC', True) else views
 
 # Configuração das rotas API
 route = routers.DefaultRouter()
 route.register(r'usuarios', app_project_viewsets.UsuarioViewSet)
+route.register(r'chamados', app_project_viewsets.ChamadoViewSet, basename='chamado')
+route.register(r'interacoes', app_project_viewsets.InteracaoChamadoViewSet, basename='interacao')
+route.register(r'notificacoes', app_project_viewsets.NotificacaoViewSet, basename='notificacao')
 
 urlpatterns = [
     # ✅ CORREÇÃO: Página inicial correta
@@ -41,7 +49,7 @@ urlpatterns = [
     
     # ✅ URLs PARA O SISTEMA DE CHAT CORRIGIDO
     path('chamado/<uuid:id_chamado>/enviar-mensagem-bot/<int:numero_mensagem>/', views.enviar_mensagem_bot_sequencia, name='enviar_mensagem_bot_sequencia'),
-    path('chamado/<uuid:id_chamado>/verificar-status/', views.verificar_status_chamado, name='verificar_status_chamado'),
+    path('chamado/<uuid:id_chamado>/verificar-status/', polling.verificar_status_chamado, name='verificar_status_chamado'),
     path('chamado/<uuid:id_chamado>/reiniciar-sequencia/', views.reiniciar_sequencia_bot, name='reiniciar_sequencia_bot'),
     
     # ✅ URL PARA SEQUÊNCIA COMPLETA
@@ -54,13 +62,17 @@ urlpatterns = [
     # URLs PARA ATUALIZAÇÃO DE STATUS
     path('chamado/<uuid:id_chamado>/atualizar-status/', views.atualizar_status_chamado, name='atualizar_status_chamado'),
     path('chamado/<uuid:id_chamado>/verificar-novas-mensagens/', views.verificar_novas_mensagens, name='verificar_novas_mensagens'),
-    path('chamado/<uuid:id_chamado>/verificar-mensagens-inteligente/', views.verificar_novas_mensagens_inteligente, name='verificar_mensagens_inteligente'),
+    path('chamado/<uuid:id_chamado>/verificar-mensagens-inteligente/', polling.verificar_novas_mensagens_inteligente, name='verificar_mensagens_inteligente'),
     
     # ✅ APIs de suporte
     path('api/chamados/recentes/', views.api_chamados_recentes, name='api_chamados_recentes'),
     path('api/intermediar-chat/<uuid:id_chamado>/', views.intermediar_chat_bot, name='intermediar_chat'),
     path('api/trocar-status/<uuid:id_chamado>/', views.trocar_status_chamado, name='trocar_status'),
     path('api/dados-grafico/', views.api_dados_grafico, name='api_dados_grafico'),
+    path('api/sla/', views.api_metricas_sla, name='api_metricas_sla'),
+    path('api/volume/', views.api_volume_chamados, name='api_volume_chamados'),
+    path('api/busca/', views.buscar_chamados, name='buscar_chamados'),
+    path('api/exportar/', views.exportar_chamados, name='exportar_chamados'),
     
     # URLs PARA NOTIFICAÇÕES
     path('notificacoes/', views.carregar_notificacoes, name='carregar_notificacoes'),
@@ -68,27 +80,38 @@ urlpatterns = [
     
     
     # ✅ URLs PARA SISTEMA DE NOTIFICAÇÕES CORRIGIDO
-    path('api/verificar-notificacoes/', views.verificar_notificacoes, name='verificar_notificacoes'),
+    path('api/verificar-notificacoes/', polling.verificar_notificacoes, name='verificar_notificacoes'),
     path('api/marcar-todas-notificacoes-lidas/', views.marcar_todas_notificacoes_lidas, name='marcar_todas_notificacoes_lidas'),
     path('api/limpar-notificacoes/', views.limpar_notificacoes, name='limpar_notificacoes'),
     path('api/notificacoes/pendentes/', views.verificar_notificacoes_pendentes_suporte, name='verificar_notificacoes_pendentes'),
     path('api/chamados/pendentes/', views.verificar_chamados_pendentes_globais, name='verificar_chamados_pendentes'),
     path('api/notificacoes/limpar-resolvidos/', views.limpar_notificacoes_chamados_resolvidos, name='limpar_notificacoes_resolvidos'),
-    path('api/chamados/abertos-para-suporte/', views.verificar_chamados_abertos_para_suporte, name='verificar_chamados_abertos_suporte'),
+    path('api/chamados/abertos-para-suporte/', polling.verificar_chamados_abertos_para_suporte, name='verificar_chamados_abertos_suporte'),
 
     # URLs PARA SUPORTE
     path('chamado/<uuid:id_chamado>/marcar-visualizado/', views.marcar_chamado_visualizado, name='marcar_chamado_visualizado'),
     path('chamado/<uuid:id_chamado>/assumir-controle/', views.assumir_controle_chat, name='assumir_controle_chat'),
     path('chamado/<uuid:id_chamado>/enviar-mensagem-suporte/', views.enviar_mensagem_suporte, name='enviar_mensagem_suporte'),
     
+    # ✅ FILA DE ATENDIMENTO (reserva atômica com expiração)
+    path('api/fila/', views.fila_atendimento, name='fila_atendimento'),
+    path('api/fila/reivindicar/', views.reivindicar_chamados, name='reivindicar_chamados'),
+    path('api/fila/<uuid:id_chamado>/renovar/', views.renovar_reserva_chamado, name='renovar_reserva_chamado'),
+    path('api/fila/<uuid:id_chamado>/liberar/', views.liberar_reserva_chamado, name='liberar_reserva_chamado'),
+    
+    # ✅ OPERAÇÕES EM LOTE
+    path('api/lote/chamados/', views.chamados_em_lote, name='chamados_em_lote'),
+    path('api/lote/notificacoes/marcar-lidas/', views.marcar_notificacoes_lidas_em_lote, name='marcar_notificacoes_lidas_em_lote'),
+    
     # ✅ URLs PARA CONTROLE DE VISUALIZAÇÃO
     path('chamado/<uuid:id_chamado>/marcar-mensagens-visualizadas/',  views.marcar_mensagens_visualizadas,  name='marcar_mensagens_visualizadas'),
     path('chamado/<uuid:id_chamado>/obter-ultima-visualizacao/',  views.obter_ultima_visualizacao,  name='obter_ultima_visualizacao'),
+    path('api/chamados/nao-lidas/', views.contar_mensagens_nao_lidas, name='contar_mensagens_nao_lidas'),
 
     # ✅ NOVAS URLs CRÍTICAS PARA NOTIFICAÇÕES
     path('api/notificacoes/<uuid:id_notificacao>/marcar-como-lida/', views.marcar_notificacao_como_lida, name='marcar_notificacao_como_lida'),
     path('api/notificacoes/obter/', views.obter_notificacoes_usuario, name='obter_notificacoes_usuario'),
-    path('api/notificacoes/verificar/', views.verificar_notificacoes, name='verificar_notificacoes'),
+    path('api/notificacoes/verificar/', polling.verificar_notificacoes, name='verificar_notificacoes'),
     path('api/notificacoes/marcar-todas-lidas/', views.marcar_todas_notificacoes_lidas, name='marcar_todas_notificacoes_lidas'),
     path('api/notificacoes/limpar/', views.limpar_notificacoes, name='limpar_notificacoes'),
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatAI_project.settings')
 
 application = get_wsgi_application()
+
+# ✅ Aquecimento: URLConf, views, templates e caches em memória antes da primeira requisição
+from app_project.aquecimento import aquecer_se_configurado  # noqa: E402
+
+aquecer_se_configurado()
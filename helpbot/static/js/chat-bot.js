@@ -9,7 +9,9 @@
 const INTERVALOS = {
     CHAT_SEGUNDO_PLANO: 2 * 60 * 1000,      // 2 minutos (ÚNICO INTERVALO PRINCIPAL)
     REFRESH_DADOS: 5 * 60 * 1000,           // 5 minutos (apenas para dados gerais)
-    VERIFICACAO_MENSAGENS: 30 * 1000,       // 30 segundos para verificações rápidas de mensagens
+    VERIFICACAO_MENSAGENS: 30 * 1000,       // 30 segundos (pausa entre ciclos quando o long-poll falha)
+    LONG_POLL_ESPERA: 25 * 1000,            // Tempo máximo que o servidor segura cada verificação
+    PAUSA_MAXIMA_LIMITE: 10 * 60 * 1000,    // 10 minutos: teto da pausa após 429 (dobra a cada recusa)
     TIMEOUT_CONEXAO: 10 * 1000              // 10 segundos para timeout
 };
 
@@ -131,8 +133,8 @@ function iniciarVerificacoesAutomaticas() {
     // ✅ CORREÇÃO: ÚNICO intervalo de 2 minutos para tudo
     intervaloVerificacaoAutomatica = setInterval(async () => {
         if (chamadoAtual && !modalAberto) {
+            // Mensagens novas já chegam pelo long-poll (iniciarLongPollMensagens)
             await verificarNotificacoesAutomaticas();
-            await verificarNovasMensagensInteligente();
         }
     }, INTERVALOS.CHAT_SEGUNDO_PLANO); // 2 minutos
     
@@ -590,12 +592,8 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
     
-    // ✅ CORREÇÃO: Verificar mensagens rapidamente (30s) mas notificações apenas a cada 2min
-    setInterval(() => {
-        if (chamadoAtual && !modalAberto) {
-            verificarNovasMensagensInteligente();
-        }
-    }, INTERVALOS.VERIFICACAO_MENSAGENS);
+    // ✅ LONG-POLL: mensagens chegam assim que são criadas, sem setInterval fixo
+    iniciarLongPollMensagens();
     
     window.addEventListener('beforeunload', function() {
         console.log('💾 Salvando estado antes de descarregar página...');
@@ -605,8 +603,43 @@ document.addEventListener('DOMContentLoaded', function () {
     detectarMudancasDePagina();
 });
 
-// ✅ FUNÇÃO MELHORADA: Verificação de novas mensagens - INTERVALOS ATUALIZADOS
-async function verificarNovasMensagensInteligente() {
+// ✅ LONG-POLL: cada requisição fica aberta no servidor até chegar mensagem nova (ou 25s)
+let longPollMensagensAtivo = false;
+
+function aguardar(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+async function iniciarLongPollMensagens() {
+    if (longPollMensagensAtivo) {
+        return;
+    }
+    longPollMensagensAtivo = true;
+    let pausaLimite = INTERVALOS.VERIFICACAO_MENSAGENS;
+
+    while (longPollMensagensAtivo) {
+        carregarEstadoAtual();
+        if (!chamadoAtual || modalAberto) {
+            await aguardar(INTERVALOS.VERIFICACAO_MENSAGENS);
+            continue;
+        }
+
+        const sucesso = await verificarNovasMensagensInteligente(INTERVALOS.LONG_POLL_ESPERA / 1000);
+        if (sucesso === 'limite') {
+            // 429: limite de requisições atingido - pausa cada vez maior até o servidor aceitar de novo
+            await aguardar(pausaLimite);
+            pausaLimite = Math.min(pausaLimite * 2, INTERVALOS.PAUSA_MAXIMA_LIMITE);
+        } else if (sucesso === false) {
+            // Erro de rede/servidor: não martelar o backend
+            await aguardar(INTERVALOS.VERIFICACAO_MENSAGENS);
+        } else {
+            pausaLimite = INTERVALOS.VERIFICACAO_MENSAGENS;
+        }
+    }
+}
+
+// ✅ FUNÇÃO MELHORADA: Verificação de novas mensagens (espera > 0 = long-poll)
+async function verificarNovasMensagensInteligente(espera = 0) {
     carregarEstadoAtual();
     
     if (!chamadoAtual) {
@@ -615,7 +648,7 @@ async function verificarNovasMensagensInteligente() {
     }
     
     try {
-        const url = `/chamado/${chamadoAtual.chamado_id}/verificar-mensagens-inteligente/?ultima_visualizada_id=${ultimaMensagemVisualizadaId || ''}`;
+        const url = `/chamado/${chamadoAtual.chamado_id}/verificar-mensagens-inteligente/?ultima_visualizada_id=${ultimaMensagemVisualizadaId || ''}&wait=${espera}`;
         
         console.log(`🔍 Verificando novas mensagens inteligente: ${url}`);
         
@@ -625,6 +658,10 @@ async function verificarNovasMensagensInteligente() {
             }
         });
         
+        if (response.status === 429) {
+            console.warn('⏳ Limite de verificações atingido, aguardando antes de tentar de novo');
+            return 'limite';
+        }
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -681,10 +718,13 @@ async function verificarNovasMensagensInteligente() {
             }
         } else {
             console.error('❌ Erro na resposta da API:', result.message);
+            return false;
         }
     } catch (error) {
         console.error('❌ Erro ao verificar novas mensagens inteligente:', error);
+        return false;
     }
+    return true;
 }
 
 // --- Funções de Gerenciamento do LocalStorage ---